@@ -26,4 +26,5 @@ setuptools.setup(
     package_dir={"": "src"},
     python_requires=">=3.6",
     install_requires=["python-periphery >= 2.3.0", "bitstring >= 3.1.9, < 4.2.0", "protobuf>=3.20"],
+    extras_require={"numpy": ["numpy"]},
 )
@@ -0,0 +1,158 @@
+"""
+Tool for measuring ADC conversion times on a specific EdgePi board
+
+The delays in adc_conv_time.py are datasheet worst cases. This tool sweeps data rate and
+filter mode configurations, times conversions by polling the ADC STATUS byte for new data,
+and writes a board profile which EdgePiADC can use instead of the worst case delays:
+
+    python -m edgepi.adc.adc_characterization adc_profile.json
+
+    edgepi_adc = EdgePiADC(conv_time_profile=ConvTimeProfile.load("adc_profile.json"))
+
+The sweep reconfigures the ADC, and takes several minutes with the default settings.
+
+Functions:
+    characterize_conversion_times(EdgePiADC, list, list, list, int)
+"""
+
+import argparse
+import logging
+
+from edgepi.adc.adc_constants import (
+    ADCNum,
+    ConvMode,
+    ADC1DataRate as DR1,
+    ADC2DataRate as DR2,
+    FilterMode as FILT,
+)
+from edgepi.adc.adc_conv_time import ConvTimeProfile
+
+_logger = logging.getLogger(__name__)
+
+# continuous conversions timed before the measured ones, new data may already be
+# available when polling starts
+NUM_SKIPPED_CONVERSIONS = 2
+
+
+def _time_initial_conversions(adc, adc_num: ADCNum, num_trials: int, stop: bool) -> float:
+    """Longest time from a start command to the first conversion, in ms"""
+    times = []
+    for _ in range(num_trials):
+        times.append(adc.measure_conversion_time(adc_num))
+        if stop:
+            adc.stop_conversions(adc_num)
+    return max(times)
+
+
+def _time_continuous_conversions(adc, adc_num: ADCNum, num_trials: int) -> float:
+    """Longest time between two continuous conversions, in ms"""
+    adc.measure_conversion_time(adc_num)
+    times = [
+        adc.measure_conversion_time(adc_num, start=False)
+        for _ in range(num_trials + NUM_SKIPPED_CONVERSIONS)
+    ]
+    adc.stop_conversions(adc_num)
+    return max(times[NUM_SKIPPED_CONVERSIONS:])
+
+
+def characterize_conversion_times(
+    adc,
+    adc_1_data_rates: list = None,
+    adc_2_data_rates: list = None,
+    filter_modes: list = None,
+    num_trials: int = 5,
+    margin: float = 0.1,
+    margin_ms: float = 0.05,
+) -> ConvTimeProfile:
+    """
+    Measure conversion times of an ADC for each data rate and filter mode configuration.
+    The longest time measured for each configuration is recorded.
+
+    Args:
+        `adc` (EdgePiADC): the ADC to characterize, it is left configured for the last
+            configuration measured
+
+        `adc_1_data_rates` (list): ADC1DataRate values to measure, defaults to all
+
+        `adc_2_data_rates` (list): ADC2DataRate values to measure, defaults to all
+
+        `filter_modes` (list): FilterMode values to measure ADC1 with, defaults to all
+
+        `num_trials` (int): number of conversions timed per configuration
+
+        `margin` (float): fractional safety margin stored in the profile
+
+        `margin_ms` (float): fixed safety margin in milliseconds stored in the profile
+
+    Returns:
+        `ConvTimeProfile`: the measured conversion times
+    """
+    if num_trials < 1:
+        raise ValueError(f"num_trials must be at least 1, got {num_trials}")
+    adc_1_data_rates = list(DR1) if adc_1_data_rates is None else adc_1_data_rates
+    adc_2_data_rates = list(DR2) if adc_2_data_rates is None else adc_2_data_rates
+    filter_modes = list(FILT) if filter_modes is None else filter_modes
+
+    profile = ConvTimeProfile(margin=margin, margin_ms=margin_ms)
+
+    for data_rate in adc_1_data_rates:
+        rate_code = data_rate.value.op_code
+        for filter_mode in filter_modes:
+            adc.set_config(
+                conversion_mode=ConvMode.PULSE, adc_1_data_rate=data_rate, filter_mode=filter_mode
+            )
+            initial = _time_initial_conversions(adc, ADCNum.ADC_1, num_trials, stop=False)
+            profile.adc1_initial.setdefault(rate_code, {})[filter_mode.value.op_code] = initial
+
+            adc.set_config(conversion_mode=ConvMode.CONTINUOUS)
+            continuous = _time_continuous_conversions(adc, ADCNum.ADC_1, num_trials)
+            profile.adc1_continuous[rate_code] = max(
+                continuous, profile.adc1_continuous.get(rate_code, 0)
+            )
+            _logger.info(
+                f"ADC1 {data_rate.name} {filter_mode.name}: initial={initial:.3f} ms, "
+                f"continuous={continuous:.3f} ms"
+            )
+
+    for data_rate in adc_2_data_rates:
+        rate_code = data_rate.value.op_code
+        adc.set_config(adc_2_data_rate=data_rate)
+        profile.adc2_initial[rate_code] = _time_initial_conversions(
+            adc, ADCNum.ADC_2, num_trials, stop=True
+        )
+        profile.adc2_continuous[rate_code] = _time_continuous_conversions(
+            adc, ADCNum.ADC_2, num_trials
+        )
+        _logger.info(
+            f"ADC2 {data_rate.name}: initial={profile.adc2_initial[rate_code]:.3f} ms, "
+            f"continuous={profile.adc2_continuous[rate_code]:.3f} ms"
+        )
+
+    return profile
+
+
+def main(argv: list = None):
+    """Characterize the ADC of this EdgePi and write its conversion time profile"""
+    # pylint: disable=import-outside-toplevel
+    # importing the ADC module requires the EdgePi hardware libraries
+    from edgepi.adc.edgepi_adc import EdgePiADC
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("output", help="path of the JSON profile to write")
+    parser.add_argument("--trials", type=int, default=5, help="conversions per configuration")
+    parser.add_argument("--margin", type=float, default=0.1, help="fractional safety margin")
+    parser.add_argument("--margin-ms", type=float, default=0.05, help="fixed safety margin (ms)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    adc = EdgePiADC()
+    profile = characterize_conversion_times(
+        adc, num_trials=args.trials, margin=args.margin, margin_ms=args.margin_ms
+    )
+    adc.reset()
+    profile.save(args.output)
+    _logger.info(f"Conversion time profile written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
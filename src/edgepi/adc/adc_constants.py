@@ -11,6 +11,8 @@ ADC_NUM_REGS = 27  # number of ADC1263 registers
 ADC_VOLTAGE_READ_LEN = 6 # number of bytes per voltage read
 ADC1_NUM_DATA_BYTES = 4 # Number of data bytes for ADC 1
 ADC2_NUM_DATA_BYTES = 3 # Number of data bytes for ADC 2
+# unchanged registers bridged when merging register writes (a new WREG command costs 2 bytes)
+ADC_REG_SPAN_MAX_GAP = 2
 
 
 @unique
@@ -5,8 +5,15 @@
 # - Digital filter mode (REG_MODE1)
 # - Data rate mode (REG_MODE2)
 # - IDAC/Chop mode (REG_MODE0) -> currently not user-configurable
+#
+# The delay tables below are datasheet worst cases. A ConvTimeProfile holds conversion times
+# measured on a specific board (see adc_characterization.py), which can be used instead.
 
 
+from dataclasses import dataclass, field
+import json
+from typing import Optional
+
 from edgepi.adc.adc_constants import (
     FilterMode as FILT,
     ADC1DataRate as DR1,
@@ -199,7 +206,134 @@ ADC2_CONT_DELAYS = {
 }
 
 
-def expected_initial_time_delay(adc_num: ADCNum, data_rate: int, filter_mode: int):
+@dataclass
+class ConvTimeProfile:
+    """
+    Conversion times measured on a specific board, in milliseconds, keyed by data rate and
+    filter mode op_code values in the same way as the datasheet delay tables of this module.
+    Delays computed from a profile add a safety margin to the measured times.
+
+    Attributes:
+        `adc1_initial` (dict): {data_rate (int): {filter_mode (int): time (float)}}, pulse
+            conversion time or first conversion time in continuous mode for ADC1
+        `adc1_continuous` (dict): {data_rate (int): time (float)}, time between ADC1
+            conversions in continuous mode
+        `adc2_initial` (dict): {data_rate (int): time (float)}, first conversion time for ADC2
+        `adc2_continuous` (dict): {data_rate (int): time (float)}, time between ADC2 conversions
+        `margin` (float): safety margin, as a fraction of the measured time
+        `margin_ms` (float): fixed safety margin in milliseconds, added to the fractional margin
+    """
+
+    adc1_initial: dict = field(default_factory=dict)
+    adc1_continuous: dict = field(default_factory=dict)
+    adc2_initial: dict = field(default_factory=dict)
+    adc2_continuous: dict = field(default_factory=dict)
+    margin: float = 0.1
+    margin_ms: float = 0.05
+
+    def __with_margin(self, measured: Optional[float]) -> Optional[float]:
+        if measured is None:
+            return None
+        return measured * (1 + self.margin) + self.margin_ms
+
+    def initial_delay(self, adc_num: ADCNum, data_rate: int, filter_mode: int) -> Optional[float]:
+        """
+        Get the initial conversion delay with safety margin, in milliseconds
+
+        Returns:
+            `float`: the delay, or None if this configuration was not measured
+        """
+        if adc_num == ADCNum.ADC_1:
+            measured = self.adc1_initial.get(data_rate, {}).get(filter_mode)
+        else:
+            measured = self.adc2_initial.get(data_rate)
+        return self.__with_margin(measured)
+
+    def continuous_delay(self, adc_num: ADCNum, data_rate: int) -> Optional[float]:
+        """
+        Get the continuous conversion delay with safety margin, in milliseconds
+
+        Returns:
+            `float`: the delay, or None if this configuration was not measured
+        """
+        table = self.adc1_continuous if adc_num == ADCNum.ADC_1 else self.adc2_continuous
+        return self.__with_margin(table.get(data_rate))
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the profile, identifying data rates and filter modes by name so the
+        profile stays readable
+
+        Returns:
+            `dict`: JSON serializable representation of this profile
+        """
+        dr1_names = {rate.value.op_code: rate.name for rate in DR1}
+        dr2_names = {rate.value.op_code: rate.name for rate in DR2}
+        filter_names = {filt.value.op_code: filt.name for filt in FILT}
+        return {
+            "adc1_initial": {
+                dr1_names[rate]: {filter_names[filt]: time for filt, time in times.items()}
+                for rate, times in self.adc1_initial.items()
+            },
+            "adc1_continuous": {
+                dr1_names[rate]: time for rate, time in self.adc1_continuous.items()
+            },
+            "adc2_initial": {dr2_names[rate]: time for rate, time in self.adc2_initial.items()},
+            "adc2_continuous": {
+                dr2_names[rate]: time for rate, time in self.adc2_continuous.items()
+            },
+            "margin": self.margin,
+            "margin_ms": self.margin_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConvTimeProfile":
+        """
+        Deserialize a profile created by `to_dict`
+
+        Args:
+            `data` (dict): serialized profile
+
+        Returns:
+            `ConvTimeProfile`: the profile
+        """
+        return cls(
+            adc1_initial={
+                DR1[rate].value.op_code: {
+                    FILT[filt].value.op_code: time for filt, time in times.items()
+                }
+                for rate, times in data.get("adc1_initial", {}).items()
+            },
+            adc1_continuous={
+                DR1[rate].value.op_code: time
+                for rate, time in data.get("adc1_continuous", {}).items()
+            },
+            adc2_initial={
+                DR2[rate].value.op_code: time for rate, time in data.get("adc2_initial", {}).items()
+            },
+            adc2_continuous={
+                DR2[rate].value.op_code: time
+                for rate, time in data.get("adc2_continuous", {}).items()
+            },
+            margin=data.get("margin", 0.1),
+            margin_ms=data.get("margin_ms", 0.05),
+        )
+
+    def save(self, path: str):
+        """Write the profile to a JSON file"""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+    @classmethod
+    def load(cls, path: str) -> "ConvTimeProfile":
+        """Read a profile from a JSON file written by `save`"""
+        with open(path, "r", encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+
+def expected_initial_time_delay(
+    adc_num: ADCNum, data_rate: int, filter_mode: int, profile: ConvTimeProfile = None
+):
     """
     Computes conversion latency (ms) based on ADC configuration
     for PULSE mode reads or initial read in CONTINUOUS mode.
@@ -211,9 +345,17 @@ def expected_initial_time_delay(adc_num: ADCNum, data_rate: int, filter_mode: in
 
         `filter_mode` (int): opcode value of filter mode bits
 
+        `profile` (ConvTimeProfile): measured conversion times to use instead of the
+            datasheet worst cases, for configurations the profile covers
+
     Returns:
         `float`: conversion delay in milliseconds (ms)
     """
+    if profile is not None:
+        delay = profile.initial_delay(adc_num, data_rate, filter_mode)
+        if delay is not None:
+            return delay
+
     if adc_num == ADCNum.ADC_1:
         # this is the initial delay for both pulse and continuous modes
         return ADC1_INITIAL_DELAYS[data_rate][filter_mode]
@@ -224,7 +366,9 @@ def expected_initial_time_delay(adc_num: ADCNum, data_rate: int, filter_mode: in
 
 
 
-def expected_continuous_time_delay(adc_num: ADCNum, data_rate: int):
+def expected_continuous_time_delay(
+    adc_num: ADCNum, data_rate: int, profile: ConvTimeProfile = None
+):
     """
     Computes conversion latency (ms) based on ADC configuration
     for reads 2...n in continuous conversion mode.
@@ -234,9 +378,17 @@ def expected_continuous_time_delay(adc_num: ADCNum, data_rate: int):
 
         `data_rate` (int): opcode value of data rate bits
 
+        `profile` (ConvTimeProfile): measured conversion times to use instead of the
+            datasheet worst cases, for configurations the profile covers
+
     Returns:
         `float`: conversion delay in milliseconds (ms)
     """
+    if profile is not None:
+        delay = profile.continuous_delay(adc_num, data_rate)
+        if delay is not None:
+            return delay
+
     if adc_num == ADCNum.ADC_1:
         return ADC1_CONT_DELAYS[data_rate]
 
@@ -0,0 +1,206 @@
+"""
+Oversampling and filtering stages for streams of ADC codes
+
+Stages operate on signed codes (see `adc_voltage.code_to_signed_code`), before conversion to
+voltage. Conversion is linear, so averaging codes and converting once gives the same result as
+converting every sample and averaging the voltages, without converting samples that are
+discarded. Stages keep their state between calls to `process`, so a stream can be filtered
+one batch at a time, and stages can be chained in a `CodePipeline`.
+
+Classes:
+    CodeFilter
+    BlockAverage
+    MovingAverage
+    BlockMedian
+    Decimator
+    CodePipeline
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+class CodeFilter(ABC):
+    """
+    Base class for filter stages. Subclasses implement `process`, returning the codes output
+    for a sequence of input codes, and `reset`, clearing the state kept between calls.
+    """
+
+    @abstractmethod
+    def process(self, codes: list) -> list:
+        """
+        Filter a sequence of codes
+
+        Args:
+            `codes` (list): codes following the codes of previous calls
+
+        Returns:
+            `list`: codes output by the filter, may be fewer than the codes input
+        """
+
+    @abstractmethod
+    def reset(self):
+        """Clear the samples kept from previous calls"""
+
+
+def _check_size(name: str, size: int):
+    if not isinstance(size, int) or size < 1:
+        raise ValueError(f"{name} must be a positive integer, got {size}")
+
+
+class BlockAverage(CodeFilter):
+    """
+    Outputs the mean of each block of `size` consecutive codes, reducing the sample rate by
+    `size` and the noise by about sqrt(`size`)
+
+    Args:
+        `size` (int): number of codes averaged per output code
+    """
+
+    def __init__(self, size: int):
+        _check_size("size", size)
+        self.size = size
+        self.__total = 0
+        self.__count = 0
+
+    def process(self, codes: list) -> list:
+        out = []
+        total, count, size = self.__total, self.__count, self.size
+        for code in codes:
+            total += code
+            count += 1
+            if count == size:
+                out.append(total / size)
+                total, count = 0, 0
+        self.__total, self.__count = total, count
+        return out
+
+    def reset(self):
+        self.__total = 0
+        self.__count = 0
+
+    def __repr__(self) -> str:
+        return f"BlockAverage(size={self.size})"
+
+
+class MovingAverage(CodeFilter):
+    """
+    Boxcar filter, outputs the mean of the last `size` codes for each code input once `size`
+    codes have been input. The mean is updated incrementally from a running sum.
+
+    Args:
+        `size` (int): number of codes in the averaging window
+    """
+
+    def __init__(self, size: int):
+        _check_size("size", size)
+        self.size = size
+        self.__window = deque()
+        self.__total = 0
+
+    def process(self, codes: list) -> list:
+        out = []
+        window, size = self.__window, self.size
+        total = self.__total
+        for code in codes:
+            window.append(code)
+            total += code
+            if len(window) > size:
+                total -= window.popleft()
+            if len(window) == size:
+                out.append(total / size)
+        self.__total = total
+        return out
+
+    def reset(self):
+        self.__window.clear()
+        self.__total = 0
+
+    def __repr__(self) -> str:
+        return f"MovingAverage(size={self.size})"
+
+
+class BlockMedian(CodeFilter):
+    """
+    Outputs the median of each block of `size` consecutive codes, rejecting outlier codes
+    such as spikes caused by switching noise
+
+    Args:
+        `size` (int): number of codes per output code, odd sizes avoid averaging the two
+            middle codes
+    """
+
+    def __init__(self, size: int):
+        _check_size("size", size)
+        self.size = size
+        self.__block = []
+
+    def process(self, codes: list) -> list:
+        out = []
+        block, size = self.__block, self.size
+        middle = size // 2
+        for code in codes:
+            block.append(code)
+            if len(block) == size:
+                block.sort()
+                out.append(block[middle] if size % 2 else (block[middle - 1] + block[middle]) / 2)
+                block.clear()
+        return out
+
+    def reset(self):
+        self.__block.clear()
+
+    def __repr__(self) -> str:
+        return f"BlockMedian(size={self.size})"
+
+
+class Decimator(CodeFilter):
+    """
+    Outputs every `factor`-th code, discarding the others. Should follow a filter removing
+    frequencies above the decimated Nyquist frequency, such as `MovingAverage`.
+
+    Args:
+        `factor` (int): decimation factor
+    """
+
+    def __init__(self, factor: int):
+        _check_size("factor", factor)
+        self.factor = factor
+        self.__phase = 0
+
+    def process(self, codes: list) -> list:
+        # index of the first code of this call to output
+        start = (self.factor - self.__phase) % self.factor
+        out = list(codes[start::self.factor])
+        self.__phase = (self.__phase + len(codes)) % self.factor
+        return out
+
+    def reset(self):
+        self.__phase = 0
+
+    def __repr__(self) -> str:
+        return f"Decimator(factor={self.factor})"
+
+
+class CodePipeline(CodeFilter):
+    """
+    Chain of filter stages, each stage processing the codes output by the previous one
+
+    Args:
+        `stages` (CodeFilter): filter stages, in processing order
+    """
+
+    def __init__(self, *stages: CodeFilter):
+        self.stages = list(stages)
+
+    def process(self, codes: list) -> list:
+        for stage in self.stages:
+            codes = stage.process(codes)
+        return list(codes)
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+
+    def __repr__(self) -> str:
+        return f"CodePipeline({', '.join(repr(stage) for stage in self.stages)})"
@@ -0,0 +1,58 @@
+"""
+Precompiled ADC voltage reads
+
+A read plan captures, from one read of the ADC configuration, everything needed to read and
+convert a voltage: the read command, the channel and the calibration to apply. Each read is
+then a single SPI transfer, with no register reads, which suits fixed rate loops such as
+`edgepi.control.control_loop.ControlLoop`.
+
+Classes:
+    ADCReadPlan
+"""
+
+from dataclasses import dataclass
+
+from edgepi.adc.adc_constants import ADC_VOLTAGE_READ_LEN, ADCNum
+from edgepi.adc.adc_exceptions import VoltageReadError
+from edgepi.adc.adc_voltage import code_to_voltage
+from edgepi.calibration.calibration_constants import CalibParam
+from edgepi.utilities.crc_8_atm import check_crc
+
+
+@dataclass(frozen=True)
+class ADCReadPlan:
+    """
+    Voltage read of one ADC channel, created by `EdgePiADC.compile_read_plan`. The ADC
+    configuration must not change while the plan is used.
+
+    Attributes:
+        `adc_num` (ADCNum): the ADC read
+        `channel` (int): the channel read, encoded as mux_p << 4 | mux_n
+        `command` (list): the read command, transferred once per read
+        `calibs` (CalibParam): gain and offset calibration of the channel
+        `single_ended` (bool): True if the channel is read against AINCOM
+    """
+
+    adc_num: ADCNum
+    channel: int
+    command: list
+    calibs: CalibParam
+    single_ended: bool
+
+    def decode(self, read_data: list) -> float:
+        """
+        Convert the data received for the read command to voltage
+
+        Args:
+            `read_data` (list): bytes received while transferring `command`
+
+        Returns:
+            `float`: input voltage (V)
+        """
+        if (len(read_data) - 1) != ADC_VOLTAGE_READ_LEN:
+            raise VoltageReadError(
+                f"Voltage read failed: incorrect number of bytes ({len(read_data)}) retrieved"
+            )
+        voltage_code = read_data[2 : (2 + self.adc_num.value.num_data_bytes)]
+        check_crc(voltage_code, read_data[6])
+        return code_to_voltage(voltage_code, self.adc_num.value, self.calibs, self.single_ended)
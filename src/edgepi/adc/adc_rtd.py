@@ -0,0 +1,242 @@
+"""
+Batch conversion of RTD codes to temperatures
+
+`RTDConverter` converts many RTD conversion codes at once, using either the linear model of
+`adc_voltage.code_to_temperature`, or the Callendar–Van Dusen equation of IEC 60751. The
+Callendar–Van Dusen equation has no closed form inverse below 0 °C, so it is inverted with a
+resistance to temperature lookup table computed once per converter, and linear interpolation
+between table entries.
+
+Classes:
+    RTDModel
+    CVDCoefficients
+    RTDConverter
+
+Functions:
+    cvd_resistance(float, float, CVDCoefficients)
+"""
+
+import bisect
+from dataclasses import dataclass
+from enum import Enum
+
+from edgepi.adc.adc_constants import ADCNum
+
+# bits of resolution of RTD codes, see `adc_voltage.code_to_temperature`
+RTD_CODE_BITS = {ADCNum.ADC_1: 30, ADCNum.ADC_2: 22}
+
+
+class RTDModel(Enum):
+    """RTD resistance to temperature models"""
+
+    LINEAR = "linear"
+    CALLENDAR_VAN_DUSEN = "callendar_van_dusen"
+
+
+@dataclass(frozen=True)
+class CVDCoefficients:
+    """
+    Callendar–Van Dusen coefficients, defaults are the IEC 60751 values for platinum RTDs
+
+    Attributes:
+        `a` (float): A coefficient (1/°C)
+        `b` (float): B coefficient (1/°C^2)
+        `c` (float): C coefficient (1/°C^4), only used below 0 °C
+    """
+
+    a: float = 3.9083e-3
+    b: float = -5.775e-7
+    c: float = -4.183e-12
+
+
+def cvd_resistance(temperature: float, r_0: float, coefficients: CVDCoefficients) -> float:
+    """
+    Resistance of an RTD at a temperature, using the Callendar–Van Dusen equation
+
+    Args:
+        `temperature` (float): temperature (°C)
+        `r_0` (float): resistance of the RTD at 0 °C (Ohms)
+        `coefficients` (CVDCoefficients): Callendar–Van Dusen coefficients
+
+    Returns:
+        `float`: RTD resistance (Ohms)
+    """
+    t = temperature
+    ratio = 1 + coefficients.a * t + coefficients.b * t * t
+    if t < 0:
+        ratio += coefficients.c * (t - 100) * t * t * t
+    return r_0 * ratio
+
+
+@dataclass(frozen=True)
+class _CVDTable:
+    """
+    Callendar–Van Dusen resistance to temperature lookup table
+
+    Attributes:
+        `temperatures` (list): table temperatures (°C), in increasing order
+        `resistances` (list): RTD resistance (Ohms) at each table temperature
+        `slopes` (list): temperature variation (°C/Ohm) between consecutive table entries
+    """
+
+    temperatures: list
+    resistances: list
+    slopes: list
+
+    @staticmethod
+    def build(r_0: float, coefficients: CVDCoefficients, t_range: tuple, t_step: float):
+        """
+        Compute the lookup table of an RTD
+
+        Args:
+            `r_0` (float): RTD resistance at 0 °C (Ohms)
+
+            `coefficients` (CVDCoefficients): Callendar–Van Dusen coefficients
+
+            `t_range` (tuple): (min, max) temperatures of the table (°C)
+
+            `t_step` (float): temperature step of the table (°C)
+
+        Returns:
+            `_CVDTable`: the lookup table
+        """
+        num_steps = int(round((t_range[1] - t_range[0]) / t_step))
+        temperatures = [t_range[0] + i * t_step for i in range(num_steps + 1)]
+        resistances = [cvd_resistance(t, r_0, coefficients) for t in temperatures]
+        slopes = [
+            (t_1 - t_0) / (res_1 - res_0)
+            for t_0, t_1, res_0, res_1 in zip(
+                temperatures, temperatures[1:], resistances, resistances[1:]
+            )
+        ]
+        return _CVDTable(temperatures, resistances, slopes)
+
+
+class RTDConverter:
+    """
+    Converts RTD codes read from the ADC to temperatures, applying the RTD calibration.
+    Codes are the unsigned integer values of the ADC data bytes, as stored in the `raw_code`
+    field of sample records.
+
+    Args:
+        `ref_resistance` (float): EdgePi RTD reference resistance (Ohms)
+
+        `adc_num` (ADCNum): ADC the codes were read with
+
+        `r_0` (float): RTD resistance at 0 °C (Ohms)
+
+        `alpha` (float): RTD resistance variation (Ohms/°C), used by the linear model
+
+        `gain` (float): RTD calibration gain
+
+        `offset` (float): RTD calibration offset (°C)
+
+        `model` (RTDModel): resistance to temperature model
+
+        `coefficients` (CVDCoefficients): Callendar–Van Dusen coefficients
+
+        `t_range` (tuple): (min, max) temperatures of the lookup table (°C). Codes outside
+            this range are converted to NaN by the Callendar–Van Dusen model.
+
+        `t_step` (float): temperature step of the lookup table (°C)
+    """
+
+    def __init__(
+        self,
+        ref_resistance: float,
+        adc_num: ADCNum,
+        r_0: float = 100,
+        alpha: float = 0.385,
+        gain: float = 1.0,
+        offset: float = 0.0,
+        model: RTDModel = RTDModel.LINEAR,
+        coefficients: CVDCoefficients = CVDCoefficients(),
+        t_range: tuple = (-200, 850),
+        t_step: float = 0.5,
+    ):
+        if t_step <= 0 or t_range[0] >= t_range[1]:
+            raise ValueError(f"Invalid lookup table range {t_range} or step {t_step}")
+        self.model = model
+        self.r_0 = r_0
+        self.alpha = alpha
+        self.gain = gain
+        self.offset = offset
+        # resistance (Ohms) of one code unit
+        self.ohms_per_code = ref_resistance / 2 ** RTD_CODE_BITS[adc_num]
+        self.__table = None
+        if model == RTDModel.CALLENDAR_VAN_DUSEN:
+            self.__table = _CVDTable.build(r_0, coefficients, t_range, t_step)
+
+    def __linear_coefficients(self) -> tuple:
+        """
+        Linear model as temperature = code * scale + intercept, calibration included
+
+        Returns:
+            `tuple`: (scale, intercept)
+        """
+        scale = self.ohms_per_code / self.alpha * self.gain
+        return scale, self.offset - self.r_0 / self.alpha * self.gain
+
+    def resistance_to_temperature(self, resistance: float) -> float:
+        """
+        Uncalibrated RTD temperature of a resistance, using the converter's model
+
+        Args:
+            `resistance` (float): RTD resistance (Ohms)
+
+        Returns:
+            `float`: temperature (°C), NaN if outside of the lookup table range
+        """
+        if self.model == RTDModel.LINEAR:
+            return (resistance - self.r_0) / self.alpha
+        table = self.__table
+        resistances = table.resistances
+        index = bisect.bisect_right(resistances, resistance) - 1
+        if index < 0 or resistance > resistances[-1]:
+            return float("nan")
+        index = min(index, len(table.slopes) - 1)
+        return table.temperatures[index] + (resistance - resistances[index]) * table.slopes[index]
+
+    def convert(self, codes) -> list:
+        """
+        Convert RTD codes to calibrated temperatures
+
+        Args:
+            `codes` (iterable): unsigned integer RTD codes
+
+        Returns:
+            `list`: temperatures (°C)
+        """
+        if self.model == RTDModel.LINEAR:
+            scale, intercept = self.__linear_coefficients()
+            return [code * scale + intercept for code in codes]
+        ohms_per_code, gain, offset = self.ohms_per_code, self.gain, self.offset
+        to_temperature = self.resistance_to_temperature
+        return [to_temperature(code * ohms_per_code) * gain + offset for code in codes]
+
+    def convert_numpy(self, codes):
+        """
+        Convert RTD codes to calibrated temperatures with NumPy, installed with the `numpy`
+        extra
+
+        Args:
+            `codes` (array_like): unsigned integer RTD codes
+
+        Returns:
+            `numpy.ndarray`: temperatures (°C)
+        """
+        # pylint: disable=import-outside-toplevel
+        import numpy
+
+        codes = numpy.asarray(codes, dtype=numpy.float64)
+        if self.model == RTDModel.LINEAR:
+            scale, intercept = self.__linear_coefficients()
+            return codes * scale + intercept
+        temperatures = numpy.interp(
+            codes * self.ohms_per_code,
+            self.__table.resistances,
+            self.__table.temperatures,
+            left=numpy.nan,
+            right=numpy.nan,
+        )
+        return temperatures * self.gain + self.offset
@@ -1,5 +1,6 @@
 """ADC State Module"""
 from dataclasses import dataclass
+from functools import cached_property
 import logging
 
 from edgepi.adc.adc_query_lang import PropertyValue, ADCProperties
@@ -12,6 +13,44 @@ from edgepi.adc.adc_constants import (
 
 _logger = logging.getLogger(__name__)
 
+def _build_lookup_table(adc_property: ADCProperties) -> tuple:
+    """
+    Maps every possible value of an ADC property's register to the property's value,
+    or to None if the register value does not encode a valid property value
+    """
+    prop = adc_property.value
+    return tuple(prop.values.get(~prop.mask & reg_value) for reg_value in range(256))
+
+
+# per-property (register address, lookup table) pairs, so decoding a property from a
+# register map takes one dict and one tuple index
+_PROPERTY_DECODERS = {
+    adc_property: (adc_property.value.addx, _build_lookup_table(adc_property))
+    for adc_property in ADCProperties
+}
+
+
+def _decode_property(reg_map: dict, adc_property: ADCProperties) -> PropertyValue:
+    """
+    Decode the value of an ADC property from a register map
+
+    Args:
+        `reg_map` (dict): register map formatted as {addx (int): value (int)}
+        `adc_property` (ADCProperties): ADC property whose value is to be decoded
+
+    Returns:
+        `PropertyValue`: information about the current value of this property
+    """
+    addx, table = _PROPERTY_DECODERS[adc_property]
+    reg_value = reg_map[addx]
+    property_value = table[reg_value]
+    if property_value is None:
+        raise KeyError(
+            f"register value {hex(reg_value)} is not a valid value of {adc_property}"
+        )
+    return property_value
+
+
 @dataclass
 class ADCReadFields:
     """
@@ -22,67 +61,146 @@ class ADCReadFields:
     mux_p: PropertyValue
     mux_n: PropertyValue
 
+    @staticmethod
+    def from_reg_map(
+        reg_map: dict,
+        conversion_mode,
+        data_rate: ADCProperties,
+        mux_p: ADCProperties,
+        mux_n: ADCProperties,
+    ) -> "ADCReadFields":
+        """
+        Create read fields decoded from a register map on first access
+
+        Args:
+            `reg_map` (dict): register map formatted as {addx (int): value (int)}
+            `conversion_mode` (ADCProperties | PropertyValue): property to decode the conversion
+                mode from, or the conversion mode itself if it is not configurable
+            `data_rate`, `mux_p`, `mux_n` (ADCProperties): properties to decode the
+                corresponding fields from
+
+        Returns:
+            `ADCReadFields`: fields decoding each property the first time it is read
+        """
+        return _LazyADCReadFields(reg_map, (conversion_mode, data_rate, mux_p, mux_n))
+
+
+class _LazyADCReadFields(ADCReadFields):
+    """ADCReadFields decoding each field from a register map on first access"""
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, reg_map: dict, properties: tuple):
+        self.__reg_map = reg_map
+        self.__properties = properties
+
+    def __decode(self, index: int) -> PropertyValue:
+        adc_property = self.__properties[index]
+        if isinstance(adc_property, PropertyValue):
+            return adc_property
+        return _decode_property(self.__reg_map, adc_property)
+
+    @cached_property
+    def conversion_mode(self) -> PropertyValue:
+        """conversion mode of this ADC"""
+        return self.__decode(0)
+
+    @cached_property
+    def data_rate(self) -> PropertyValue:
+        """data rate of this ADC"""
+        return self.__decode(1)
+
+    @cached_property
+    def mux_p(self) -> PropertyValue:
+        """positive input of this ADC"""
+        return self.__decode(2)
+
+    @cached_property
+    def mux_n(self) -> PropertyValue:
+        """negative input of this ADC"""
+        return self.__decode(3)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ADCReadFields):
+            return NotImplemented
+        return (self.conversion_mode, self.data_rate, self.mux_p, self.mux_n) == (
+            other.conversion_mode, other.data_rate, other.mux_p, other.mux_n
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ADCReadFields(conversion_mode={self.conversion_mode!r}, "
+            f"data_rate={self.data_rate!r}, mux_p={self.mux_p!r}, mux_n={self.mux_n!r})"
+        )
+
+
 class ADCState:
-    """ADC state intended for reading by users"""
-    # pylint: disable=too-many-instance-attributes
+    """
+    ADC state intended for reading by users.
+
+    Properties are decoded from the register map on first access, so callers only pay for
+    the properties they read.
+    """
+
     def __init__(self, reg_map: dict):
-        self.__reg_map = reg_map
-        self.adc_1: ADCReadFields = ADCReadFields(
-            self.__get_state(ADCProperties.CONV_MODE),
-            self.__get_state(ADCProperties.DATA_RATE_1),
-            self.__get_state(ADCProperties.ADC1_MUXP),
-            self.__get_state(ADCProperties.ADC1_MUXN),
+        # copy the map, so later register updates do not change this state
+        self.__reg_map = reg_map.copy()
+        self.adc_1: ADCReadFields = ADCReadFields.from_reg_map(
+            self.__reg_map,
+            ADCProperties.CONV_MODE,
+            ADCProperties.DATA_RATE_1,
+            ADCProperties.ADC1_MUXP,
+            ADCProperties.ADC1_MUXN,
         )
-        self.adc_2: ADCReadFields = ADCReadFields(
+        self.adc_2: ADCReadFields = ADCReadFields.from_reg_map(
+            self.__reg_map,
             PropertyValue("continuous", ADCProperties.CONV_MODE),
-            self.__get_state(ADCProperties.DATA_RATE_2),
-            self.__get_state(ADCProperties.ADC2_MUXP),
-            self.__get_state(ADCProperties.ADC2_MUXN),
+            ADCProperties.DATA_RATE_2,
+            ADCProperties.ADC2_MUXP,
+            ADCProperties.ADC2_MUXN,
         )
-        self.filter_mode: PropertyValue = self.__get_state(ADCProperties.FILTER_MODE)
-        self.status_byte: PropertyValue = self.__get_state(ADCProperties.STATUS_MODE)
-        self.checksum_mode: PropertyValue = self.__get_state(ADCProperties.CHECK_MODE)
-        self.rtd_adc: ADCNum = self.__get_rtd_adc_num()
-        self.rtd_mode: RTDModes = self.__get_rtd_mode()
 
-    def __query_state(self, adc_property: ADCProperties) -> PropertyValue:
+    @cached_property
+    def filter_mode(self) -> PropertyValue:
+        """digital filter mode of ADC1"""
+        return self.__get_state(ADCProperties.FILTER_MODE)
+
+    @cached_property
+    def status_byte(self) -> PropertyValue:
+        """whether the status byte is sent with conversion data"""
+        return self.__get_state(ADCProperties.STATUS_MODE)
+
+    @cached_property
+    def checksum_mode(self) -> PropertyValue:
+        """checksum byte mode of conversion data"""
+        return self.__get_state(ADCProperties.CHECK_MODE)
+
+    @cached_property
+    def rtd_adc(self) -> ADCNum:
+        """ADC attached to the RTD, or None if the RTD is off"""
+        return self.__get_rtd_adc_num()
+
+    @cached_property
+    def rtd_mode(self) -> RTDModes:
+        """RTD on/off mode"""
+        return self.__get_rtd_mode()
+
+    def __get_state(self, adc_property: ADCProperties) -> PropertyValue:
         """
         Read the current state of configurable ADC properties
 
         Args:
             `adc_property` (ADCProperties): ADC property whose state is to be read
-            `reg_map`: register map formatted as {addx (int): value (int)}
 
         Returns:
-            `PropertyValue`: information about the current value of this property
+            `PropertyValue`: information about the current value of this mode
         """
-        # value of this adc_property's register
-        reg_value = self.__reg_map[adc_property.value.addx]
-        # get value of bits corresponding to this property by letting through only the bits
-        # that were "masked" when setting this property (clear all bits except the property bits)
-        adc_property_bits = (~adc_property.value.mask) & reg_value
-        # name of current value of this adc_property
-        adc_property_value = adc_property.value.values[adc_property_bits]
+        adc_property_value = _decode_property(self.__reg_map, adc_property)
         _logger.debug(
             f"query_state: query_property='{adc_property}',"
-            f" adc_property_bits={hex(adc_property_bits)},"
             f" adc_property_value='{adc_property_value}'"
         )
         return adc_property_value
 
-    def __get_state(self, adc_property: ADCProperties) -> PropertyValue:
-        """
-        Read the current state of configurable ADC properties. Read both ADC1 and ADC2 configuration
-        to verify which one is attached to the RTD
-
-        Args:
-            `adc_property` (ADCProperties): ADC property whose state is to be read
-
-        Returns:
-            `PropertyValue`: information about the current value of this mode
-        """
-        return self.__query_state(adc_property)
-
     def __get_current_rtd_state(self) -> dict[str, PropertyValue]:
         return {
             "adc_1_ch": self.adc_1.mux_p.code,
@@ -114,3 +114,18 @@ def get_adc_status(status_code: int) -> dict:
         status_dict[bit_num] = status
 
     return status_dict
+
+
+def is_status_bit_set(status_code: int, status_bit: ADCStatusBit) -> bool:
+    """
+    Check a single STATUS byte bit, without decoding the rest of the STATUS byte
+
+    Args:
+        `status_code` (int): uint value of ADC STATUS byte from voltage reading
+        `status_bit` (ADCStatusBit): the STATUS bit to check
+
+    Returns:
+        `bool`: True if the STATUS bit is set
+    """
+    # ADCStatusBit numbers bits from the most significant bit
+    return bool(status_code & (0x80 >> status_bit.value))
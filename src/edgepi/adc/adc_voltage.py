@@ -5,7 +5,7 @@ import logging
 
 from edgepi.adc.adc_constants import ADCReadInfo, ADCNum, ADC1_NUM_DATA_BYTES, ADC2_NUM_DATA_BYTES
 from edgepi.calibration.calibration_constants import CalibParam
-from edgepi.utilities.utilities import bitstring_from_list, combine_to_uint32
+from edgepi.utilities.utilities import combine_to_uint32
 
 
 # TODO: retrieve these values from EEPROM once added
@@ -54,27 +54,21 @@ def _adc_voltage_to_input_voltage(v_in: float, gain: float, offset: float):
     return v_in * step_up_ratio * gain + offset
 
 
-def code_to_voltage(
-    code: list[int],
-    adc_info: ADCReadInfo,
-    calibs: CalibParam,
-    single_ended: bool,
-) -> float:
+def code_to_signed_code(code: list[int], adc_info: ADCReadInfo, single_ended: bool) -> int:
     """
-    Converts ADC voltage read digital code to output voltage (voltage measured at terminal block)
+    Converts ADC voltage read digital code to a signed integer proportional to the
+    ADC input voltage. Codes can be averaged or filtered in this form before being
+    converted to voltage with `signed_code_to_voltage`.
 
     Args:
         `code` (list[int]): code bytes retrieved from ADC voltage read
         `adc_info` (ADCReadInfo): data about this adc's voltage reading configuration
-        `calibs` (CalibParam): voltage reading gain and offset calibration values
         `single_ended` (bool): whether the mode should be single ended or not single ended
                                (differential)
 
     Returns:
-        `float`: voltage value (V) corresponding to `code`
+        `int`: signed code corresponding to `code`
     """
-
-    num_bits = adc_info.num_data_bytes * 8
     if adc_info.num_data_bytes == ADC1_NUM_DATA_BYTES:
         code_val = combine_to_uint32(code[0], code[1], code[2], code[3])
     elif adc_info.num_data_bytes == ADC2_NUM_DATA_BYTES:
@@ -96,11 +90,49 @@ def code_to_voltage(
             code_val += ADC2_UPPER_LIMIT
     else:
         if _is_negative_voltage(code):
-            code_val -= 2**num_bits
+            code_val -= 2 ** (adc_info.num_data_bytes * 8)
+
+    return code_val
+
+
+def signed_code_to_voltage(code_val: float, adc_info: ADCReadInfo, calibs: CalibParam) -> float:
+    """
+    Converts a signed code, see `code_to_signed_code`, to output voltage (voltage measured at
+    terminal block)
+
+    Args:
+        `code_val` (float): signed code, may be fractional if it is an average of codes
+        `adc_info` (ADCReadInfo): data about this adc's voltage reading configuration
+        `calibs` (CalibParam): voltage reading gain and offset calibration values
+
+    Returns:
+        `float`: voltage value (V) corresponding to `code_val`
+    """
+    v_in = _code_to_input_voltage(code_val, REFERENCE_VOLTAGE, adc_info.num_data_bytes * 8)
+    return _adc_voltage_to_input_voltage(v_in, calibs.gain, calibs.offset)
 
-    v_in = _code_to_input_voltage(code_val, REFERENCE_VOLTAGE, num_bits)
-    v_out = _adc_voltage_to_input_voltage(v_in, calibs.gain, calibs.offset)
-    return v_out
+
+def code_to_voltage(
+    code: list[int],
+    adc_info: ADCReadInfo,
+    calibs: CalibParam,
+    single_ended: bool,
+) -> float:
+    """
+    Converts ADC voltage read digital code to output voltage (voltage measured at terminal block)
+
+    Args:
+        `code` (list[int]): code bytes retrieved from ADC voltage read
+        `adc_info` (ADCReadInfo): data about this adc's voltage reading configuration
+        `calibs` (CalibParam): voltage reading gain and offset calibration values
+        `single_ended` (bool): whether the mode should be single ended or not single ended
+                               (differential)
+
+    Returns:
+        `float`: voltage value (V) corresponding to `code`
+    """
+    code_val = code_to_signed_code(code, adc_info, single_ended)
+    return signed_code_to_voltage(code_val, adc_info, calibs)
 
 
 def code_to_temperature(
@@ -125,13 +157,13 @@ def code_to_temperature(
     Returns:
         `float`: temperature value (°C) corresponding to `code`
     """
-    code_bits = bitstring_from_list(code)
+    code_val = int.from_bytes(bytes(code), "big")
 
     # refer to Three-Wire RTD Measurement, Low-Side Reference
     # https://www.ti.com/lit/an/sbaa275a/sbaa275a.pdf?ts=1683111690519&ref_url=https%253A%252F%252Fduckduckgo.com%252F
     number_of_bits = 30 if adc_num == ADCNum.ADC_1 else 22
-    r_rtd = code_bits.uint / (2 ** number_of_bits) * ref_resistance
+    r_rtd = code_val / (2 ** number_of_bits) * ref_resistance
     temperature = (r_rtd - rtd_sensor_resistance) / rtd_sensor_resistance_variation
-    _logger.debug(f"computed rtd temperature = {temperature}, from code = {code_bits.uint}")
+    _logger.debug(f"computed rtd temperature = {temperature}, from code = {code_val}")
     temperature = temperature*rtd_calib_gain+rtd_calib_offset
     return temperature
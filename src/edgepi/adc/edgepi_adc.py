@@ -1,15 +1,17 @@
 # pylint: disable=too-many-lines
 """ User interface for EdgePi ADC """
 
+from dataclasses import dataclass
 from enum import Enum
 from operator import attrgetter
 import logging
 import time
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
 from edgepi.adc.adc_query_lang import ADCProperties
 from edgepi.calibration.calibration_constants import CalibParam
 from edgepi.peripherals.spi import SpiDevice as SPI
+from edgepi.peripherals.ipc import SharedRegisterShadow
 from edgepi.adc.adc_commands import ADCCommands
 from edgepi.adc.adc_constants import (
     ADC1PGA,
@@ -23,7 +25,9 @@ from edgepi.adc.adc_constants import (
     DifferentialPair,
     FilterMode,
     ADCReferenceSwitching,
+    StatusByte,
     ADC_NUM_REGS,
+    ADC_REG_SPAN_MAX_GAP,
     ADC_VOLTAGE_READ_LEN,
     CheckMode,
     DiffMode,
@@ -40,19 +44,32 @@ from edgepi.adc.adc_constants import (
 from edgepi.adc.adc_voltage import (
     code_to_voltage,
     code_to_temperature,
+    code_to_signed_code,
+    signed_code_to_voltage,
 )
-from edgepi.utilities.crc_8_atm import check_crc
+from edgepi.adc.adc_pipeline import BlockAverage, BlockMedian, CodeFilter
+from edgepi.adc.adc_rtd import RTDConverter, RTDModel
+from edgepi.adc.adc_read_plan import ADCReadPlan
+from edgepi.utilities.crc_8_atm import check_crc, CRCCheckError
 from edgepi.gpio.edgepi_gpio import EdgePiGPIO
 from edgepi.gpio.gpio_configs import ADCPins, RTDPins
 from edgepi.utilities.utilities import filter_dict, filter_dict_list_key_val
-from edgepi.reg_helper.reg_helper import OpCode, apply_opcodes
+from edgepi.utilities.waiter import Waiter
+from edgepi.utilities.sample_records import SampleBatch, SampleRecord
+from edgepi.utilities.tracing import traced
+from edgepi.reg_helper.reg_helper import OpCode, apply_opcodes, changed_register_spans
 from edgepi.adc.adc_multiplexers import (
     generate_mux_opcode,
     validate_channels_allowed,
 )
-from edgepi.adc.adc_conv_time import expected_initial_time_delay, expected_continuous_time_delay
-from edgepi.adc.adc_status import get_adc_status
+from edgepi.adc.adc_conv_time import (
+    ConvTimeProfile,
+    expected_initial_time_delay,
+    expected_continuous_time_delay,
+)
+from edgepi.adc.adc_status import ADCStatusBit, get_adc_status, is_status_bit_set
 from edgepi.eeprom.edgepi_eeprom import EdgePiEEPROM
+from edgepi.eeprom.edgepi_eeprom_data import EepromDataClass
 from edgepi.eeprom.protobuf_assets.eeprom_data_classes.eeprom_adc_module import AdcCalibParamKeys
 from edgepi.adc.adc_state import ADCState
 from edgepi.adc.adc_exceptions import (
@@ -68,20 +85,53 @@ from edgepi.adc.adc_exceptions import (
 _logger = logging.getLogger(__name__)
 
 
-class EdgePiADC(SPI):
+@dataclass
+class _PinnedConfig:
+    """
+    ADC configuration pinned by `EdgePiADC.pin_config`
+
+    Attributes:
+        `resync_interval` (float): maximum time in seconds between register re-reads, or None
+        `reg_map` (dict): pinned register map formatted as {addx (int): value (int)}, None if
+            stale
+        `state` (ADCState): ADC state decoded from `reg_map`, None if stale
+        `generation` (int): generation of the shared register shadow `reg_map` was read at
+        `time` (float): `time.monotonic` time `reg_map` was read at
+    """
+
+    resync_interval: Optional[float]
+    reg_map: Optional[dict] = None
+    state: Optional[ADCState] = None
+    generation: Optional[int] = None
+    time: float = 0.0
+
+
+class EdgePiADC(SPI):  # pylint: disable=too-many-instance-attributes, too-many-public-methods
     """
     EdgePi ADC device
 
-    Warning, when caching is enabled to track the ADC's internal state, EdgePiADC objects are
-    safe to use only within a single dev environment. Using multiple EdgePiADC objects,
-    each within a different environment, will lead to the cached ADC state being out of sync
-    with the actual hardware state. To avoid this, disable caching when creating the
-    EdgePiADC object; the state of the ADC will be read from hardware instead, at the
+    When caching is enabled to track the ADC's internal state, the cached register map is
+    shared with other processes using the ADC through a shared-memory register shadow. Every
+    register update made by an EdgePiADC object, in any process, bumps the shadow's generation
+    counter, so a stale cache is detected without re-reading the ADC registers. Register
+    read-modify-write sequences hold the inter-process SPI bus lock. Changes made to the ADC
+    registers without going through EdgePiADC are not tracked; disable caching if other software
+    writes to the ADC, and the state of the ADC will be read from hardware instead, at the
     cost of increased SPI reading load.
+
+    A process which owns the ADC configuration can avoid this load by pinning the configuration
+    with `pin_config`. Voltage reads then use the configuration last read or written by this
+    object, and re-read the registers only when the ADC reports a reset in the STATUS byte,
+    a read fails, another EdgePiADC object updates the registers, or an optional resync
+    interval elapses.
     """
 
     # keep track of ADC register map state for state caching
     __state: dict = {}
+    # generation of the shared register shadow that __state was last synced with
+    __state_generation: int = None
+    # register map shared between processes, opened on first use (False if unavailable)
+    __shadow = None
 
     # default RTD model-dependent hardware constants
     RTD_SENSOR_RESISTANCE = 100 # RTD sensor resistance value (Ohms)
@@ -104,7 +154,12 @@ class EdgePiADC(SPI):
         self,
         enable_cache: bool = False,
         rtd_sensor_resistance: float = None,
-        rtd_sensor_resistance_variation: float = None
+        rtd_sensor_resistance_variation: float = None,
+        waiter: Waiter = None,
+        conv_time_profile: ConvTimeProfile = None,
+        transport: Callable = None,
+        gpio: EdgePiGPIO = None,
+        eeprom_data: EepromDataClass = None,
     ):
         """
         Args:
@@ -114,15 +169,33 @@ class EdgePiADC(SPI):
 
             `rtd_sensor_resistance_variation` (float): set RTD model-dependent resistance
                 variation (Ohms/°C)
+
+            `waiter` (Waiter): waiting strategy for conversion delays, defaults to `time.sleep`.
+                A `HybridWaiter` reduces delay overshoot at high data rates, at the cost of
+                CPU time.
+
+            `conv_time_profile` (ConvTimeProfile): conversion times measured on this board,
+                used for conversion delays instead of the datasheet worst cases
+
+            `transport` (Callable): SPI transport, defaults to the SPI device. See
+                `edgepi.peripherals.spi_replay` for recording and replaying ADC transfers.
+
+            `gpio` (EdgePiGPIO): GPIO manager shared with other modules, created if None
+
+            `eeprom_data` (EepromDataClass): calibration data already read from the EEPROM,
+                read if None
         """
 
-        super().__init__(bus_num=6, dev_id=1)
+        super().__init__(bus_num=6, dev_id=1, waiter=waiter, transport=transport)
         # declare instance vars before config call below
         self.enable_cache = enable_cache
+        self.conv_time_profile = conv_time_profile
+        # configuration used by voltage reads, None if the configuration is not pinned
+        self.__pinned: Optional[_PinnedConfig] = None
 
         # Load eeprom data and generate dictionary of calibration dataclass
-        eeprom = EdgePiEEPROM()
-        eeprom_data  = eeprom.read_edgepi_data()
+        if eeprom_data is None:
+            eeprom_data = EdgePiEEPROM().read_edgepi_data()
         self.adc_calib_params = {
             ADCNum.ADC_1: eeprom_data.adc1_calib_params.extract_ch_dict(),
             ADCNum.ADC_2: eeprom_data.adc2_calib_params.extract_ch_dict(),
@@ -130,7 +203,11 @@ class EdgePiADC(SPI):
         self.rtd_calib = eeprom_data.rtd_calib_params
 
         self.adc_ops = ADCCommands()
-        self.gpio = EdgePiGPIO()
+        self.gpio = gpio if gpio is not None else EdgePiGPIO()
+
+        # the shared register shadow may predate this process, re-sync it with the hardware
+        if self.enable_cache:
+            self.__get_register_map(override_cache=True)
 
         # ADC always needs to be in CRC check mode. This also updates the internal __state.
         # If this call to __config is removed, replace with a call to get_register_map to
@@ -176,7 +253,209 @@ class EdgePiADC(SPI):
             `reg_map` (dict): register map formatted as {int: {"value": int}}
         """
         EdgePiADC.__state = {addx: entry["value"] for (addx, entry) in reg_map.items()}
+        self.__publish_state()
+
+    @staticmethod
+    def __get_shadow():
+        """
+        Get the register shadow shared between processes
+
+        Returns:
+            `SharedRegisterShadow`: the shared register shadow, or None if it cannot be opened
+        """
+        if EdgePiADC.__shadow is None:
+            try:
+                EdgePiADC.__shadow = SharedRegisterShadow("adc", ADC_NUM_REGS)
+            except OSError as exc:
+                _logger.warning(f"Failed to open shared ADC register shadow, cache is local: {exc}")
+                EdgePiADC.__shadow = False
+        return EdgePiADC.__shadow or None
+
+    def __publish_state(self):
+        """
+        Copy the internal ADC state to the shared register shadow. Must be called while
+        holding the SPI bus lock, right after the register transaction the state reflects.
+        """
+        shadow = self.__get_shadow()
+        if shadow is None:
+            return
+        generation, reg_map = shadow.read()
+        if reg_map == EdgePiADC.__state:
+            # nothing changed, do not make other processes re-sync
+            EdgePiADC.__state_generation = generation
+        else:
+            EdgePiADC.__state_generation = shadow.write(EdgePiADC.__state)
+
+    def __sync_shared_state(self) -> bool:
+        """
+        Bring the internal ADC state up to date with the shared register shadow
+
+        Returns:
+            `bool`: True if the internal ADC state is valid, False if the registers
+                must be read from the ADC
+        """
+        shadow = self.__get_shadow()
+        if shadow is None:
+            return bool(EdgePiADC.__state)
+        if EdgePiADC.__state and shadow.generation == EdgePiADC.__state_generation:
+            return True
+        generation, reg_map = shadow.read()
+        if reg_map is None:
+            return False
+        EdgePiADC.__state = reg_map
+        EdgePiADC.__state_generation = generation
+        return True
+
+    def __invalidate_state(self):
+        """Discard cached ADC state in this and all other processes"""
+        EdgePiADC.__state = {}
+        shadow = self.__get_shadow()
+        if shadow is not None:
+            EdgePiADC.__state_generation = shadow.invalidate()
+
+    def pin_config(self, resync_interval: float = None):
+        """
+        Declare the ADC configuration as owned by this process. Voltage reads stop reading the
+        ADC registers before each conversion and use the configuration last read or written by
+        this object instead. The registers are re-read when the STATUS byte of a voltage read
+        reports an ADC reset, when a voltage read fails, when another EdgePiADC object updates
+        the registers, or every `resync_interval` seconds.
+
+        The ADC must be configured to send the STATUS byte with voltage reads for resets to be
+        detected; this is the EdgePi default.
+
+        Args:
+            `resync_interval` (float): maximum time in seconds between register re-reads,
+                or None to re-read the registers only when a change is detected
+        """
+        if resync_interval is not None and resync_interval <= 0:
+            raise ValueError(f"resync_interval must be positive, got {resync_interval}")
+        self.__pinned = _PinnedConfig(resync_interval)
+        self.__resync_pinned_state()
+
+    def unpin_config(self):
+        """Stop using the pinned ADC configuration, voltage reads read the ADC state again"""
+        self.__pinned = None
+
+    @property
+    def is_config_pinned(self) -> bool:
+        """True if the ADC configuration is pinned by `pin_config`"""
+        return self.__pinned is not None
+
+    def __set_pinned_state(self, reg_map: dict):
+        """Use a register map just read or written as the pinned ADC configuration"""
+        self.__pinned.reg_map = dict(reg_map)
+        self.__pinned.state = ADCState(reg_map)
+        self.__pinned.generation = EdgePiADC.__state_generation
+        self.__pinned.time = time.monotonic()
+
+    def __resync_pinned_state(self):
+        """
+        Re-read the pinned ADC configuration. If the ADC RESET bit shows the ADC was reset
+        since the configuration was pinned, the pinned configuration is written back to the ADC.
+        The RESET bit is cleared, so that the next reset can be detected from the STATUS byte.
+        """
+        reset_mask = ADCPower.RESET_CLEAR.value.op_mask
+        power_addx = ADCReg.REG_POWER.value
+        with self.lock_spi[self.dev_id]:
+            # read the ADC, the cached registers may predate a reset
+            reg_map = self.__get_register_map(override_cache=True)
+            target = reg_map
+            if reg_map[power_addx] & ~reset_mask and self.__pinned.reg_map is not None:
+                _logger.warning("ADC reset detected, restoring the pinned ADC configuration")
+                target = self.__pinned.reg_map
+            target = {**target, power_addx: target[power_addx] & reset_mask}
+            updated_reg_values = {
+                addx: {"value": target[addx], "is_changed": target[addx] != value}
+                for addx, value in reg_map.items()
+            }
+            for start_addx, data in changed_register_spans(
+                updated_reg_values, ADC_REG_SPAN_MAX_GAP
+            ):
+                self.__write_register(ADCReg(start_addx), data)
+            self.__update_cache_map(updated_reg_values)
+            self.__validate_updates(updated_reg_values)
+            self.__set_pinned_state(EdgePiADC.__state)
 
+    def __publish_written_state(self):
+        """
+        Publish the internal ADC state after registers were written outside of `__config`, and
+        use it as the pinned configuration if the configuration is pinned. Must be called while
+        holding the SPI bus lock.
+        """
+        self.__publish_state()
+        if self.__pinned is not None:
+            self.__set_pinned_state(EdgePiADC.__state)
+
+    def __is_pinned_state_stale(self) -> bool:
+        """Checks for changes to the ADC configuration which do not require reading the ADC"""
+        pinned = self.__pinned
+        if pinned.state is None:
+            return True
+        if (
+            pinned.resync_interval is not None
+            and time.monotonic() - pinned.time >= pinned.resync_interval
+        ):
+            return True
+        # another EdgePiADC object has updated the registers
+        shadow = self.__get_shadow()
+        return shadow is not None and shadow.generation != pinned.generation
+
+    def __get_sample_state(self) -> ADCState:
+        """
+        Get the ADC state a voltage read should use: the pinned configuration if the
+        configuration is pinned, otherwise the current ADC state.
+        """
+        if self.__pinned is None:
+            return self.get_state()
+        if self.__is_pinned_state_stale():
+            self.__resync_pinned_state()
+        return self.__pinned.state
+
+    def __is_reset_reported(self, state: ADCState, status_code: int) -> bool:
+        """Returns True if the STATUS byte of a voltage read reports a new ADC reset"""
+        return (
+            state.status_byte.code == StatusByte.STATUS_BYTE_ON
+            and is_status_bit_set(status_code, ADCStatusBit.RESET)
+        )
+
+    def __sample(self, adc_num: ADCNum, trigger) -> tuple:
+        """
+        Perform a voltage read. If the configuration is pinned and the read reports an ADC
+        reset or fails, the pinned configuration is re-read and the read is repeated once.
+
+        Args:
+            `adc_num` (ADCNum): the ADC to be read
+            `trigger` (Callable[[ADCState], None]): validates the ADC state and waits for,
+                or starts, the conversion to be read
+
+        Returns:
+            `tuple`: (state, timestamp_ns, status_code, voltage_code), where state is the
+                ADCState the conversion was made with, and timestamp_ns the time the
+                conversion data was read
+        """
+        state = self.__get_sample_state()
+        if self.__pinned is None:
+            trigger(state)
+            status_code, voltage_code, _ = self.__voltage_read(adc_num)
+            return state, self.last_transfer_ns, status_code, voltage_code
+
+        try:
+            trigger(state)
+            status_code, voltage_code, _ = self.__voltage_read(adc_num)
+            if not self.__is_reset_reported(state, status_code):
+                return state, self.last_transfer_ns, status_code, voltage_code
+            _logger.warning("ADC reset detected, re-reading pinned ADC configuration")
+        except (VoltageReadError, CRCCheckError) as exc:
+            _logger.warning(f"Voltage read failed, re-reading pinned ADC configuration: {exc}")
+
+        self.__resync_pinned_state()
+        state = self.__pinned.state
+        trigger(state)
+        status_code, voltage_code, _ = self.__voltage_read(adc_num)
+        return state, self.last_transfer_ns, status_code, voltage_code
+
+    @traced(category="adc")
     def __get_register_map(
         self,
         override_cache: bool = False,
@@ -192,8 +471,10 @@ class EdgePiADC(SPI):
         Returns:
             dict: mapping of uint register addresses to uint register values
         """
-        if not EdgePiADC.__state or override_cache or not self.enable_cache:
-            EdgePiADC.__state = self.__read_registers_to_map()
+        with self.lock_spi[self.dev_id]:
+            if override_cache or not self.enable_cache or not self.__sync_shared_state():
+                EdgePiADC.__state = self.__read_registers_to_map()
+                self.__publish_state()
 
         # if caching is disabled, don't use cached state for return (dict() deepcopies)
         return (
@@ -202,6 +483,7 @@ class EdgePiADC(SPI):
             else dict(EdgePiADC.__state)
         )
 
+    @traced(category="adc")
     def __read_register(self, start_addx: ADCReg, num_regs: int = 1):
         """
         Read data from ADC registers, either individually or as a block.
@@ -225,6 +507,7 @@ class EdgePiADC(SPI):
             # first 2 entries are null bytes
             return out[2:]
 
+    @traced(category="adc")
     def __write_register(self, start_addx: ADCReg, data: list[int]):
         """
         Write data to ADC registers, either individually or as a block.
@@ -255,6 +538,7 @@ class EdgePiADC(SPI):
         self.gpio.clear_pin_state(RTDPins.RTD_EN.value)
 
     # TODO: To be deleted
+    @traced(category="adc")
     def set_adc_reference(self, reference_config: ADCReferenceSwitching = None):
         """
         Setting ADC referene terminal state. pin 18 and 23 labeled IN GND on the enclosure. It can
@@ -276,6 +560,7 @@ class EdgePiADC(SPI):
             self.gpio.clear_pin_state(ADCPins.GNDSW_IN1.value)
             self.gpio.clear_pin_state(ADCPins.GNDSW_IN2.value)
 
+    @traced(category="adc")
     def stop_conversions(self, adc_num: ADCNum):
         """
         Halt voltage read conversions when ADC is set to perform continuous conversions
@@ -290,6 +575,7 @@ class EdgePiADC(SPI):
         with self.spi_open():
             self.transfer(start_cmd)
 
+    @traced(category="adc")
     def start_conversions(self, adc_num: ADCNum):
         """
         Start ADC voltage read conversions. If ADC is continuous conversion mode,
@@ -298,7 +584,10 @@ class EdgePiADC(SPI):
         performing reads.
         """
         # get state for configs relevant to conversion delay
-        state = self.get_state()
+        self.__start_conversions(adc_num, self.__get_sample_state())
+
+    def __start_conversions(self, adc_num: ADCNum, state: ADCState):
+        """Start conversions and wait for the first conversion, using the configuration `state`"""
         conv_mode = state.adc_1.conversion_mode.code
         data_rate = (
             state.adc_1.data_rate.code if adc_num == ADCNum.ADC_1 else state.adc_2.data_rate.code
@@ -306,7 +595,7 @@ class EdgePiADC(SPI):
         filter_mode = state.filter_mode.code
 
         conv_delay = expected_initial_time_delay(
-            adc_num, data_rate.value.op_code, filter_mode.value.op_code
+            adc_num, data_rate.value.op_code, filter_mode.value.op_code, self.conv_time_profile
         )
         _logger.debug(
             f"\nComputed time delay = {conv_delay} (ms) with the following config opcodes:\n"
@@ -316,7 +605,7 @@ class EdgePiADC(SPI):
         )
         self.__send_start_command(adc_num)
         # apply delay for first conversion
-        time.sleep(conv_delay / 1000)
+        self.delay(conv_delay / 1000)
 
     def clear_reset_bit(self):
         """
@@ -332,6 +621,7 @@ class EdgePiADC(SPI):
         with self.spi_open():
             return self.transfer(ADCCommands.read_adc_command(adc_num.value, data_size))
 
+    @traced(category="adc")
     def __voltage_read(self, adc_num: ADCNum):
         """
         Performs ADC voltage read and formats output into status, voltage,
@@ -372,19 +662,20 @@ class EdgePiADC(SPI):
                 f"Cannot retrieve calibration values for invalid differential pair {diff_pair}"
             )
 
-    def __get_calibration_params(self, adc_num: ADCNum) -> CalibParam:
+    def __get_calibration_params(self, adc_num: ADCNum, state: ADCState = None) -> CalibParam:
         """
         Retrieve voltage reading calibration values based on currently configured
         input multiplexer channels
 
         Args:
-            `adc_calibs` (dict): eeprom adc calibration values
             `adc_num` (ADCNum): adc number voltage is being read from
+            `state` (ADCState): ADC state the voltage was read with, read from the ADC if None
 
         Returns:
             `CalibParam`: gain and offset values for voltage reading calibration
         """
-        state = self.get_state()
+        if state is None:
+            state = self.get_state()
         mux_p = attrgetter(f"adc_{adc_num.value.id_num}.mux_p")(state)
         mux_n = attrgetter(f"adc_{adc_num.value.id_num}.mux_n")(state)
 
@@ -422,9 +713,11 @@ class EdgePiADC(SPI):
         data_rate = (
             state.adc_1.data_rate.code if adc_num == ADCNum.ADC_1 else state.adc_2.data_rate.code
         )
-        delay = expected_continuous_time_delay(adc_num, data_rate.value.op_code)
+        delay = expected_continuous_time_delay(
+            adc_num, data_rate.value.op_code, self.conv_time_profile
+        )
 
-        time.sleep(delay / 1000)
+        self.delay(delay / 1000)
 
     def __check_adc_1_conv_mode(self, state: ADCState):
         # assert adc is in continuous mode
@@ -433,6 +726,25 @@ class EdgePiADC(SPI):
                 "ADC1 must be in CONTINUOUS conversion mode in order to call this method."
             )
 
+    @staticmethod
+    def __mux_channel_id(mux_p: CH, mux_n: CH) -> int:
+        """Channel identifier of a sample record, encoded like the INPMUX register"""
+        return (mux_p.value << 4) | mux_n.value
+
+    @staticmethod
+    def __sample_record(
+        timestamp_ns: int, mux_p: CH, mux_n: CH, voltage_code: list, voltage: float, status: int
+    ) -> SampleRecord:
+        """Create the sample record of a voltage read"""
+        return SampleRecord(
+            timestamp_ns,
+            EdgePiADC.__mux_channel_id(mux_p, mux_n),
+            int.from_bytes(bytes(voltage_code), "big"),
+            voltage,
+            status,
+        )
+
+    @traced(category="adc")
     def read_voltage(self, adc_num: ADCNum):
         """
         Read voltage input to either ADC1 or ADC2, when performing single channel reading
@@ -445,30 +757,76 @@ class EdgePiADC(SPI):
         Returns:
             `float`: input voltage (V) read from the indicated ADC
         """
-        single_ended = False
-        state = self.get_state()
-        if adc_num == ADCNum.ADC_1:
-            self.__check_adc_1_conv_mode(state)
-            # Check whether the ADC is either in single-ended or differential
-            if state.adc_1.mux_n.code == CH.AINCOM:
-                single_ended = True
-        else:
-            if state.adc_2.mux_n.code == CH.AINCOM:
-                single_ended = True
+        return self.read_voltage_record(adc_num).value
 
-        self.__continuous_time_delay(adc_num, state)
+    @traced(category="adc")
+    def read_voltage_record(self, adc_num: ADCNum) -> SampleRecord:
+        """
+        Same as `read_voltage`, but returns a timestamped sample record
 
-        status_code, voltage_code, _ = self.__voltage_read(adc_num)
+        Args:
+            `adc_num` (ADCNum): the ADC to be read
+
+        Returns:
+            `SampleRecord`: the voltage (V) read, with the time it was read, the channel read
+                (encoded as mux_p << 4 | mux_n), the raw conversion code and the STATUS byte
+        """
+        def trigger(state: ADCState):
+            if adc_num == ADCNum.ADC_1:
+                self.__check_adc_1_conv_mode(state)
+            self.__continuous_time_delay(adc_num, state)
+
+        state, timestamp_ns, status_code, voltage_code = self.__sample(adc_num, trigger)
+
+        # Check whether the ADC is either in single-ended or differential
+        adc_fields = state.adc_1 if adc_num == ADCNum.ADC_1 else state.adc_2
+        single_ended = adc_fields.mux_n.code == CH.AINCOM
 
         # log STATUS byte
-        status = get_adc_status(status_code)
-        _logger.debug(f" read_voltage: Logging STATUS byte:\n{status}")
+        if _logger.isEnabledFor(logging.DEBUG):
+            status = get_adc_status(status_code)
+            _logger.debug(f" read_voltage: Logging STATUS byte:\n{status}")
 
-        calibs = self.__get_calibration_params(adc_num)
+        calibs = self.__get_calibration_params(adc_num, state)
         _logger.debug(f" read_voltage: gain {calibs.gain}, offset {calibs.offset}")
 
-        return code_to_voltage(voltage_code, adc_num.value, calibs, single_ended)
+        voltage = code_to_voltage(voltage_code, adc_num.value, calibs, single_ended)
+        return self.__sample_record(
+            timestamp_ns,
+            adc_fields.mux_p.code,
+            adc_fields.mux_n.code,
+            voltage_code,
+            voltage,
+            status_code,
+        )
+
+    @traced(category="adc")
+    def compile_read_plan(self, adc_num: ADCNum) -> ADCReadPlan:
+        """
+        Capture the current configuration of an ADC as a read plan, so voltages can be read
+        with a single SPI transfer each, e.g. by a control loop. ADC1 must be configured to
+        `CONTINUOUS` conversion mode, and conversions started, before the plan is used.
+
+        Args:
+            `adc_num` (ADCNum): the ADC to be read
+
+        Returns:
+            `ADCReadPlan`: the read plan of the ADC's current channel
+        """
+        state = self.__get_sample_state()
+        if adc_num == ADCNum.ADC_1:
+            self.__check_adc_1_conv_mode(state)
+        adc_fields = state.adc_1 if adc_num == ADCNum.ADC_1 else state.adc_2
+        mux_p, mux_n = adc_fields.mux_p.code, adc_fields.mux_n.code
+        return ADCReadPlan(
+            adc_num=adc_num,
+            channel=self.__mux_channel_id(mux_p, mux_n),
+            command=ADCCommands.read_adc_command(adc_num.value, ADC_VOLTAGE_READ_LEN),
+            calibs=self.__get_calibration_params(adc_num, state),
+            single_ended=mux_n == CH.AINCOM,
+        )
 
+    @traced(category="adc")
     def read_rtd_temperature(self):
         """
         Read RTD temperature continuously. Note, to obtain valid temperature values,
@@ -478,7 +836,7 @@ class EdgePiADC(SPI):
         Returns:
             `float`: RTD measured temperature (°C)
         """
-        state = self.get_state()
+        state = self.__get_sample_state()
         adc_num = state.rtd_adc
         if adc_num == ADCNum.ADC_1:
             self.__check_adc_1_conv_mode(state)
@@ -501,6 +859,7 @@ class EdgePiADC(SPI):
         if state.adc_1.conversion_mode.code != ConvMode.PULSE:
             self.__config(conversion_mode=ConvMode.PULSE)
 
+    @traced(category="adc")
     def single_sample(self):
         """
         Trigger a single ADC1 voltage sampling event, when performing single channel reading or
@@ -511,29 +870,49 @@ class EdgePiADC(SPI):
         Returns:
             `float`: input voltage (V) read from ADC1
         """
-        state = self.get_state()
-        # Check whether the ADC is either in single-ended or differential
-        single_ended = state.adc_1.mux_n.code == CH.AINCOM
+        return self.single_sample_record().value
 
-        self.__enforce_pulse_mode(state)
+    @traced(category="adc")
+    def single_sample_record(self) -> SampleRecord:
+        """
+        Same as `single_sample`, but returns a timestamped sample record
 
-        # send command to trigger conversion
-        self.start_conversions(ADCNum.ADC_1)
+        Returns:
+            `SampleRecord`: the voltage (V) read, with the time it was read, the channel read
+                (encoded as mux_p << 4 | mux_n), the raw conversion code and the STATUS byte
+        """
+        def trigger(state: ADCState):
+            self.__enforce_pulse_mode(state)
+            # send command to trigger conversion
+            self.start_conversions(ADCNum.ADC_1)
 
         # send command to read conversion data.
-        status_code, voltage_code, _ = self.__voltage_read(ADCNum.ADC_1)
+        state, timestamp_ns, status_code, voltage_code = self.__sample(ADCNum.ADC_1, trigger)
+
+        # Check whether the ADC is either in single-ended or differential
+        single_ended = state.adc_1.mux_n.code == CH.AINCOM
 
         # log STATUS byte
-        status = get_adc_status(status_code)
-        _logger.debug(f"single_sample: Logging STATUS byte:\n{status}")
+        if _logger.isEnabledFor(logging.DEBUG):
+            status = get_adc_status(status_code)
+            _logger.debug(f"single_sample: Logging STATUS byte:\n{status}")
 
-        calibs = self.__get_calibration_params(ADCNum.ADC_1)
+        calibs = self.__get_calibration_params(ADCNum.ADC_1, state)
 
         # convert from code to voltage
         _logger.debug(f" read_voltage: code {voltage_code}")
         _logger.debug(f" read_voltage: gain {calibs.gain}, offset {calibs.offset}")
-        return code_to_voltage(voltage_code, ADCNum.ADC_1.value, calibs, single_ended)
+        voltage = code_to_voltage(voltage_code, ADCNum.ADC_1.value, calibs, single_ended)
+        return self.__sample_record(
+            timestamp_ns,
+            state.adc_1.mux_p.code,
+            state.adc_1.mux_n.code,
+            voltage_code,
+            voltage,
+            status_code,
+        )
 
+    @traced(category="adc")
     def single_sample_rtd(self):
         """
         Trigger a single RTD temperature sampling event. Note, to obtain valid temperature values,
@@ -543,7 +922,7 @@ class EdgePiADC(SPI):
         Returns:
             `float`: RTD measured temperature (°C)
         """
-        state = self.get_state()
+        state = self.__get_sample_state()
         adc_num = state.rtd_adc
         if adc_num == ADCNum.ADC_1:
             self.__enforce_pulse_mode(state)
@@ -564,19 +943,55 @@ class EdgePiADC(SPI):
             adc_num
         )
 
+    @traced(category="adc")
     def reset(self):
         """
         Reset ADC register values to EdgePi ADC power-on state.
         Note this state differs from ADS1263 default power-on, due to
         application of custom power-on configurations required by EdgePi.
         """
-        with self.spi_open():
-            self.transfer(ADCCommands.reset_adc_command())
+        with self.lock_spi[self.dev_id]:
+            with self.spi_open():
+                self.transfer(ADCCommands.reset_adc_command())
+            self.__invalidate_state()
         self.__reapply_config()
+        if self.__pinned is not None:
+            # this reset is expected, do not report it to the next voltage read
+            self.__resync_pinned_state()
+
+    @traced(category="adc")
+    def measure_conversion_time(
+        self, adc_num: ADCNum, start: bool = True, timeout: float = 2.0
+    ) -> float:
+        """
+        Measure the time until the ADC reports new conversion data, by polling the STATUS byte.
+        Used to characterize conversion times of the ADC with its current configuration.
+
+        Args:
+            `adc_num` (ADCNum): the ADC whose conversion is timed
+
+            `start` (bool): send a start command first, and time the first conversion. Otherwise
+                time until the next conversion of an ADC already converting continuously.
+
+            `timeout` (float): time in seconds to wait for new data
+
+        Returns:
+            `float`: time until new conversion data was reported, in milliseconds
+
+        Raises:
+            `TimeoutError`: if no new data is reported before the timeout
+        """
+        if start:
+            self.__send_start_command(adc_num)
+        start_ns = time.perf_counter_ns()
+        deadline_ns = start_ns + int(timeout * 1e9)
+        while not self.__is_data_ready(adc_num):
+            if time.perf_counter_ns() > deadline_ns:
+                raise TimeoutError(f"{adc_num} reported no new data within {timeout} s")
+        return (time.perf_counter_ns() - start_ns) / 1e6
 
     def __is_data_ready(self, adc_num: ADCNum):
-        # pylint: disable=unused-private-member
-        # required for integration testing in test_conversion_times.py
+        # also used for integration testing in test_conversion_times.py
         """Utility for testing conversion times, returns True if ADC indicates new voltage data"""
         with self.spi_open():
             read_data = self.transfer(
@@ -683,6 +1098,7 @@ class EdgePiADC(SPI):
 
         return opcode_list
 
+    @traced(category="adc")
     def select_differential(self, adc: ADCNum, diff_mode: DiffMode):
         """
         Select a differential voltage sampling mode for either ADC1 or ADC2
@@ -784,6 +1200,7 @@ class EdgePiADC(SPI):
         )
         return updates
 
+    @traced(category="adc")
     def set_rtd(self, set_rtd: bool, adc_num: ADCNum = ADCNum.ADC_2):
         """
         Enable/Disable RTD with ADC type passed as arguments.
@@ -808,6 +1225,228 @@ class EdgePiADC(SPI):
 
         self.__config(**updates, override_rtd_validation=True)
 
+    def get_rtd_converter(
+        self, model: RTDModel = RTDModel.LINEAR, adc_num: Optional[ADCNum] = None, **kwargs
+    ) -> RTDConverter:
+        """
+        Create a converter for batches of RTD codes, e.g. the `raw_code` fields of sample
+        records, using this EdgePi's RTD calibration and sensor constants
+
+        Args:
+            `model` (RTDModel): resistance to temperature model
+
+            `adc_num` (ADCNum): ADC the codes are read with, defaults to the ADC currently
+                attached to the RTD
+
+            `kwargs`: other RTDConverter arguments, such as `coefficients`
+
+        Returns:
+            `RTDConverter`: the converter
+
+        Raises:
+            `ValueError`: if `adc_num` is None and RTD mode is off
+        """
+        if adc_num is None:
+            adc_num = self.__get_sample_state().rtd_adc
+            if adc_num is None:
+                raise ValueError("RTD mode is off, enable it with set_rtd or pass adc_num")
+        return RTDConverter(
+            self.rtd_calib.rtd_resistor,
+            adc_num,
+            r_0=self.rtd_sensor_resistance,
+            alpha=self.rtd_sensor_resistance_variation,
+            gain=self.rtd_calib.rtd.gain,
+            offset=self.rtd_calib.rtd.offset,
+            model=model,
+            **kwargs,
+        )
+
+    @traced(category="adc")
+    def read_rtd_samples(
+        self,
+        num_samples: int,
+        average: int = 1,
+        reject_outliers: bool = False,
+        model: RTDModel = RTDModel.LINEAR,
+        timeout: float = 1.0,
+    ) -> SampleBatch:
+        """
+        Acquire a batch of RTD temperature samples. Unlike `read_rtd_temperature`, the ADC
+        configuration is read and checked once for the whole batch, see `stream_rtd_samples`.
+
+        Args:
+            `num_samples` (int): number of temperature samples
+
+            `average` (int): number of conversions averaged into each sample
+
+            `reject_outliers` (bool): use the median of the conversions of each sample instead
+                of their mean
+
+            `model` (RTDModel): resistance to temperature model
+
+            `timeout` (float): time in seconds to wait for each conversion, when the STATUS
+                byte is enabled
+
+        Returns:
+            `SampleBatch`: RTD temperatures (°C), see `stream_rtd_samples`
+        """
+        batches = self.stream_rtd_samples(
+            num_samples, average, reject_outliers, model, timeout, num_batches=1
+        )
+        try:
+            return next(batches)
+        finally:
+            batches.close()
+
+    def stream_rtd_samples(
+        self,
+        batch_size: int,
+        average: int = 1,
+        reject_outliers: bool = False,
+        model: RTDModel = RTDModel.LINEAR,
+        timeout: float = 1.0,
+        num_batches: Optional[int] = None,
+    ) -> Iterator[SampleBatch]:
+        """
+        Acquire RTD temperature samples continuously, one batch at a time. The ADC
+        configuration is read and checked once, conversions are started once, and each
+        conversion is then a single data read, paced by the ADC's data rate, with no register
+        reads. RTD mode must first be enabled with `set_rtd`, and ADC1 must be configured to
+        `CONTINUOUS` conversion mode if the RTD is attached to ADC1. The configuration must not
+        be changed while streaming. Conversions are stopped when the stream is closed.
+
+        If the STATUS byte is enabled, reads that do not report new data are repeated, so each
+        conversion is read exactly once.
+
+        Args:
+            `batch_size` (int): number of temperature samples per batch
+
+            `average` (int): number of conversions averaged into each sample
+
+            `reject_outliers` (bool): use the median of the conversions of each sample instead
+                of their mean
+
+            `model` (RTDModel): resistance to temperature model
+
+            `timeout` (float): time in seconds to wait for each conversion, when the STATUS
+                byte is enabled
+
+            `num_batches` (int): number of batches to acquire, None to stream until closed
+
+        Returns:
+            `Iterator[SampleBatch]`: batches of RTD temperatures (°C), with the time the last
+                conversion of each sample was read, the RTD channel (mux_p << 4 | mux_n), the
+                averaged RTD code and the STATUS byte of the last conversion
+
+        Raises:
+            `ValueError`: if RTD mode is off
+            `ContinuousModeError`: if the RTD is attached to ADC1 and ADC1 is in `PULSE` mode
+            `TimeoutError`: if the STATUS byte reports no new data within `timeout`
+        """
+        for name, value in (("batch_size", batch_size), ("average", average)):
+            if not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be a positive integer, got {value}")
+        state = self.__get_sample_state()
+        adc_num = state.rtd_adc
+        if adc_num is None:
+            raise ValueError("RTD mode is off, enable it with set_rtd")
+        if adc_num == ADCNum.ADC_1:
+            self.__check_adc_1_conv_mode(state)
+
+        converter = self.get_rtd_converter(model, adc_num)
+        code_filter = BlockMedian(average) if reject_outliers else BlockAverage(average)
+        adc_fields = state.adc_1 if adc_num == ADCNum.ADC_1 else state.adc_2
+        channel = self.__mux_channel_id(adc_fields.mux_p.code, adc_fields.mux_n.code)
+        period_ns = int(
+            expected_continuous_time_delay(
+                adc_num, adc_fields.data_rate.code.value.op_code, self.conv_time_profile
+            )
+            * 1e6
+        )
+        poll_status = state.status_byte.code == StatusByte.STATUS_BYTE_ON
+
+        self.__start_conversions(adc_num, state)
+        try:
+            next_read_ns = time.perf_counter_ns()
+            batch_count = 0
+            while num_batches is None or batch_count < num_batches:
+                reads, next_read_ns = self.__read_conversions(
+                    adc_num, batch_size * average, period_ns, next_read_ns,
+                    poll_status, int(timeout * 1e9),
+                )
+                # samples never span batches, so the block filters output one code per sample
+                codes = code_filter.process([code for _, code, _ in reads])
+                temperatures = converter.convert(codes)
+                batch = SampleBatch()
+                for (timestamp_ns, _, status_code), code, temperature in zip(
+                    reads[average - 1::average], codes, temperatures
+                ):
+                    batch.append(timestamp_ns, channel, int(round(code)), temperature, status_code)
+                batch_count += 1
+                yield batch
+        finally:
+            self.stop_conversions(adc_num)
+
+    def __read_conversions(
+        self,
+        adc_num: ADCNum,
+        count: int,
+        period_ns: int,
+        next_read_ns: int,
+        poll_status: bool,
+        timeout_ns: int,
+    ) -> tuple:
+        """
+        Read `count` conversions of an ADC converting continuously, in one SPI session
+
+        Args:
+            `adc_num` (ADCNum): the ADC to be read
+            `count` (int): number of conversions to read
+            `period_ns` (int): conversion period
+            `next_read_ns` (int): `time.perf_counter_ns` time of the first read
+            `poll_status` (bool): repeat reads until the STATUS byte reports new data
+            `timeout_ns` (int): time to wait for new data when polling the STATUS byte
+
+        Returns:
+            `tuple`: (reads, next_read_ns), where reads is a list of (timestamp_ns, code,
+                status_code) of each conversion, and next_read_ns the time of the next read
+        """
+        command = ADCCommands.read_adc_command(adc_num.value, ADC_VOLTAGE_READ_LEN)
+        num_data_bytes = adc_num.value.num_data_bytes
+        new_data_bit = (
+            ADCStatusBit.ADC1_DATA if adc_num == ADCNum.ADC_1 else ADCStatusBit.ADC2_DATA
+        )
+        reads = []
+        with self.spi_open():
+            deadline_ns = next_read_ns + timeout_ns
+            while len(reads) < count:
+                self.waiter.wait_until(next_read_ns)
+                read_data = self.transfer(command)
+                if (len(read_data) - 1) != ADC_VOLTAGE_READ_LEN:
+                    raise VoltageReadError(
+                        f"Voltage read failed: incorrect number of bytes ({len(read_data)}) "
+                        "retrieved"
+                    )
+                now_ns = time.perf_counter_ns()
+                status_code = read_data[1]
+                if poll_status and not is_status_bit_set(status_code, new_data_bit):
+                    if now_ns > deadline_ns:
+                        raise TimeoutError(
+                            f"{adc_num} reported no new data within {timeout_ns / 1e9} s"
+                        )
+                    # conversion not complete yet, poll again shortly
+                    next_read_ns = now_ns + period_ns // 16
+                    continue
+                voltage_code = read_data[2 : (2 + num_data_bytes)]
+                check_crc(voltage_code, read_data[6])
+                reads.append(
+                    (self.last_transfer_ns, int.from_bytes(bytes(voltage_code), "big"), status_code)
+                )
+                # keep to the conversion schedule, unless reads fell behind it
+                next_read_ns = max(next_read_ns + period_ns, now_ns)
+                deadline_ns = now_ns + timeout_ns
+        return reads, next_read_ns
+
     @staticmethod
     def __extract_mux_args(args: dict) -> dict:
         """
@@ -831,6 +1470,7 @@ class EdgePiADC(SPI):
                 only_mux_args[mux_name] = args[arg]
         return only_mux_args
 
+    @traced(category="adc")
     def __config(
         self,
         adc_1_ch: CH = None,
@@ -906,50 +1546,64 @@ class EdgePiADC(SPI):
             if issubclass(entry.__class__, Enum) and isinstance(entry.value, OpCode)
         ]
 
-        # get current register values
-        reg_values = self.__get_register_map()
-        _logger.debug(f"__config: register values before updates:\n{reg_values}")
+        # hold the bus so no other thread or process changes registers during read-modify-write
+        with self.lock_spi[self.dev_id]:
+            # get current register values
+            reg_values = self.__get_register_map()
+            _logger.debug(f"__config: register values before updates:\n{reg_values}")
 
-        # get codes to update register values
-        updated_reg_values = apply_opcodes(dict(reg_values), ops_list)
-        _logger.debug(f"__config: register values after updates:\n{reg_values}")
+            # get codes to update register values
+            updated_reg_values = apply_opcodes(dict(reg_values), ops_list)
+            _logger.debug(f"__config: register values after updates:\n{reg_values}")
 
-        # write updated reg values to ADC using a single write.
-        data = [entry["value"] for entry in updated_reg_values.values()]
-        self.__write_register(ADCReg.REG_ID, data)
+            # write only the registers whose value changes, using one write per span of
+            # neighbouring registers
+            for start_addx, data in changed_register_spans(
+                updated_reg_values, ADC_REG_SPAN_MAX_GAP
+            ):
+                self.__write_register(ADCReg(start_addx), data)
 
-        # update ADC state (for state caching)
-        self.__update_cache_map(updated_reg_values)
+            # update ADC state (for state caching)
+            self.__update_cache_map(updated_reg_values)
 
-        # validate updates were applied correctly
-        if not override_updates_validation:
-            self.__validate_updates(updated_reg_values)
+            # validate updates were applied correctly
+            if not override_updates_validation:
+                self.__validate_updates(updated_reg_values)
+
+            if self.__pinned is not None:
+                self.__set_pinned_state(EdgePiADC.__state)
 
         return updated_reg_values
 
     def __validate_updates(self, updated_reg_values: dict):
         """
-        Validates updated config values have been applied to ADC registers.
+        Validates updated config values have been applied to ADC registers, by reading back
+        only the registers written by the latest __config().
 
         Args:
             updated_reg_values (dict): register values that were applied in latest __config()
         """
-        reg_values = self.__get_register_map()
-
-        # check updated value were applied
-        for addx, value in reg_values.items():
-            observed_val = updated_reg_values[addx]["value"]
-            if int(value) != int(updated_reg_values[addx]["value"]):
-                _logger.error("__config: failed to update register")
-                raise ADCRegisterUpdateError(
-                    (
-                        "Register failed to update: "
-                        f"addx={hex(addx)}, expected: {hex(value)}, observed: {hex(observed_val)}"
+        for start_addx, expected in changed_register_spans(
+            updated_reg_values, ADC_REG_SPAN_MAX_GAP
+        ):
+            observed = self.__read_register(ADCReg(start_addx), len(expected))
+            # check updated values were applied
+            for addx, expected_val, observed_val in zip(
+                range(start_addx, start_addx + len(expected)), expected, observed
+            ):
+                if int(observed_val) != int(expected_val):
+                    _logger.error("__config: failed to update register")
+                    raise ADCRegisterUpdateError(
+                        (
+                            "Register failed to update: "
+                            f"addx={hex(addx)}, expected: {hex(expected_val)}, "
+                            f"observed: {hex(observed_val)}"
+                        )
                     )
-                )
 
         return True
 
+    @traced(category="adc")
     def set_config(
         self,
         adc_1_analog_in: AnalogIn = None,
@@ -993,6 +1647,7 @@ class EdgePiADC(SPI):
 
     # pylint: disable=too-many-branches
     # pylint: disable=too-many-statements
+    @traced(category="adc")
     def read_samples_adc1_batch(
         self,
         data_rate: ADC1DataRate,
@@ -1009,6 +1664,301 @@ class EdgePiADC(SPI):
 
         This function only supports ADC 1, and changes the conversion mode to PULSE automatically.
         """
+        samples, _ = self.__read_batch(data_rate, analog_in_list, differential_pairs)
+        return [self.__batch_sample_voltage(*sample) for sample in samples]
+
+    @traced(category="adc")
+    def read_sample_records_adc1_batch(
+        self,
+        data_rate: ADC1DataRate,
+        analog_in_list: Optional[list[AnalogIn]] = None,
+        differential_pairs: Optional[list[DiffMode]] = None,
+    ) -> SampleBatch:
+        """
+        Same as `read_samples_adc1_batch`, but returns timestamped sample records
+
+        Returns:
+            `SampleBatch`: one record per channel read, in the order of analog_in_list followed
+                by differential_pairs. Each record is timestamped when its conversion data was
+                read, and holds the channel read (encoded as mux_p << 4 | mux_n), the raw
+                conversion code and the STATUS byte.
+        """
+        samples, timestamps = self.__read_batch(data_rate, analog_in_list, differential_pairs)
+        batch = SampleBatch()
+        for timestamp_ns, sample in zip(timestamps, samples):
+            mux_p, mux_n, voltage_code, status, _ = sample
+            batch.append(
+                timestamp_ns,
+                self.__mux_channel_id(mux_p, mux_n),
+                int.from_bytes(bytes(voltage_code), "big"),
+                self.__batch_sample_voltage(*sample),
+                status,
+            )
+        return batch
+
+    @traced(category="adc")
+    def read_filtered_samples_adc1_batch(
+        self,
+        data_rate: ADC1DataRate,
+        num_scans: int,
+        analog_in_list: Optional[list[AnalogIn]] = None,
+        differential_pairs: Optional[list[DiffMode]] = None,
+        filters: Optional[dict] = None,
+        default_filter: Optional[CodeFilter] = None,
+    ) -> dict:
+        """
+        Oversampled version of `read_samples_adc1_batch`. Every channel is read `num_scans`
+        times in a single SPI session, and the codes of each channel are passed through a
+        filter stage (see `edgepi.adc.adc_pipeline`) before being converted to voltage.
+
+        Filters keep their state between calls, so passing the same filter objects to
+        successive calls filters each channel as one continuous stream.
+
+        Args:
+            `data_rate` (ADC1DataRate): data rate to set ADC1 to
+
+            `num_scans` (int): number of times each channel is read
+
+            `analog_in_list` (list): AnalogIn channels to read, single-ended
+
+            `differential_pairs` (list): DiffMode channel pairs to read
+
+            `filters` (dict): filter stage of each channel, formatted as
+                {AnalogIn or DiffMode: CodeFilter}
+
+            `default_filter` (CodeFilter): filter stage of channels missing from `filters`.
+                If None, the codes of these channels are converted without filtering.
+
+        Returns:
+            `dict`: voltages (V) output by each channel's filter, formatted as
+                {AnalogIn or DiffMode: list of float}
+
+        Raises:
+            `ValueError`: if a channel is listed more than once
+        """
+        if not isinstance(num_scans, int) or num_scans < 1:
+            raise ValueError(f"num_scans must be a positive integer, got {num_scans}")
+        filters = {} if filters is None else filters
+        channels = list(analog_in_list or []) + list(differential_pairs or [])
+        if len(set(channels)) != len(channels):
+            raise ValueError(f"channels must be listed only once, got {channels}")
+
+        samples, _ = self.__read_batch(
+            data_rate, analog_in_list, differential_pairs, num_scans=num_scans
+        )
+
+        voltages = {}
+        adc_info = ADCNum.ADC_1.value
+        for i, channel in enumerate(channels):
+            channel_samples = samples[i::len(channels)]
+            mux_p, mux_n, _, _, single_ended = channel_samples[0]
+            codes = [
+                code_to_signed_code(voltage_code, adc_info, single_ended)
+                for _, _, voltage_code, _, _ in channel_samples
+            ]
+            code_filter = filters.get(channel, default_filter)
+            if code_filter is not None:
+                codes = code_filter.process(codes)
+            calibs = self.__get_calibration_params_mux(ADCNum.ADC_1, mux_p, mux_n)
+            voltages[channel] = [signed_code_to_voltage(code, adc_info, calibs) for code in codes]
+        return voltages
+
+    @traced(category="adc")
+    def read_dual_samples(
+        self,
+        adc_1_channels: list,
+        adc_2_channels: Optional[list] = None,
+        num_scans: int = 1,
+        timeout: float = 1.0,
+    ) -> dict:
+        """
+        Acquire samples with both ADCs at the same time. ADC1 scans its channels `num_scans`
+        times while ADC2 converts continuously, cycling through its own channels. Both ADCs are
+        served from a single loop polling the STATUS byte's ADC1 and ADC2 new data bits, and
+        whichever ADC has new data is read. Data rates and other settings are those configured
+        with `set_config`, and the STATUS byte must be enabled.
+
+        Args:
+            `adc_1_channels` (list): AnalogIn or DiffMode channels read by ADC1, in scan order
+
+            `adc_2_channels` (list): AnalogIn or DiffMode channels read by ADC2. ADC2 is not
+                used if None.
+
+            `num_scans` (int): number of times ADC1 reads its list of channels
+
+            `timeout` (float): time in seconds to wait for each ADC1 conversion
+
+        Returns:
+            `dict`: timestamped samples of each ADC, formatted as {ADCNum: SampleBatch}. Channels
+                are encoded as mux_p << 4 | mux_n, see `read_voltage_record`.
+
+        Raises:
+            `ValueError`: if the STATUS byte is disabled
+            `RTDEnabledError`: if a channel list is given for the ADC attached to the RTD
+            `ChannelNotAvailableError`: if a channel uses an input reserved for the RTD
+            `TimeoutError`: if ADC1 reports no new data within `timeout`
+        """
+        if not adc_1_channels:
+            raise ValueError("adc_1_channels cannot be empty")
+        if not isinstance(num_scans, int) or num_scans < 1:
+            raise ValueError(f"num_scans must be a positive integer, got {num_scans}")
+        adc_1_muxes = [self.__channel_mux(channel) for channel in adc_1_channels]
+        adc_2_muxes = [self.__channel_mux(channel) for channel in adc_2_channels or []]
+        timeout_ns = int(timeout * 1e9)
+
+        def start_command(adc_num: ADCNum, mux: tuple) -> list:
+            # writing the mux register and starting in one transfer
+            return ADCCommands.unsafe_write_register_command(
+                adc_num.value.addx.value,
+                [generate_mux_opcode(adc_num.value.addx, *mux).op_code],
+            ) + ADCCommands.start_adc_command(adc_num.value)
+
+        adc_1_reads, adc_2_reads = [], []
+        num_conversions = len(adc_1_muxes) * num_scans
+        with self.lock_spi[self.dev_id]:
+            state = ADCState(self.__get_register_map())
+            self.__validate_dual_channels(state, adc_1_muxes, adc_2_muxes)
+            with self.spi_open():
+                if adc_2_muxes:
+                    self.transfer(start_command(ADCNum.ADC_2, adc_2_muxes[0]))
+                self.transfer(start_command(ADCNum.ADC_1, adc_1_muxes[0]))
+                deadline_ns = time.perf_counter_ns() + timeout_ns
+                while len(adc_1_reads) < num_conversions:
+                    read_data = self.transfer(
+                        ADCCommands.read_adc_command(ADCNum.ADC_1.value, ADC_VOLTAGE_READ_LEN)
+                    )
+                    status_code = read_data[1]
+                    if is_status_bit_set(status_code, ADCStatusBit.ADC1_DATA):
+                        mux = adc_1_muxes[len(adc_1_reads) % len(adc_1_muxes)]
+                        adc_1_reads.append((self.last_transfer_ns, mux, read_data))
+                        if len(adc_1_reads) < num_conversions:
+                            next_mux = adc_1_muxes[len(adc_1_reads) % len(adc_1_muxes)]
+                            self.transfer(start_command(ADCNum.ADC_1, next_mux))
+                        deadline_ns = time.perf_counter_ns() + timeout_ns
+                    elif time.perf_counter_ns() > deadline_ns:
+                        raise TimeoutError(f"ADC1 reported no new data within {timeout} s")
+
+                    if adc_2_muxes and is_status_bit_set(status_code, ADCStatusBit.ADC2_DATA):
+                        mux = adc_2_muxes[len(adc_2_reads) % len(adc_2_muxes)]
+                        adc_2_data = self.transfer(
+                            ADCCommands.read_adc_command(ADCNum.ADC_2.value, ADC_VOLTAGE_READ_LEN)
+                        )
+                        adc_2_reads.append((self.last_transfer_ns, mux, adc_2_data))
+                        if len(adc_2_muxes) > 1:
+                            next_mux = adc_2_muxes[len(adc_2_reads) % len(adc_2_muxes)]
+                            self.transfer(start_command(ADCNum.ADC_2, next_mux))
+
+                if adc_2_muxes:
+                    self.transfer(ADCCommands.stop_adc_command(ADCNum.ADC_2.value))
+
+            # update with final ADC state we wrote (for state caching)
+            EdgePiADC.__state[ADCReg.REG_INPMUX.value] = generate_mux_opcode(
+                ADCReg.REG_INPMUX, *adc_1_muxes[(num_conversions - 1) % len(adc_1_muxes)]
+            ).op_code
+            if adc_2_muxes:
+                # the channel ADC2 was left converting
+                last_mux = adc_2_muxes[len(adc_2_reads) % len(adc_2_muxes)]
+                EdgePiADC.__state[ADCReg.REG_ADC2MUX.value] = generate_mux_opcode(
+                    ADCReg.REG_ADC2MUX, *last_mux
+                ).op_code
+            self.__publish_written_state()
+
+        return {
+            ADCNum.ADC_1: self.__decode_reads(ADCNum.ADC_1, adc_1_reads),
+            ADCNum.ADC_2: self.__decode_reads(ADCNum.ADC_2, adc_2_reads),
+        }
+
+    def __validate_dual_channels(self, state: ADCState, adc_1_muxes: list, adc_2_muxes: list):
+        """
+        Checks the ADC state allows `read_dual_samples` to read the given channels
+
+        Args:
+            `state` (ADCState): the current ADC state
+            `adc_1_muxes` (list): (mux_p, mux_n) pairs to be read by ADC1
+            `adc_2_muxes` (list): (mux_p, mux_n) pairs to be read by ADC2
+
+        Raises:
+            `ValueError`: if the STATUS byte is disabled
+            `RTDEnabledError`: if channels are given for the ADC attached to the RTD
+            `ChannelNotAvailableError`: if a channel uses an input reserved for the RTD
+        """
+        if state.status_byte.code != StatusByte.STATUS_BYTE_ON:
+            raise ValueError("The STATUS byte must be enabled to read both ADCs")
+        rtd_adc = state.rtd_adc
+        if rtd_adc is None:
+            return
+        if (rtd_adc == ADCNum.ADC_1 and adc_1_muxes) or (rtd_adc == ADCNum.ADC_2 and adc_2_muxes):
+            raise RTDEnabledError(f"{rtd_adc.name} channels cannot be read while RTD is enabled")
+        channels = [mux for muxes in (adc_1_muxes, adc_2_muxes) for pair in muxes for mux in pair]
+        validate_channels_allowed(channels, rtd_enabled=True)
+
+    def __channel_mux(self, channel) -> tuple:
+        """Returns the (mux_p, mux_n) pair of an AnalogIn or DiffMode channel"""
+        if isinstance(channel, DiffMode):
+            return channel.value.mux_p, channel.value.mux_n
+        mux_p = self.__analog_in_to_adc_in_map.get(channel)
+        if mux_p is None or mux_p in (CH.AINCOM, CH.FLOAT):
+            raise ValueError(f"Invalid channel {channel}")
+        return mux_p, CH.AINCOM
+
+    def __decode_reads(self, adc_num: ADCNum, reads: list) -> SampleBatch:
+        """
+        Convert data reads to sample records
+
+        Args:
+            `adc_num` (ADCNum): the ADC that was read
+            `reads` (list): (timestamp_ns, (mux_p, mux_n), read_data) of each read
+        """
+        batch = SampleBatch()
+        calibs = {}
+        num_data_bytes = adc_num.value.num_data_bytes
+        for timestamp_ns, (mux_p, mux_n), read_data in reads:
+            if (len(read_data) - 1) != ADC_VOLTAGE_READ_LEN:
+                raise VoltageReadError(
+                    f"Voltage read failed: incorrect number of bytes ({len(read_data)}) retrieved"
+                )
+            voltage_code = read_data[2 : (2 + num_data_bytes)]
+            check_crc(voltage_code, read_data[6])
+            if (mux_p, mux_n) not in calibs:
+                calibs[(mux_p, mux_n)] = self.__get_calibration_params_mux(adc_num, mux_p, mux_n)
+            voltage = code_to_voltage(
+                voltage_code, adc_num.value, calibs[(mux_p, mux_n)], mux_n == CH.AINCOM
+            )
+            batch.append(
+                timestamp_ns,
+                self.__mux_channel_id(mux_p, mux_n),
+                int.from_bytes(bytes(voltage_code), "big"),
+                voltage,
+                read_data[1],
+            )
+        return batch
+
+    def __batch_sample_voltage(
+        self, mux_p: CH, mux_n: CH, voltage_code: list, _status: int, single_ended: bool
+    ) -> float:
+        """Convert a sample read by `__read_batch` to voltage"""
+        calibs = self.__get_calibration_params_mux(ADCNum.ADC_1, mux_p, mux_n)
+        return code_to_voltage(voltage_code, ADCNum.ADC_1.value, calibs, single_ended)
+
+    @traced(category="adc")
+    def __read_batch(
+        self,
+        data_rate: ADC1DataRate,
+        analog_in_list: Optional[list[AnalogIn]],
+        differential_pairs: Optional[list[DiffMode]],
+        num_scans: int = 1,
+    ) -> tuple:
+        """
+        Read a batch of ADC1 channels
+
+        Args:
+            `num_scans` (int): number of times the list of channels is read
+
+        Returns:
+            `tuple`: (samples, timestamps), where samples is a list of
+                (mux_p, mux_n, voltage_code, status_code, single_ended) for each channel read,
+                and timestamps the monotonic ns times at which each channel's data was read
+        """
         analog_in_list     = [] if analog_in_list is None else analog_in_list
         differential_pairs = [] if differential_pairs is None else differential_pairs
 
@@ -1022,50 +1972,56 @@ class EdgePiADC(SPI):
         if any(ch is None for ch in channel_list):
             raise ValueError(f"Invalid analog_in_list={analog_in_list}")
 
-        # get current register values by doing an SPI read
-        register_values = self.__get_register_map()
-        if len(register_values.values()) < 1:
-            raise ValueError("Number of reg_values must be at least 1")
-
-        # determine the conversion delay using the table from the datasheet
-        # (best case is sleep of 0.207ms)
-        filter_mode_op_code = (
-            (~ADCProperties.FILTER_MODE.value.mask)
-            & register_values[ADCProperties.FILTER_MODE.value.addx]
-        )
-        conversion_delay = expected_initial_time_delay(
-            ADCNum.ADC_1, data_rate.value.op_code, filter_mode_op_code
-        ) / 1000
-
-        # this is the register value of MODE2 that contains the new data_rate
-        mode2_register_value = (
-            register_values[ADCReg.REG_MODE2.value]
-            & data_rate.value.op_mask
-        ) | data_rate.value.op_code
-
-        mux_pairs = (
-            [(channel, CH.AINCOM) for channel in channel_list] +
-            [(diff_mode.value.mux_p, diff_mode.value.mux_n) for diff_mode in differential_pairs]
-        )
-
-        data_list = self.spi_apply_adc_commands([
-            # get instructions we need to send to perform a read of each pin
-            ADCCommands.read_command_tuple(
-                # the first command tuple should write the mode2 register to contain the data rate
-                mode2_register_value if i == 0 else None,
-                conversion_delay,
-                mux_p, mux_n
-            ) for i, (mux_p, mux_n) in enumerate(mux_pairs)
-        ])
-
-        # update with final ADC state we wrote (for state caching)
-        EdgePiADC.__state[ADCReg.REG_MODE2.value] = mode2_register_value
-        mux_p, mux_n = mux_pairs[-1]
-        EdgePiADC.__state[ADCReg.REG_INPMUX.value] = generate_mux_opcode(
-            ADCReg.REG_INPMUX, mux_p, mux_n
-        ).op_code
-
-        voltage_list = []
+        # hold the bus so the cached MODE2 and INPMUX values match what was written last
+        with self.lock_spi[self.dev_id]:
+            # get current register values by doing an SPI read
+            register_values = self.__get_register_map()
+            if len(register_values.values()) < 1:
+                raise ValueError("Number of reg_values must be at least 1")
+
+            # determine the conversion delay using the table from the datasheet
+            # (best case is sleep of 0.207ms)
+            filter_mode_op_code = (
+                (~ADCProperties.FILTER_MODE.value.mask)
+                & register_values[ADCProperties.FILTER_MODE.value.addx]
+            )
+            conversion_delay = expected_initial_time_delay(
+                ADCNum.ADC_1, data_rate.value.op_code, filter_mode_op_code, self.conv_time_profile
+            ) / 1000
+
+            # this is the register value of MODE2 that contains the new data_rate
+            mode2_register_value = (
+                register_values[ADCReg.REG_MODE2.value]
+                & data_rate.value.op_mask
+            ) | data_rate.value.op_code
+
+            mux_pairs = (
+                [(channel, CH.AINCOM) for channel in channel_list] +
+                [(diff_mode.value.mux_p, diff_mode.value.mux_n) for diff_mode in differential_pairs]
+            ) * num_scans
+
+            data_list = self.spi_apply_adc_commands([
+                # get instructions we need to send to perform a read of each pin
+                ADCCommands.read_command_tuple(
+                    # the first command tuple should write the mode2 register to contain the
+                    # data rate
+                    mode2_register_value if i == 0 else None,
+                    conversion_delay,
+                    mux_p, mux_n
+                ) for i, (mux_p, mux_n) in enumerate(mux_pairs)
+            ])
+            timestamps = self.last_command_timestamps_ns
+
+            # update with final ADC state we wrote (for state caching)
+            EdgePiADC.__state[ADCReg.REG_MODE2.value] = mode2_register_value
+            mux_p, mux_n = mux_pairs[-1]
+            EdgePiADC.__state[ADCReg.REG_INPMUX.value] = generate_mux_opcode(
+                ADCReg.REG_INPMUX, mux_p, mux_n
+            ).op_code
+            self.__publish_written_state()
+
+        samples = []
+        num_channels = len(channel_list) + len(differential_pairs)
         for i, read_data in enumerate(data_list):
             if (len(read_data) - 1) != ADC_VOLTAGE_READ_LEN:
                 raise VoltageReadError(
@@ -1077,16 +2033,12 @@ class EdgePiADC(SPI):
             check_crc(voltage_code, check_code)
 
             mux_p, mux_n = mux_pairs[i]
+            single_ended = i % num_channels < len(channel_list)
+            samples.append((mux_p, mux_n, voltage_code, read_data[1], single_ended))
 
-            # convert from voltage_code to voltage value (float)
-            calibs = self.__get_calibration_params_mux(ADCNum.ADC_1, mux_p, mux_n)
-            single_ended = i < len(channel_list)
-            voltage_list += [code_to_voltage(
-                voltage_code, ADCNum.ADC_1.value, calibs, single_ended
-            )]
-
-        return voltage_list
+        return samples, timestamps
 
+    @traced(category="adc")
     def get_state(self, override_cache: bool = False) -> ADCState:
         """
         Read the current hardware state of configurable ADC properties
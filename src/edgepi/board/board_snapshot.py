@@ -0,0 +1,39 @@
+"""
+State of the whole EdgePi board, read together
+
+Classes:
+    BoardSnapshot
+"""
+
+from dataclasses import dataclass
+
+from edgepi.adc.adc_state import ADCState
+from edgepi.dac.dac_snapshot import DACSnapshot
+
+
+@dataclass(frozen=True)
+class BoardSnapshot:  # pylint: disable=too-many-instance-attributes
+    """
+    Board state read by `EdgePiBoard.get_snapshot`
+
+    Attributes:
+        `expander_pins` (dict): state and direction of every GPIO expander pin, formatted as
+            {pin name: (True if high, True if input)}
+        `dout` (dict): state of each digital output, formatted as {DoutPins: DoutTriState}
+        `din` (dict): state of each digital input, formatted as {DinPins: bool}
+        `leds` (dict): state of each LED, formatted as {LEDPins: True if on}
+        `relay` (bool): True if the relay is closed
+        `pwm` (dict): state of each PWM output, formatted as {PWMPins: PWMState}, None for
+            outputs which are not initialized
+        `adc` (ADCState): ADC configuration, None if not requested
+        `dac` (DACSnapshot): DAC codes and expected voltages, None if not requested
+    """
+
+    expander_pins: dict
+    dout: dict
+    din: dict
+    leds: dict
+    relay: bool
+    pwm: dict
+    adc: ADCState = None
+    dac: DACSnapshot = None
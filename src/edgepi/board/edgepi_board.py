@@ -0,0 +1,179 @@
+"""
+Shared context for the EdgePi modules
+
+Each EdgePi module creates its own GPIO manager when used on its own, and the ADC and DAC each
+read the calibration data from the EEPROM. `EdgePiBoard` creates each module the first time it
+is used, passing all of them a single GPIO manager and the calibration data read once:
+
+    with EdgePiBoard() as board:
+        board.dac.write_voltage(DACChannel.AOUT1, 2.5)
+        board.dout.set_dout_state(DoutPins.DOUT3, DoutTriState.HIGH)
+        print(board.adc.read_voltage(ADCNum.ADC_1))
+
+Classes:
+    EdgePiBoard
+"""
+
+import logging
+import threading
+
+from edgepi.adc.adc_constants import ADCNum
+from edgepi.adc.edgepi_adc import EdgePiADC
+from edgepi.board.board_snapshot import BoardSnapshot
+from edgepi.dac.edgepi_dac import EdgePiDAC
+from edgepi.digital_input.digital_input_constants import DinPins
+from edgepi.digital_input.edgepi_digital_input import EdgePiDigitalInput
+from edgepi.digital_output.digital_output_constants import DoutPins, DoutTriState
+from edgepi.digital_output.edgepi_digital_output import EdgePiDigitalOutput
+from edgepi.eeprom.edgepi_eeprom import EdgePiEEPROM
+from edgepi.eeprom.edgepi_eeprom_data import EepromDataClass
+from edgepi.gpio.edgepi_gpio import EdgePiGPIO
+from edgepi.gpio.gpio_constants import GpioPins
+from edgepi.led.edgepi_leds import EdgePiLED
+from edgepi.led.led_constants import LEDPins
+from edgepi.pwm.edgepi_pwm import EdgePiPWM, PwmDeviceError
+from edgepi.pwm.pwm_constants import PWMPins
+from edgepi.relay.edgepi_relay import EdgePiRelay
+from edgepi.tc.edgepi_tc import EdgePiTC
+
+_logger = logging.getLogger(__name__)
+
+
+class EdgePiBoard:
+    """
+    Creates the EdgePi modules on first use and shares one GPIO manager and one read of the
+    EEPROM calibration data among them. Modules are created once and reused until `close`.
+
+    Args:
+        `adc_options` (dict): keyword arguments of `EdgePiADC`, e.g. {"enable_cache": True}
+    """
+
+    def __init__(self, adc_options: dict = None):
+        self.adc_options = adc_options if adc_options is not None else {}
+        # modules created so far, by name
+        self.__modules = {}
+        self.__lock = threading.RLock()
+
+    def __get(self, name: str, factory):
+        """Return the module created under `name`, creating it with `factory` on first use"""
+        with self.__lock:
+            if name not in self.__modules:
+                _logger.debug(f"Creating board module '{name}'")
+                self.__modules[name] = factory()
+            return self.__modules[name]
+
+    @property
+    def gpio(self) -> EdgePiGPIO:
+        """GPIO manager shared by all modules"""
+        return self.__get("gpio", EdgePiGPIO)
+
+    @property
+    def eeprom_data(self) -> EepromDataClass:
+        """Calibration and board data, read from the EEPROM once"""
+        return self.__get("eeprom_data", lambda: EdgePiEEPROM().read_edgepi_data())
+
+    @property
+    def adc(self) -> EdgePiADC:
+        """ADC module"""
+        return self.__get(
+            "adc",
+            lambda: EdgePiADC(
+                gpio=self.gpio, eeprom_data=self.eeprom_data, **self.adc_options
+            ),
+        )
+
+    @property
+    def dac(self) -> EdgePiDAC:
+        """DAC module, also used by `dout` to tri-state outputs"""
+        return self.__get("dac", lambda: EdgePiDAC(gpio=self.gpio, eeprom_data=self.eeprom_data))
+
+    @property
+    def tc(self) -> EdgePiTC:
+        """Thermocouple module"""
+        return self.__get("tc", EdgePiTC)
+
+    @property
+    def dout(self) -> EdgePiDigitalOutput:
+        """Digital output module"""
+        return self.__get(
+            "dout", lambda: EdgePiDigitalOutput(gpio=self.gpio, dac_factory=lambda: self.dac)
+        )
+
+    @property
+    def din(self) -> EdgePiDigitalInput:
+        """Digital input module"""
+        return self.__get("din", lambda: EdgePiDigitalInput(gpio=self.gpio))
+
+    @property
+    def led(self) -> EdgePiLED:
+        """LED module"""
+        return self.__get("led", lambda: EdgePiLED(gpio=self.gpio))
+
+    @property
+    def relay(self) -> EdgePiRelay:
+        """Relay module"""
+        return self.__get("relay", lambda: EdgePiRelay(gpio=self.gpio))
+
+    @property
+    def pwm(self) -> EdgePiPWM:
+        """PWM module"""
+        return self.__get("pwm", lambda: EdgePiPWM(gpio=self.gpio))
+
+    def get_snapshot(self, adc: bool = True, dac: bool = True) -> BoardSnapshot:
+        """
+        Read the state of the whole board with as few transactions as possible: each GPIO
+        expander port register once in one I2C session, all digital inputs in one GPIO
+        request, the ADC register map once, all DAC channels in one SPI session, and the PWM
+        sysfs attributes of initialized PWM outputs.
+
+        Args:
+            `adc` (bool): include the ADC configuration, creating the ADC module if needed
+            `dac` (bool): include the DAC channel states, creating the DAC module if needed
+
+        Returns:
+            `BoardSnapshot`: the decoded board state
+        """
+        expander_pins = self.gpio.read_expander_pin_states()
+        dout = {}
+        for pin in DoutPins:
+            is_high, is_input = expander_pins[pin.value]
+            if is_input:
+                dout[pin] = DoutTriState.HI_Z
+            else:
+                dout[pin] = DoutTriState.HIGH if is_high else DoutTriState.LOW
+        din = dict(zip(DinPins, self.gpio.batch_read_din_state(list(DinPins))))
+        return BoardSnapshot(
+            expander_pins=expander_pins,
+            dout=dout,
+            din=din,
+            leds={led: expander_pins[led.value][0] for led in LEDPins},
+            relay=expander_pins[GpioPins.RELAY.value][0],
+            pwm={pwm_num: self.pwm.get_state(pwm_num) for pwm_num in PWMPins},
+            adc=self.adc.get_state() if adc else None,
+            dac=self.dac.get_snapshot() if dac else None,
+        )
+
+    def close(self):
+        """
+        Stop ADC conversions and close PWM devices started through this board, then release
+        all modules. Modules are created again if used after closing.
+        """
+        with self.__lock:
+            modules, self.__modules = self.__modules, {}
+        if "adc" in modules:
+            for adc_num in ADCNum:
+                modules["adc"].stop_conversions(adc_num)
+        if "pwm" in modules:
+            for pwm_num in PWMPins:
+                try:
+                    modules["pwm"].close(pwm_num)
+                except PwmDeviceError:
+                    # not initialized
+                    pass
+        _logger.debug(f"Closed board modules {list(modules)}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
@@ -0,0 +1,240 @@
+"""
+Fixed rate control loops coupling ADC reads to DAC writes
+
+`ControlLoop` runs a read, compute, write cycle from a dedicated thread: it reads a voltage
+with a compiled ADC read plan, passes it to a controller, and writes the controller's output
+to a DAC channel. Both SPI devices are held open for the whole run and iterations start on the
+deadline schedule of `PeriodicRunner`, so an iteration costs two SPI transfers plus the
+controller's own time:
+
+    adc.set_config(adc_1_ch=AnalogIn.AIN1, conversion_mode=ConvMode.CONTINUOUS,
+                   adc_1_data_rate=ADC1DataRate.SPS_2400)
+    loop = ControlLoop(
+        adc, adc.compile_read_plan(ADCNum.ADC_1), dac, DACChannel.AOUT1,
+        PIDController(kp=0.5, ki=20, setpoint=1.0), rate=1000, waiter=HybridWaiter(),
+    )
+    loop.start()
+    ...
+    loop.stop()
+    print(loop.stats.jitter_ns.quantile(0.99))
+
+Classes:
+    PIDController
+    ControlLoopStats
+    ControlLoop
+"""
+
+from contextlib import contextmanager
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from edgepi.adc.adc_read_plan import ADCReadPlan
+from edgepi.dac.dac_constants import (
+    UPPER_LIMIT,
+    DACChannel,
+    EdgePiDacCalibrationConstants as CalibConst,
+)
+from edgepi.utilities.histogram import Histogram
+from edgepi.utilities.periodic_runner import PeriodicRunner
+from edgepi.utilities.waiter import Waiter
+
+
+class PIDController:
+    """
+    Proportional-integral-derivative controller, callable as a `ControlLoop` controller.
+    The derivative acts on the measurement, so setpoint changes do not cause output spikes,
+    and the integral stops accumulating while the output is saturated.
+
+    Args:
+        `kp` (float): proportional gain (V/V)
+        `ki` (float): integral gain (V/(V.s))
+        `kd` (float): derivative gain (V.s/V)
+        `setpoint` (float): target measurement (V)
+        `output_limits` (tuple): (min, max) output voltage (V)
+    """
+
+    def __init__(
+        self,
+        kp: float,
+        ki: float = 0.0,
+        kd: float = 0.0,
+        setpoint: float = 0.0,
+        output_limits: tuple = (0.0, UPPER_LIMIT),
+    ):
+        if output_limits[0] > output_limits[1]:
+            raise ValueError(f"Invalid output limits {output_limits}")
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.setpoint = setpoint
+        self.output_limits = output_limits
+        self.__integral = 0.0
+        self.__last_measurement = None
+
+    def reset(self):
+        """Clear the integral and derivative state"""
+        self.__integral = 0.0
+        self.__last_measurement = None
+
+    def __call__(self, measurement: float, dt: float) -> float:
+        """
+        Compute the output for a new measurement
+
+        Args:
+            `measurement` (float): measured voltage (V)
+            `dt` (float): time since the previous measurement (s)
+
+        Returns:
+            `float`: output voltage (V)
+        """
+        error = self.setpoint - measurement
+        derivative = 0.0
+        if self.__last_measurement is not None and dt > 0:
+            derivative = -(measurement - self.__last_measurement) / dt
+        self.__last_measurement = measurement
+
+        integral = self.__integral + error * dt
+        output = self.kp * error + self.ki * integral + self.kd * derivative
+        low, high = self.output_limits
+        if low <= output <= high:
+            self.__integral = integral
+        return min(max(output, low), high)
+
+
+@dataclass
+class ControlLoopStats:
+    """
+    Timing statistics of a control loop run, in nanoseconds
+
+    Attributes:
+        `iterations` (int): number of iterations run
+        `period_ns` (Histogram): time between the starts of consecutive iterations
+        `jitter_ns` (Histogram): time between each iteration's deadline and its start
+        `duration_ns` (Histogram): time from the start to the end of each iteration
+        `overrun_ns` (Histogram): time between the next iteration's deadline and the end of
+            each iteration which ended after it. The schedule restarts from the end of an
+            overrun iteration.
+    """
+
+    iterations: int = 0
+    period_ns: Histogram = field(default_factory=Histogram)
+    jitter_ns: Histogram = field(default_factory=Histogram)
+    duration_ns: Histogram = field(default_factory=Histogram)
+    overrun_ns: Histogram = field(default_factory=Histogram)
+
+    @property
+    def overruns(self) -> int:
+        """number of iterations which ended after the next iteration's deadline"""
+        return self.overrun_ns.count
+
+
+class ControlLoop(PeriodicRunner):
+    """
+    Runs a fixed rate control loop from a dedicated thread
+
+    Args:
+        `adc` (EdgePiADC): the ADC to read
+
+        `read_plan` (ADCReadPlan): read plan of the measured channel, see
+            `EdgePiADC.compile_read_plan`
+
+        `dac` (EdgePiDAC): the DAC to write
+
+        `analog_out` (DACChannel): the DAC channel written
+
+        `controller` (Callable[[float, float], float]): called with each measurement (V) and
+            the time since the previous measurement (s), returns the output voltage (V). Outputs
+            are clamped to the DAC's range. `PIDController` is a built-in controller.
+
+        `rate` (float): iterations per second. Should not exceed the ADC data rate, otherwise
+            some iterations read the same conversion.
+
+        `waiter` (Waiter): waits for each iteration's deadline, defaults to the ADC's waiter.
+            `HybridWaiter` gives the lowest jitter.
+
+    Conversions are stopped when the loop ends or is stopped. The DAC output keeps the last
+    voltage written.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        adc,
+        read_plan: ADCReadPlan,
+        dac,
+        analog_out: DACChannel,
+        controller: Callable[[float, float], float],
+        rate: float,
+        waiter: Waiter = None,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        super().__init__(waiter if waiter is not None else adc.waiter)
+        self.adc = adc
+        self.read_plan = read_plan
+        self.dac = dac
+        self.analog_out = analog_out
+        self.controller = controller
+        self.rate = rate
+        self.stats = ControlLoopStats()
+        # last measurement and output voltages (V)
+        self.measurement = None
+        self.output = None
+        self.__dac_gain = 1
+        self.__last_start_ns = None
+
+    def start(self, max_iterations: int = None):
+        """
+        Start conversions, route the DAC output and start the loop
+
+        Args:
+            `max_iterations` (int): number of iterations to run, None to run until `stop`
+        """
+        if self.is_running:
+            raise RuntimeError("Control loop is already running")
+        _, _, gain_state = self.dac.get_state(gain=True)
+        self.__dac_gain = CalibConst.DAC_GAIN_FACTOR.value if gain_state else 1
+        self.dac.enable_outputs([self.analog_out])
+        self.adc.start_conversions(self.read_plan.adc_num)
+
+        self.stats = ControlLoopStats()
+        self.__last_start_ns = None
+        self._start_thread(self.rate, "ControlLoop", max_iterations)
+
+    @contextmanager
+    def _session(self):
+        try:
+            with self.adc.spi_open(), self.dac.spi_open():
+                yield
+        finally:
+            self.adc.stop_conversions(self.read_plan.adc_num)
+
+    def _iterate(self, deadline_ns: int) -> int:
+        """Read a measurement, and write the controller's output"""
+        stats, plan, dac_ops = self.stats, self.read_plan, self.dac.dac_ops
+        channel, dac_gain = self.analog_out.value, self.__dac_gain
+        start_ns = time.perf_counter_ns()
+        stats.jitter_ns.record(max(start_ns - deadline_ns, 0))
+        if self.__last_start_ns is None:
+            dt = 1 / self.rate
+        else:
+            stats.period_ns.record(start_ns - self.__last_start_ns)
+            dt = (start_ns - self.__last_start_ns) / 1e9
+        self.__last_start_ns = start_ns
+
+        measurement = plan.decode(self.adc.transfer(plan.command))
+        output = min(max(self.controller(measurement, dt), 0.0), UPPER_LIMIT * dac_gain)
+        code = min(
+            max(dac_ops.voltage_to_code(channel, output, dac_gain), 0), CalibConst.RANGE.value
+        )
+        self.dac.transfer(dac_ops.codes_to_frames(channel, [code])[0])
+        self.measurement, self.output = measurement, output
+
+        end_ns = time.perf_counter_ns()
+        stats.duration_ns.record(end_ns - start_ns)
+        stats.iterations += 1
+        return end_ns
+
+    def _overrun(self, lateness_ns: int):
+        self.stats.overrun_ns.record(lateness_ns)
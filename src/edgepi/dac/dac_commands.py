@@ -1,7 +1,6 @@
 """ Command class and methods for DAC devices """
 
 import logging
-from bitstring import Bits, pack
 from edgepi.dac.dac_constants import (
     NUM_PINS,
     READ_WRITE_SIZE,
@@ -21,6 +20,22 @@ class DACCommands:
         _logger.info("Initializing DAC Methods")
         self.dict_calib_param = dict_calib_param
 
+    @property
+    def dict_calib_param(self) -> dict:
+        """calibration parameters of each channel, formatted as {channel: CalibParam}"""
+        return self.__dict_calib_param
+
+    @dict_calib_param.setter
+    def dict_calib_param(self, dict_calib_param: dict):
+        self.__dict_calib_param = dict_calib_param
+        # voltage to code conversion of each channel as code = voltage * scale + bias, at unity
+        # DAC gain. Computed once per calibration instead of on every conversion.
+        codes_per_volt = CALIB_CONSTS.RANGE.value / CALIB_CONSTS.V_RANGE.value
+        self.__coefficients = {
+            ch: (codes_per_volt / calib.gain, -calib.offset * codes_per_volt / calib.gain)
+            for ch, calib in dict_calib_param.items()
+        }
+
     def generate_write_and_update_command(self, ch: int, data: int) -> list:
         """Construct a write and update command"""
         self.check_range(ch, 0, NUM_PINS-1)
@@ -32,8 +47,8 @@ class DACCommands:
         Convert a voltage to full precision binary code value
         code = ((expected_v - offset)/gain) * (Code_range/V_range))/DAC_GAIN
         """
-        float_code =(((expected-self.dict_calib_param[ch].offset)/self.dict_calib_param[ch].gain)*\
-                    (CALIB_CONSTS.RANGE.value/CALIB_CONSTS.V_RANGE.value))/dac_gain
+        scale, bias = self.__coefficients[ch]
+        float_code = (expected * scale + bias) / dac_gain
         _logger.debug(f"Full code generated {float_code}")
         return float_code
 
@@ -58,6 +73,105 @@ class DACCommands:
         # DAC only accepts int values, round to nearest int
         return round(float_code)
 
+    def voltages_to_codes(self, ch: int, voltages, dac_gain: int = 1) -> list:
+        """
+        Convert a sequence of voltages to binary code values, in one pass
+
+        Args:
+            ch (int): the DAC channel to write voltages to (0-indexed)
+
+            voltages (iterable): the voltages to convert
+
+            dac_gain (int): dac gain state, x1 or x2, when x2 voltage range extened to 10V from 5V
+
+        Returns:
+            list: 16 bit binary code values for writing the voltages to the DAC
+
+        Raises:
+            ValueError: if a voltage converts to a code outside of the DAC's range
+        """
+        self.check_range(ch, 0, NUM_PINS-1)
+        scale, bias = self.__coefficients[ch]
+        scale, bias = scale / dac_gain, bias / dac_gain
+        codes = [round(voltage * scale + bias) for voltage in voltages]
+        if codes:
+            self.check_range(min(codes), 0, CALIB_CONSTS.RANGE.value)
+            self.check_range(max(codes), 0, CALIB_CONSTS.RANGE.value)
+        return codes
+
+    @staticmethod
+    def codes_to_frames(ch: int, codes: list) -> list:
+        """
+        Build the write and update command frames setting a channel to each of a sequence of
+        codes, without validating them
+
+        Args:
+            ch (int): the DAC channel to write codes to (0-indexed)
+
+            codes (list): 16 bit binary code values
+
+        Returns:
+            list: a list of message frames, each of the form
+                [command_and_channel_byte, code_msb, code_lsb]
+        """
+        command = (COMMAND.COM_WRITE_UPDATE.value << 4) | CH(ch).value
+        return [[command, code >> 8, code & 0xFF] for code in codes]
+
+    def voltages_to_frames(self, ch: int, voltages, dac_gain: int = 1) -> list:
+        """
+        Convert a sequence of voltages to the write and update command frames setting a
+        channel to each voltage
+
+        Args:
+            ch (int): the DAC channel to write voltages to (0-indexed)
+
+            voltages (iterable): the voltages to convert
+
+            dac_gain (int): dac gain state, x1 or x2, when x2 voltage range extened to 10V from 5V
+
+        Returns:
+            list: a list of message frames, each of the form
+                [command_and_channel_byte, code_msb, code_lsb]
+
+        Raises:
+            ValueError: if a voltage converts to a code outside of the DAC's range
+        """
+        return self.codes_to_frames(ch, self.voltages_to_codes(ch, voltages, dac_gain))
+
+    def voltages_to_frames_numpy(self, ch: int, voltages, dac_gain: int = 1):
+        """
+        Same as `voltages_to_frames`, using NumPy, installed with the `numpy` extra
+
+        Args:
+            ch (int): the DAC channel to write voltages to (0-indexed)
+
+            voltages (array_like): the voltages to convert
+
+            dac_gain (int): dac gain state, x1 or x2, when x2 voltage range extened to 10V from 5V
+
+        Returns:
+            numpy.ndarray: uint8 array of shape (number of voltages, 3), one frame per row
+
+        Raises:
+            ValueError: if a voltage converts to a code outside of the DAC's range
+        """
+        # pylint: disable=import-outside-toplevel
+        import numpy
+
+        self.check_range(ch, 0, NUM_PINS-1)
+        scale, bias = self.__coefficients[ch]
+        scale, bias = scale / dac_gain, bias / dac_gain
+        codes = numpy.rint(numpy.asarray(voltages, dtype=numpy.float64) * scale + bias)
+        if codes.size:
+            self.check_range(codes.min(), 0, CALIB_CONSTS.RANGE.value)
+            self.check_range(codes.max(), 0, CALIB_CONSTS.RANGE.value)
+        codes = codes.astype(numpy.uint32)
+        frames = numpy.empty((codes.size, 3), dtype=numpy.uint8)
+        frames[:, 0] = (COMMAND.COM_WRITE_UPDATE.value << 4) | CH(ch).value
+        frames[:, 1] = codes >> 8
+        frames[:, 2] = codes & 0xFF
+        return frames
+
     @staticmethod
     def extract_read_data(read_code: list) -> int:
         """
@@ -76,11 +190,9 @@ class DACCommands:
         if len(read_code) != READ_WRITE_SIZE:
             raise ValueError("code must contain exactly 3 byte values")
 
-        bits = pack("uint:8, uint:8, uint:8", read_code[0], read_code[1], read_code[2])
-
         # B23 to DB20 contain undefined data, and the last 16 bits contain the
-        # DB19 to DB4 DAC register contents. B23 (MSB) is index 0 here.
-        return bits[-16:].uint
+        # DB19 to DB4 DAC register contents. B23 (MSB) is in read_code[0].
+        return (read_code[1] << 8) | read_code[2]
 
     def __code_to_float_voltage(self, ch: int, code: int, dac_gain: int = 1) -> float:
         """
@@ -161,7 +273,7 @@ class DACCommands:
         Returns:
             int: a 16 bit binary code value for updating DAC channel power mode
         """
-        data = Bits()
+        data = 0
         for value in dac_state:
-            data += Bits(uint=value, length=2)
-        return data.uint
+            data = (data << 2) | value
+        return data
@@ -0,0 +1,28 @@
+"""
+State of all DAC channels, read together
+
+Classes:
+    DACSnapshot
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DACSnapshot:
+    """
+    Input register codes of every DAC channel and the voltages they map to, read in one SPI
+    session by `EdgePiDAC.get_snapshot`
+
+    Attributes:
+        `gain_state` (bool): True if the DAC gain is enabled
+        `codes` (dict): code value of each channel's input register, formatted as
+            {DACChannel: code}
+        `voltages` (dict): expected voltage (V) of each channel, formatted as
+            {DACChannel: voltage}. As with `EdgePiDAC.compute_expected_voltage`, this is a
+            calculation from the code, not a measurement of the terminal block pin.
+    """
+
+    gain_state: bool
+    codes: dict
+    voltages: dict
@@ -0,0 +1,166 @@
+"""
+Buffered waveform playback on the EdgePi DAC
+
+`WaveformPlayer` writes a voltage waveform to one or more analog out pins at a fixed sample
+rate, from a dedicated thread. Waveforms given as sequences are converted to DAC command frames
+once before playback starts, the DAC gain is read once, the outputs are routed once, and the SPI
+device is held open for the whole playback, so each sample costs one SPI transfer per channel.
+Samples are written on the deadline schedule of `PeriodicRunner`, `start + n / sample_rate`, so
+per-sample delays do not accumulate into a frequency error:
+
+    player = WaveformPlayer(
+        edgepi_dac,
+        {DACChannel.AOUT3: [2.5 + 2 * math.sin(2 * math.pi * i / 100) for i in range(100)]},
+        sample_rate=1000,
+        loop=True,
+        waiter=HybridWaiter(),
+    )
+    player.start()
+    ...
+    player.stop()
+    print(player.stats)
+
+Classes:
+    PlaybackStats
+    WaveformPlayer
+"""
+
+import itertools
+import time
+from dataclasses import dataclass
+
+from edgepi.dac.dac_constants import (
+    NUM_PINS,
+    UPPER_LIMIT,
+    DACChannel,
+    EdgePiDacCalibrationConstants as CalibConst,
+)
+from edgepi.utilities.periodic_runner import PeriodicRunner
+from edgepi.utilities.waiter import WaitStats, Waiter
+
+
+@dataclass
+class PlaybackStats(WaitStats):
+    """
+    Timing statistics of a playback. Overshoot is the time between a sample's deadline and
+    the end of its SPI transfers, i.e. the output jitter.
+
+    Attributes:
+        `underruns` (int): number of samples written more than one sample period late. The
+            schedule restarts from the end of the late sample, so the following samples are not
+            rushed.
+    """
+
+    underruns: int = 0
+
+
+class WaveformPlayer(PeriodicRunner):
+    """
+    Plays voltage waveforms on DAC channels at a fixed sample rate, from a dedicated thread
+
+    Args:
+        `dac` (EdgePiDAC): the DAC to write to
+
+        `waveforms` (dict): voltages (V) of each channel, formatted as
+            {DACChannel: waveform}. Waveforms with a length, such as lists or NumPy arrays,
+            are converted to DAC codes when playback starts. Other iterables, such as
+            generators, are converted one sample at a time during playback. Playback stops
+            at the end of the shortest waveform.
+
+        `sample_rate` (float): samples written per second, on every channel
+
+        `loop` (bool): repeat waveforms with a length until `stop` is called
+
+        `waiter` (Waiter): waits for each sample's deadline, defaults to the DAC's waiter.
+            `HybridWaiter` gives the lowest jitter.
+
+    Outputs keep the last voltage written when playback ends or is stopped.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        dac,
+        waveforms: dict,
+        sample_rate: float,
+        loop: bool = False,
+        waiter: Waiter = None,
+    ):
+        if sample_rate <= 0:
+            raise ValueError(f"sample_rate must be positive, got {sample_rate}")
+        if not waveforms:
+            raise ValueError("waveforms cannot be empty")
+        super().__init__(waiter if waiter is not None else dac.waiter)
+        self.dac = dac
+        self.waveforms = waveforms
+        self.sample_rate = sample_rate
+        self.loop = loop
+        self.stats = PlaybackStats()
+        self.__dac_gain = 1
+        # command frames of each sample, on every channel
+        self.__ticks = iter(())
+
+    @property
+    def is_playing(self) -> bool:
+        """True while the playback thread is running"""
+        return self.is_running
+
+    def __frame(self, analog_out: DACChannel, voltage: float) -> list:
+        """Write and update command frame setting a channel to a voltage"""
+        ops = self.dac.dac_ops
+        ops.check_range(voltage, 0, UPPER_LIMIT * self.__dac_gain)
+        code = ops.voltage_to_code(analog_out.value, voltage, self.__dac_gain)
+        return ops.generate_write_and_update_command(analog_out.value, code)
+
+    def __channel_frames(self) -> list:
+        """Command frames of each channel, precomputed for waveforms with a length"""
+        channel_frames = []
+        for analog_out, waveform in self.waveforms.items():
+            self.dac.dac_ops.check_range(analog_out.value, 0, NUM_PINS - 1)
+            if hasattr(waveform, "__len__"):
+                channel_frames.append(
+                    self.dac.dac_ops.voltages_to_frames(analog_out.value, waveform, self.__dac_gain)
+                )
+            else:
+                channel_frames.append(
+                    map(lambda voltage, ch=analog_out: self.__frame(ch, voltage), waveform)
+                )
+        return channel_frames
+
+    def start(self):
+        """
+        Convert the waveforms, route the outputs and start playback. Raises `ValueError`
+        before anything is written if a precomputed waveform has an out of range voltage.
+        """
+        if self.is_playing:
+            raise RuntimeError("Playback is already running")
+        _, _, gain_state = self.dac.get_state(gain=True)
+        self.__dac_gain = CalibConst.DAC_GAIN_FACTOR.value if gain_state else 1
+        channel_frames = self.__channel_frames()
+        ticks = zip(*[
+            itertools.cycle(frames) if self.loop and isinstance(frames, list) else frames
+            for frames in channel_frames
+        ])
+        self.dac.enable_outputs(list(self.waveforms))
+
+        self.stats = PlaybackStats()
+        self.__ticks = ticks
+        self._start_thread(self.sample_rate, "WaveformPlayer")
+
+    def _session(self):
+        return self.dac.spi_open()
+
+    def _iterate(self, deadline_ns: int) -> int:
+        """Write the frames of the next sample, None at the end of the waveforms"""
+        frames = next(self.__ticks, None)
+        if frames is None:
+            return None
+        transfer = self.dac.transfer
+        for frame in frames:
+            transfer(frame)
+        end_ns = time.perf_counter_ns()
+        self.stats.record(max(end_ns - deadline_ns, 0))
+        return end_ns
+
+    def _overrun(self, lateness_ns: int):
+        self.stats.underruns += 1
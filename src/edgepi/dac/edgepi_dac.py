@@ -5,6 +5,7 @@ Module for interacting with the EdgePi DAC via SPI.
 
 import logging
 from edgepi.dac.dac_commands import DACCommands
+from edgepi.dac.dac_snapshot import DACSnapshot
 from edgepi.dac.dac_constants import (
     NULL_BITS,
     NUM_PINS,
@@ -22,6 +23,8 @@ from edgepi.peripherals.spi import SpiDevice as spi
 from edgepi.gpio.gpio_constants import GpioPins
 from edgepi.gpio.edgepi_gpio import EdgePiGPIO
 from edgepi.eeprom.edgepi_eeprom import EdgePiEEPROM
+from edgepi.eeprom.edgepi_eeprom_data import EepromDataClass
+from edgepi.utilities.tracing import traced
 
 class EdgePiDAC(spi):
     """A EdgePi DAC device"""
@@ -52,18 +55,25 @@ class EdgePiDAC(spi):
 
 
 
-    def __init__(self):
+    def __init__(self, gpio: EdgePiGPIO = None, eeprom_data: EepromDataClass = None):
+        """
+        Args:
+            `gpio` (EdgePiGPIO): GPIO manager shared with other modules, created if None
+
+            `eeprom_data` (EepromDataClass): calibration data already read from the EEPROM,
+                read if None
+        """
         self.log = logging.getLogger(__name__)
         self.log.info("Initializing DAC Bus")
         super().__init__(bus_num=6, dev_id=3, mode=1, max_speed=1000000)
 
         # Read edgepi reserved data and generate calibration parameter dictionary
-        eeprom = EdgePiEEPROM()
-        eeprom_data  = eeprom.read_edgepi_data()
+        if eeprom_data is None:
+            eeprom_data = EdgePiEEPROM().read_edgepi_data()
         dac_calib_params = eeprom_data.dac_calib_params.extract_ch_dict()
 
         self.dac_ops = DACCommands(dac_calib_params)
-        self.gpio = EdgePiGPIO()
+        self.gpio = gpio if gpio is not None else EdgePiGPIO()
 
         self.__dac_power_state = {
             DACChannel.AOUT8.value: PowerMode.NORMAL.value,
@@ -76,7 +86,100 @@ class EdgePiDAC(spi):
             DACChannel.AOUT1.value: PowerMode.NORMAL.value,
         }
 
+        # DAC_GAIN pin state and routing state of each channel, formatted as
+        # {A/D_OUT pin number: state}, last read or written by this object, valid while the
+        # GPIO expander generation is unchanged. None is unknown.
+        self.__gain_state = None
+        self.__output_states = {}
+        self.__expander_generation = None
+
+    def __sync_expander_state(self):
+        """
+        Forget the cached gain and routing states if the GPIO expander was written by another
+        object since they were read, such as the digital output and PWM modules, or another
+        process. States are never cached if the expander generation is not shared.
+        """
+        generation = self.gpio.expander_generation
+        if generation is None or generation != self.__expander_generation:
+            self.__gain_state = None
+            self.__output_states = {}
+            self.__expander_generation = generation
+
+    def __record_expander_writes(self, output_states: dict = None, gain_state: bool = None):
+        """
+        Update the cached states after this object wrote the GPIO expander
+
+        Args:
+            `output_states` (dict): routing states written, formatted as
+                {A/D_OUT pin number: state}
+            `gain_state` (bool): DAC_GAIN state written, None if not written
+        """
+        self.__output_states.update(output_states or {})
+        if gain_state is not None:
+            self.__gain_state = gain_state
+        # the writes incremented the generation, while the cached states, synced before the
+        # writes, are still valid
+        self.__expander_generation = self.gpio.expander_generation
+
+    def __get_routing_pins(self, analog_out: int) -> tuple:
+        """
+        Expander pins routing a DAC channel to its analog out pin. The digital out and PWM
+        enable pins have the same state whether the channel is connected or not, while the
+        analog enable pin is high when connected and low when disconnected.
+
+        Args:
+            `analog_out` (int): A/D_OUT pin number
+
+        Returns:
+            `tuple`: states of the digital out and PWM enable pins, formatted as
+                {pin name: (is_high, is_input)}, and the name of the analog enable pin
+        """
+        pins = {self.__analog_to_digital_pin_map[analog_out].value: (False, False)}
+        if analog_out in [DACChannel.AOUT1.value, DACChannel.AOUT2.value]:
+            pwm_en = GpioPins.PWM1 if analog_out == DACChannel.AOUT1.value else GpioPins.PWM2
+            pins[pwm_en.value] = (True, False)
+        return pins, self.__analog_out_pin_map[analog_out].value
+
+    def __read_output_states(self, analog_outs: list) -> dict:
+        """
+        Routing states of DAC channels. States which are not cached are read back from the GPIO
+        expander, with a single I2C session.
+
+        Args:
+            `analog_outs` (list): A/D_OUT pin numbers
+
+        Returns:
+            `dict`: states formatted as {A/D_OUT pin number: state}, where state is True if
+                connected, False if disconnected, and None if the pins are in neither state
+        """
+        self.__sync_expander_state()
+        routing = {
+            analog_out: self.__get_routing_pins(analog_out)
+            for analog_out in analog_outs
+            if analog_out not in self.__output_states
+        }
+        if not routing:
+            return {analog_out: self.__output_states[analog_out] for analog_out in analog_outs}
+        pin_names = []
+        for pins, ao_pin in routing.values():
+            pin_names += list(pins) + [ao_pin]
+        pin_states = self.gpio.read_expander_pin_states(pin_names)
+        output_states = {}
+        for analog_out, (pins, ao_pin) in routing.items():
+            output_states[analog_out] = None
+            if all(pin_states[pin] == state for pin, state in pins.items()):
+                is_high, is_input = pin_states[ao_pin]
+                if not is_input:
+                    output_states[analog_out] = is_high
+        self.__output_states.update(output_states)
+        return {analog_out: self.__output_states[analog_out] for analog_out in analog_outs}
+
     def __send_to_gpio_pins(self, analog_out: int, voltage: float):
+        if voltage < 0:
+            raise ValueError("voltage cannot be negative")
+        # pins only change on 0 V <-> non-zero voltage transitions
+        if self.__read_output_states([analog_out])[analog_out] == (voltage > 0):
+            return
         ao_pin = self.__analog_out_pin_map[analog_out].value
         do_pin = self.__analog_to_digital_pin_map[analog_out].value
         if voltage > 0:
@@ -90,8 +193,7 @@ class EdgePiDAC(spi):
             self.gpio.set_pin_state(ao_pin)
             self.gpio.clear_pin_state(do_pin)
             self.gpio.clear_pin_state(ao_pin)
-        else:
-            raise ValueError("voltage cannot be negative")
+        self.__record_expander_writes(output_states={analog_out: voltage > 0})
 
     def __dac_switching_logic(self, analog_out: int):
         """
@@ -106,6 +208,7 @@ class EdgePiDAC(spi):
         self.gpio.set_pin_state(pwm_en.value)
 
     # TODO: Decimal instead of float for precision testing
+    @traced(category="dac")
     def write_voltage(self, analog_out: DACChannel, voltage: float):
         """
         Write a voltage value to an analog out pin. Voltage will be continuously
@@ -132,6 +235,102 @@ class EdgePiDAC(spi):
         self.__send_to_gpio_pins(analog_out.value, voltage)
         return code
 
+    @traced(category="dac")
+    def write_voltages(self, voltages: dict) -> dict:
+        """
+        Write voltage values to several analog out pins at once. All channels are written in a
+        single SPI session, one frame right after the other, so the outputs change within a few
+        microseconds of each other. The analog out and digital out pin changes of all channels
+        are then applied together, with one GPIO expander write per port, and a second write
+        for the channels switched to 0 V.
+
+        Args:
+            `voltages` (dict): voltages to write, formatted as {DACChannel: voltage (V)}
+
+        Returns:
+            `dict`: code written to each channel, formatted as {DACChannel: code}
+
+        Raises:
+            `ValueError`: if a voltage is out of range, in which case no voltage is written
+        """
+        dac_gain = CalibConst.DAC_GAIN_FACTOR.value if self.__get_gain_state() else 1
+        codes = {}
+        for analog_out, voltage in voltages.items():
+            self.dac_ops.check_range(analog_out.value, 0, NUM_PINS-1)
+            self.dac_ops.check_range(voltage, 0, (UPPER_LIMIT*dac_gain))
+            codes[analog_out] = self.dac_ops.voltage_to_code(analog_out.value, voltage, dac_gain)
+        self.log.debug(f'Codes: {codes}')
+
+        # update DAC registers
+        with self.spi_open():
+            for analog_out, code in codes.items():
+                self.transfer(
+                    self.dac_ops.generate_write_and_update_command(analog_out.value, code)
+                )
+
+        # send voltages to analog out pins
+        self.__set_output_states({
+            analog_out: voltage > 0 for analog_out, voltage in voltages.items()
+        })
+        return codes
+
+    def __set_output_states(self, output_states: dict):
+        """
+        Connect or disconnect DAC channels from their analog out pins, with a single GPIO
+        update for the channels whose state changes, and a second one clearing AO_EN of the
+        channels being disconnected
+
+        Args:
+            `output_states` (dict): states formatted as {DACChannel: True to connect}
+        """
+        current_states = self.__read_output_states(
+            [analog_out.value for analog_out in output_states]
+        )
+        pin_states, disconnect_states, changed_states = {}, {}, {}
+        for analog_out, enable in output_states.items():
+            if current_states[analog_out.value] != enable:
+                changed_states[analog_out.value] = enable
+                # like write_voltage, a channel is disconnected by setting AO_EN and clearing
+                # DOUT first, then clearing AO_EN
+                pin_states.update(self.__get_output_pin_states(analog_out, True))
+                if not enable:
+                    disconnect_states[self.__analog_out_pin_map[analog_out.value].value] = False
+        if pin_states:
+            self.gpio.set_pin_states(pin_states)
+        if disconnect_states:
+            self.gpio.set_pin_states(disconnect_states)
+        if changed_states:
+            self.__record_expander_writes(output_states=changed_states)
+
+    def __get_output_pin_states(self, analog_out: DACChannel, enable: bool) -> dict:
+        """
+        Pin states routing a DAC channel to its analog out pin, formatted as {pin name: state}
+
+        Args:
+            `analog_out` (DACChannel): A/D_OUT pin to route
+            `enable` (bool): True to connect the DAC channel to the pin, False to disconnect it
+        """
+        pin_states = {}
+        if analog_out in (DACChannel.AOUT1, DACChannel.AOUT2):
+            pwm_en = GpioPins.PWM1 if analog_out == DACChannel.AOUT1 else GpioPins.PWM2
+            pin_states[pwm_en.value] = True
+        pin_states[self.__analog_out_pin_map[analog_out.value].value] = enable
+        pin_states[self.__analog_to_digital_pin_map[analog_out.value].value] = False
+        return pin_states
+
+    @traced(category="dac")
+    def enable_outputs(self, analog_outs: list):
+        """
+        Connect DAC channels to their analog out pins, as writing a non-zero voltage does,
+        without changing the DAC registers. Outputs stay connected when 0 V is written to them
+        with a `WaveformPlayer`, but not with `write_voltage`.
+
+        Args:
+            `analog_outs` (list): A/D_OUT pins to connect
+        """
+        self.__set_output_states({analog_out: True for analog_out in analog_outs})
+
+    @traced(category="dac")
     def set_power_mode(self, analog_out: DACChannel, power_mode: PowerMode):
         """
         Set power mode for individual DAC channels to either normal power consumption,
@@ -151,6 +350,7 @@ class EdgePiDAC(spi):
         with self.spi_open():
             self.transfer(cmd)
 
+    @traced(category="dac")
     def reset(self):
         """
         Performs a software reset of the EdgePi DAC to power-on default values,
@@ -160,6 +360,7 @@ class EdgePiDAC(spi):
         with self.spi_open():
             self.transfer(cmd)
 
+    @traced(category="dac")
     def channel_readback(self, analog_out: DACChannel) -> int:
         """
         Readback the input register of DAC.
@@ -184,6 +385,7 @@ class EdgePiDAC(spi):
         return self.dac_ops.extract_read_data(read_data)
 
 
+    @traced(category="dac")
     def compute_expected_voltage(self, analog_out: DACChannel) -> float:
         """
         Computes expected voltage from the DAC channel corresponding to analog out pin.
@@ -202,6 +404,53 @@ class EdgePiDAC(spi):
         dac_gain = CalibConst.DAC_GAIN_FACTOR.value if self.__get_gain_state() else 1
         return self.dac_ops.code_to_voltage(analog_out.value, code, dac_gain)
 
+    def __read_all_codes(self) -> dict:
+        """
+        Readback the input registers of all DAC channels in one SPI session. A readback
+        command's data is clocked out during the next transfer, so each channel's readback
+        command also fetches the previous channel's code, and a final all zero transfer fetches
+        the last.
+
+        Return:
+            (dict): code value of each channel, formatted as {DACChannel: code}
+        """
+        channels = list(DACChannel)
+        read_data = []
+        with self.spi_open():
+            self.transfer(
+                self.dac_ops.combine_command(COM.COM_READBACK.value, channels[0].value, NULL_BITS)
+            )
+            for ch in channels[1:]:
+                read_data.append(self.transfer(
+                    self.dac_ops.combine_command(COM.COM_READBACK.value, ch.value, NULL_BITS)
+                ))
+            read_data.append(self.transfer([NULL_BITS, NULL_BITS, NULL_BITS]))
+        self.log.debug(f"reading codes {read_data}")
+        return {
+            ch: self.dac_ops.extract_read_data(data) for ch, data in zip(channels, read_data)
+        }
+
+    @traced(category="dac")
+    def get_snapshot(self) -> DACSnapshot:
+        """
+        Read the codes of all DAC channels in one SPI session and the gain pin once, and
+        compute each channel's expected voltage. Equivalent to calling `get_state` with `code`,
+        `voltage` and `gain` for every channel, with 9 SPI transfers in one session and one gain
+        read instead of 32 transfers in 16 sessions and 8 gain reads.
+
+        Returns:
+            `DACSnapshot`: gain state, codes and expected voltages of all channels
+        """
+        gain_state = self.__get_gain_state(override_cache=True)
+        dac_gain = CalibConst.DAC_GAIN_FACTOR.value if gain_state else 1
+        codes = self.__read_all_codes()
+        voltages = {
+            ch: self.dac_ops.code_to_voltage(ch.value, code, dac_gain)
+            for ch, code in codes.items()
+        }
+        self.log.debug(f":get_snapshot: codes {codes}, expected {voltages}, gain {gain_state}")
+        return DACSnapshot(gain_state=gain_state, codes=codes, voltages=voltages)
+
     def __compute_code_val(self, set_gain: bool, code: int = None):
         """
         Modify code value depending on the enable flag
@@ -267,6 +516,7 @@ class EdgePiDAC(spi):
                     # update DAC register
                     self.transfer(self.dac_ops.generate_write_and_update_command(ch, code))
 
+    @traced(category="dac")
     def set_dac_gain(self, set_gain: bool, auto_code_change: bool = False):
         """
         Enable/Disable internal DAC gain.
@@ -287,23 +537,26 @@ class EdgePiDAC(spi):
         else:
             self.gpio.set_pin_state(GainPin.DAC_GAIN.value) if set_gain else \
             self.gpio.clear_pin_state(GainPin.DAC_GAIN.value)
+        self.__record_expander_writes(gain_state=set_gain)
         return self.__get_gain_state()
 
-    def __get_gain_state(self):
+    def __get_gain_state(self, override_cache: bool = False):
         """
-        Retrieve the internal gain state by reading the expander pin
+        Retrieve the internal gain state, reading the expander pin only if the state is not
+        cached, or the expander was written by another object since it was read
         Args:
-            N/A
+            override_cache (bool): read the expander pin even if the state is cached
         Return:
             gain_state (bool): True - gain enalbed, False - gain disabled
         """
-
-        pin_state = self.gpio.read_pin_state(GainPin.DAC_GAIN.value)
-        pin_dir = self.gpio.get_pin_direction(GainPin.DAC_GAIN.value)
-        if pin_state and not pin_dir:
-            return True
-        return False
-
+        self.__sync_expander_state()
+        if self.__gain_state is None or override_cache:
+            pin_state = self.gpio.read_pin_state(GainPin.DAC_GAIN.value)
+            pin_dir = self.gpio.get_pin_direction(GainPin.DAC_GAIN.value)
+            self.__gain_state = bool(pin_state and not pin_dir)
+        return self.__gain_state
+
+    @traced(category="dac")
     def get_state(self, analog_out: DACChannel = None,
                         code: bool = None,
                         voltage: bool = None,
@@ -326,7 +579,7 @@ class EdgePiDAC(spi):
         """
         code_val = self.channel_readback(analog_out) if code else None
         voltage_val = self.compute_expected_voltage(analog_out) if voltage else None
-        gain_state = self.__get_gain_state() if gain else None
+        gain_state = self.__get_gain_state(override_cache=True) if gain else None
         self.log.debug(f":get_state: state of {analog_out} code {code_val},"
                        f"expected {voltage_val}, dac_gain {gain_state}")
         return code_val, voltage_val, gain_state
@@ -10,9 +10,13 @@ class InvalidPinName(Exception):
 
 class EdgePiDigitalInput():
     """handling reading of digital inputs"""
-    def __init__(self):
+    def __init__(self, gpio: EdgePiGPIO = None):
+        """
+        Args:
+            gpio (EdgePiGPIO): GPIO manager shared with other modules, created if None
+        """
         # To limit access to input functionality, using composition rather than inheritance
-        self.gpio = EdgePiGPIO()
+        self.gpio = gpio if gpio is not None else EdgePiGPIO()
 
     def digital_input_state(self, pin_name: Optional[DinPins] = None):
         """
@@ -2,6 +2,7 @@
 """Digital Output Module"""
 
 import time
+from typing import Callable
 
 from edgepi.dac.edgepi_dac import EdgePiDAC
 from edgepi.dac.dac_constants import DACChannel as Ch
@@ -35,10 +36,31 @@ class EdgePiDigitalOutput():
         DoutPins.DOUT7 : Ch.AOUT7,
         DoutPins.DOUT8 : Ch.AOUT8,
     }
-    def __init__(self):
+    def __init__(self, gpio: EdgePiGPIO = None, dac_factory: Callable[[], EdgePiDAC] = None):
+        """
+        Args:
+            gpio (EdgePiGPIO): GPIO manager shared with other modules, created if None
+            dac_factory (Callable): returns the DAC to use for tri-state, called when the DAC
+                is first needed. Defaults to creating an `EdgePiDAC` sharing `gpio`.
+        """
         # To limit access to input functionality, using composition rather than inheritance
-        self.gpio = EdgePiGPIO()
-        self.dac = EdgePiDAC()
+        self.gpio = gpio if gpio is not None else EdgePiGPIO()
+        # the DAC is only needed for tri-state, and reads the EEPROM when created
+        self.__dac = None
+        self.__dac_factory = (
+            dac_factory if dac_factory is not None else lambda: EdgePiDAC(gpio=self.gpio)
+        )
+
+    @property
+    def dac(self) -> EdgePiDAC:
+        """DAC used to zero analog outputs before switching them to tri-state, created on use"""
+        if self.__dac is None:
+            self.__dac = self.__dac_factory()
+        return self.__dac
+
+    @dac.setter
+    def dac(self, dac: EdgePiDAC):
+        self.__dac = dac
 
     def set_dout_state(self, pin_name: DoutPins = None, state: DoutTriState = None):
         """
@@ -71,6 +93,44 @@ class EdgePiDigitalOutput():
         else:
             raise ValueError(f'Invalid state passed: {state}')
 
+    def set_dout_states(self, pin_states: dict):
+        """
+        Change the output states of several pins at once. The switching sequence of
+        `set_dout_state` is applied to all pins together, each step being a single GPIO
+        expander write per port: analog enables set, digital outputs written, a single delay if
+        any pin is switched low, analog enables cleared, then tri-state pins set to input.
+        Args:
+            pin_states (dict): states formatted as {DoutPins: DoutTriState}
+        """
+        for pin_name, state in pin_states.items():
+            if pin_name is None or pin_name.value not in [pins.value for pins in DoutPins]:
+                raise InvalidPinName(f'Invalid pin name passed: {pin_name}')
+            if not isinstance(state, DoutTriState):
+                raise ValueError(f'Invalid state passed: {state}')
+        if not pin_states:
+            return
+        hi_z_pins = [pin for pin, state in pin_states.items() if state == DoutTriState.HI_Z]
+        if hi_z_pins:
+            # set dac to 0V before tri-stating its outputs
+            self.dac.write_voltages({self._dout_dac_pair[pin]: 0 for pin in hi_z_pins})
+
+        self.gpio.set_pin_states(
+            {self._dout_aout_pair[pin].value: True for pin in pin_states}
+        )
+        self.gpio.set_pin_states(
+            {pin.value: state == DoutTriState.HIGH for pin, state in pin_states.items()}
+        )
+        if DoutTriState.LOW in pin_states.values():
+            time.sleep(0.05)
+        aout_clears = {
+            self._dout_aout_pair[pin].value: False
+            for pin, state in pin_states.items() if state != DoutTriState.HI_Z
+        }
+        if aout_clears:
+            self.gpio.set_pin_states(aout_clears)
+        if hi_z_pins:
+            self.gpio.set_pin_directions_in([pin.value for pin in hi_z_pins])
+
     def get_state(self, pin_name: DoutPins = None):
         """
         Get the current state of the specified pin
@@ -22,6 +22,7 @@ from edgepi.eeprom.eeprom_constants import (
 from edgepi.eeprom.edgepi_eeprom_data import EepromDataClass
 from edgepi.eeprom.protobuf_assets.generated_pb2 import edgepi_module_pb2
 from edgepi.peripherals.i2c import I2CDevice
+from edgepi.utilities.tracing import traced
 
 class PermissionDenied(Exception):
     """Raised when permission is denied to perform an operation"""
@@ -158,6 +159,7 @@ class EdgePiEEPROM(I2CDevice):
                 time.sleep(0.01)
         return bytes(buff[2:buff_and_len])
 
+    @traced(category="eeprom")
     def read_edgepi_data(self) -> EepromDataClass:
         """
         Read Edgepi reserved memory space and populate dataclass
@@ -171,6 +173,7 @@ class EdgePiEEPROM(I2CDevice):
         eeprom_data = EepromDataClass.extract_eeprom_data(self.eeprom_pb)
         return eeprom_data
 
+    @traced(category="eeprom")
     def write_edgepi_data(self, eeprom_data: EepromDataClass):
         """
         Write EdgePi reserved memory space using the populated dataclass
@@ -184,6 +187,7 @@ class EdgePiEEPROM(I2CDevice):
         eeprom_data.populate_eeprom_module(self.eeprom_pb)
         self.__write_edgepi_reserved_memory(self.eeprom_pb.SerializeToString())
 
+    @traced(category="eeprom")
     def __sequential_read(self, mem_addr: int = None, length: int = None):
         '''
         Read operation reads the specified number of memory location starting from provided address.
@@ -203,6 +207,7 @@ class EdgePiEEPROM(I2CDevice):
         self.log.debug(f'__sequential_read: Read data: {len(msg[1].data)}')
         return read_result
 
+    @traced(category="eeprom")
     def __page_write_register(self, mem_addr: int = None, data: list = None):
         '''
         Write operation writes a page of data to the specified address
@@ -276,6 +281,7 @@ class EdgePiEEPROM(I2CDevice):
         self.log.debug(f"__generate_list_of_pages_crc: {number_of_pages} pages generated")
         return pages
 
+    @traced(category="eeprom")
     def read_user_space(self, mem_size: int = None):
         """
         Read user space memory starting from 0 to 16383
@@ -303,6 +309,7 @@ class EdgePiEEPROM(I2CDevice):
                 buff+=buff_list[:-1]
         return buff[2:buff_and_len]
 
+    @traced(category="eeprom")
     def write_user_space(self, data: bytes):
         """
         Writes data to the eeprom
@@ -327,6 +334,7 @@ class EdgePiEEPROM(I2CDevice):
                 mem_offset = mem_offset+len(page)
 
 # TODO why not separate it into a class
+    @traced(category="eeprom")
     def init_memory(self):
         """
         Initial Memory Reading
@@ -371,6 +379,7 @@ class EdgePiEEPROM(I2CDevice):
 
         return is_full, is_empty
 
+    @traced(category="eeprom")
     def reset_user_space(self):
         """
         Reset User space memory
@@ -393,6 +402,7 @@ class EdgePiEEPROM(I2CDevice):
                 self.__page_write_register(mem_offset, reset_vals)
                 mem_offset = mem_offset+page_size
 
+    @traced(category="eeprom")
     def reset_edgepi_memory(self, bin_hash: str = None, bin_bytes: bytes = None):
         """
         reset edgepi reserved memory by reading default binary files. In order to trigger this
@@ -78,6 +78,25 @@ class EdgePiGPIO(EdgePiGPIOExpander, EdgePiGPIOChip):
         if pin_name in self.gpiochip_pins_dict:
             self.write_gpio_pin_state(pin_name, False)
 
+    def set_pin_states(self, pin_states: dict):
+        """
+        Set the states of several pins at once, updating each GPIO expander port register
+        involved with a single write
+        Args:
+            pin_states (dict): pin names to states, True for high and False for low
+        return:
+            N/A
+        """
+        expander_states = {}
+        for pin_name, state in pin_states.items():
+            self.__pin_name_check(pin_name)
+            if pin_name in self.expander_pin_dict:
+                expander_states[pin_name] = state
+            if pin_name in self.gpiochip_pins_dict:
+                self.write_gpio_pin_state(pin_name, state)
+        if expander_states:
+            self.set_expander_pin_states(expander_states)
+
     def get_pin_direction(self, pin_name: str = None):
         """
         Get GPIO pin direction
@@ -108,6 +127,25 @@ class EdgePiGPIO(EdgePiGPIOExpander, EdgePiGPIOChip):
         if pin_name in self.gpiochip_pins_dict:
             self.set_gpio_pin_dir(pin_name, True)
 
+    def set_pin_directions_in(self, pin_names: list):
+        """
+        Set the directions of several pins to input at once, updating each GPIO expander
+        configuration port register involved with a single write
+        Args:
+            pin_names (list): names of the pins
+        Return:
+            N/A
+        """
+        expander_pins = []
+        for pin_name in pin_names:
+            self.__pin_name_check(pin_name)
+            if pin_name in self.expander_pin_dict:
+                expander_pins.append(pin_name)
+            if pin_name in self.gpiochip_pins_dict:
+                self.set_gpio_pin_dir(pin_name, True)
+        if expander_pins:
+            self.set_expander_pin_directions_in(expander_pins)
+
     def set_pin_direction_out(self, pin_name: str = None):
         """
         Set GPIO pin direction to output
@@ -4,9 +4,11 @@ Provides a class for interacting with the GPIO pins through I2C and GPIO periphe
 
 
 import logging
+from typing import Optional
 from edgepi.gpio.gpio_configs import generate_expander_pin_info
 from edgepi.gpio.gpio_constants import GpioDevPaths
 from edgepi.peripherals.i2c import I2CDevice
+from edgepi.peripherals.ipc import SharedRegisterShadow
 from edgepi.reg_helper.reg_helper import OpCode, apply_opcodes, is_bit_set
 
 _logger = logging.getLogger(__name__)
@@ -18,11 +20,43 @@ class EdgePiGPIOExpander(I2CDevice):
     This class will be imported to each module that requires GPIO manipulation.
     It is not intended for users.
     '''
+    # counts the expander register writes of all processes, False if it cannot be opened
+    __write_counter = None
+
     def __init__(self):
         super().__init__(GpioDevPaths.I2C_DEV_PATH.value)
         # get this device's expander pin names and opcodes for set, clear, direction ops
         self.expander_pin_dict = generate_expander_pin_info()
 
+    @staticmethod
+    def __get_write_counter():
+        '''
+        Get the expander write counter shared between processes, a register shadow holding no
+        registers, whose generation is incremented by each write
+
+        Returns:
+            `SharedRegisterShadow`: the shared write counter, or None if it cannot be opened
+        '''
+        if EdgePiGPIOExpander.__write_counter is None:
+            try:
+                EdgePiGPIOExpander.__write_counter = SharedRegisterShadow("gpio-expander", 0)
+            except OSError as exc:
+                _logger.warning(f"Failed to open shared GPIO expander write counter: {exc}")
+                EdgePiGPIOExpander.__write_counter = False
+        return EdgePiGPIOExpander.__write_counter or None
+
+    @property
+    def expander_generation(self) -> Optional[int]:
+        '''
+        Number of expander register writes made by any object of any process. Pin states
+        read from the expander are still valid while the generation is unchanged.
+
+        Returns:
+            `int`: the write count, None if it is not shared and pin states cannot be cached
+        '''
+        write_counter = self.__get_write_counter()
+        return write_counter.generation if write_counter is not None else None
+
     def __read_register(self, reg_address: int, dev_address: int) -> int:
         '''
         function to read one register value from an I2C device
@@ -51,12 +85,16 @@ class EdgePiGPIOExpander(I2CDevice):
         Returns:
             void
         '''
+        write_counter = self.__get_write_counter()
         with self.i2c_open():
             for reg_addx, entry in reg_dict.items():
                 if entry['is_changed']:
                     msg_write = self.set_write_msg(reg_addx, [entry['value']])
                     _logger.debug(f'Write Message Content {msg_write[0]}')
                     self.transfer(dev_address, msg_write)
+                    # pin states other objects read before this write are now stale
+                    if write_counter is not None:
+                        write_counter.write({})
 
     def read_expander_pin(self, pin_name: str) -> bool:
         '''
@@ -79,6 +117,45 @@ class EdgePiGPIOExpander(I2CDevice):
 
         return pin_state
 
+    def read_expander_pin_states(self, pin_names: list = None) -> dict:
+        '''
+        Get the current states and directions of several GPIO expander pins at once. Each
+        output and configuration port register involved is read once, in a single I2C session.
+
+        Args:
+            `pin_names` (list): names of the pins to read, all expander pins if None
+
+        Returns:
+            `dict`: (state, direction) of each pin, formatted as {pin_name: (bool, bool)}, where
+                state is True if high and direction is True if input
+        '''
+        if pin_names is None:
+            pin_names = list(self.expander_pin_dict)
+        registers = set()
+        for pin_name in pin_names:
+            pin_info = self.expander_pin_dict[pin_name]
+            registers.add((pin_info.address, pin_info.set_code.reg_address))
+            registers.add((pin_info.address, pin_info.dir_out_code.reg_address))
+
+        reg_vals = {}
+        with self.i2c_open():
+            for dev_address, reg_addx in sorted(registers):
+                msg_read = self.set_read_msg(reg_addx, [0xFF])
+                self.transfer(dev_address, msg_read)
+                reg_vals[(dev_address, reg_addx)] = msg_read[1].data[0]
+
+        pin_states = {}
+        for pin_name in pin_names:
+            pin_info = self.expander_pin_dict[pin_name]
+            out_val = reg_vals[(pin_info.address, pin_info.set_code.reg_address)]
+            dir_val = reg_vals[(pin_info.address, pin_info.dir_out_code.reg_address)]
+            pin_states[pin_name] = (
+                bool(is_bit_set(out_val, pin_info.set_code.op_mask)),
+                bool(is_bit_set(dir_val, pin_info.dir_out_code.op_mask)),
+            )
+        _logger.debug(":read_expander_pin_states: pins = '%s'", pin_states)
+        return pin_states
+
     def get_expander_pin_direction(self, pin_name: str) -> bool:
         '''
         Get the current direction of a GPIO expander pin (low or high).
@@ -166,6 +243,63 @@ class EdgePiGPIOExpander(I2CDevice):
 
         self.expander_pin_dict[pin_name].is_high = True
 
+    def set_expander_pin_states(self, pin_states: dict):
+        '''
+        Set the states of several GPIO expander pins at once. Each port register involved is
+        read once and written at most once, instead of once per pin. Pins configured as inputs
+        are set to outputs after their output states are written.
+
+        Args:
+            `pin_states` (dict): pin names to states, True for high and False for low
+        '''
+        out_codes, dir_codes = {}, {}
+        for pin_name, state in pin_states.items():
+            pin_info = self.expander_pin_dict[pin_name]
+            code = pin_info.set_code if state else pin_info.clear_code
+            out_codes.setdefault((pin_info.address, code.reg_address), []).append(code)
+            dir_codes.setdefault(
+                (pin_info.address, pin_info.dir_out_code.reg_address), []
+            ).append(pin_info.dir_out_code)
+
+        for (dev_address, reg_addx), codes in out_codes.items():
+            reg_val = self.__read_register(reg_addx, dev_address)
+            self.__write_changed_values(apply_opcodes({reg_addx: reg_val}, codes), dev_address)
+
+        for (dev_address, reg_addx), codes in dir_codes.items():
+            reg_val = self.__read_register(reg_addx, dev_address)
+            # only input pins need a direction change
+            codes = [code for code in codes if is_bit_set(reg_val, code.op_mask)]
+            if codes:
+                self.__write_changed_values(apply_opcodes({reg_addx: reg_val}, codes), dev_address)
+
+        for pin_name, state in pin_states.items():
+            self.expander_pin_dict[pin_name].is_out = True
+            self.expander_pin_dict[pin_name].is_high = bool(state)
+        _logger.debug(":set_expander_pin_states: pins set to '%s'", pin_states)
+
+    def set_expander_pin_directions_in(self, pin_names: list):
+        '''
+        Set the directions of several GPIO expander pins to high impedance input at once. Each
+        configuration port register involved is read and written once.
+
+        Args:
+            `pin_names` (list): names of the pins whose direction to set
+        '''
+        dir_codes = {}
+        for pin_name in pin_names:
+            pin_info = self.expander_pin_dict[pin_name]
+            dir_codes.setdefault(
+                (pin_info.address, pin_info.dir_in_code.reg_address), []
+            ).append(pin_info.dir_in_code)
+
+        for (dev_address, reg_addx), codes in dir_codes.items():
+            reg_val = self.__read_register(reg_addx, dev_address)
+            self.__write_changed_values(apply_opcodes({reg_addx: reg_val}, codes), dev_address)
+
+        for pin_name in pin_names:
+            self.expander_pin_dict[pin_name].is_out = False
+        _logger.debug(":set_expander_pin_directions_in: pins '%s' set to input", pin_names)
+
     def __apply_code_to_register(self, dev_addx: int, reg_addx: int, reg_val: int, opcode: OpCode):
         """
         Applies an opcode obtained from I2CPinInfo object to a register.
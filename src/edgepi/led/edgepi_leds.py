@@ -17,8 +17,12 @@ class InvalidLEDNameError(Exception):
 class EdgePiLED:
     """Interact with the EdgePi LED Array"""
 
-    def __init__(self):
-        self.gpio_ops = EdgePiGPIO()
+    def __init__(self, gpio: EdgePiGPIO = None):
+        """
+        Args:
+            `gpio` (EdgePiGPIO): GPIO manager shared with other modules, created if None
+        """
+        self.gpio_ops = gpio if gpio is not None else EdgePiGPIO()
         self.log = logging.getLogger(__name__)
 
     @staticmethod
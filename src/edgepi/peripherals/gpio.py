@@ -2,13 +2,16 @@
 Module for GPIO devices
 """
 
-import threading
+import time
 from contextlib import contextmanager
 from periphery import GPIO
+from edgepi.peripherals.ipc import BusLock
+from edgepi.peripherals.io_stats import IO_STATS, acquire_lock, release_lock
 
 class GpioDevice:
     """Class for representing a GPIO device"""
-    lock_gpio=threading.Lock()
+    # gpiochip lock, shared between threads and processes
+    lock_gpio=BusLock("gpio")
     def __init__(self, dev_path: str = None):
         self.gpio_fd = dev_path
         self.gpio = None
@@ -22,8 +25,9 @@ class GpioDevice:
             pin_dir (str): pin direction
             pin_bias (str): bias direction
         """
+        stats = IO_STATS.device("gpio", self.gpio_fd)
+        acquired_ns = acquire_lock(GpioDevice.lock_gpio, stats)
         try:
-            GpioDevice.lock_gpio.acquire()
             self.gpio = GPIO(self.gpio_fd, pin_num, pin_dir, bias=pin_bias)
             yield self.gpio
         finally:
@@ -32,7 +36,7 @@ class GpioDevice:
             except Exception as exc:
                 raise OSError(f"Failed to close {self.gpio_fd}") from exc
             finally:
-                GpioDevice.lock_gpio.release()
+                release_lock(GpioDevice.lock_gpio, stats, acquired_ns)
 
     def read_state(self) -> bool:
         """
@@ -42,17 +46,26 @@ class GpioDevice:
         Return:
             bool: True if high else False
         """
-        return self.gpio.read()
+        stats = IO_STATS.device("gpio", self.gpio_fd)
+        if stats is None:
+            return self.gpio.read()
+        start_ns = time.perf_counter_ns()
+        state = self.gpio.read()
+        stats.record_transaction(time.perf_counter_ns() - start_ns)
+        return state
 
     def open_read_state(self, pin_num:int, pin_dir:str, pin_bias:str) -> bool:
         """
         To minimize issues with the lock, we open & read in a single function call
         """
+        stats = IO_STATS.device("gpio", self.gpio_fd)
+        acquired_ns = acquire_lock(GpioDevice.lock_gpio, stats)
         try:
-            # pylint: disable=consider-using-with
-            GpioDevice.lock_gpio.acquire()
             gpio   = GPIO(self.gpio_fd, pin_num, pin_dir, bias=pin_bias)
+            start_ns = time.perf_counter_ns()
             result = gpio.read()
+            if stats is not None:
+                stats.record_transaction(time.perf_counter_ns() - start_ns)
 
         finally:
             try:
@@ -60,7 +73,7 @@ class GpioDevice:
             except Exception as exc:
                 raise OSError(f"Failed to close {self.gpio_fd}") from exc
             finally:
-                GpioDevice.lock_gpio.release()
+                release_lock(GpioDevice.lock_gpio, stats, acquired_ns)
 
         return result
 
@@ -76,9 +89,9 @@ class GpioDevice:
         just a single time.
         """
         results = []
+        stats = IO_STATS.device("gpio", self.gpio_fd)
+        acquired_ns = acquire_lock(GpioDevice.lock_gpio, stats)
         try:
-            # pylint: disable=consider-using-with
-            GpioDevice.lock_gpio.acquire()
             gpio = None
             try:
                 # Performance Notes:
@@ -99,7 +112,10 @@ class GpioDevice:
                         gpio._reopen(
                             pin_dir, edge="none", bias=pin_bias, drive="default", inverted=False
                         )
+                    start_ns = time.perf_counter_ns()
                     results.append(gpio.read())
+                    if stats is not None:
+                        stats.record_transaction(time.perf_counter_ns() - start_ns)
             finally:
                 try:
                     gpio.close()
@@ -107,7 +123,7 @@ class GpioDevice:
                     raise OSError(f"Failed to close {self.gpio_fd}") from exc
 
         finally:
-            GpioDevice.lock_gpio.release()
+            release_lock(GpioDevice.lock_gpio, stats, acquired_ns)
 
         return results
 
@@ -119,4 +135,10 @@ class GpioDevice:
         Return:
             N/A
         """
+        stats = IO_STATS.device("gpio", self.gpio_fd)
+        if stats is None:
+            self.gpio.write(state)
+            return
+        start_ns = time.perf_counter_ns()
         self.gpio.write(state)
+        stats.record_transaction(time.perf_counter_ns() - start_ns)
@@ -5,11 +5,13 @@ Classes:
     I2CDevice
 """
 import logging
-import threading
+import time
 
 from typing import Union
 from contextlib import contextmanager
 from periphery import I2C
+from edgepi.peripherals.ipc import BusLock
+from edgepi.peripherals.io_stats import IO_STATS, acquire_lock, release_lock
 
 _logger = logging.getLogger(__name__)
 
@@ -17,7 +19,8 @@ class I2CDevice():
     '''
     I2C Device class
     '''
-    lock_i2c=threading.Lock()
+    # bus lock, shared between threads and processes
+    lock_i2c=BusLock("i2c")
 
     def __init__(self, fd: str = None):
         self.i2c_fd = fd
@@ -32,8 +35,9 @@ class I2CDevice():
         Return:
             N/A
         """
+        stats = IO_STATS.device("i2c", self.i2c_fd)
+        acquired_ns = acquire_lock(I2CDevice.lock_i2c, stats)
         try:
-            I2CDevice.lock_i2c.acquire()
             self.i2cdev = I2C(devpath=self.i2c_fd)
             _logger.debug(f"Open I2C device with path '{self.i2c_fd}'")
             yield self.i2cdev
@@ -43,7 +47,7 @@ class I2CDevice():
             except Exception as exc:
                 raise OSError(f"Failed to close {self.i2c_fd}") from exc
             finally:
-                I2CDevice.lock_i2c.release()
+                release_lock(I2CDevice.lock_i2c, stats, acquired_ns)
 
     def set_read_msg(self, addr:Union[int,list] = None, msg:list = None):
         '''
@@ -83,7 +87,16 @@ class I2CDevice():
         Return:
             MsgList: list of message bytes if reading flag was set
         '''
-        self.i2cdev.transfer(dev_addr, msg)
+        stats = IO_STATS.device("i2c", self.i2c_fd)
+        if stats is None:
+            self.i2cdev.transfer(dev_addr, msg)
+        else:
+            start_ns = time.perf_counter_ns()
+            self.i2cdev.transfer(dev_addr, msg)
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            bytes_out = sum(len(message.data) for message in msg if not message.read)
+            bytes_in = sum(len(message.data) for message in msg if message.read)
+            stats.record_transaction(elapsed_ns, bytes_out, bytes_in)
         if len(msg)>1:
             return msg[1].data
         return None
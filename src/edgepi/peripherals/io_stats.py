@@ -0,0 +1,289 @@
+"""
+Instrumentation of peripheral device I/O
+
+When enabled, the SPI, I2C, GPIO and PWM devices record per device path statistics: number of
+transactions and bytes, device opens and closes, time spent waiting for and holding the bus
+locks, transaction latencies and device delays such as ADC conversion waits. Recording is
+disabled by default, costing a single attribute check per operation:
+
+    IO_STATS.enable()
+    adc.read_voltage(ADCNum.ADC_1)
+    print(IO_STATS.get("spi", "/dev/spidev6.1").transactions)
+
+    exporter = PrometheusExporter(port=9464)
+    exporter.start()   # metrics served at http://127.0.0.1:9464/metrics
+
+Statistics are updated while the device's bus lock is held, except for PWM devices, which
+have no bus lock and should not be used from several threads at once.
+
+Classes:
+    DeviceStats
+    IOStatsRegistry
+    PrometheusExporter
+
+Functions:
+    format_prometheus(IOStatsRegistry)
+"""
+
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from edgepi.utilities.histogram import Histogram
+from edgepi.utilities.tracing import TRACER
+
+_logger = logging.getLogger(__name__)
+
+
+class DeviceStats:
+    """
+    I/O statistics of one device. Times are in nanoseconds.
+
+    Attributes:
+        `bus` (str): bus type, "spi", "i2c", "gpio" or "pwm"
+        `path` (str): device path
+        `transactions` (int): number of transfers, reads and writes
+        `bytes_out` (int): bytes written by SPI and I2C transfers
+        `bytes_in` (int): bytes read by SPI and I2C transfers
+        `opens` (int): number of times the device was opened
+        `closes` (int): number of times the device was closed
+        `lock_wait_ns` (Histogram): time spent waiting for the bus lock before each open
+        `lock_hold_ns` (Histogram): time from each open to the matching close
+        `transaction_ns` (Histogram): duration of each transaction
+        `delay_ns` (Histogram): actual duration of device delays, e.g. ADC conversion waits
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, bus: str, path: str):
+        self.bus = bus
+        self.path = path
+        self.transactions = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.opens = 0
+        self.closes = 0
+        self.lock_wait_ns = Histogram()
+        self.lock_hold_ns = Histogram()
+        self.transaction_ns = Histogram()
+        self.delay_ns = Histogram()
+
+    def record_transaction(self, elapsed_ns: int, bytes_out: int = 0, bytes_in: int = 0):
+        """Add a transaction to the statistics"""
+        self.transactions += 1
+        self.bytes_out += bytes_out
+        self.bytes_in += bytes_in
+        self.transaction_ns.record(elapsed_ns)
+
+    def __repr__(self) -> str:
+        return (
+            f"DeviceStats(bus={self.bus}, path={self.path}, transactions={self.transactions}, "
+            f"bytes_out={self.bytes_out}, bytes_in={self.bytes_in}, opens={self.opens}, "
+            f"lock_wait_ns={self.lock_wait_ns}, lock_hold_ns={self.lock_hold_ns})"
+        )
+
+
+class IOStatsRegistry:
+    """Statistics of every device used by this process, created on first use"""
+
+    def __init__(self):
+        self.enabled = False
+        self.__devices = {}
+        self.__lock = threading.Lock()
+
+    def enable(self):
+        """Start recording statistics"""
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording statistics. Statistics recorded so far are kept."""
+        self.enabled = False
+
+    def reset(self):
+        """Discard all statistics"""
+        with self.__lock:
+            self.__devices = {}
+
+    def device(self, bus: str, path: str):
+        """
+        Statistics to record an operation of a device into
+
+        Args:
+            `bus` (str): bus type
+            `path` (str): device path
+
+        Returns:
+            `DeviceStats`: the device's statistics, None if recording is disabled
+        """
+        if not self.enabled:
+            return None
+        key = (bus, path)
+        stats = self.__devices.get(key)
+        if stats is None:
+            with self.__lock:
+                stats = self.__devices.setdefault(key, DeviceStats(bus, path))
+        return stats
+
+    def get(self, bus: str, path: str):
+        """
+        Args:
+            `bus` (str): bus type
+            `path` (str): device path
+
+        Returns:
+            `DeviceStats`: the device's statistics, None if nothing was recorded for it
+        """
+        return self.__devices.get((bus, path))
+
+    def devices(self) -> list:
+        """
+        Returns:
+            `list`: statistics of all devices recorded so far
+        """
+        with self.__lock:
+            return list(self.__devices.values())
+
+
+# statistics of this process
+IO_STATS = IOStatsRegistry()
+
+
+def acquire_lock(lock, stats: DeviceStats) -> int:
+    """
+    Acquire a bus lock, recording the wait and the device open, and a tracing span of the wait
+
+    Returns:
+        `int`: time the lock was acquired, to pass to `release_lock`
+    """
+    if stats is None and not TRACER.enabled:
+        lock.acquire()
+        return 0
+    start_ns = time.perf_counter_ns()
+    lock.acquire()
+    acquired_ns = time.perf_counter_ns()
+    TRACER.add_span(f"{lock.name} lock wait", "lock", start_ns, acquired_ns)
+    if stats is not None:
+        stats.lock_wait_ns.record(acquired_ns - start_ns)
+        stats.opens += 1
+    return acquired_ns
+
+
+def release_lock(lock, stats: DeviceStats, acquired_ns: int):
+    """
+    Release a bus lock acquired with `acquire_lock`, recording the hold time and close, and a
+    tracing span of the hold
+    """
+    if acquired_ns:
+        released_ns = time.perf_counter_ns()
+        TRACER.add_span(f"{lock.name} lock hold", "lock", acquired_ns, released_ns)
+        if stats is not None:
+            stats.lock_hold_ns.record(released_ns - acquired_ns)
+            stats.closes += 1
+    lock.release()
+
+
+def _prometheus_histogram(lines: list, name: str, labels: str, histogram: Histogram):
+    """Append the sample lines of a histogram, converted to seconds"""
+    for bound, count in histogram.buckets():
+        le = "+Inf" if bound == float("inf") else repr(bound / 1e9)
+        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum / 1e9!r}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+_COUNTERS = [
+    ("transactions", "edgepi_io_transactions_total", "Device transactions"),
+    ("bytes_out", "edgepi_io_bytes_written_total", "Bytes written to the device"),
+    ("bytes_in", "edgepi_io_bytes_read_total", "Bytes read from the device"),
+    ("opens", "edgepi_io_opens_total", "Device opens"),
+    ("closes", "edgepi_io_closes_total", "Device closes"),
+]
+
+_HISTOGRAMS = [
+    ("lock_wait_ns", "edgepi_io_lock_wait_seconds", "Time waiting for the bus lock"),
+    ("lock_hold_ns", "edgepi_io_lock_hold_seconds", "Time holding the bus lock"),
+    ("transaction_ns", "edgepi_io_transaction_seconds", "Transaction latency"),
+    ("delay_ns", "edgepi_io_delay_seconds", "Device delay duration"),
+]
+
+
+def format_prometheus(registry: IOStatsRegistry = IO_STATS) -> str:
+    """
+    Format statistics in the Prometheus text exposition format
+
+    Args:
+        `registry` (IOStatsRegistry): statistics to format
+
+    Returns:
+        `str`: one counter or histogram per statistic, labelled with bus and device path
+    """
+    devices = registry.devices()
+    lines = []
+    for attr, name, help_text in _COUNTERS:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for stats in devices:
+            labels = f'bus="{stats.bus}",path="{stats.path}"'
+            lines.append(f"{name}{{{labels}}} {getattr(stats, attr)}")
+    for attr, name, help_text in _HISTOGRAMS:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for stats in devices:
+            labels = f'bus="{stats.bus}",path="{stats.path}"'
+            _prometheus_histogram(lines, name, labels, getattr(stats, attr))
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusExporter:
+    """
+    Serves statistics in the Prometheus text format over HTTP, from a daemon thread. Recording
+    is enabled when the exporter starts.
+
+    Args:
+        `port` (int): TCP port to listen on, 0 to pick a free port
+        `host` (str): address to listen on, local only by default
+        `registry` (IOStatsRegistry): statistics to serve
+    """
+
+    def __init__(self, port: int = 9464, host: str = "127.0.0.1",
+                 registry: IOStatsRegistry = IO_STATS):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self.__server = None
+        self.__thread = None
+
+    def start(self):
+        """Start serving, on `http://host:port/metrics`"""
+        registry = self.registry
+
+        class _Handler(BaseHTTPRequestHandler):
+            """Serves the formatted statistics on any path"""
+
+            # pylint: disable=invalid-name
+            def do_GET(self):
+                """Send the statistics"""
+                body = format_prometheus(registry).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            # pylint: disable=redefined-builtin
+            def log_message(self, format, *args):
+                _logger.debug(format, *args)
+
+        self.registry.enable()
+        self.__server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self.port = self.__server.server_address[1]
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever, name="PrometheusExporter", daemon=True
+        )
+        self.__thread.start()
+        _logger.info(f"Serving I/O statistics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        """Stop serving"""
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
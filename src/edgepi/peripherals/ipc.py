@@ -0,0 +1,225 @@
+"""
+Module for sharing peripheral buses and device state between processes
+
+Classes:
+    BusLock
+    SharedRegisterShadow
+"""
+
+import fcntl
+import grp
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+_logger = logging.getLogger(__name__)
+
+LOCK_DIRS = ["/run/lock", tempfile.gettempdir()]
+SHM_DIRS = ["/dev/shm", tempfile.gettempdir()]
+
+# Lock and shadow files are shared with the members of FILE_GROUP, or of the group of the first
+# process creating them if None. Processes of different users using the EdgePi at the same time
+# must belong to this group.
+FILE_MODE = 0o660
+FILE_GROUP = None
+
+
+def _first_writable_dir(candidates: list) -> str:
+    """Returns the first directory in candidates the current user can write to"""
+    for path in candidates:
+        if os.path.isdir(path) and os.access(path, os.W_OK):
+            return path
+    return tempfile.gettempdir()
+
+
+def _share_file(fd: int, mode: int, group: str):
+    """
+    Set the permissions of a lock or shadow file, so other processes can open it
+
+    Args:
+        `fd` (int): file descriptor of the open file
+        `mode` (int): permission bits of the file
+        `group` (str): name of the group owning the file, or None to keep the current group
+    """
+    try:
+        if group is not None:
+            os.fchown(fd, -1, grp.getgrnam(group).gr_gid)
+        os.fchmod(fd, mode)
+    except (KeyError, OSError) as exc:
+        # unknown group, or the file was created by another user who already set its permissions
+        _logger.debug(f"failed to set permissions of shared file: {exc}")
+
+
+class BusLock:
+    """
+    Reentrant lock serializing access to a peripheral bus, both between threads of this
+    process and between processes.
+
+    Threads are serialized with a `threading.RLock`, processes with an advisory `flock` on a
+    per-bus lock file. The lock is reentrant so that a multi-transaction operation, such as a
+    register read-modify-write, can hold the bus across several `spi_open` / `i2c_open` calls.
+    If the lock file cannot be opened the lock degrades to a thread-only lock. The lock file is
+    created with `mode` and `group`, `FILE_MODE` and `FILE_GROUP` if None.
+    """
+
+    def __init__(self, name: str, lock_dir: str = None, mode: int = None, group: str = None):
+        self.name = name
+        self.lock_dir = lock_dir
+        self.mode = mode
+        self.group = group
+        self.__thread_lock = threading.RLock()
+        self.__depth = 0
+        # (pid, fd) of the lock file opened by process pid
+        self.__file = None
+
+    @property
+    def path(self) -> str:
+        """path of the lock file backing this lock"""
+        lock_dir = self.lock_dir if self.lock_dir is not None else _first_writable_dir(LOCK_DIRS)
+        return os.path.join(lock_dir, f"edgepi-{self.name}.lock")
+
+    def __get_fd(self):
+        """
+        Open the lock file once per process. After a fork the child must not reuse the
+        parent's open file description, since flock ownership is tied to it.
+        """
+        pid = os.getpid()
+        if self.__file is not None and self.__file[0] == pid:
+            return self.__file[1]
+        mode = self.mode if self.mode is not None else FILE_MODE
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, mode)
+        except OSError as exc:
+            _logger.warning(f"BusLock: failed to open {self.path}, using thread lock only: {exc}")
+            return None
+        # allow other users on the board to lock the same bus
+        _share_file(fd, mode, self.group if self.group is not None else FILE_GROUP)
+        self.__file = (pid, fd)
+        return fd
+
+    def acquire(self):
+        """Acquire the bus, blocking until no other thread or process holds it"""
+        # released by release(), __exit__ when used as a context manager
+        self.__thread_lock.acquire()  # pylint: disable=consider-using-with
+        if self.__depth == 0:
+            fd = self.__get_fd()
+            if fd is not None:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except OSError:
+                    self.__thread_lock.release()
+                    raise
+        self.__depth += 1
+
+    def release(self):
+        """Release the bus"""
+        self.__depth -= 1
+        try:
+            if self.__depth == 0 and self.__file is not None and self.__file[0] == os.getpid():
+                fcntl.flock(self.__file[1], fcntl.LOCK_UN)
+        finally:
+            self.__thread_lock.release()
+
+    def locked(self) -> bool:
+        """Returns True if a thread of this process currently holds the bus"""
+        return self.__depth > 0
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class SharedRegisterShadow:
+    """
+    Copy of a device register map shared between processes through a memory-mapped file.
+
+    Each update increments a generation counter, which lets a process holding a local copy of
+    the register map check whether it is stale by reading four bytes instead of re-reading the
+    device. Updates should be made while holding the `BusLock` of the device, so the shadow
+    always reflects the last register transaction made by any process.
+
+    Layout: generation (uint32), valid flag (uint8), 3 padding bytes, register values. The file
+    is created with `mode` and `group`, `FILE_MODE` and `FILE_GROUP` if None.
+    """
+
+    __header = struct.Struct("<IB3x")
+
+    def __init__(
+        self, name: str, num_regs: int, shm_dir: str = None, mode: int = None, group: str = None
+    ):
+        self.name = name
+        self.num_regs = num_regs
+        shm_dir = shm_dir if shm_dir is not None else _first_writable_dir(SHM_DIRS)
+        self.path = os.path.join(shm_dir, f"edgepi-{name}-regs")
+        self.__size = self.__header.size + num_regs
+        mode = mode if mode is not None else FILE_MODE
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, mode)
+        try:
+            _share_file(fd, mode, group if group is not None else FILE_GROUP)
+            if os.fstat(fd).st_size < self.__size:
+                os.ftruncate(fd, self.__size)
+            self.__map = mmap.mmap(fd, self.__size)
+        finally:
+            os.close(fd)
+
+    @property
+    def generation(self) -> int:
+        """number of updates made to the shadow since it was created"""
+        return self.__header.unpack_from(self.__map, 0)[0]
+
+    def read(self):
+        """
+        Read the shared register map
+
+        Returns:
+            `tuple`: (generation, reg_map) where reg_map is formatted as
+                {register addx (int): register_value (int)}, or None if the shadow has been
+                invalidated or never written
+        """
+        generation, valid = self.__header.unpack_from(self.__map, 0)
+        if not valid:
+            return generation, None
+        values = self.__map[self.__header.size:self.__size]
+        return generation, dict(enumerate(values))
+
+    def write(self, reg_map: dict) -> int:
+        """
+        Update the shared register map
+
+        Args:
+            `reg_map` (dict): register values formatted as {addx (int): value (int)}. Only
+                the registers present are updated. An invalidated shadow becomes valid again
+                only once a write contains every register.
+
+        Returns:
+            `int`: the new generation number
+        """
+        generation, valid = self.__header.unpack_from(self.__map, 0)
+        for addx, value in reg_map.items():
+            self.__map[self.__header.size + addx] = value
+        valid = valid or len(reg_map) >= self.num_regs
+        generation = (generation + 1) & 0xFFFFFFFF
+        self.__header.pack_into(self.__map, 0, generation, valid)
+        return generation
+
+    def invalidate(self) -> int:
+        """
+        Mark the shared register map as unknown, for example after a device reset,
+        forcing the next reader to read the device
+
+        Returns:
+            `int`: the new generation number
+        """
+        generation = (self.generation + 1) & 0xFFFFFFFF
+        self.__header.pack_into(self.__map, 0, generation, 0)
+        return generation
+
+    def close(self):
+        """Unmap the shared register map"""
+        self.__map.close()
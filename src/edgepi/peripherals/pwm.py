@@ -3,7 +3,9 @@ Module for PWM devices
 """
 
 import logging
+import time
 from periphery import PWM
+from edgepi.peripherals.io_stats import IO_STATS
 from edgepi.pwm.pwm_constants import Polarity
 
 
@@ -14,13 +16,27 @@ class PwmDevice:
         self.log = logging.getLogger(__name__)
         self.chip = chip
         self.channel = channel
+        self.devpath = f"/sys/class/pwm/pwmchip{chip}/pwm{channel}"
         self.pwm = None
 
+    def __access(self, operation):
+        """Run a sysfs access, recording it if I/O statistics are enabled"""
+        stats = IO_STATS.device("pwm", self.devpath)
+        if stats is None:
+            return operation()
+        start_ns = time.perf_counter_ns()
+        result = operation()
+        stats.record_transaction(time.perf_counter_ns() - start_ns)
+        return result
+
     def open_pwm(self):
         """
         Instantiate PWM device
         """
         self.pwm = PWM(self.chip, self.channel)
+        stats = IO_STATS.device("pwm", self.devpath)
+        if stats is not None:
+            stats.opens += 1
 
     def enable_pwm(self):
         """
@@ -31,7 +47,7 @@ class PwmDevice:
             N/A
         """
         self.log.info("Enabling PWM")
-        self.pwm.enable()
+        self.__access(self.pwm.enable)
 
     def disable_pwm(self):
         """
@@ -41,7 +57,7 @@ class PwmDevice:
         Return:
             N/A
         """
-        self.pwm.disable()
+        self.__access(self.pwm.disable)
 
     def set_frequency_pwm(self, freq: float = None):
         """
@@ -51,7 +67,7 @@ class PwmDevice:
         Return:
             N/A
         """
-        self.pwm.frequency = freq
+        self.__access(lambda: setattr(self.pwm, "frequency", freq))
 
     def get_frequency_pwm(self):
         """
@@ -61,7 +77,7 @@ class PwmDevice:
         Return:
             freq (float): frequency to set
         """
-        return self.pwm.frequency
+        return self.__access(lambda: self.pwm.frequency)
 
     def set_duty_cycle_pwm(self, duty_cycle: float = None):
         """
@@ -71,7 +87,7 @@ class PwmDevice:
         Return:
             N/A
         """
-        self.pwm.duty_cycle = duty_cycle
+        self.__access(lambda: setattr(self.pwm, "duty_cycle", duty_cycle))
 
     def get_duty_cycle_pwm(self):
         """
@@ -81,7 +97,7 @@ class PwmDevice:
         Return:
             duty_cycle (float): duty cycle value from 0 to 1.0
         """
-        return self.pwm.duty_cycle
+        return self.__access(lambda: self.pwm.duty_cycle)
 
     def set_polarity_pwm(self, polarity: Polarity = None):
         """
@@ -92,9 +108,9 @@ class PwmDevice:
             N/A
         """
         if polarity == Polarity.NORMAL:
-            self.pwm.polarity = "normal"
+            self.__access(lambda: setattr(self.pwm, "polarity", "normal"))
         elif polarity == Polarity.INVERSED:
-            self.pwm.polarity = "inversed"
+            self.__access(lambda: setattr(self.pwm, "polarity", "inversed"))
         else:
             raise ValueError(f"{polarity} is not a valid value for polarity.")
 
@@ -106,12 +122,13 @@ class PwmDevice:
         Return:
             polarity (Polarity)
         """
-        if self.pwm.polarity == "normal":
+        polarity = self.__access(lambda: self.pwm.polarity)
+        if polarity == "normal":
             return Polarity.NORMAL
-        if self.pwm.polarity == "inversed":
+        if polarity == "inversed":
             return Polarity.INVERSED
 
-        raise ValueError(f"{self.pwm.polarity} is not a valid value for polarity.")
+        raise ValueError(f"{polarity} is not a valid value for polarity.")
 
     def get_enabled_pwm(self):
         """
@@ -121,8 +138,11 @@ class PwmDevice:
         Return:
             enabled (bool): True enabled, False, disabled
         """
-        return self.pwm.enabled
+        return self.__access(lambda: self.pwm.enabled)
 
     def close_pwm(self):
         """Close pwm connection"""
         self.pwm.close()
+        stats = IO_STATS.device("pwm", self.devpath)
+        if stats is not None:
+            stats.closes += 1
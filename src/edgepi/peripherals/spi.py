@@ -6,22 +6,27 @@ Classes:
 """
 #pylint:disable=too-many-instance-attributes
 from contextlib import contextmanager
+from typing import Callable
 import logging
-import threading
 import time
 
 from periphery import SPI
+from edgepi.peripherals.ipc import BusLock
+from edgepi.peripherals.io_stats import IO_STATS, acquire_lock, release_lock
+from edgepi.utilities.tracing import TRACER, traced
+from edgepi.utilities.waiter import SleepWaiter, Waiter
 
 
 _logger = logging.getLogger(__name__)
 
 class SpiDevice:
     """Class representing an I2C device"""
+    # per chip-select bus locks, shared between threads and processes
     lock_spi = {
-        0:threading.Lock(),
-        1:threading.Lock(),
-        2:threading.Lock(),
-        3:threading.Lock()
+        0:BusLock("spi-dev0"),
+        1:BusLock("spi-dev1"),
+        2:BusLock("spi-dev2"),
+        3:BusLock("spi-dev3")
     }
     _devPath = "/dev/spidev"
     def __init__(
@@ -33,6 +38,8 @@ class SpiDevice:
         bit_order: str = "msb",
         bits_per_word: int = 8,
         extra_flags: int = 0,
+        waiter: Waiter = None,
+        transport: Callable = None,
     ):
         self.devpath = f"/dev/spidev{bus_num}.{dev_id}"
         self.dev_id = dev_id
@@ -42,15 +49,25 @@ class SpiDevice:
         self.bits_per_word = bits_per_word
         self.extra_flags = extra_flags
         self.spi = None
+        # waits for device delays, e.g. conversion times, between transfers
+        self.waiter = waiter if waiter is not None else SleepWaiter()
+        # creates SPI connections, called with the arguments of periphery.SPI.
+        # None uses periphery.SPI, see spi_replay for recording and replaying transfers.
+        self.transport = transport
+        # time.monotonic_ns values taken right after the last transfer, and after each
+        # read transfer of the last spi_apply_adc_commands call
+        self.last_transfer_ns = None
+        self.last_command_timestamps_ns = []
 
     @contextmanager
     def spi_open(self):
         """
         Open SPI device file
         """
+        stats = IO_STATS.device("spi", self.devpath)
+        acquired_ns = acquire_lock(SpiDevice.lock_spi[self.dev_id], stats)
         try:
-            SpiDevice.lock_spi[self.dev_id].acquire()
-            self.spi = SPI(
+            self.spi = (self.transport or SPI)(
                 self.devpath,
                 self.mode,
                 self.max_speed,
@@ -66,13 +83,43 @@ class SpiDevice:
             except Exception as exc:
                 raise OSError(f"Failed to close {self.devpath}") from exc
             finally:
-                SpiDevice.lock_spi[self.dev_id].release()
+                release_lock(SpiDevice.lock_spi[self.dev_id], stats, acquired_ns)
 
     def transfer(self, data: list) -> list:
         """Conduct an SPI data transfer"""
+        out = self.__transfer(data)
+        self.last_transfer_ns = time.monotonic_ns()
+        return out
+
+    def __transfer(self, data: list) -> list:
+        """Transfer data, recording the transaction if I/O statistics are enabled"""
+        stats = IO_STATS.device("spi", self.devpath)
+        if stats is None:
+            return self.spi.transfer(data)
+        start_ns = time.perf_counter_ns()
         out = self.spi.transfer(data)
+        stats.record_transaction(time.perf_counter_ns() - start_ns, len(data), len(out))
         return out
 
+    def delay(self, seconds: float):
+        """
+        Wait for a device delay, e.g. a conversion time, with `waiter`
+
+        Args:
+            `seconds` (float): time to wait in seconds
+        """
+        stats = IO_STATS.device("spi", self.devpath)
+        if stats is None and not TRACER.enabled:
+            self.waiter.wait(seconds)
+            return
+        start_ns = time.perf_counter_ns()
+        self.waiter.wait(seconds)
+        end_ns = time.perf_counter_ns()
+        TRACER.add_span("SpiDevice.delay", "spi", start_ns, end_ns, {"seconds": seconds})
+        if stats is not None:
+            stats.delay_ns.record(end_ns - start_ns)
+
+    @traced(category="spi")
     def spi_apply_adc_commands(self, command_tup_list):
         """
         This function applies a list of SPI commands for use in the ADC module,
@@ -82,12 +129,17 @@ class SpiDevice:
         then another command.
 
         See the `unsafe_write_register_command` for creating commands.
+
+        The time each second command of a tuple completed is stored in
+        `last_command_timestamps_ns`.
         """
         result_list = []
+        timestamps = []
 
+        stats = IO_STATS.device("spi", self.devpath)
+        acquired_ns = acquire_lock(SpiDevice.lock_spi[self.dev_id], stats)
         try:
-            SpiDevice.lock_spi[self.dev_id].acquire()
-            self.spi = SPI(
+            self.spi = (self.transport or SPI)(
                 self.devpath,
                 self.mode,
                 self.max_speed,
@@ -96,9 +148,10 @@ class SpiDevice:
                 self.extra_flags,
             )
             for data1, delay, data2 in command_tup_list:
-                self.spi.transfer(data1)
-                time.sleep(delay)
-                result_list += [self.spi.transfer(data2)]
+                self.__transfer(data1)
+                self.delay(delay)
+                result_list += [self.__transfer(data2)]
+                timestamps.append(time.monotonic_ns())
 
         finally:
             try:
@@ -106,6 +159,7 @@ class SpiDevice:
             except Exception as exc:
                 raise OSError(f"Failed to close {self.devpath}") from exc
             finally:
-                SpiDevice.lock_spi[self.dev_id].release()
+                release_lock(SpiDevice.lock_spi[self.dev_id], stats, acquired_ns)
 
+        self.last_command_timestamps_ns = timestamps
         return result_list
@@ -0,0 +1,246 @@
+"""
+Recording and replay of SPI transfers
+
+A `SpiRecorder` passed as the `transport` of an SPI device (e.g. `EdgePiADC(transport=...)`)
+records every transfer made with the device. A `SpiReplayer` passed as the transport of the
+same device, running the same sequence of calls, serves the recorded responses instead of
+accessing the hardware. This lets the SDK's conversion and processing code run off-device,
+deterministically, either at the recorded pace or at full CPU speed:
+
+    recorder = SpiRecorder()
+    adc = EdgePiADC(transport=recorder)
+    voltages = [adc.read_voltage(ADCNum.ADC_1) for _ in range(1000)]
+    recorder.recording.save("adc_reads.json")
+
+    replayer = SpiReplayer(SpiRecording.load("adc_reads.json"))
+    adc = EdgePiADC(transport=replayer, waiter=NullWaiter())
+
+Only SPI transfers are replayed, devices also using I2C or GPIO, such as the ADC's EEPROM
+calibration and RTD pins, still need those peripherals or mocks of them.
+
+Classes:
+    SpiFrame
+    SpiRecording
+    SpiRecorder
+    SpiReplayer
+    ReplayMismatchError
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+
+from periphery import SPI
+from edgepi.utilities.waiter import SleepWaiter, Waiter
+
+RECORDING_VERSION = 1
+
+
+class ReplayMismatchError(Exception):
+    """Raised when a replayed device transfers data that differs from the recording"""
+
+
+@dataclass
+class SpiFrame:
+    """
+    A recorded SPI transfer
+
+    Attributes:
+        `devpath` (str): path of the SPI device, e.g. "/dev/spidev6.1"
+        `time_ns` (int): time of the transfer, relative to the first recorded transfer
+        `tx` (bytes): data sent to the device
+        `rx` (bytes): data received from the device
+    """
+
+    devpath: str
+    time_ns: int
+    tx: bytes
+    rx: bytes
+
+
+@dataclass
+class SpiRecording:
+    """
+    Sequence of recorded SPI transfers
+
+    Attributes:
+        `frames` (list): SpiFrame of each transfer, in transfer order
+    """
+
+    frames: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Serializable representation of the recording"""
+        return {
+            "version": RECORDING_VERSION,
+            "frames": [
+                [frame.devpath, frame.time_ns, frame.tx.hex(), frame.rx.hex()]
+                for frame in self.frames
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SpiRecording":
+        """Create a recording from the output of `to_dict`"""
+        return cls([
+            SpiFrame(devpath, time_ns, bytes.fromhex(tx), bytes.fromhex(rx))
+            for devpath, time_ns, tx, rx in data["frames"]
+        ])
+
+    def save(self, path: str):
+        """Write the recording to a JSON file"""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, path: str) -> "SpiRecording":
+        """Read a recording from a JSON file written by `save`"""
+        with open(path, "r", encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+
+class _RecordingSpi:
+    """SPI connection recording the transfers made through it"""
+
+    def __init__(self, recorder: "SpiRecorder", devpath: str, spi):
+        self.__recorder = recorder
+        self.__devpath = devpath
+        self.__spi = spi
+
+    def transfer(self, data: list) -> list:
+        """Transfer data, and record it with the data received"""
+        out = self.__spi.transfer(data)
+        self.__recorder.record(self.__devpath, data, out)
+        return out
+
+    def close(self):
+        """Close the SPI connection"""
+        self.__spi.close()
+
+
+class SpiRecorder:
+    """
+    SPI device transport recording every transfer
+
+    Args:
+        `transport` (Callable): transport making the recorded transfers, defaults to
+            periphery.SPI
+
+    Attributes:
+        `recording` (SpiRecording): transfers recorded so far
+    """
+
+    def __init__(self, transport=None):
+        self.recording = SpiRecording()
+        self.__transport = transport
+        self.__start_ns = None
+
+    def __call__(self, devpath: str, *args, **kwargs) -> _RecordingSpi:
+        spi = (self.__transport or SPI)(devpath, *args, **kwargs)
+        return _RecordingSpi(self, devpath, spi)
+
+    def record(self, devpath: str, tx: list, rx: list):
+        """Add a transfer to the recording"""
+        now = time.monotonic_ns()
+        if self.__start_ns is None:
+            self.__start_ns = now
+        self.recording.frames.append(
+            SpiFrame(devpath, now - self.__start_ns, bytes(tx), bytes(rx))
+        )
+
+
+class _ReplaySpi:
+    """SPI connection serving recorded transfers"""
+
+    def __init__(self, replayer: "SpiReplayer", devpath: str):
+        self.__replayer = replayer
+        self.__devpath = devpath
+
+    def transfer(self, data: list) -> list:
+        """Returns the data received by the next recorded transfer"""
+        return list(self.__replayer.next_frame(self.__devpath, data).rx)
+
+    def close(self):
+        """Nothing to close"""
+
+
+class SpiReplayer:
+    """
+    SPI device transport serving the responses of a recording. Frames are served in recorded
+    order, independently for each device path.
+
+    Args:
+        `recording` (SpiRecording): transfers to replay
+
+        `speed` (float): replay pace relative to the recording, e.g. 1 for the original pace
+            or 10 for ten times faster. None serves transfers immediately, at full CPU speed.
+
+        `strict` (bool): raise ReplayMismatchError if the data sent by the device differs from
+            the data sent when recording, i.e. the replayed code took a different path
+
+        `waiter` (Waiter): waits until the time of each frame when `speed` is set
+    """
+
+    def __init__(
+        self,
+        recording: SpiRecording,
+        speed: float = None,
+        strict: bool = True,
+        waiter: Waiter = None,
+    ):
+        if speed is not None and speed <= 0:
+            raise ValueError(f"speed must be positive, got {speed}")
+        self.recording = recording
+        self.speed = speed
+        self.strict = strict
+        self.waiter = waiter if waiter is not None else SleepWaiter()
+        self.__frames = {}
+        for frame in recording.frames:
+            self.__frames.setdefault(frame.devpath, []).append(frame)
+        self.__positions = {}
+        self.__start_ns = None
+
+    def __call__(self, devpath: str, *_args, **_kwargs) -> _ReplaySpi:
+        return _ReplaySpi(self, devpath)
+
+    @property
+    def remaining(self) -> int:
+        """number of frames not replayed yet"""
+        return sum(
+            len(frames) - self.__positions.get(devpath, 0)
+            for devpath, frames in self.__frames.items()
+        )
+
+    def rewind(self):
+        """Restart the replay from the first frame"""
+        self.__positions = {}
+        self.__start_ns = None
+
+    def next_frame(self, devpath: str, tx: list) -> SpiFrame:
+        """
+        Get the next recorded frame of a device, waiting until its time if pacing the replay
+
+        Args:
+            `devpath` (str): path of the SPI device
+            `tx` (list): data sent by the device
+
+        Returns:
+            `SpiFrame`: the frame
+        """
+        frames = self.__frames.get(devpath, [])
+        position = self.__positions.get(devpath, 0)
+        if position >= len(frames):
+            raise ReplayMismatchError(f"Recording has no more transfers for {devpath}")
+        frame = frames[position]
+        if self.strict and bytes(tx) != frame.tx:
+            raise ReplayMismatchError(
+                f"Transfer {position} of {devpath} sent {bytes(tx).hex()}, "
+                f"recording sent {frame.tx.hex()}"
+            )
+        self.__positions[devpath] = position + 1
+
+        if self.speed is not None:
+            if self.__start_ns is None:
+                self.__start_ns = time.perf_counter_ns() - int(frame.time_ns / self.speed)
+            self.waiter.wait_until(self.__start_ns + int(frame.time_ns / self.speed))
+        return frame
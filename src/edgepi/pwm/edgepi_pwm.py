@@ -11,6 +11,7 @@ from edgepi.gpio.gpio_constants import GpioPins
 from edgepi.pwm.pwm_constants import (
     PWMCh,
     PWMPins,
+    PWMState,
     Polarity,
     PWM_MAX_FREQ,
     PWM_MIN_FREQ,
@@ -33,9 +34,13 @@ class EdgePiPWM():
     }
 
     """handling PWM output"""
-    def __init__(self):
+    def __init__(self, gpio: EdgePiGPIO = None):
+        """
+        Args:
+            gpio (EdgePiGPIO): GPIO manager shared with other modules, created if None
+        """
         self.log = logging.getLogger(__name__)
-        self.gpio = EdgePiGPIO()
+        self.gpio = gpio if gpio is not None else EdgePiGPIO()
 
     def __check_range(self, target, range_min, range_max) -> bool:
         """Validates target is in range between a min and max value"""
@@ -184,6 +189,25 @@ class EdgePiPWM():
             raise PwmDeviceError(f"get_frequency:{pwm_num} not initialized")
         return EdgePiPWM.__pwm_devs[pwm_num].get_enabled_pwm()
 
+    def get_state(self, pwm_num: PWMPins):
+        """
+        Get the frequency, duty cycle, polarity and enabled state together
+        Args:
+            pwm_num (PWMPins): target pwm device
+        Returns:
+            state (PWMState): configuration of the PWM device, None if it is not initialized
+        """
+        if pwm_num is None or pwm_num not in EdgePiPWM.__pwm_devs:
+            raise ValueError(f"get_state: PWM number is missing {pwm_num}")
+        with EdgePiPWM.__lock_pwm[pwm_num]:
+            pwm_dev = EdgePiPWM.__pwm_devs[pwm_num]
+            if pwm_dev is None:
+                return None
+            return PWMState(frequency=pwm_dev.get_frequency_pwm(),
+                            duty_cycle=pwm_dev.get_duty_cycle_pwm(),
+                            polarity=pwm_dev.get_polarity_pwm(),
+                            enabled=pwm_dev.get_enabled_pwm())
+
     def close(self, pwm_num: PWMPins):
         """
         Close PWM connection
@@ -33,6 +33,21 @@ class Polarity(Enum):
     NORMAL = 1
     INVERSED = -1
 
+@dataclass(frozen=True)
+class PWMState:
+    """
+    Configuration of an initialized PWM device
+    Attributes:
+        frequency (float): frequency (Hz)
+        duty_cycle (float): duty cycle, from 0 to 1
+        polarity (Polarity): polarity
+        enabled (bool): True if the PWM output is enabled
+    """
+    frequency: float = None
+    duty_cycle: float = None
+    polarity: Polarity = None
+    enabled: bool = None
+
 PWM_MAX_FREQ = 10000.0
 PWM_MIN_FREQ = 1000.0
 PWM_MAX_DUTY_CYCLE = 1.0
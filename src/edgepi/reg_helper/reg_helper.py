@@ -5,17 +5,19 @@ Classes:
 
     OpCode
     OpCodeMaskIncompatibleError(ValueError)
+    RegisterUpdateError(Exception)
 
 Functions:
 
-    _add_change_flags(dict)
+    compile_opcodes(list)
+    apply_compiled_opcodes(bytearray, tuple, int)
     apply_opcodes(dict, list)
-    apply_opcode(OpCode, int)
+    changed_register_spans(dict, int)
 """
 
-from copy import deepcopy
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -75,10 +77,78 @@ class RegisterUpdateError(Exception):
     """
 
 
+@lru_cache(maxsize=256)
+def _compile_opcodes(opcodes: tuple) -> tuple:
+    merged = {}
+    for opcode in opcodes:
+        # ensure op_code only writes to bits of register covered by mask
+        if opcode.op_code & opcode.op_mask:
+            raise OpCodeMaskIncompatibleError(
+                f"""opcode ({hex(opcode.op_code)}) affects bits
+                not covered by mask ({hex(opcode.op_mask)}"""
+            )
+        and_mask, or_value = merged.get(opcode.reg_address, (0xFF, 0x00))
+        # applying (m2, c2) after (m1, c1): ((v & m1 | c1) & m2) | c2
+        merged[opcode.reg_address] = (
+            and_mask & opcode.op_mask,
+            (or_value & opcode.op_mask) | opcode.op_code,
+        )
+    return tuple((addx, *merged[addx]) for addx in sorted(merged))
+
+
+def compile_opcodes(opcodes: list) -> tuple:
+    """
+    Merges a list of opcodes into a single (and_mask, or_value) pair per register, so that
+    each register is updated with one AND and one OR no matter how many opcodes target it.
+    Opcodes targeting the same register are merged in list order, later opcodes taking
+    precedence over earlier ones for the bits they both cover. Compiled results are cached,
+    since devices configure themselves from a small set of opcode lists.
+
+    Args:
+        opcodes (list): a list of OpCode objects
+
+    Returns:
+        `tuple`: (reg_addx (int), and_mask (int), or_value (int)) tuples, ordered by address
+
+    Raises:
+        OpCodeMaskIncompatibleError: if an opcode affects bits not covered by its mask
+    """
+    return _compile_opcodes(tuple(opcodes))
+
+
+def apply_compiled_opcodes(register_image, compiled: tuple, base_addx: int = 0) -> int:
+    """
+    Applies compiled opcodes in place to a flat register image. Opcodes targeting registers
+    outside the image are ignored.
+
+    Args:
+        register_image (bytearray | array.array): register values, where index i holds
+            the value of the register at address `base_addx` + i
+
+        compiled (tuple): opcodes compiled by `compile_opcodes`
+
+        base_addx (int): address of the register held at index 0 of `register_image`
+
+    Returns:
+        `int`: dirty bitmap, with bit i set if the opcodes changed the value of the register at
+            index i. Registers the opcodes leave at their current value are not dirty.
+    """
+    dirty = 0
+    size = len(register_image)
+    for addx, and_mask, or_value in compiled:
+        index = addx - base_addx
+        if 0 <= index < size:
+            value = (register_image[index] & and_mask) | or_value
+            if value != register_image[index]:
+                register_image[index] = value
+                dirty |= 1 << index
+    return dirty
+
+
 def apply_opcodes(register_values: dict, opcodes: list):
     """
-    Generates updated register values after applying opcodes,
-    and sets is_changed flag for updated registers.
+    Generates updated register values after applying opcodes, and sets the is_changed flag of
+    registers whose value was changed by the opcodes.
 
     Args:
         register_values (dict): a map of a device's registers to a dictionary containing their
@@ -95,6 +165,7 @@ def apply_opcodes(register_values: dict, opcodes: list):
 
     Raises:
         ValueError: if either register_values or opcodes is empty
+        RegisterUpdateError: if the value of a register not targeted by an opcode was changed
     """
 
     if len(register_values) < 1 or len(opcodes) < 1:
@@ -102,105 +173,65 @@ def apply_opcodes(register_values: dict, opcodes: list):
             "empty values received for 'register_values' or 'opcodes' args, opcodes not applied"
         )
         raise ValueError("register_values and opcodes args must both be non-empty")
-    _format_register_map(register_values)
-
-    original_regs = deepcopy(register_values)
-
-    # apply each opcode to its corresponding register
-    for opcode in opcodes:
-        register_entry = register_values.get(opcode.reg_address)
-        # if this opcode maps to a valid register address
-        if register_entry is not None:
-            # apply the opcode to the register
-            register_entry["value"] = _apply_opcode(register_entry["value"], opcode)
-            register_entry["is_changed"] = True
-
-    # There's no reason for us to suspect the other values would change?
-    # I'm not sure why this was done. The deepcopy which depends on this
-    # is quite slow (takes 1ms!)
-    __validate_register_updates(original_regs, register_values)
 
-    return register_values
-
-
-def _apply_opcode(register_value: int, opcode: OpCode):
-    """
-    Generates an update code for a specific register by applying an opcode
-
-    Args:
-        opcode (OpCode): an OpCode object representing the opcode to be applied to the register
-
-        register_value (int): the current stored value of the register
-
-    Returns:
-        an update code, the value to be written back to the register in order to apply
-        the opcode.
-    """
-    # ensure op_code only writes to bits of register covered by mask
-    if (~opcode.op_mask & opcode.op_code) != opcode.op_code:
-        raise OpCodeMaskIncompatibleError(
-            f"""opcode ({hex(opcode.op_code)}) affects bits
-            not covered by mask ({hex(opcode.op_mask)}"""
-        )
-
-    register_value &= opcode.op_mask  # clear the bits to be overwritten
-    register_value |= opcode.op_code  # apply the opcode to the cleared bits
-
-    return register_value
-
-
-def __validate_register_updates(original_regs, updated_regs):
-    """
-    Verifies the value of regsiters not targeted for updates has not changed after applying updates
-    """
-    for addx, entry in updated_regs.items():
-        if not entry["is_changed"] and entry["value"] != original_regs[addx]["value"]:
+    # lay the map out as a flat image covering its address range
+    base_addx = min(register_values)
+    image = bytearray(max(register_values) - base_addx + 1)
+    for addx, value in register_values.items():
+        image[addx - base_addx] = value
+
+    original_image = bytes(image)
+    compiled = compile_opcodes(opcodes)
+    dirty = apply_compiled_opcodes(image, compiled, base_addx)
+
+    # check registers not targeted by an opcode kept their value, comparing against a copy of
+    # the flat image rather than a deepcopy of the register map
+    targeted = {addx for addx, _, _ in compiled}
+    for addx in register_values:
+        index = addx - base_addx
+        if addx not in targeted and image[index] != original_image[index]:
             raise RegisterUpdateError(
                 f"Register at address {addx} has been incorrectly targeted for updates."
             )
+        register_values[addx] = {"value": image[index], "is_changed": bool(dirty >> index & 1)}
 
+    return register_values
 
-def _add_change_flags(register_values: dict):
-    """
-    adds flags to register values for checking to see if register value has been modified later
-
-    Args:
-        register_values (dict): a map of the device's registers to their current values
 
-    Returns:
-        the same dictionary but with an added 'is_changed' field for each entry
+def changed_register_spans(register_values: dict, max_gap: int = 0) -> list:
     """
-    for key in register_values:
-        register_values[key]["is_changed"] = False
-
-
-def _convert_values_to_dict(reg_map: dict) -> dict:
-    """Changes a register_address, register_value map to use register_address, dictionary format
-    where the dictionary now hold the register_value.
+    Groups the changed registers of a register map into contiguous spans of addresses,
+    so that a device supporting multi-register transfers can be updated with as few
+    and as short transfers as possible.
 
     Args:
-        reg_map (dict): a dictionary containing (int) register_address, (int) register_value pairs
+        register_values (dict): a map of register addresses to their updated values and change
+            flags, as returned by `apply_opcodes`, formatted as:
 
-    Returns:
-        a dictionary containing (int) register_address, {'value': register_value} pairs
-    """
-    # convert each addx, value pair to addx, dictionary pair
-    for addx, value in reg_map.items():
-        reg_map[addx] = {"value": value}
+                { reg_addx (int): {"value": int, "is_changed": bool} }
 
-
-def _format_register_map(reg_map: dict) -> dict:
-    """converts map of register_address, register_value pairs to a format compatible with functions
-    defined in this module.
-
-    Args:
-        reg_map (dict): a dictionary containing (int) register_address, (int) register_value pairs
+        max_gap (int): largest number of unchanged registers allowed between two changed
+            registers of the same span. Unchanged registers inside a span keep their
+            current value, so they must be present in register_values.
 
     Returns:
-        a dictionary holding (int) reg_address, {'value': reg_value, 'is_changed': False} pairs
+        `list`: (start_addx (int), values (list[int])) tuples, ordered by address
     """
-    _convert_values_to_dict(reg_map)
-    _add_change_flags(reg_map)
+    changed = sorted(addx for addx, entry in register_values.items() if entry["is_changed"])
+    spans = []
+    for addx in changed:
+        if (
+            spans
+            and addx - spans[-1][1] <= max_gap + 1
+            and all(gap in register_values for gap in range(spans[-1][1] + 1, addx))
+        ):
+            spans[-1][1] = addx
+        else:
+            spans.append([addx, addx])
+    return [
+        (start, [register_values[addx]["value"] for addx in range(start, end + 1)])
+        for start, end in spans
+    ]
 
 
 def convert_dict_to_values(reg_dict: dict = None):
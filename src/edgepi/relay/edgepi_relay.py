@@ -8,9 +8,13 @@ _logger = logging.getLogger(__name__)
 
 class EdgePiRelay():
     """A class to control the relay"""
-    def __init__(self):
+    def __init__(self, gpio: EdgePiGPIO = None):
+        """
+        Args:
+            gpio (EdgePiGPIO): GPIO manager shared with other modules, created if None
+        """
         # To limit access to input functionality, using composition rather than inheritance
-        self.gpio = EdgePiGPIO()
+        self.gpio = gpio if gpio is not None else EdgePiGPIO()
 
     def get_state_relay(self):
         """
@@ -5,6 +5,7 @@ Module for interacting with the EdgePi Thermocouple via SPI.
 
 import logging
 import time
+from typing import Callable
 from enum import Enum
 
 from bitstring import Bits
@@ -36,9 +37,15 @@ from edgepi.tc.tc_faults import map_fault_status
 from edgepi.reg_helper.reg_helper import OpCode, apply_opcodes
 from edgepi.utilities.utilities import filter_dict
 from edgepi.tc.tc_conv_time import calc_conv_time
+from edgepi.utilities.sample_records import SampleBatch
+from edgepi.utilities.tracing import traced
 
 _logger = logging.getLogger(__name__)
 
+# channels of the temperature sample records
+TC_CJ_CHANNEL = 0
+TC_LT_CHANNEL = 1
+
 # pylint: disable=too-many-instance-attributes
 class TCState:
     """
@@ -134,15 +141,46 @@ class EdgePiTC(SpiDevice):
         TCAddresses.CJTL_W.value: 0x00,
     }
 
-    def __init__(self):
-        super().__init__(bus_num=6, dev_id=2)
+    def __init__(self, transport: Callable = None):
+        """
+        Args:
+            `transport` (Callable): SPI transport, defaults to the SPI device. See
+                `edgepi.peripherals.spi_replay` for recording and replaying TC transfers.
+        """
+        super().__init__(bus_num=6, dev_id=2, transport=transport)
         self.tc_state = TCState()
 
+    @traced(category="tc")
     def read_temperatures(self):
         """Use to read cold junction and linearized thermocouple temperature measurements"""
         temp_bytes = self.__read_registers(TCAddresses.CJTH_R.value, 5)
         return code_to_temp(temp_bytes)
 
+    @traced(category="tc")
+    def read_temperature_records(self) -> SampleBatch:
+        """
+        Same as `read_temperatures`, but returns timestamped sample records
+
+        Returns:
+            `SampleBatch`: two records, the cold junction temperature (channel 0) and the
+                linearized thermocouple temperature (channel 1). Both are timestamped when the
+                temperature registers were read, and hold the raw temperature code and the
+                fault status register value.
+        """
+        # read the fault status register in the same transfer as the temperatures
+        temp_bytes = self.__read_registers(TCAddresses.CJTH_R.value, 6)
+        timestamp_ns = self.last_transfer_ns
+        cj_temp, lt_temp = code_to_temp(temp_bytes)
+        cj_code = ((temp_bytes[1] << 8) | temp_bytes[2]) >> 2
+        lt_code = ((temp_bytes[3] << 16) | (temp_bytes[4] << 8) | temp_bytes[5]) >> 5
+        fault_status = temp_bytes[6]
+
+        records = SampleBatch()
+        records.append(timestamp_ns, TC_CJ_CHANNEL, cj_code, cj_temp, fault_status)
+        records.append(timestamp_ns, TC_LT_CHANNEL, lt_code, lt_temp, fault_status)
+        return records
+
+    @traced(category="tc")
     def single_sample(self, safe_delay: bool = True):
         """Conduct a single sampling event. Returns measured temperature in degrees Celsius.
 
@@ -157,6 +195,29 @@ class EdgePiTC(SpiDevice):
             a tuple containing temperatures for cold junction
             and linearized thermocouple temperature
         """
+        self.__trigger_single_sample(safe_delay)
+
+        # read cold junction and linearized TC temperatures
+        temp_codes = self.read_temperatures()
+
+        _logger.debug(f"single sample codes: {temp_codes}")
+
+        return temp_codes
+
+    @traced(category="tc")
+    def single_sample_records(self, safe_delay: bool = True) -> SampleBatch:
+        """
+        Same as `single_sample`, but returns timestamped sample records,
+        see `read_temperature_records`
+
+        Args:
+            safe_delay (bool): see `single_sample`
+        """
+        self.__trigger_single_sample(safe_delay)
+        return self.read_temperature_records()
+
+    def __trigger_single_sample(self, safe_delay: bool):
+        """Trigger a single sampling event and wait for its temperatures to be available"""
         cr0_value = self.__read_register(TCAddresses.CR0_R.value)
         cr1_value = self.__read_register(TCAddresses.CR1_R.value)
         command = cr0_value[1] | TCOps.SINGLE_SHOT.value.op_code
@@ -166,13 +227,7 @@ class EdgePiTC(SpiDevice):
         conv_time = calc_conv_time(cr0_value[1], cr1_value[1], safe_delay)
         time.sleep(conv_time / 1000)
 
-        # read cold junction and linearized TC temperatures
-        temp_codes = self.read_temperatures()
-
-        _logger.debug(f"single sample codes: {temp_codes}")
-
-        return temp_codes
-
+    @traced(category="tc")
     def read_faults(self, filter_at_fault=True) -> list:
         """Read information about thermocouple fault status.
 
@@ -203,6 +258,7 @@ class EdgePiTC(SpiDevice):
 
         return fault_msgs
 
+    @traced(category="tc")
     def clear_faults(self):
         """
         When thermocouple is in Interrupt Fault Mode, clears all bits in Fault Status Register,
@@ -233,6 +289,7 @@ class EdgePiTC(SpiDevice):
         """
         self.set_config(cj_temp=cj_temp, cj_temp_decimals=cj_temp_decimals)
 
+    @traced(category="tc")
     def reset_registers(self):
         """
         Resets register values to factory default values. Please refer to MAX31856
@@ -416,6 +473,7 @@ class EdgePiTC(SpiDevice):
             ops_list += tempcode_to_opcode(tempcode, tc_type, cj_status)
         _logger.debug(f"set_config: ops_list:\n\n{ops_list}\n\n")
 
+    @traced(category="tc")
     def set_config(
         self,
         conversion_mode: ConvMode = None,
@@ -550,6 +608,7 @@ class EdgePiTC(SpiDevice):
         # Update configuration state
         self.get_state()
 
+    @traced(category="tc")
     def get_state(self):
         """
         Read config registers and update state object
@@ -0,0 +1,379 @@
+"""
+Binary columnar file format for long acquisitions
+
+An acquisition file stores timestamped sample records (see `sample_records`) from any mix of
+sources, e.g. ADC, TC and digital input samples, in chunks holding the samples of a single
+channel. Each chunk stores one column per record field, so a reader can memory-map the file
+and access a channel's values or timestamps without copying or decoding them.
+
+Layout, all integers little-endian:
+    file header     magic, version, metadata length, index offset and chunk count
+    metadata        UTF-8 JSON: channel descriptions and calibration parameters
+    chunks          chunk header (channel, sample count, first and last timestamps),
+                    followed by the timestamp_ns, channel, raw_code, value and status columns
+    chunk index     one entry per chunk, written when the writer is closed
+
+Chunks and columns start at 8 byte aligned offsets. If a writer is not closed, e.g. after a
+power failure, the reader rebuilds the chunk index from the chunk headers.
+
+Classes:
+    ChannelInfo
+    ChunkInfo
+    AcquisitionWriter
+    AcquisitionReader
+"""
+
+import bisect
+import json
+import mmap
+import struct
+import sys
+from dataclasses import asdict, dataclass, fields, is_dataclass
+
+from edgepi.utilities.sample_records import SAMPLE_FIELDS, SampleBatch
+
+ACQ_MAGIC = b"EDGEPIAQ"
+ACQ_VERSION = 1
+CHUNK_MAGIC = b"CHNK"
+
+# magic, version, flags, metadata length, index offset, number of chunks
+_FILE_HEADER = struct.Struct("<8sHHIQQ")
+# magic, channel, count, first timestamp, last timestamp
+_CHUNK_HEADER = struct.Struct("<4sHxxIqq4x")
+# chunk offset, channel, count, first timestamp, last timestamp
+_INDEX_ENTRY = struct.Struct("<QHxxIqq")
+
+# EEPROM data fields written to the metadata, AWS keys must never be written to data files
+CALIBRATION_FIELDS = (
+    "dac_calib_params",
+    "adc1_calib_params",
+    "adc2_calib_params",
+    "rtd_calib_params",
+    "tc_calib_params",
+    "serial",
+    "model",
+)
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _column_sizes(count: int) -> list:
+    """aligned size in bytes of each column of a chunk"""
+    return [_align(count * struct.calcsize(typecode)) for _, typecode, _ in SAMPLE_FIELDS]
+
+
+@dataclass
+class ChannelInfo:
+    """
+    Description of a channel stored in an acquisition file
+
+    Attributes:
+        `channel` (int): channel identifier of the channel's sample records
+        `name` (str): channel name, e.g. "AIN1"
+        `source` (str): module the samples were read from, e.g. "adc", "tc" or "din"
+        `units` (str): units of the record values, e.g. "V" or "C"
+    """
+
+    channel: int
+    name: str = ""
+    source: str = ""
+    units: str = ""
+
+
+@dataclass
+class ChunkInfo:
+    """
+    Location and time span of a chunk of an acquisition file
+
+    Attributes:
+        `offset` (int): offset of the chunk header in the file
+        `channel` (int): channel identifier of the chunk's samples
+        `count` (int): number of samples in the chunk
+        `first_ns` (int): timestamp of the first sample
+        `last_ns` (int): timestamp of the last sample
+    """
+
+    offset: int
+    channel: int
+    count: int
+    first_ns: int
+    last_ns: int
+
+
+def _calibration_metadata(calibration) -> dict:
+    """Calibration parameters of an EepromDataClass, or a dict, as JSON serializable values"""
+    if calibration is None:
+        return {}
+    if is_dataclass(calibration):
+        names = {field.name for field in fields(calibration)}
+        metadata = {}
+        for name in CALIBRATION_FIELDS:
+            value = getattr(calibration, name) if name in names else None
+            if value is not None:
+                metadata[name] = asdict(value) if is_dataclass(value) else value
+        return metadata
+    return dict(calibration)
+
+
+class AcquisitionWriter:
+    """
+    Writes sample records to an acquisition file. Samples are buffered per channel, and a
+    chunk is written each time a channel's buffer reaches `chunk_size` samples.
+
+    Samples of a channel must be appended in timestamp order. Channel identifiers of
+    different sources may collide, e.g. ADC channel 0 and TC channel 0, use the
+    `channel_offset` argument of `append` to keep them apart.
+
+    Args:
+        `path` (str): path of the file to create, an existing file is overwritten
+
+        `channels` (list): ChannelInfo describing each channel that will be written
+
+        `calibration` (EepromDataClass): calibration parameters to store with the samples,
+            or a JSON serializable dict
+
+        `chunk_size` (int): number of samples per chunk
+    """
+
+    def __init__(self, path: str, channels: list = None, calibration=None, chunk_size: int = 4096):
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        self.path = path
+        self.chunk_size = chunk_size
+        self.num_chunks = 0
+        self.__index = []
+        self.__buffers = {}
+        metadata = json.dumps({
+            "channels": [asdict(channel) for channel in channels or []],
+            "calibration": _calibration_metadata(calibration),
+        }).encode("utf-8")
+        # pylint: disable=consider-using-with
+        self.__file = open(path, "wb")
+        self.__metadata_len = len(metadata)
+        self.__file.write(_FILE_HEADER.pack(ACQ_MAGIC, ACQ_VERSION, 0, len(metadata), 0, 0))
+        self.__file.write(metadata)
+        self.__pad()
+
+    def __pad(self):
+        position = self.__file.tell()
+        self.__file.write(b"\0" * (_align(position) - position))
+
+    def append(self, batch: SampleBatch, channel_offset: int = 0):
+        """
+        Add samples to the file
+
+        Args:
+            `batch` (SampleBatch): samples to add, of any channels
+
+            `channel_offset` (int): value added to the channel identifier of every sample
+        """
+        for record in batch:
+            channel = record.channel + channel_offset
+            buffer = self.__buffers.get(channel)
+            if buffer is None:
+                buffer = self.__buffers[channel] = SampleBatch()
+            buffer.append(
+                record.timestamp_ns, channel, record.raw_code, record.value, record.status
+            )
+            if len(buffer) >= self.chunk_size:
+                self.__write_chunk(channel, buffer)
+                self.__buffers[channel] = SampleBatch()
+
+    def flush(self):
+        """Write the buffered samples of every channel to the file"""
+        for channel, buffer in self.__buffers.items():
+            if len(buffer):
+                self.__write_chunk(channel, buffer)
+        self.__buffers = {}
+        self.__file.flush()
+
+    def __write_chunk(self, channel: int, buffer: SampleBatch):
+        offset = self.__file.tell()
+        count = len(buffer)
+        first_ns, last_ns = buffer.timestamp_ns[0], buffer.timestamp_ns[-1]
+        self.__file.write(_CHUNK_HEADER.pack(CHUNK_MAGIC, channel, count, first_ns, last_ns))
+        for name, _, _ in SAMPLE_FIELDS:
+            column = getattr(buffer, name)
+            if sys.byteorder == "big":
+                column = column[:]
+                column.byteswap()
+            self.__file.write(column.tobytes())
+            self.__pad()
+        self.__index.append(ChunkInfo(offset, channel, count, first_ns, last_ns))
+        self.num_chunks += 1
+
+    def close(self):
+        """Write the remaining samples and the chunk index, and close the file"""
+        if self.__file.closed:
+            return
+        self.flush()
+        index_offset = self.__file.tell()
+        for chunk in self.__index:
+            self.__file.write(
+                _INDEX_ENTRY.pack(
+                    chunk.offset, chunk.channel, chunk.count, chunk.first_ns, chunk.last_ns
+                )
+            )
+        self.__file.seek(0)
+        self.__file.write(
+            _FILE_HEADER.pack(
+                ACQ_MAGIC, ACQ_VERSION, 0, self.__metadata_len, index_offset, len(self.__index)
+            )
+        )
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AcquisitionReader:
+    """
+    Memory-maps an acquisition file for reading. Column views returned by the reader refer to
+    the mapped file, they must be released before the reader is closed.
+
+    Args:
+        `path` (str): path of the acquisition file
+
+    Attributes:
+        `channels` (dict): ChannelInfo of each channel, formatted as {channel (int): ChannelInfo}
+        `calibration` (dict): calibration parameters stored with the samples
+        `chunks` (list): ChunkInfo of every chunk, in file order
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, metadata_len, index_offset, num_chunks = _FILE_HEADER.unpack_from(
+            self.__map, 0
+        )
+        if magic != ACQ_MAGIC:
+            self.__map.close()
+            raise ValueError(f"{path} is not an acquisition file")
+        if version > ACQ_VERSION:
+            self.__map.close()
+            raise ValueError(f"{path} has unsupported version {version}")
+
+        metadata = json.loads(
+            self.__map[_FILE_HEADER.size:_FILE_HEADER.size + metadata_len].decode("utf-8")
+        )
+        self.channels = {
+            channel["channel"]: ChannelInfo(**channel) for channel in metadata["channels"]
+        }
+        self.calibration = metadata["calibration"]
+        data_offset = _align(_FILE_HEADER.size + metadata_len)
+        if index_offset:
+            self.chunks = [
+                ChunkInfo(*entry)
+                for entry in _INDEX_ENTRY.iter_unpack(
+                    self.__map[index_offset:index_offset + num_chunks * _INDEX_ENTRY.size]
+                )
+            ]
+        else:
+            self.chunks = self.__scan_chunks(data_offset)
+
+    def __scan_chunks(self, offset: int) -> list:
+        """rebuild the chunk index of a file whose writer was not closed"""
+        chunks = []
+        while offset + _CHUNK_HEADER.size <= len(self.__map):
+            magic, channel, count, first_ns, last_ns = _CHUNK_HEADER.unpack_from(
+                self.__map, offset
+            )
+            end = offset + _CHUNK_HEADER.size + sum(_column_sizes(count))
+            if magic != CHUNK_MAGIC or end > len(self.__map):
+                break
+            chunks.append(ChunkInfo(offset, channel, count, first_ns, last_ns))
+            offset = end
+        return chunks
+
+    def __chunk_columns(self, chunk: ChunkInfo) -> dict:
+        """zero-copy memoryviews of the columns of a chunk"""
+        columns = {}
+        offset = chunk.offset + _CHUNK_HEADER.size
+        view = memoryview(self.__map)
+        for (name, typecode, _), size in zip(SAMPLE_FIELDS, _column_sizes(chunk.count)):
+            length = chunk.count * struct.calcsize(typecode)
+            columns[name] = view[offset:offset + length].cast(typecode)
+            offset += size
+        return columns
+
+    def column_views(self, channel: int, start_ns: int = None, end_ns: int = None) -> list:
+        """
+        Zero-copy views of the samples of a channel, one set of columns per chunk
+
+        Args:
+            `channel` (int): channel identifier
+
+            `start_ns` (int): only samples with timestamps from `start_ns` are returned
+
+            `end_ns` (int): only samples with timestamps before `end_ns` are returned
+
+        Returns:
+            `list`: one dict per chunk holding samples in the time range, formatted as
+                {field name (str): memoryview}
+        """
+        views = []
+        for chunk in self.chunks:
+            if chunk.channel != channel or chunk.count == 0:
+                continue
+            if (start_ns is not None and chunk.last_ns < start_ns) or (
+                end_ns is not None and chunk.first_ns >= end_ns
+            ):
+                continue
+            columns = self.__chunk_columns(chunk)
+            timestamps = columns["timestamp_ns"]
+            first = 0 if start_ns is None else bisect.bisect_left(timestamps, start_ns)
+            last = chunk.count if end_ns is None else bisect.bisect_left(timestamps, end_ns)
+            views.append({name: column[first:last] for name, column in columns.items()})
+        return views
+
+    def read_batch(self, channel: int, start_ns: int = None, end_ns: int = None) -> SampleBatch:
+        """
+        Copy the samples of a channel into a SampleBatch, see `column_views` for arguments
+        """
+        batch = SampleBatch()
+        for columns in self.column_views(channel, start_ns, end_ns):
+            for name, _, _ in SAMPLE_FIELDS:
+                getattr(batch, name).frombytes(columns[name].tobytes())
+        if sys.byteorder == "big":
+            for name, _, _ in SAMPLE_FIELDS:
+                getattr(batch, name).byteswap()
+        return batch
+
+    def read_numpy(self, channel: int, start_ns: int = None, end_ns: int = None) -> dict:
+        """
+        NumPy arrays of the samples of a channel, see `column_views` for arguments. The
+        arrays are views of the mapped file when the samples are in a single chunk.
+        Requires NumPy, installed with the `numpy` extra.
+
+        Returns:
+            `dict`: formatted as {field name (str): numpy.ndarray}
+        """
+        # pylint: disable=import-outside-toplevel
+        import numpy
+
+        views = self.column_views(channel, start_ns, end_ns)
+        arrays = {}
+        for name, _, dtype in SAMPLE_FIELDS:
+            columns = [numpy.frombuffer(view[name], dtype=dtype) for view in views]
+            if len(columns) == 1:
+                arrays[name] = columns[0]
+            else:
+                arrays[name] = (
+                    numpy.concatenate(columns) if columns else numpy.empty(0, dtype=dtype)
+                )
+        return arrays
+
+    def close(self):
+        """Unmap the file, raises BufferError if column views are still in use"""
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
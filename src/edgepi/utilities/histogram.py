@@ -0,0 +1,114 @@
+"""
+Fixed bucket histograms for timing statistics
+
+Recording a value is a bisection over the bucket bounds, with no allocation, so histograms can
+be updated from timing critical loops.
+
+Classes:
+    Histogram
+
+Functions:
+    exponential_bounds(float, float, int)
+"""
+
+import bisect
+
+
+def exponential_bounds(start: float, factor: float, count: int) -> list:
+    """
+    Bucket upper bounds growing geometrically
+
+    Args:
+        `start` (float): upper bound of the first bucket
+        `factor` (float): ratio between consecutive bounds, greater than 1
+        `count` (int): number of bounds
+
+    Returns:
+        `list`: the bounds, e.g. [1, 2, 4, 8] for start=1, factor=2, count=4
+    """
+    if start <= 0 or factor <= 1 or count < 1:
+        raise ValueError(f"Invalid bounds start={start}, factor={factor}, count={count}")
+    return [start * factor ** i for i in range(count)]
+
+
+# 1 µs to about 1 s, in nanoseconds
+DEFAULT_TIME_BOUNDS_NS = exponential_bounds(1000, 2, 21)
+
+
+class Histogram:
+    """
+    Counts of recorded values per bucket. Bucket `i` counts values v with
+    bounds[i - 1] < v <= bounds[i], and a last bucket counts values above the last bound.
+
+    Args:
+        `bounds` (list): increasing bucket upper bounds
+    """
+
+    def __init__(self, bounds: list = None):
+        bounds = list(bounds if bounds is not None else DEFAULT_TIME_BOUNDS_NS)
+        if not bounds or any(low >= high for low, high in zip(bounds, bounds[1:])):
+            raise ValueError(f"bounds must be non-empty and increasing, got {bounds}")
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value: float):
+        """Add a value to the histogram"""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        """mean of the recorded values, None if no values were recorded"""
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Upper bound of the bucket holding a quantile of the recorded values
+
+        Args:
+            `fraction` (float): quantile, e.g. 0.99 for the 99th percentile
+
+        Returns:
+            `float`: the bucket's upper bound, the maximum value for the last bucket, or None
+                if no values were recorded
+        """
+        if not 0 <= fraction <= 1:
+            raise ValueError(f"fraction must be between 0 and 1, got {fraction}")
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        total = 0
+        for index, count in enumerate(self.counts):
+            total += count
+            if total >= rank and count:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def buckets(self) -> list:
+        """
+        Cumulative bucket counts, as Prometheus histograms report them
+
+        Returns:
+            `list`: (upper bound, number of values <= upper bound) of each bucket, the last
+                bucket's upper bound being `float("inf")`
+        """
+        cumulative = []
+        total = 0
+        for bound, count in zip(self.bounds + [float("inf")], self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+    def __repr__(self) -> str:
+        return (
+            f"Histogram(count={self.count}, mean={self.mean}, min={self.min}, max={self.max})"
+        )
@@ -0,0 +1,154 @@
+"""
+Fixed rate tasks run from a dedicated thread
+
+`PeriodicRunner` runs iterations of a task from a daemon thread, on a deadline schedule,
+`start + n * period`, so per-iteration delays do not accumulate into a rate error. An iteration
+which ends after the next iteration's deadline is an overrun, and the schedule restarts from
+its end, so the following iterations are not rushed to catch up.
+
+Classes:
+    PeriodicRunner
+"""
+
+from abc import ABC, abstractmethod
+import logging
+import threading
+import time
+
+from edgepi.utilities.waiter import Waiter
+
+_logger = logging.getLogger(__name__)
+
+
+class PeriodicRunner(ABC):
+    """
+    Base class for fixed rate tasks run from a dedicated thread. Subclasses implement
+    `_session` and `_iterate`, and `start`, which starts the thread with `_start_thread`.
+
+    Args:
+        `waiter` (Waiter): waits for each iteration's deadline
+    """
+
+    def __init__(self, waiter: Waiter):
+        self.waiter = waiter
+        # exception raised by the runner thread, if any
+        self.error = None
+        self.__thread = None
+        self.__stop_event = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        """True while the runner thread is running"""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @abstractmethod
+    def start(self):
+        """Prepare the devices and start the run"""
+
+    def _start_thread(self, rate: float, name: str, max_iterations: int = None):
+        """
+        Start the runner thread
+
+        Args:
+            `rate` (float): iterations per second
+
+            `name` (str): name of the runner thread
+
+            `max_iterations` (int): number of iterations to run, None to run until `_iterate`
+                returns None or `stop` is called
+        """
+        self.error = None
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(
+            target=self.__run, args=(int(1e9 / rate), max_iterations), name=name, daemon=True
+        )
+        self.__thread.start()
+
+    @abstractmethod
+    def _session(self):
+        """Context manager holding the devices used by the iterations open during the run"""
+
+    @abstractmethod
+    def _iterate(self, deadline_ns: int) -> int:
+        """
+        Run one iteration
+
+        Args:
+            `deadline_ns` (int): `time.perf_counter_ns` deadline of the iteration
+
+        Returns:
+            `int`: `time.perf_counter_ns` time the iteration ended at, None to end the run
+        """
+
+    def _overrun(self, lateness_ns: int):
+        """
+        Called when an iteration ends after the next iteration's deadline
+
+        Args:
+            `lateness_ns` (int): time between the next iteration's deadline and the end of
+                the iteration
+        """
+
+    def __run(self, period_ns: int, max_iterations: int):
+        """Runner thread, runs an iteration at each deadline"""
+        waiter, iterate = self.waiter, self._iterate
+        name = threading.current_thread().name
+        iterations = 0
+        try:
+            with self._session():
+                deadline_ns = time.perf_counter_ns()
+                while max_iterations is None or iterations < max_iterations:
+                    if self.__stop_event.is_set():
+                        break
+                    waiter.wait_until(deadline_ns)
+                    end_ns = iterate(deadline_ns)
+                    if end_ns is None:
+                        break
+                    iterations += 1
+                    deadline_ns += period_ns
+                    if end_ns > deadline_ns:
+                        self._overrun(end_ns - deadline_ns)
+                        deadline_ns = end_ns
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            _logger.error(f"{name} failed: {exc}")
+            self.error = exc
+        _logger.debug(f"{name} ended after {iterations} iterations")
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait for the run to end
+
+        Args:
+            `timeout` (float): maximum time to wait in seconds, None to wait indefinitely
+
+        Returns:
+            `bool`: True if the run has ended
+
+        Raises:
+            the exception that ended the run, if the run failed
+        """
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+        return not self.is_running
+
+    def stop(self, timeout: float = None) -> bool:
+        """
+        Stop the run
+
+        Args:
+            `timeout` (float): maximum time to wait for the runner thread in seconds
+
+        Returns:
+            `bool`: True if the run has ended
+        """
+        self.__stop_event.set()
+        return self.wait(timeout)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.stop()
@@ -0,0 +1,148 @@
+"""
+Timestamped sample records for acquisition APIs
+
+A sample record holds the time a sample was read from its device, the channel it was read
+from, the raw code returned by the device, the calibrated value computed from the raw code,
+and the device status bits returned with the sample. Timestamps are `time.monotonic_ns`
+values taken right after the SPI transfer that read the sample.
+
+Batches of records are stored column-wise in `array.array` objects, so that large batches
+stay compact and can be converted to NumPy arrays without copying each record.
+
+Classes:
+    SampleRecord
+    SampleBatch
+
+Constants:
+    SAMPLE_FIELDS
+"""
+
+from array import array
+
+# (field name, array typecode, NumPy dtype) of each sample record field
+SAMPLE_FIELDS = (
+    ("timestamp_ns", "q", "<i8"),
+    ("channel", "H", "<u2"),
+    ("raw_code", "q", "<i8"),
+    ("value", "d", "<f8"),
+    ("status", "H", "<u2"),
+)
+
+
+class SampleRecord:
+    """
+    A single timestamped sample
+
+    Attributes:
+        `timestamp_ns` (int): `time.monotonic_ns` value when the sample was read
+        `channel` (int): device specific identifier of the channel sampled
+        `raw_code` (int): unsigned raw code read from the device
+        `value` (float): calibrated value computed from the raw code
+        `status` (int): device status bits read with the sample
+    """
+
+    __slots__ = tuple(name for name, _, _ in SAMPLE_FIELDS)
+
+    def __init__(self, timestamp_ns: int, channel: int, raw_code: int, value: float, status: int):
+        self.timestamp_ns = timestamp_ns
+        self.channel = channel
+        self.raw_code = raw_code
+        self.value = value
+        self.status = status
+
+    def as_tuple(self) -> tuple:
+        """Returns the record fields, in SAMPLE_FIELDS order"""
+        return (self.timestamp_ns, self.channel, self.raw_code, self.value, self.status)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SampleRecord):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __repr__(self) -> str:
+        return (
+            f"SampleRecord(timestamp_ns={self.timestamp_ns}, channel={self.channel}, "
+            f"raw_code={hex(self.raw_code)}, value={self.value}, status={hex(self.status)})"
+        )
+
+
+class SampleBatch:
+    """
+    A batch of timestamped samples, stored as one array per record field
+
+    Attributes:
+        `timestamp_ns`, `channel`, `raw_code`, `value`, `status` (array.array): record field
+            columns, see `SampleRecord`
+    """
+
+    __slots__ = tuple(name for name, _, _ in SAMPLE_FIELDS)
+
+    def __init__(self, records: list = None):
+        """
+        Args:
+            `records` (list): SampleRecord objects to initialize the batch with
+        """
+        self.timestamp_ns = array("q")
+        self.channel = array("H")
+        self.raw_code = array("q")
+        self.value = array("d")
+        self.status = array("H")
+        for record in records or []:
+            self.append(*record.as_tuple())
+
+    def append(self, timestamp_ns: int, channel: int, raw_code: int, value: float, status: int):
+        """Add a sample to the batch"""
+        self.timestamp_ns.append(timestamp_ns)
+        self.channel.append(channel)
+        self.raw_code.append(raw_code)
+        self.value.append(value)
+        self.status.append(status)
+
+    def extend(self, other: "SampleBatch"):
+        """Add the samples of another batch to this batch"""
+        for name, _, _ in SAMPLE_FIELDS:
+            getattr(self, name).extend(getattr(other, name))
+
+    def __len__(self) -> int:
+        return len(self.timestamp_ns)
+
+    def __getitem__(self, index: int) -> SampleRecord:
+        return SampleRecord(
+            self.timestamp_ns[index],
+            self.channel[index],
+            self.raw_code[index],
+            self.value[index],
+            self.status[index],
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SampleBatch):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name, _, _ in SAMPLE_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"SampleBatch({list(self)})"
+
+    def to_numpy(self):
+        """
+        Convert the batch to a NumPy structured array, with one field per record field.
+        Requires NumPy, installed with the `numpy` extra.
+
+        Returns:
+            `numpy.ndarray`: structured array of the samples
+        """
+        # pylint: disable=import-outside-toplevel
+        import numpy
+
+        samples = numpy.empty(
+            len(self), dtype=[(name, dtype) for name, _, dtype in SAMPLE_FIELDS]
+        )
+        for name, _, _ in SAMPLE_FIELDS:
+            # arrays expose the buffer protocol, so columns are read without per-item conversion
+            column = getattr(self, name)
+            samples[name] = numpy.frombuffer(column, dtype=column.typecode)
+        return samples
@@ -0,0 +1,226 @@
+"""
+Optional tracing of SDK operations
+
+When enabled, public SDK methods and their internal stages (register map reads, configuration
+writes, SPI command sequences, conversion waits, bus lock waits, EEPROM page I/O) record
+timed spans. Spans of a thread nest by time, so the trace shows where a slow call spent its
+time. Tracing is disabled by default, costing a single attribute check per traced call:
+
+    TRACER.enable()
+    adc.read_samples_adc1_batch(...)
+    TRACER.save_chrome_trace("trace.json")   # open with chrome://tracing or ui.perfetto.dev
+
+Classes:
+    Span
+    Tracer
+
+Functions:
+    traced(str, str)
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class Span:
+    """
+    A timed operation
+
+    Attributes:
+        `name` (str): operation name, e.g. "EdgePiADC.__get_register_map"
+        `category` (str): operation category, e.g. "adc", "spi", "lock"
+        `start_ns` (int): time.perf_counter_ns value at the start of the operation
+        `end_ns` (int): time.perf_counter_ns value at the end of the operation
+        `thread_id` (int): identifier of the thread running the operation
+        `args` (dict): operation details shown with the span
+    """
+
+    name: str
+    category: str
+    start_ns: int
+    end_ns: int
+    thread_id: int
+    args: dict = field(default_factory=dict)
+
+    @property
+    def duration_ns(self) -> int:
+        """duration of the operation"""
+        return self.end_ns - self.start_ns
+
+
+class _ActiveSpan:
+    """Context manager timing a span and adding it to a tracer on exit"""
+
+    def __init__(self, tracer, name: str, category: str, args: dict):
+        self.__tracer = tracer
+        self.__name = name
+        self.__category = category
+        self.__args = args
+        self.__start_ns = None
+
+    def __enter__(self):
+        self.__start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, _exc, _traceback):
+        args = self.__args
+        if exc_type is not None:
+            args = {**args, "error": exc_type.__name__}
+        self.__tracer.add_span(
+            self.__name, self.__category, self.__start_ns, time.perf_counter_ns(), args
+        )
+
+
+class _NullSpan:
+    """Context manager doing nothing, returned while tracing is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects spans of the whole process. The oldest spans are dropped once `max_spans` are
+    held.
+
+    Args:
+        `max_spans` (int): maximum number of spans held
+    """
+
+    def __init__(self, max_spans: int = 100000):
+        self.enabled = False
+        self.__spans = deque(maxlen=max_spans)
+        self.__thread_names = {}
+
+    def enable(self):
+        """Start recording spans"""
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording spans. Spans recorded so far are kept."""
+        self.enabled = False
+
+    def clear(self):
+        """Discard all spans"""
+        self.__spans.clear()
+        self.__thread_names.clear()
+
+    def span(self, name: str, category: str = "sdk", **args):
+        """
+        Time an operation
+
+        Args:
+            `name` (str): operation name
+            `category` (str): operation category
+            `args` : operation details shown with the span
+
+        Returns:
+            a context manager recording the span on exit, doing nothing while disabled
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _ActiveSpan(self, name, category, args)
+
+    def add_span(self, name: str, category: str, start_ns: int, end_ns: int, args: dict = None):
+        """
+        Record an operation timed by the caller. Does nothing while disabled.
+
+        Args:
+            `name` (str): operation name
+            `category` (str): operation category
+            `start_ns` (int): time.perf_counter_ns value at the start of the operation
+            `end_ns` (int): time.perf_counter_ns value at the end of the operation
+            `args` (dict): operation details shown with the span
+        """
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        self.__thread_names[thread.ident] = thread.name
+        self.__spans.append(
+            Span(name, category, start_ns, end_ns, thread.ident, args if args else {})
+        )
+
+    def spans(self) -> list:
+        """
+        Returns:
+            `list`: recorded spans, in order of completion
+        """
+        return list(self.__spans)
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Convert the recorded spans to the Chrome trace event format, as complete ("X") events
+        with timestamps in microseconds
+
+        Returns:
+            `dict`: the trace, serializable with `json.dump`
+        """
+        pid = os.getpid()
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self.__thread_names.items())
+        ]
+        for span in self.spans():
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": span.start_ns / 1000,
+                    "dur": span.duration_ns / 1000,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": {key: str(value) for key, value in span.args.items()},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ns"}
+
+    def save_chrome_trace(self, path: str):
+        """
+        Write the recorded spans to a Chrome trace event JSON file
+
+        Args:
+            `path` (str): path of the file written
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file)
+
+
+# tracer of this process
+TRACER = Tracer()
+
+
+def traced(name: str = None, category: str = "sdk"):
+    """
+    Decorator recording a span for each call of a function while `TRACER` is enabled
+
+    Args:
+        `name` (str): span name, defaults to the function's qualified name
+        `category` (str): span category
+    """
+
+    def decorator(func):
+        span_name = name if name is not None else func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with _ActiveSpan(TRACER, span_name, category, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
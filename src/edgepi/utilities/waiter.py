@@ -0,0 +1,189 @@
+"""
+Waiting strategies for short device delays, such as ADC conversion times
+
+`time.sleep` is subject to the scheduler's wake-up latency, which on the Raspberry Pi often
+overshoots short delays by 50-100 µs or more. For delays of a few hundred microseconds this
+overshoot dominates, so devices can be given a waiter which spins on `time.perf_counter_ns`
+for all, or only the last part, of the delay.
+
+Classes:
+    WaitStrategy
+    WaitStats
+    Waiter
+    SleepWaiter
+    SpinWaiter
+    HybridWaiter
+    NullWaiter
+
+Functions:
+    get_waiter(WaitStrategy)
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+import time
+
+
+class WaitStrategy(Enum):
+    """Waiting strategies available for device delays"""
+
+    SLEEP = "sleep"
+    SPIN = "spin"
+    HYBRID = "hybrid"
+    NONE = "none"
+
+
+@dataclass
+class WaitStats:
+    """
+    Overshoot statistics of the waits performed by a waiter, in nanoseconds. Overshoot is
+    the time elapsed past a wait's deadline when the wait returned.
+
+    Attributes:
+        `count` (int): number of waits performed
+        `total_overshoot_ns` (int): sum of the overshoot of all waits
+        `min_overshoot_ns` (int): smallest overshoot, None if no waits were performed
+        `max_overshoot_ns` (int): largest overshoot, None if no waits were performed
+    """
+
+    count: int = 0
+    total_overshoot_ns: int = 0
+    min_overshoot_ns: int = None
+    max_overshoot_ns: int = None
+
+    @property
+    def mean_overshoot_ns(self) -> float:
+        """mean overshoot of all waits, None if no waits were performed"""
+        return self.total_overshoot_ns / self.count if self.count else None
+
+    def record(self, overshoot_ns: int):
+        """Add the overshoot of a wait to the statistics"""
+        self.count += 1
+        self.total_overshoot_ns += overshoot_ns
+        if self.min_overshoot_ns is None or overshoot_ns < self.min_overshoot_ns:
+            self.min_overshoot_ns = overshoot_ns
+        if self.max_overshoot_ns is None or overshoot_ns > self.max_overshoot_ns:
+            self.max_overshoot_ns = overshoot_ns
+
+
+class Waiter(ABC):
+    """
+    Base class for waiting strategies. Subclasses implement `_wait_until`, waiting until
+    `time.perf_counter_ns` reaches a deadline.
+    """
+
+    strategy: WaitStrategy = None
+
+    def __init__(self):
+        self.stats = WaitStats()
+
+    def wait(self, seconds: float):
+        """
+        Wait for a delay, and record the overshoot
+
+        Args:
+            `seconds` (float): delay in seconds
+        """
+        self.wait_until(time.perf_counter_ns() + int(seconds * 1e9))
+
+    def wait_until(self, deadline_ns: int):
+        """
+        Wait until a deadline, and record the overshoot
+
+        Args:
+            `deadline_ns` (int): deadline as a `time.perf_counter_ns` value
+        """
+        self._wait_until(deadline_ns)
+        self.stats.record(max(time.perf_counter_ns() - deadline_ns, 0))
+
+    def reset_stats(self):
+        """Clear the overshoot statistics"""
+        self.stats = WaitStats()
+
+    @abstractmethod
+    def _wait_until(self, deadline_ns: int):
+        """Wait until `time.perf_counter_ns` reaches `deadline_ns`"""
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(stats={self.stats})"
+
+
+class SleepWaiter(Waiter):
+    """Waits using `time.sleep`, leaving the CPU to other threads and processes"""
+
+    strategy = WaitStrategy.SLEEP
+
+    def _wait_until(self, deadline_ns: int):
+        remaining_ns = deadline_ns - time.perf_counter_ns()
+        if remaining_ns > 0:
+            time.sleep(remaining_ns / 1e9)
+
+
+class SpinWaiter(Waiter):
+    """Waits by polling `time.perf_counter_ns`, keeping one CPU core busy for the whole delay"""
+
+    strategy = WaitStrategy.SPIN
+
+    def _wait_until(self, deadline_ns: int):
+        while time.perf_counter_ns() < deadline_ns:
+            pass
+
+
+class HybridWaiter(Waiter):
+    """
+    Sleeps until shortly before the deadline, then spins for the rest of the delay
+
+    Args:
+        `spin_us` (float): time before the deadline at which to stop sleeping and start
+            spinning, in microseconds. Should exceed the typical `time.sleep` overshoot.
+    """
+
+    strategy = WaitStrategy.HYBRID
+
+    def __init__(self, spin_us: float = 200):
+        super().__init__()
+        if spin_us < 0:
+            raise ValueError(f"spin_us must not be negative, got {spin_us}")
+        self.spin_ns = int(spin_us * 1000)
+
+    def _wait_until(self, deadline_ns: int):
+        sleep_ns = deadline_ns - self.spin_ns - time.perf_counter_ns()
+        if sleep_ns > 0:
+            time.sleep(sleep_ns / 1e9)
+        while time.perf_counter_ns() < deadline_ns:
+            pass
+
+
+class NullWaiter(Waiter):
+    """
+    Returns immediately, for devices whose delays are simulated, e.g. when replaying
+    recorded SPI transfers to measure software overhead
+    """
+
+    strategy = WaitStrategy.NONE
+
+    def _wait_until(self, deadline_ns: int):
+        pass
+
+
+_waiter_classes = {
+    WaitStrategy.SLEEP: SleepWaiter,
+    WaitStrategy.SPIN: SpinWaiter,
+    WaitStrategy.HYBRID: HybridWaiter,
+    WaitStrategy.NONE: NullWaiter,
+}
+
+
+def get_waiter(strategy: WaitStrategy, **kwargs) -> Waiter:
+    """
+    Create a waiter using a waiting strategy
+
+    Args:
+        `strategy` (WaitStrategy): the waiting strategy
+        `kwargs`: arguments of the waiter class, such as `spin_us` for `WaitStrategy.HYBRID`
+
+    Returns:
+        `Waiter`: a new waiter, with its own overshoot statistics
+    """
+    return _waiter_classes[strategy](**kwargs)
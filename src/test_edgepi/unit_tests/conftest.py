@@ -0,0 +1,16 @@
+"""Fixtures shared by all unit tests"""
+
+import pytest
+from edgepi.adc.edgepi_adc import EdgePiADC
+from edgepi.gpio.edgepi_gpio_expander import EdgePiGPIOExpander
+from edgepi.peripherals import ipc
+
+
+@pytest.fixture(autouse=True)
+def fixture_ipc_dirs(tmp_path, monkeypatch):
+    """Keep bus lock and register shadow files of the tests out of the system directories"""
+    monkeypatch.setattr(ipc, "LOCK_DIRS", [str(tmp_path)])
+    monkeypatch.setattr(ipc, "SHM_DIRS", [str(tmp_path)])
+    # each test gets a new ADC register shadow and GPIO expander write counter
+    monkeypatch.setattr(EdgePiADC, "_EdgePiADC__shadow", None)
+    monkeypatch.setattr(EdgePiGPIOExpander, "_EdgePiGPIOExpander__write_counter", None)
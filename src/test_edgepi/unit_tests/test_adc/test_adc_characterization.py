@@ -0,0 +1,56 @@
+"""Unit tests for adc_characterization.py module"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from edgepi.adc.adc_characterization import characterize_conversion_times
+from edgepi.adc.adc_conv_time import ConvTimeProfile
+from edgepi.adc.adc_constants import (
+    ADCNum,
+    ADC1DataRate as DR1,
+    ADC2DataRate as DR2,
+    FilterMode as FILT,
+)
+
+
+def _mock_adc(times: dict):
+    """ADC whose conversions take times[(adc_num, start)] ms"""
+    adc = MagicMock()
+    adc.measure_conversion_time.side_effect = (
+        lambda adc_num, start=True: times[(adc_num, start)].pop(0)
+    )
+    return adc
+
+
+def test_characterize_conversion_times():
+    adc = _mock_adc({
+        # two ADC1 configurations, ADC2: 3 initial and 1 more to start continuous conversions
+        (ADCNum.ADC_1, True): [0.5, 0.7, 0.9, 0.6, 0.8, 0.9],
+        (ADCNum.ADC_2, True): [5, 6, 4, 6],
+        # continuous conversion times include 2 skipped conversions per configuration
+        (ADCNum.ADC_1, False): [9, 9, 0.1, 0.2, 9, 9, 0.3, 0.1],
+        (ADCNum.ADC_2, False): [9, 9, 1, 2],
+    })
+    profile = characterize_conversion_times(
+        adc,
+        adc_1_data_rates=[DR1.SPS_38400],
+        adc_2_data_rates=[DR2.SPS_800],
+        filter_modes=[FILT.SINC1, FILT.SINC2],
+        num_trials=2,
+    )
+    assert profile == ConvTimeProfile(
+        adc1_initial={
+            DR1.SPS_38400.value.op_code: {
+                FILT.SINC1.value.op_code: 0.7,
+                FILT.SINC2.value.op_code: 0.8,
+            }
+        },
+        adc1_continuous={DR1.SPS_38400.value.op_code: 0.3},
+        adc2_initial={DR2.SPS_800.value.op_code: 6},
+        adc2_continuous={DR2.SPS_800.value.op_code: 2},
+    )
+
+
+def test_characterize_conversion_times_invalid_trials():
+    with pytest.raises(ValueError):
+        characterize_conversion_times(MagicMock(), num_trials=0)
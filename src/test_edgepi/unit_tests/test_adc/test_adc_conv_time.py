@@ -8,6 +8,7 @@ from edgepi.adc.adc_conv_time import (
     ADC1_INITIAL_DELAYS,
     ADC2_CONT_DELAYS,
     ADC2_INITIAL_DELAYS,
+    ConvTimeProfile,
 )
 from edgepi.adc.adc_constants import (
     FilterMode as FILT,
@@ -740,3 +741,48 @@ def test_compute_initial_time_delay(adc_num, data_rate, filter_mode, expected):
 )
 def test_compute_continuous_time_delay_adc_1(adc_num, data_rate, expected):
     assert expected_continuous_time_delay(adc_num, data_rate) == expected
+
+
+def _profile():
+    return ConvTimeProfile(
+        adc1_initial={DR1.SPS_38400.value.op_code: {FILT.SINC1.value.op_code: 0.2}},
+        adc1_continuous={DR1.SPS_38400.value.op_code: 0.03},
+        adc2_initial={DR2.SPS_800.value.op_code: 3.0},
+        adc2_continuous={DR2.SPS_800.value.op_code: 1.0},
+        margin=0.5,
+        margin_ms=0.1,
+    )
+
+
+@pytest.mark.parametrize("adc_num, data_rate, filter_mode, expected", [
+    (ADCNum.ADC_1, DR1.SPS_38400.value.op_code, FILT.SINC1.value.op_code, 0.2 * 1.5 + 0.1),
+    (ADCNum.ADC_2, DR2.SPS_800.value.op_code, FILT.SINC1.value.op_code, 3.0 * 1.5 + 0.1),
+    # configurations missing from the profile use the datasheet delays
+    (
+        ADCNum.ADC_1,
+        DR1.SPS_38400.value.op_code,
+        FILT.SINC4.value.op_code,
+        ADC1_INITIAL_DELAYS[DR1.SPS_38400.value.op_code][FILT.SINC4.value.op_code],
+    ),
+    (ADCNum.ADC_2, DR2.SPS_10.value.op_code, FILT.SINC1.value.op_code,
+     ADC2_INITIAL_DELAYS[DR2.SPS_10.value.op_code]),
+])
+def test_initial_time_delay_with_profile(adc_num, data_rate, filter_mode, expected):
+    delay = expected_initial_time_delay(adc_num, data_rate, filter_mode, _profile())
+    assert delay == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("adc_num, data_rate, expected", [
+    (ADCNum.ADC_1, DR1.SPS_38400.value.op_code, 0.03 * 1.5 + 0.1),
+    (ADCNum.ADC_2, DR2.SPS_800.value.op_code, 1.0 * 1.5 + 0.1),
+    (ADCNum.ADC_1, DR1.SPS_20.value.op_code, ADC1_CONT_DELAYS[DR1.SPS_20.value.op_code]),
+    (ADCNum.ADC_2, DR2.SPS_10.value.op_code, ADC2_CONT_DELAYS[DR2.SPS_10.value.op_code]),
+])
+def test_continuous_time_delay_with_profile(adc_num, data_rate, expected):
+    assert expected_continuous_time_delay(adc_num, data_rate, _profile()) == pytest.approx(expected)
+
+
+def test_conv_time_profile_save_load(tmp_path):
+    path = str(tmp_path / "profile.json")
+    _profile().save(path)
+    assert ConvTimeProfile.load(path) == _profile()
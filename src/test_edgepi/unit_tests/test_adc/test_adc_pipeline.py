@@ -0,0 +1,65 @@
+"""Unit tests for adc_pipeline.py module"""
+
+import pytest
+
+from edgepi.adc.adc_pipeline import (
+    BlockAverage,
+    BlockMedian,
+    CodeFilter,
+    CodePipeline,
+    Decimator,
+    MovingAverage,
+)
+
+
+@pytest.mark.parametrize(
+    "code_filter, codes, expected",
+    [
+        (BlockAverage(2), [1, 3, 5, 7, 9], [2, 6]),
+        (BlockAverage(1), [1, -3], [1, -3]),
+        (MovingAverage(3), [3, 6, 9, 12], [6, 9]),
+        (MovingAverage(1), [1, 2], [1, 2]),
+        (BlockMedian(3), [1, 1000, 2, -500, 5, 6, 7], [2, 5]),
+        (BlockMedian(2), [1, 3, 8, 2], [2, 5]),
+        (Decimator(3), [0, 1, 2, 3, 4, 5, 6], [0, 3, 6]),
+        (CodePipeline(BlockMedian(3), BlockAverage(2)), [1, 9, 2, 4, 3, -9], [2.5]),
+        (CodePipeline(), [1, 2], [1, 2]),
+    ],
+)
+def test_filter_process(code_filter, codes, expected):
+    assert code_filter.process(codes) == expected
+
+
+@pytest.mark.parametrize(
+    "make_filter",
+    [
+        lambda: BlockAverage(3),
+        lambda: MovingAverage(4),
+        lambda: BlockMedian(3),
+        lambda: Decimator(4),
+        lambda: CodePipeline(MovingAverage(2), Decimator(3)),
+    ],
+)
+def test_filter_streaming_matches_single_call(make_filter):
+    codes = [(i * 37) % 101 - 50 for i in range(50)]
+    expected = make_filter().process(codes)
+    streamed_filter = make_filter()
+    streamed = []
+    for start in range(0, len(codes), 7):
+        streamed += streamed_filter.process(codes[start:start + 7])
+    assert streamed == expected
+
+    streamed_filter.reset()
+    assert streamed_filter.process(codes) == expected
+
+
+@pytest.mark.parametrize("filter_class", [BlockAverage, MovingAverage, BlockMedian, Decimator])
+@pytest.mark.parametrize("size", [0, -1, 1.5])
+def test_filter_invalid_size(filter_class, size):
+    with pytest.raises(ValueError):
+        filter_class(size)
+
+
+def test_code_filter_is_abstract():
+    with pytest.raises(TypeError):
+        CodeFilter()  # pylint: disable=abstract-class-instantiated
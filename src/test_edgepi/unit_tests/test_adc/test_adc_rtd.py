@@ -0,0 +1,74 @@
+"""Unit tests for adc_rtd.py module"""
+
+import math
+
+import pytest
+
+from edgepi.adc.adc_constants import ADCNum
+from edgepi.adc.adc_rtd import CVDCoefficients, RTDConverter, RTDModel, cvd_resistance
+from edgepi.adc.adc_voltage import code_to_temperature
+
+
+@pytest.mark.parametrize(
+    "temperature, resistance",
+    [(0, 100), (100, 138.5055), (-100, 60.2558), (-200, 18.5201), (850, 390.4811)],
+)
+def test_cvd_resistance(temperature, resistance):
+    resistance_computed = cvd_resistance(temperature, 100, CVDCoefficients())
+    assert resistance_computed == pytest.approx(resistance, abs=1e-4)
+
+
+@pytest.mark.parametrize(
+    "code, adc_num, gain, offset",
+    [
+        ([0x03, 0x85, 0x1E, 0xB8], ADCNum.ADC_1, 1, 0),
+        ([0x03, 0x85, 0x1E], ADCNum.ADC_2, 1, 0),
+        ([0x03, 0x85, 0x1E, 0xB8], ADCNum.ADC_1, 1.02, -0.5),
+        ([0x01, 0x00, 0x00], ADCNum.ADC_2, 0.98, 0.25),
+    ],
+)
+def test_linear_matches_code_to_temperature(code, adc_num, gain, offset):
+    converter = RTDConverter(2000, adc_num, gain=gain, offset=offset)
+    expected = code_to_temperature(code, 2000, 100, 0.385, gain, offset, adc_num)
+    raw_code = int.from_bytes(bytes(code), "big")
+    assert converter.convert([raw_code]) == [pytest.approx(expected)]
+
+
+@pytest.mark.parametrize("adc_num", [ADCNum.ADC_1, ADCNum.ADC_2])
+def test_cvd_convert(adc_num):
+    converter = RTDConverter(
+        2000, adc_num, gain=1.01, offset=-0.2, model=RTDModel.CALLENDAR_VAN_DUSEN
+    )
+    temperatures = [-195.3, -40, -0.25, 0, 25, 301.7, 849]
+    codes = [
+        round(cvd_resistance(t, 100, CVDCoefficients()) / converter.ohms_per_code)
+        for t in temperatures
+    ]
+    converted = converter.convert(codes)
+    for temperature, result in zip(temperatures, converted):
+        assert result == pytest.approx(temperature * 1.01 - 0.2, abs=1e-3)
+
+
+def test_cvd_out_of_range():
+    converter = RTDConverter(2000, ADCNum.ADC_2, model=RTDModel.CALLENDAR_VAN_DUSEN)
+    too_cold, too_hot = [
+        round(resistance / converter.ohms_per_code) for resistance in (10, 400)
+    ]
+    assert all(math.isnan(t) for t in converter.convert([too_cold, too_hot]))
+
+
+@pytest.mark.parametrize("model", list(RTDModel))
+def test_convert_numpy(model):
+    numpy = pytest.importorskip("numpy")
+    converter = RTDConverter(2000, ADCNum.ADC_1, gain=1.01, offset=0.1, model=model)
+    codes = [2**30 // 25 + i * 100_000 for i in range(50)] + [0]
+    expected = converter.convert(codes)
+    assert numpy.allclose(converter.convert_numpy(codes), expected, equal_nan=True)
+
+
+@pytest.mark.parametrize("t_range, t_step", [((-200, 850), 0), ((100, 100), 1)])
+def test_invalid_lookup_table(t_range, t_step):
+    with pytest.raises(ValueError):
+        RTDConverter(
+            2000, ADCNum.ADC_1, model=RTDModel.CALLENDAR_VAN_DUSEN, t_range=t_range, t_step=t_step
+        )
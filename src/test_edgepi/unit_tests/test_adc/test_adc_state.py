@@ -9,7 +9,7 @@ sys.modules['periphery'] = mock.MagicMock()
 
 # pylint: disable=wrong-import-position
 # mocked periphery module needs to be placed above
-from edgepi.adc.adc_state import ADCState
+from edgepi.adc.adc_state import ADCReadFields, ADCState
 from edgepi.adc.adc_query_lang import ADCProperties
 from edgepi.adc.adc_constants import (
     ADC1DataRate,
@@ -913,3 +913,42 @@ def test_adc_state_init(updates, state_property, expected):
     # using eval to access nested attributes of state with dot notation
     state = ADCState(reg_map)
     assert eval(state_property) == expected
+
+
+def test_adc_state_decodes_lazily():
+    # only the registers holding ADC1 conversion mode and data rate are needed to read them
+    reg_map = {
+        ADCReg.REG_MODE0.value: ConvMode.CONTINUOUS.value.op_code,
+        ADCReg.REG_MODE2.value: ADC1DataRate.SPS_100.value.op_code,
+    }
+    state = ADCState(reg_map)
+    assert state.adc_1.conversion_mode == ADCProperties.CONV_MODE.value.values[
+        ConvMode.CONTINUOUS.value.op_code
+    ]
+    assert state.adc_1.data_rate == ADCProperties.DATA_RATE_1.value.values[
+        ADC1DataRate.SPS_100.value.op_code
+    ]
+    with pytest.raises(KeyError):
+        _ = state.filter_mode
+
+    # decoded values are kept, and later changes to the register map are not observed
+    reg_map[ADCReg.REG_MODE0.value] = ConvMode.PULSE.value.op_code
+    assert state.adc_1.conversion_mode.code == ConvMode.CONTINUOUS
+    assert ADCState(reg_map).adc_1.conversion_mode.code == ConvMode.PULSE
+
+
+def test_adc_read_fields_construction():
+    conv_mode = ADCProperties.CONV_MODE.value.values[ConvMode.CONTINUOUS.value.op_code]
+    data_rate = ADCProperties.DATA_RATE_1.value.values[ADC1DataRate.SPS_100.value.op_code]
+    mux_p = ADCProperties.ADC1_MUXP.value.values[0x00]
+    mux_n = ADCProperties.ADC1_MUXN.value.values[0x0A]
+    fields = ADCReadFields(conv_mode, data_rate, mux_p=mux_p, mux_n=mux_n)
+    assert fields.data_rate == data_rate
+    # fields decoded from a register map compare equal to constructed ones
+    reg_map = {
+        ADCReg.REG_MODE0.value: ConvMode.CONTINUOUS.value.op_code,
+        ADCReg.REG_MODE2.value: ADC1DataRate.SPS_100.value.op_code,
+        ADCReg.REG_INPMUX.value: 0x0A,
+    }
+    assert ADCState(reg_map).adc_1 == fields
+    assert fields == ADCState(reg_map).adc_1
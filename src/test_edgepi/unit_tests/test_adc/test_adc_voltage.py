@@ -10,6 +10,8 @@ from edgepi.adc.adc_voltage import (
     _adc_voltage_to_input_voltage,
     code_to_voltage,
     code_to_temperature,
+    code_to_signed_code,
+    signed_code_to_voltage,
 )
 
 # pylint: disable=too-many-lines
@@ -119,6 +121,26 @@ def test_code_to_voltage(code, adc_num, calibs, result):
 def test_code_to_voltage_single_ended(code, adc_num, calibs, result):
     assert pytest.approx(code_to_voltage(code, adc_num, calibs, single_ended=True),0.0001) == result
 
+@pytest.mark.parametrize(
+    "codes, adc_num, single_ended",
+    [
+        ([[0x00, 0x00, 0x00, 0x10], [0x00, 0x00, 0x00, 0x20]], ADCNum.ADC_1.value, False),
+        ([[0xFF, 0xFF, 0xFF, 0xF0], [0x00, 0x00, 0x00, 0x20]], ADCNum.ADC_1.value, False),
+        ([[0x80, 0x00, 0x00, 0x10], [0x7F, 0xFF, 0xFF, 0x00]], ADCNum.ADC_1.value, True),
+        ([[0xFF, 0xFF, 0xF0], [0x00, 0x01, 0x20]], ADCNum.ADC_2.value, False),
+        ([[0x80, 0x00, 0x10], [0x00, 0x01, 0x20]], ADCNum.ADC_2.value, True),
+    ],
+)
+def test_signed_code_average_matches_voltage_average(codes, adc_num, single_ended):
+    calibs = CalibParam(gain=1.01, offset=0.02)
+    signed_codes = [code_to_signed_code(code, adc_num, single_ended) for code in codes]
+    voltages = [code_to_voltage(code, adc_num, calibs, single_ended) for code in codes]
+    for signed_code, voltage in zip(signed_codes, voltages):
+        assert signed_code_to_voltage(signed_code, adc_num, calibs) == pytest.approx(voltage)
+    assert signed_code_to_voltage(
+        sum(signed_codes) / len(signed_codes), adc_num, calibs
+    ) == pytest.approx(sum(voltages) / len(voltages))
+
 @pytest.mark.parametrize(
     "code, ref_resistance, temp_offset, rtd_conv_constant,rtd_gain,rtd_offset,adc_num,expected",
     [
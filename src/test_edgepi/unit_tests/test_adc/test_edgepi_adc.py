@@ -32,15 +32,30 @@ from edgepi.adc.adc_constants import (
     ADC2DataRate,
     FilterMode,
     ADC1PGA,
+    CheckMode,
+    StatusByte,
 )
 from edgepi.reg_helper.reg_helper import OpCode, BitMask
+from edgepi.peripherals.ipc import SharedRegisterShadow
+from edgepi.utilities.crc_8_atm import CRCCheckError, get_crc
+from edgepi.adc.adc_conv_time import ConvTimeProfile, expected_continuous_time_delay
+from edgepi.utilities.sample_records import SampleRecord
+from edgepi.adc.adc_pipeline import BlockAverage
+from edgepi.adc.adc_rtd import RTDModel
+from edgepi.adc.adc_voltage import code_to_temperature, code_to_voltage
+from edgepi.peripherals.spi_replay import SpiFrame, SpiRecording, SpiReplayer
+from edgepi.utilities.waiter import NullWaiter
+from edgepi.utilities.tracing import TRACER
 from edgepi.calibration.calibration_constants import CalibParam
 from edgepi.adc.edgepi_adc import ADCState
 from edgepi.adc.adc_exceptions import (
     ADCRegisterUpdateError,
+    ContinuousModeError,
     RTDEnabledError,
-    InvalidDifferentialPairError
+    InvalidDifferentialPairError,
+    VoltageReadError,
 )
+from edgepi.adc.adc_multiplexers import ChannelNotAvailableError
 
 from edgepi.eeprom.edgepi_eeprom_data import EepromDataClass
 from edgepi.eeprom.protobuf_assets.generated_pb2 import edgepi_module_pb2
@@ -367,6 +382,35 @@ def test_config(mocker, reg_updates, args, update_vals, adc):
             assert entry["value"] == adc_vals[addx]
 
 
+@pytest.mark.parametrize(
+    "args, writes",
+    [
+        # ADC1 already runs at 20 SPS, nothing to write
+        ({"adc_1_data_rate": ADC1DataRate.SPS_20}, []),
+        (
+            {"adc_1_data_rate": ADC1DataRate.SPS_20, "adc_1_ch": CH.AIN2},
+            [(ADCReg.REG_INPMUX, [0x2A])],
+        ),
+        (
+            {"conversion_mode": ConvMode.PULSE, "adc_1_ch": CH.AIN2},
+            [(ADCReg.REG_MODE0, [0x40, 0x80, 0x04, 0x2A])],
+        ),
+        (
+            {"checksum_mode": CheckMode.CHECK_BYTE_CRC, "adc_2_ch": CH.AIN2},
+            [(ADCReg.REG_INTERFACE, [0x06]), (ADCReg.REG_ADC2MUX, [0x2A])],
+        ),
+    ],
+)
+def test_config_writes_changed_spans(mocker, args, writes, adc):
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__read_register",
+        return_value=deepcopy(adc_default_vals),
+    )
+    write_register = mocker.patch("edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__write_register")
+    adc._EdgePiADC__config(**args)
+    assert write_register.call_args_list == [mock.call(*write) for write in writes]
+
+
 @pytest.mark.parametrize(
     "args",
     [
@@ -574,16 +618,16 @@ def test_get_channel_assign_opcodes(
     "updated_regs, actual_regs, err",
     [
         (
-            {ADCReg.REG_INTERFACE.value: {"value": 0x4}},
+            {ADCReg.REG_INTERFACE.value: {"value": 0x4, "is_changed": True}},
             {ADCReg.REG_INTERFACE.value: 0x4},
             does_not_raise(),
         ),
         (
             {
-                ADCReg.REG_INTERFACE.value: {"value": 0x0},
-                ADCReg.REG_INPMUX.value: {"value": 0x1},
-                ADCReg.REG_MODE0.value: {"value": 0x2},
-                ADCReg.REG_MODE1.value: {"value": 0x3},
+                ADCReg.REG_INTERFACE.value: {"value": 0x0, "is_changed": True},
+                ADCReg.REG_INPMUX.value: {"value": 0x1, "is_changed": True},
+                ADCReg.REG_MODE0.value: {"value": 0x2, "is_changed": True},
+                ADCReg.REG_MODE1.value: {"value": 0x3, "is_changed": True},
             },
             {
                 ADCReg.REG_INTERFACE.value: 0x0,
@@ -595,10 +639,10 @@ def test_get_channel_assign_opcodes(
         ),
         (
             {
-                ADCReg.REG_INTERFACE.value: {"value": 0x0},
-                ADCReg.REG_INPMUX.value: {"value": 0x1},
-                ADCReg.REG_MODE0.value: {"value": 0x2},
-                ADCReg.REG_MODE1.value: {"value": 0x3},
+                ADCReg.REG_INTERFACE.value: {"value": 0x0, "is_changed": True},
+                ADCReg.REG_INPMUX.value: {"value": 0x1, "is_changed": True},
+                ADCReg.REG_MODE0.value: {"value": 0x2, "is_changed": True},
+                ADCReg.REG_MODE1.value: {"value": 0x3, "is_changed": True},
             },
             {
                 ADCReg.REG_INTERFACE.value: 0x0,
@@ -610,10 +654,10 @@ def test_get_channel_assign_opcodes(
         ),
         (
             {
-                ADCReg.REG_INTERFACE.value: {"value": 0x0},
-                ADCReg.REG_INPMUX.value: {"value": 0x0},
-                ADCReg.REG_MODE0.value: {"value": 0x2},
-                ADCReg.REG_MODE1.value: {"value": 0x3},
+                ADCReg.REG_INTERFACE.value: {"value": 0x0, "is_changed": True},
+                ADCReg.REG_INPMUX.value: {"value": 0x0, "is_changed": True},
+                ADCReg.REG_MODE0.value: {"value": 0x2, "is_changed": True},
+                ADCReg.REG_MODE1.value: {"value": 0x3, "is_changed": True},
             },
             {
                 ADCReg.REG_INTERFACE.value: 0x0,
@@ -638,8 +682,8 @@ def test_validate_updates(mocker, updated_regs, actual_regs, err):
     mocker.patch("edgepi.adc.edgepi_adc.EdgePiEEPROM")
     adc = EdgePiADC()
     mocker.patch(
-        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__read_registers_to_map",
-        return_value=actual_regs,
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__read_register",
+        side_effect=lambda start, num: [actual_regs[start.value + i] for i in range(num)],
     )
     with err:
         assert adc._EdgePiADC__validate_updates(updated_regs)
@@ -1245,3 +1289,536 @@ def test_set_config(param, error, adc):
                        filter_mode = param[4],
                        conversion_mode = param[5],
                        override_updates_validation = param[6])
+
+
+def test_set_config_traced(adc):
+    TRACER.clear()
+    TRACER.enable()
+    try:
+        adc.set_config(adc_1_data_rate=ADC1DataRate.SPS_20)
+    finally:
+        TRACER.disable()
+    spans = {span.name: span for span in TRACER.spans()}
+    TRACER.clear()
+    outer = spans["EdgePiADC.set_config"]
+    for name in ["EdgePiADC.__config", "EdgePiADC.__get_register_map"]:
+        assert outer.start_ns <= spans[name].start_ns <= spans[name].end_ns <= outer.end_ns
+
+
+def test_cache_shared_between_processes(mocker, tmp_path, adc):
+    shadow = SharedRegisterShadow("adc", ADC_NUM_REGS, shm_dir=str(tmp_path))
+    mocker.patch.object(EdgePiADC, "_EdgePiADC__shadow", shadow)
+    read_regs = mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__read_register",
+        return_value=deepcopy(adc_default_vals)
+    )
+    adc.enable_cache = True
+    adc.get_state(override_cache=True)
+    assert read_regs.call_count == 1
+    adc.get_state()
+    assert read_regs.call_count == 1
+
+    # another process changes the ADC1 data rate
+    other_process = SharedRegisterShadow("adc", ADC_NUM_REGS, shm_dir=str(tmp_path))
+    other_process.write({ADCReg.REG_MODE2.value: 0x0F})
+    state = adc.get_state()
+    assert read_regs.call_count == 1
+    assert state.adc_1.data_rate.code == ADC1DataRate.SPS_38400
+
+    # another process resets the ADC
+    other_process.invalidate()
+    adc.get_state()
+    assert read_regs.call_count == 2
+    assert shadow.read()[1] == dict(enumerate(adc_default_vals))
+
+
+def _mock_pinned_reads(mocker, tmp_path, voltage_reads):
+    shadow = SharedRegisterShadow("adc", ADC_NUM_REGS, shm_dir=str(tmp_path))
+    mocker.patch.object(EdgePiADC, "_EdgePiADC__shadow", shadow)
+    read_regs = mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__read_register",
+        return_value=deepcopy(adc_default_vals)
+    )
+    voltage_read = mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__voltage_read", side_effect=voltage_reads
+    )
+    mocker.patch("edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__check_adc_1_conv_mode")
+    mocker.patch("edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__continuous_time_delay")
+    mocker.patch("edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_calibration_params")
+    mocker.patch("edgepi.adc.edgepi_adc.code_to_voltage")
+    return shadow, read_regs, voltage_read
+
+
+def test_pinned_config_skips_register_reads(mocker, tmp_path, adc):
+    shadow, read_regs, voltage_read = _mock_pinned_reads(
+        mocker, tmp_path, [(0x40, [0, 0, 0, 0], 0)] * 4
+    )
+    adc.pin_config()
+    assert adc.is_config_pinned
+    reads_after_pin = read_regs.call_count
+    adc.read_voltage(ADCNum.ADC_1)
+    adc.read_voltage(ADCNum.ADC_1)
+    assert read_regs.call_count == reads_after_pin
+    assert voltage_read.call_count == 2
+
+    # another EdgePiADC object updates the registers
+    SharedRegisterShadow("adc", ADC_NUM_REGS, shm_dir=str(tmp_path)).write({})
+    adc.read_voltage(ADCNum.ADC_1)
+    assert read_regs.call_count == reads_after_pin + 1
+
+    adc.unpin_config()
+    adc.read_voltage(ADCNum.ADC_1)
+    assert read_regs.call_count == reads_after_pin + 2
+    shadow.close()
+
+
+@pytest.mark.parametrize("first_read", [
+    # STATUS byte reports an ADC reset
+    (0x41, [0, 0, 0, 0], 0),
+    # voltage read fails
+    CRCCheckError("CRC check failed"),
+])
+@pytest.mark.parametrize("enable_cache", [False, True])
+def test_pinned_config_resyncs(mocker, tmp_path, first_read, enable_cache, adc):
+    shadow, read_regs, voltage_read = _mock_pinned_reads(
+        mocker, tmp_path, [first_read, (0x40, [0, 0, 0, 0], 0)]
+    )
+    # the resync reads the ADC even though the shared register cache is valid
+    adc.enable_cache = enable_cache
+    adc.pin_config()
+    reads_after_pin = read_regs.call_count
+    adc.read_voltage(ADCNum.ADC_1)
+    assert read_regs.call_count == reads_after_pin + 1
+    assert voltage_read.call_count == 2
+    shadow.close()
+
+
+def test_pinned_config_restored_after_reset(mocker, tmp_path, adc):
+    shadow, read_regs, _ = _mock_pinned_reads(
+        mocker, tmp_path, [(0x41, [0, 0, 0, 0], 0), (0x40, [0, 0, 0, 0], 0)]
+    )
+    pinned_vals = deepcopy(adc_default_vals)
+    pinned_vals[ADCReg.REG_POWER.value] = 0x01
+    pinned_vals[ADCReg.REG_MODE2.value] = 0x0F
+    read_regs.return_value = pinned_vals
+    adc.pin_config()
+    # the ADC resets to its default register values
+    read_regs.return_value = deepcopy(adc_default_vals)
+    write_reg = mocker.patch("edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__write_register")
+    adc.read_voltage(ADCNum.ADC_1)
+    written = {}
+    for call in write_reg.call_args_list:
+        start_addx, data = call.args
+        written.update(enumerate(data, start_addx.value))
+    assert written[ADCReg.REG_POWER.value] == 0x01
+    assert written[ADCReg.REG_MODE2.value] == 0x0F
+    state = adc._EdgePiADC__pinned.state
+    assert state.adc_1.data_rate.code == ADC1DataRate.SPS_38400
+    adc.unpin_config()
+    shadow.close()
+
+
+def test_pinned_config_resync_keeps_shadow_generation(mocker, tmp_path, adc):
+    shadow, read_regs, _ = _mock_pinned_reads(mocker, tmp_path, [])
+    read_regs.return_value[ADCReg.REG_POWER.value] = 0x01
+    adc.pin_config()
+    generation = shadow.generation
+    adc._EdgePiADC__resync_pinned_state()
+    # the registers are unchanged, other processes do not need to re-sync
+    assert shadow.generation == generation
+    adc.unpin_config()
+    shadow.close()
+
+
+def test_batch_read_refreshes_pinned_state(mocker, adc):
+    # no shared register shadow to signal the register changes
+    mocker.patch.object(EdgePiADC, "_EdgePiADC__shadow", False)
+    adc.pin_config()
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC.spi_apply_adc_commands",
+        return_value=[[232, 233, 129, 25, 121, 83, 30], [224, 225, 146, 108, 19, 147, 221]],
+    )
+    adc.read_samples_adc1_batch(
+        ADC1DataRate.SPS_38400, analog_in_list=[AnalogIn.AIN1, AnalogIn.AIN2]
+    )
+    state = adc._EdgePiADC__pinned.state
+    assert state.adc_1.mux_p.code == CH.AIN1
+    assert state.adc_1.mux_n.code == CH.AINCOM
+    assert state.adc_1.data_rate.code == ADC1DataRate.SPS_38400
+    adc.unpin_config()
+
+
+def test_pin_config_invalid_interval(adc):
+    with pytest.raises(ValueError):
+        adc.pin_config(resync_interval=0)
+    assert not adc.is_config_pinned
+
+
+def test_conversion_delays_use_waiter(mocker, adc):
+    adc.waiter = mocker.MagicMock()
+    state = adc.get_state()
+    adc._EdgePiADC__continuous_time_delay(ADCNum.ADC_1, state)
+    adc.waiter.wait.assert_called_once_with(
+        expected_continuous_time_delay(ADCNum.ADC_1, state.adc_1.data_rate.code.value.op_code)
+        / 1000
+    )
+
+
+def test_measure_conversion_time(mocker, adc):
+    start_cmd = mocker.patch("edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__send_start_command")
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__is_data_ready",
+        side_effect=[False, False, True, False]
+    )
+    assert adc.measure_conversion_time(ADCNum.ADC_1) >= 0
+    start_cmd.assert_called_once_with(ADCNum.ADC_1)
+    with pytest.raises(TimeoutError):
+        adc.measure_conversion_time(ADCNum.ADC_1, start=False, timeout=0)
+    start_cmd.assert_called_once()
+
+
+def test_read_voltage_record(mocker, adc):
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__voltage_read",
+        return_value=(0x40, [0x12, 0x34, 0x56, 0x78], 0)
+    )
+    mocker.patch("edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__check_adc_1_conv_mode")
+    mocker.patch("edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__continuous_time_delay")
+    mocker.patch("edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_calibration_params")
+    mocker.patch("edgepi.adc.edgepi_adc.code_to_voltage", return_value=1.5)
+    adc.last_transfer_ns = 123
+    state = adc.get_state()
+    channel = (state.adc_1.mux_p.code.value << 4) | state.adc_1.mux_n.code.value
+    record = adc.read_voltage_record(ADCNum.ADC_1)
+    assert record == SampleRecord(123, channel, 0x12345678, 1.5, 0x40)
+    assert adc.read_voltage(ADCNum.ADC_1) == 1.5
+
+
+def test_read_sample_records_adc1_batch(mocker, adc):
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_register_map",
+        return_value=dict(enumerate(adc_default_vals))
+    )
+
+    def apply_commands(command_tup_list):
+        adc.last_command_timestamps_ns = [100, 200][:len(command_tup_list)]
+        return [[232, 233, 129, 25, 121, 83, 30], [224, 225, 146, 108, 19, 147, 221]]
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC.spi_apply_adc_commands", side_effect=apply_commands
+    )
+
+    batch = adc.read_sample_records_adc1_batch(
+        ADC1DataRate.SPS_38400, analog_in_list=[AnalogIn.AIN1, AnalogIn.AIN2]
+    )
+    assert list(batch.timestamp_ns) == [100, 200]
+    assert list(batch.channel) == [0x0A, 0x1A]
+    assert list(batch.raw_code) == [0x81197953, 0x926C1393]
+    assert list(batch.status) == [233, 225]
+    assert list(batch.value) == adc.read_samples_adc1_batch(
+        ADC1DataRate.SPS_38400, analog_in_list=[AnalogIn.AIN1, AnalogIn.AIN2]
+    )
+
+
+def test_read_samples_adc1_batch_conv_time_profile(mocker, adc):
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_register_map",
+        return_value=dict(enumerate(adc_default_vals))
+    )
+    spi_apply_commands = mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC.spi_apply_adc_commands",
+        return_value=[[232, 233, 129, 25, 121, 83, 30]],
+    )
+    # measured 2 ms conversions at every filter mode, without safety margin
+    adc.conv_time_profile = ConvTimeProfile(
+        adc1_initial={
+            ADC1DataRate.SPS_38400.value.op_code: {
+                filter_mode.value.op_code: 2.0 for filter_mode in FilterMode
+            }
+        },
+        margin=0,
+        margin_ms=0,
+    )
+    adc.read_samples_adc1_batch(ADC1DataRate.SPS_38400, analog_in_list=[AnalogIn.AIN1])
+    ((_, conversion_delay, _),) = spi_apply_commands.call_args.args[0]
+    assert conversion_delay == pytest.approx(0.002)
+
+
+def test_read_filtered_samples_adc1_batch(mocker, adc):
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_register_map",
+        return_value=dict(enumerate(adc_default_vals))
+    )
+    ain1_data = [232, 233, 129, 25, 121, 83, 30]
+    ain2_data = [224, 225, 146, 108, 19, 147, 221]
+    spi_apply_commands = mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC.spi_apply_adc_commands",
+        return_value=[ain1_data, ain2_data] * 2,
+    )
+
+    voltages = adc.read_filtered_samples_adc1_batch(
+        ADC1DataRate.SPS_38400,
+        num_scans=2,
+        analog_in_list=[AnalogIn.AIN1, AnalogIn.AIN2],
+        filters={AnalogIn.AIN1: BlockAverage(2)},
+    )
+    assert len(spi_apply_commands.call_args.args[0]) == 4
+    assert voltages[AnalogIn.AIN1] == [pytest.approx(0.1036727201741353)]
+    assert voltages[AnalogIn.AIN2] == [pytest.approx(1.7370293866017112)] * 2
+
+    with pytest.raises(ValueError):
+        adc.read_filtered_samples_adc1_batch(
+            ADC1DataRate.SPS_38400, num_scans=0, analog_in_list=[AnalogIn.AIN1]
+        )
+    # results are keyed by channel, a channel read twice would be overwritten
+    with pytest.raises(ValueError):
+        adc.read_filtered_samples_adc1_batch(
+            ADC1DataRate.SPS_38400, num_scans=2, analog_in_list=[AnalogIn.AIN1, AnalogIn.AIN1]
+        )
+    with pytest.raises(ValueError):
+        adc.read_filtered_samples_adc1_batch(
+            ADC1DataRate.SPS_38400,
+            num_scans=2,
+            differential_pairs=[DiffMode.DIFF_1, DiffMode.DIFF_1],
+        )
+
+
+def test_replay_batch_read(mocker, adc):
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_register_map",
+        return_value=dict(enumerate(adc_default_vals))
+    )
+    data_list = [[232, 233, 129, 25, 121, 83, 30], [224, 225, 146, 108, 19, 147, 221]]
+    # each channel read is a mux write followed by a data read
+    recording = SpiRecording([
+        SpiFrame(adc.devpath, 0, b"", bytes(frame))
+        for data in data_list for frame in ([0] * 4, data)
+    ])
+    adc.transport = SpiReplayer(recording, strict=False)
+    adc.waiter = NullWaiter()
+    voltages = adc.read_samples_adc1_batch(
+        ADC1DataRate.SPS_38400, analog_in_list=[AnalogIn.AIN1, AnalogIn.AIN2]
+    )
+    assert voltages == [pytest.approx(0.1036727201741353), pytest.approx(1.7370293866017112)]
+    assert adc.transport.remaining == 0
+
+
+def _dual_replayer(adc, rx_frames):
+    return SpiReplayer(
+        SpiRecording([SpiFrame(adc.devpath, 0, b"", bytes(rx)) for rx in rx_frames]),
+        strict=False,
+    )
+
+
+def test_read_dual_samples(mocker, adc):
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_register_map",
+        return_value=dict(enumerate(adc_default_vals))
+    )
+    adc_1_data = [0x12, 0x34, 0x56, 0x78, 28]
+    adc_2_read = [0, 0x80, 1, 2, 3, 0, 72]
+    adc.transport = _dual_replayer(adc, [
+        [0] * 4,  # start ADC2
+        [0] * 4,  # start ADC1
+        [0, 0x00] + [0] * 5,  # no new data
+        [0, 0x80] + [0] * 5,  # ADC2 new data
+        adc_2_read,
+        [0, 0x40] + adc_1_data,  # ADC1 new data, first channel
+        [0] * 4,  # start ADC1, second channel
+        [0, 0xC0] + adc_1_data,  # ADC1 and ADC2 new data
+        adc_2_read,
+        [0],  # stop ADC2
+    ])
+    samples = adc.read_dual_samples(
+        [AnalogIn.AIN1, DiffMode.DIFF_1], [AnalogIn.AIN8], num_scans=1
+    )
+    assert adc.transport.remaining == 0
+    assert list(samples[ADCNum.ADC_1].channel) == [
+        (CH.AIN0.value << 4) | CH.AINCOM.value,
+        (DiffMode.DIFF_1.value.mux_p.value << 4) | DiffMode.DIFF_1.value.mux_n.value,
+    ]
+    assert list(samples[ADCNum.ADC_1].raw_code) == [0x12345678] * 2
+    assert list(samples[ADCNum.ADC_1].status) == [0x40, 0xC0]
+    assert list(samples[ADCNum.ADC_2].channel) == [(CH.AIN7.value << 4) | CH.AINCOM.value] * 2
+    assert list(samples[ADCNum.ADC_2].raw_code) == [0x010203] * 2
+
+
+def test_read_dual_samples_timeout(mocker, adc):
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_register_map",
+        return_value=dict(enumerate(adc_default_vals))
+    )
+    adc.transport = _dual_replayer(adc, [[0] * 4] + [[0, 0x00] + [0] * 5] * 1000)
+    with pytest.raises(TimeoutError):
+        adc.read_dual_samples([AnalogIn.AIN1], timeout=0)
+    with pytest.raises(ValueError):
+        adc.read_dual_samples([])
+
+
+@pytest.mark.parametrize("interface, rtd_adc, adc_1_channels, adc_2_channels, error", [
+    # STATUS byte disabled
+    (0x1, None, [AnalogIn.AIN1], None, ValueError),
+    (0x5, ADCNum.ADC_1, [AnalogIn.AIN1], None, RTDEnabledError),
+    (0x5, ADCNum.ADC_2, [AnalogIn.AIN1], [AnalogIn.AIN2], RTDEnabledError),
+    # AIN5 is connected to the RTD
+    (0x5, ADCNum.ADC_2, [AnalogIn.AIN5], None, ChannelNotAvailableError),
+])
+def test_read_dual_samples_invalid_state(
+    mocker, interface, rtd_adc, adc_1_channels, adc_2_channels, error, adc
+):
+    reg_map = dict(enumerate(adc_default_vals))
+    reg_map[ADCReg.REG_INTERFACE.value] = interface
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_register_map", return_value=reg_map
+    )
+    mocker.patch.object(ADCState, "rtd_adc", new_callable=mock.PropertyMock, return_value=rtd_adc)
+    transfer = mocker.patch("edgepi.adc.edgepi_adc.EdgePiADC.transfer")
+    with pytest.raises(error):
+        adc.read_dual_samples(adc_1_channels, adc_2_channels)
+    transfer.assert_not_called()
+
+
+def test_get_rtd_converter(adc):
+    with pytest.raises(ValueError):
+        adc.get_rtd_converter()
+    converter = adc.get_rtd_converter(RTDModel.LINEAR, adc_num=ADCNum.ADC_2)
+    code = [0x03, 0x85, 0x1E]
+    assert converter.convert([int.from_bytes(bytes(code), "big")]) == [pytest.approx(
+        code_to_temperature(
+            code,
+            adc.rtd_calib.rtd_resistor,
+            adc.rtd_sensor_resistance,
+            adc.rtd_sensor_resistance_variation,
+            adc.rtd_calib.rtd.gain,
+            adc.rtd_calib.rtd.offset,
+            ADCNum.ADC_2,
+        )
+    )]
+
+
+def _rtd_state(mocker, adc_num, status_byte=StatusByte.STATUS_BYTE_ON):
+    state = mocker.MagicMock(rtd_adc=adc_num)
+    state.status_byte.code = status_byte
+    state.adc_1.conversion_mode.code = ConvMode.CONTINUOUS
+    state.adc_2.data_rate.code = ADC2DataRate.SPS_800
+    state.adc_2.mux_p.code = CH.AIN5
+    state.adc_2.mux_n.code = CH.AIN6
+    return state
+
+
+def _rtd_read(status, code):
+    data = list(code.to_bytes(3, "big"))
+    return [0, status, *data, 0, get_crc(data)[-1]]
+
+
+@pytest.mark.parametrize("reject_outliers, expected_codes", [
+    (False, [100004, 200000]),
+    (True, [100001, 200000]),
+])
+def test_read_rtd_samples(mocker, adc, reject_outliers, expected_codes):
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_sample_state",
+        return_value=_rtd_state(mocker, ADCNum.ADC_2),
+    )
+    codes = [100000, 100001, 100011, 199999, 200000, 200001]
+    reads = [_rtd_read(0x80, code) for code in codes]
+    adc.transport = _dual_replayer(adc, [
+        [0],  # start ADC2
+        [0, 0x00] + [0] * 5,  # no new data
+        *reads[:3],
+        [0, 0x00] + [0] * 5,
+        *reads[3:],
+        [0],  # stop ADC2
+    ])
+    adc.waiter = NullWaiter()
+    samples = adc.read_rtd_samples(2, average=3, reject_outliers=reject_outliers)
+    assert adc.transport.remaining == 0
+    assert list(samples.raw_code) == expected_codes
+    assert list(samples.channel) == [(CH.AIN5.value << 4) | CH.AIN6.value] * 2
+    assert list(samples.value) == pytest.approx(
+        adc.get_rtd_converter(adc_num=ADCNum.ADC_2).convert(expected_codes)
+    )
+
+
+def test_stream_rtd_samples(mocker, adc):
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_sample_state",
+        return_value=_rtd_state(mocker, ADCNum.ADC_2, StatusByte.STATUS_BYTE_OFF),
+    )
+    read = _rtd_read(0x00, 0x03851E)
+    adc.transport = _dual_replayer(adc, [[0]] + [read] * 6 + [[0]])
+    adc.waiter = NullWaiter()
+    stream = adc.stream_rtd_samples(2)
+    batches = [next(stream) for _ in range(3)]
+    stream.close()
+    assert adc.transport.remaining == 0
+    assert [len(batch) for batch in batches] == [2, 2, 2]
+    assert batches[2].value[1] == pytest.approx(
+        code_to_temperature(
+            read[2:5],
+            adc.rtd_calib.rtd_resistor,
+            adc.rtd_sensor_resistance,
+            adc.rtd_sensor_resistance_variation,
+            adc.rtd_calib.rtd.gain,
+            adc.rtd_calib.rtd.offset,
+            ADCNum.ADC_2,
+        )
+    )
+
+
+def test_read_rtd_samples_errors(mocker, adc):
+    state = _rtd_state(mocker, None)
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_sample_state", return_value=state
+    )
+    with pytest.raises(ValueError):
+        adc.read_rtd_samples(1)
+    with pytest.raises(ValueError):
+        adc.read_rtd_samples(1, average=0)
+    state.rtd_adc = ADCNum.ADC_1
+    state.adc_1.conversion_mode.code = ConvMode.PULSE
+    with pytest.raises(ContinuousModeError):
+        adc.read_rtd_samples(1)
+    state.rtd_adc = ADCNum.ADC_2
+    adc.transport = _dual_replayer(adc, [[0]] + [[0, 0x00] + [0] * 5] * 2 + [[0]])
+    adc.waiter = NullWaiter()
+    with pytest.raises(TimeoutError):
+        adc.read_rtd_samples(1, timeout=0)
+
+
+@pytest.mark.parametrize("adc_num, mux_p, mux_n, single_ended", [
+    (ADCNum.ADC_1, CH.AIN5, CH.AINCOM, True),
+    (ADCNum.ADC_2, CH.AIN4, CH.AIN5, False),
+])
+def test_compile_read_plan(mocker, adc, adc_num, mux_p, mux_n, single_ended):
+    state = _rtd_state(mocker, None)
+    adc_fields = state.adc_1 if adc_num == ADCNum.ADC_1 else state.adc_2
+    adc_fields.mux_p.code = mux_p
+    adc_fields.mux_n.code = mux_n
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_sample_state", return_value=state
+    )
+    plan = adc.compile_read_plan(adc_num)
+    assert plan.command == [adc_num.value.read_cmd] + [255] * 6
+    assert plan.channel == (mux_p.value << 4) | mux_n.value
+    assert plan.single_ended == single_ended
+    assert plan.calibs == adc._EdgePiADC__get_calibration_params(adc_num, state)
+
+    data = [0x12, 0x34, 0x56, 0x78][:adc_num.value.num_data_bytes]
+    read = [0, 0x40, *data] + [0] * (4 - len(data)) + [get_crc(data)[-1]]
+    assert plan.decode(read) == pytest.approx(
+        code_to_voltage(data, adc_num.value, plan.calibs, single_ended)
+    )
+    with pytest.raises(CRCCheckError):
+        plan.decode(read[:-1] + [read[-1] ^ 1])
+    with pytest.raises(VoltageReadError):
+        plan.decode(read[:-1])
+
+
+def test_compile_read_plan_pulse_mode(mocker, adc):
+    state = _rtd_state(mocker, None)
+    state.adc_1.conversion_mode.code = ConvMode.PULSE
+    mocker.patch(
+        "edgepi.adc.edgepi_adc.EdgePiADC._EdgePiADC__get_sample_state", return_value=state
+    )
+    with pytest.raises(ContinuousModeError):
+        adc.compile_read_plan(ADCNum.ADC_1)
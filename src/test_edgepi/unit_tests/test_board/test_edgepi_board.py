@@ -0,0 +1,160 @@
+"""unit tests for edgepi_board module"""
+
+# pylint: disable=C0413
+
+from unittest import mock
+import sys
+sys.modules['periphery'] = mock.MagicMock()
+
+import pytest
+from edgepi.adc.adc_constants import ADCNum
+from edgepi.board.edgepi_board import EdgePiBoard
+from edgepi.dac.dac_constants import DACChannel
+from edgepi.digital_input.digital_input_constants import DinPins
+from edgepi.digital_output.digital_output_constants import DoutPins, DoutTriState
+from edgepi.gpio.gpio_configs import generate_expander_pin_info
+from edgepi.gpio.gpio_constants import GpioPins
+from edgepi.led.led_constants import LEDPins
+from edgepi.pwm.edgepi_pwm import PwmDeviceError
+from edgepi.pwm.pwm_constants import PWMPins, PWMState
+from edgepi.eeprom.edgepi_eeprom_data import EepromDataClass
+from edgepi.eeprom.protobuf_assets.generated_pb2 import edgepi_module_pb2
+from test_edgepi.unit_tests.test_eeprom.read_serialized import read_binfile
+from test_edgepi.unit_tests.test_gpio.fake_gpio import FakeGPIO
+
+_MODULES = ["EdgePiGPIO", "EdgePiEEPROM", "EdgePiADC", "EdgePiDAC", "EdgePiTC",
+            "EdgePiDigitalOutput", "EdgePiDigitalInput", "EdgePiLED", "EdgePiRelay", "EdgePiPWM"]
+
+
+@pytest.fixture(name="mocks")
+def fixture_mocks(mocker):
+    yield {
+        name: mocker.patch(f"edgepi.board.edgepi_board.{name}") for name in _MODULES
+    }
+
+
+def test_modules_created_once(mocks):
+    board = EdgePiBoard(adc_options={"enable_cache": True})
+    for mock_class in mocks.values():
+        mock_class.assert_not_called()
+    adc, dac = board.adc, board.dac
+    assert board.adc is adc and board.dac is dac
+    gpio = mocks["EdgePiGPIO"].return_value
+    eeprom_data = mocks["EdgePiEEPROM"].return_value.read_edgepi_data.return_value
+    mocks["EdgePiGPIO"].assert_called_once()
+    mocks["EdgePiEEPROM"].return_value.read_edgepi_data.assert_called_once()
+    mocks["EdgePiADC"].assert_called_once_with(
+        gpio=gpio, eeprom_data=eeprom_data, enable_cache=True
+    )
+    mocks["EdgePiDAC"].assert_called_once_with(gpio=gpio, eeprom_data=eeprom_data)
+    for module, name in [(board.din, "EdgePiDigitalInput"), (board.led, "EdgePiLED"),
+                         (board.relay, "EdgePiRelay"), (board.pwm, "EdgePiPWM")]:
+        assert module is mocks[name].return_value
+        mocks[name].assert_called_once_with(gpio=gpio)
+    tc = board.tc
+    assert board.tc is tc
+    mocks["EdgePiTC"].assert_called_once_with()
+
+
+def test_dout_shares_dac(mocks):
+    board = EdgePiBoard()
+    dout = board.dout
+    assert board.dout is dout
+    kwargs = mocks["EdgePiDigitalOutput"].call_args.kwargs
+    assert kwargs["gpio"] is board.gpio
+    mocks["EdgePiDAC"].assert_not_called()
+    assert kwargs["dac_factory"]() is board.dac
+
+
+def test_close(mocks):
+    mocks["EdgePiPWM"].return_value.close.side_effect = [None, PwmDeviceError]
+    with EdgePiBoard() as board:
+        adc, pwm = board.adc, board.pwm
+    assert adc.stop_conversions.call_args_list == [mock.call(adc_num) for adc_num in ADCNum]
+    assert pwm.close.call_args_list == [mock.call(pwm_num) for pwm_num in PWMPins]
+    # modules are created again after closing
+    mocks["EdgePiADC"].reset_mock()
+    board.adc.read_voltage(ADCNum.ADC_1)
+    mocks["EdgePiADC"].assert_called_once()
+
+
+def test_close_unused(mocks):
+    EdgePiBoard().close()
+    for mock_class in mocks.values():
+        mock_class.assert_not_called()
+
+
+@pytest.mark.parametrize("adc, dac", [(True, True), (False, False)])
+def test_get_snapshot(mocks, adc, dac):
+    expander_pins = {pin: (False, False) for pin in generate_expander_pin_info()}
+    expander_pins.update({
+        DoutPins.DOUT1.value: (True, False),
+        DoutPins.DOUT2.value: (False, True),
+        LEDPins.LED3.value: (True, False),
+        GpioPins.RELAY.value: (True, False),
+    })
+    gpio = mocks["EdgePiGPIO"].return_value
+    gpio.read_expander_pin_states.return_value = expander_pins
+    gpio.batch_read_din_state.return_value = [True, False] * 4
+    pwm = mocks["EdgePiPWM"].return_value
+    pwm.get_state.side_effect = [PWMState(frequency=1000), None]
+
+    snapshot = EdgePiBoard().get_snapshot(adc=adc, dac=dac)
+    gpio.read_expander_pin_states.assert_called_once_with()
+    gpio.batch_read_din_state.assert_called_once_with(list(DinPins))
+    assert snapshot.expander_pins == expander_pins
+    assert snapshot.dout[DoutPins.DOUT1] == DoutTriState.HIGH
+    assert snapshot.dout[DoutPins.DOUT2] == DoutTriState.HI_Z
+    assert snapshot.dout[DoutPins.DOUT3] == DoutTriState.LOW
+    assert snapshot.din == dict(zip(DinPins, [True, False] * 4))
+    assert snapshot.leds == {led: led == LEDPins.LED3 for led in LEDPins}
+    assert snapshot.relay
+    assert snapshot.pwm == {PWMPins.PWM1: PWMState(frequency=1000), PWMPins.PWM2: None}
+    if adc:
+        assert snapshot.adc is mocks["EdgePiADC"].return_value.get_state.return_value
+        assert snapshot.dac is mocks["EdgePiDAC"].return_value.get_snapshot.return_value
+    else:
+        assert snapshot.adc is None and snapshot.dac is None
+        mocks["EdgePiADC"].assert_not_called()
+        mocks["EdgePiDAC"].assert_not_called()
+
+
+@pytest.fixture(name="fake_gpio_board")
+def fixture_fake_gpio_board(mocker):
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    mocker.patch("edgepi.pwm.edgepi_pwm.PwmDevice")
+    mocker.patch("edgepi.digital_output.edgepi_digital_output.time.sleep")
+    # pylint: disable=no-member
+    eelayout = edgepi_module_pb2.EepromData()
+    eelayout.ParseFromString(read_binfile())
+    eeprom = mocker.patch("edgepi.board.edgepi_board.EdgePiEEPROM")
+    eeprom.return_value.read_edgepi_data.return_value = (
+        EepromDataClass.extract_eeprom_data(eelayout)
+    )
+    mocker.patch("edgepi.board.edgepi_board.EdgePiGPIO", return_value=FakeGPIO())
+    board = EdgePiBoard()
+    yield board
+    board.close()
+
+
+def test_dac_rerouted_after_dout_state(fake_gpio_board):
+    board = fake_gpio_board
+    board.dac.write_voltage(DACChannel.AOUT3, 2.5)
+    board.dout.set_dout_state(DoutPins.DOUT3, DoutTriState.HIGH)
+    board.dac.write_voltage(DACChannel.AOUT3, 3.0)
+    assert board.gpio.pins[GpioPins.AO_EN3.value] == (True, False)
+    assert board.gpio.pins[GpioPins.DOUT3.value] == (False, False)
+
+
+def test_dac_rerouted_after_pwm(fake_gpio_board):
+    board = fake_gpio_board
+    board.dac.write_voltage(DACChannel.AOUT1, 2.5)
+    board.pwm.init_pwm(PWMPins.PWM1)
+    board.pwm.get_enabled = mock.MagicMock(return_value=False)
+    board.pwm.enable(PWMPins.PWM1)
+    assert board.gpio.pins[GpioPins.PWM1.value] == (False, False)
+    board.pwm.close(PWMPins.PWM1)
+    board.dac.write_voltage(DACChannel.AOUT1, 3.0)
+    assert board.gpio.pins[GpioPins.PWM1.value] == (True, False)
+    assert board.gpio.pins[GpioPins.AO_EN1.value] == (True, False)
+    assert board.gpio.pins[GpioPins.DOUT1.value] == (False, False)
@@ -0,0 +1,147 @@
+""" Unit tests for control_loop module """
+
+from unittest import mock
+from unittest.mock import call
+import sys
+import time
+
+sys.modules['periphery'] = mock.MagicMock()
+
+# pylint: disable=wrong-import-position
+# pylint: disable=no-member
+
+import pytest
+from edgepi.adc.adc_constants import ADCChannel, ADCNum
+from edgepi.adc.adc_read_plan import ADCReadPlan
+from edgepi.adc.adc_voltage import code_to_voltage
+from edgepi.calibration.calibration_constants import CalibParam
+from edgepi.control.control_loop import ControlLoop, PIDController
+from edgepi.dac.dac_constants import DACChannel as CH
+from edgepi.utilities.crc_8_atm import CRCCheckError, get_crc
+from edgepi.utilities.waiter import NullWaiter
+from test_edgepi.unit_tests.test_dac.mock_dac import make_mock_dac, write_frames
+
+_DATA = [0x10, 0x00, 0x00, 0x00]
+_READ = [0, 0x40, *_DATA, get_crc(_DATA)[-1]]
+
+
+@pytest.fixture(name="dac")
+def fixture_test_dac(mocker):
+    yield make_mock_dac(mocker)
+
+
+@pytest.fixture(name="adc")
+def fixture_test_adc(mocker):
+    adc = mocker.MagicMock()
+    adc.transfer.return_value = _READ
+    yield adc
+
+
+@pytest.fixture(name="plan")
+def fixture_test_plan():
+    yield ADCReadPlan(
+        adc_num=ADCNum.ADC_1,
+        channel=ADCChannel.AIN1.value << 4 | ADCChannel.AINCOM.value,
+        command=[0x12] + [255] * 6,
+        calibs=CalibParam(gain=1, offset=0),
+        single_ended=True,
+    )
+
+
+def test_pid_controller():
+    pid = PIDController(kp=2, ki=1, kd=0.5, setpoint=1, output_limits=(-5, 5))
+    # first call has no derivative term
+    assert pid(0.5, 0.1) == pytest.approx(2 * 0.5 + 0.05)
+    # derivative acts on the measurement
+    assert pid(0.7, 0.1) == pytest.approx(2 * 0.3 + 0.08 + 0.5 * -2)
+    pid.reset()
+    assert pid(0.5, 0.1) == pytest.approx(1.05)
+
+
+def test_pid_controller_anti_windup():
+    pid = PIDController(kp=1, ki=10, setpoint=10, output_limits=(0, 5))
+    for _ in range(10):
+        assert pid(0, 1) == 5
+    # the integral did not accumulate while saturated, so the output drops immediately
+    assert pid(9.5, 0.01) == pytest.approx(0.5 + 10 * 0.005)
+
+
+def test_pid_controller_invalid_limits():
+    with pytest.raises(ValueError):
+        PIDController(kp=1, output_limits=(1, 0))
+
+
+def test_control_loop(mocker, adc, dac, plan):
+    mock_spi = mocker.patch("edgepi.peripherals.spi.SPI")
+    measurement = code_to_voltage(_DATA, ADCNum.ADC_1.value, plan.calibs, True)
+    controller = mocker.MagicMock(side_effect=[1.0, 2.0, 6.0, -1.0])
+    loop = ControlLoop(adc, plan, dac, CH.AOUT2, controller, rate=1e6, waiter=NullWaiter())
+    loop.start(max_iterations=4)
+    assert loop.wait(timeout=5)
+
+    adc.start_conversions.assert_called_once_with(ADCNum.ADC_1)
+    adc.spi_open.assert_called_once()
+    adc.stop_conversions.assert_called_once_with(ADCNum.ADC_1)
+    assert adc.transfer.call_args_list == [call(plan.command)] * 4
+    assert [args[0] for args, _ in controller.call_args_list] == [measurement] * 4
+    # one DAC SPI session, outputs clamped to the DAC's range
+    mock_spi.assert_called_once()
+    assert mock_spi.return_value.transfer.call_args_list == write_frames(
+        dac, CH.AOUT2, [1.0, 2.0, 5.0, 0.0]
+    )
+    dac.gpio.set_pin_states.assert_called_once()
+    assert (loop.measurement, loop.output) == (measurement, 0.0)
+    assert loop.stats.iterations == 4
+    assert loop.stats.jitter_ns.count == 4
+    assert loop.stats.period_ns.count == 3
+    assert loop.stats.duration_ns.count == 4
+
+
+def test_control_loop_overruns(mocker, adc, dac, plan):
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    mock_time = mocker.patch("edgepi.control.control_loop.time")
+    mocker.patch("edgepi.utilities.periodic_runner.time", mock_time)
+    # initial deadline, then (start, end) of each iteration
+    mock_time.perf_counter_ns.side_effect = [0, 100, 500, 1000, 2500, 2600, 2700]
+    loop = ControlLoop(
+        adc, plan, dac, CH.AOUT1, lambda *_: 1.0, rate=1e6, waiter=NullWaiter()
+    )
+    loop.start(max_iterations=3)
+    loop.wait(timeout=5)
+    # deadlines 0, 1000, then 2500 rescheduled from the end of the overrun
+    assert loop.stats.overruns == 1
+    assert loop.stats.overrun_ns.sum == 500
+    assert loop.stats.jitter_ns.sum == 100 + 0 + 100
+    assert loop.stats.period_ns.sum == 900 + 1600
+    assert loop.stats.duration_ns.sum == 400 + 1500 + 100
+
+
+def test_control_loop_stop(mocker, adc, dac, plan):
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    loop = ControlLoop(adc, plan, dac, CH.AOUT1, PIDController(kp=1, setpoint=2), rate=1000)
+    loop.start()
+    with pytest.raises(RuntimeError):
+        loop.start()
+    timeout = time.monotonic() + 5
+    while loop.stats.iterations == 0 and time.monotonic() < timeout:
+        time.sleep(0.001)
+    assert loop.stop(timeout=5)
+    assert not loop.is_running
+    assert loop.stats.iterations > 0
+    adc.stop_conversions.assert_called_once_with(ADCNum.ADC_1)
+
+
+def test_control_loop_error(mocker, adc, dac, plan):
+    mock_spi = mocker.patch("edgepi.peripherals.spi.SPI")
+    adc.transfer.return_value = _READ[:-1] + [_READ[-1] ^ 1]
+    loop = ControlLoop(adc, plan, dac, CH.AOUT1, lambda *_: 1.0, rate=1e6, waiter=NullWaiter())
+    loop.start(max_iterations=2)
+    with pytest.raises(CRCCheckError):
+        loop.wait(timeout=5)
+    mock_spi.return_value.transfer.assert_not_called()
+    adc.stop_conversions.assert_called_once_with(ADCNum.ADC_1)
+
+
+def test_control_loop_invalid_rate(adc, dac, plan):
+    with pytest.raises(ValueError):
+        ControlLoop(adc, plan, dac, CH.AOUT1, lambda *_: 1.0, rate=0)
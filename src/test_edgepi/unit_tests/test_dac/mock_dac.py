@@ -0,0 +1,39 @@
+"""EdgePiDAC with mocked peripherals, shared by tests of modules driving the DAC"""
+
+from unittest.mock import call
+
+from edgepi.calibration.calibration_constants import CalibParam
+from edgepi.dac.dac_constants import DACChannel as CH
+from edgepi.dac.edgepi_dac import EdgePiDAC
+from edgepi.eeprom.edgepi_eeprom_data import EepromDataClass
+from edgepi.eeprom.protobuf_assets.generated_pb2 import edgepi_module_pb2
+from test_edgepi.unit_tests.test_eeprom.read_serialized import read_binfile
+
+
+def make_mock_dac(mocker) -> EdgePiDAC:
+    """
+    Create an EdgePiDAC with mocked SPI and GPIO, gain disabled and unity calibration, so each
+    voltage maps to the uncalibrated code
+    """
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    mocker.patch("edgepi.dac.edgepi_dac.EdgePiGPIO")
+    # pylint: disable=no-member
+    eelayout= edgepi_module_pb2.EepromData()
+    eelayout.ParseFromString(read_binfile())
+    mocker.patch("edgepi.dac.edgepi_dac.EdgePiEEPROM.read_edgepi_data",
+                  return_value = EepromDataClass.extract_eeprom_data(eelayout))
+    mocker.patch("edgepi.dac.edgepi_dac.EdgePiDAC._EdgePiDAC__get_gain_state",
+                  return_value = False)
+    dac = EdgePiDAC()
+    dac.dac_ops.dict_calib_param = {ch.value: CalibParam(gain=1, offset=0) for ch in CH}
+    return dac
+
+
+def write_frames(dac: EdgePiDAC, channel: CH, voltages: list) -> list:
+    """SPI transfer calls writing each voltage to a DAC channel"""
+    return [
+        call(dac.dac_ops.generate_write_and_update_command(
+            channel.value, dac.dac_ops.voltage_to_code(channel.value, voltage)
+        ))
+        for voltage in voltages
+    ]
@@ -311,3 +311,34 @@ def test_dac_voltage_precisions(dac_ops):
     while i < 10.0:
         dac_ops.voltage_to_code(1, i, 2)
         i += step
+
+
+@pytest.mark.parametrize("ch, voltages, dac_gain", [
+    (0, [0, 0.5, 1.234, 2.5, 5], 1),
+    (3, [0, 0.5, 1.234, 2.5, 9.9999], 2),
+    (7, [], 1),
+])
+def test_dac_voltages_to_frames(ch, voltages, dac_gain, dac_ops):
+    codes = [dac_ops.voltage_to_code(ch, voltage, dac_gain) for voltage in voltages]
+    assert dac_ops.voltages_to_codes(ch, voltages, dac_gain) == codes
+    expected = [dac_ops.generate_write_and_update_command(ch, code) for code in codes]
+    assert dac_ops.voltages_to_frames(ch, voltages, dac_gain) == expected
+    numpy = pytest.importorskip("numpy")
+    frames = dac_ops.voltages_to_frames_numpy(ch, numpy.array(voltages), dac_gain)
+    assert frames.tolist() == expected
+
+
+def test_dac_voltage_coefficients(dac_ops):
+    dac_ops.dict_calib_param = {1: CalibParam(gain=1.01, offset=-0.02)}
+    # calibration applied as ((voltage - offset) / gain) * (code range / voltage range)
+    assert dac_ops.voltage_to_code(1, 2.5) == round((2.52 / 1.01) * 65535 / 5)
+    assert dac_ops.voltages_to_codes(1, [2.5]) == [dac_ops.voltage_to_code(1, 2.5)]
+
+
+@pytest.mark.parametrize("voltages, dac_gain", [([1, 5.1], 1), ([-0.1], 1), ([10.1], 2)])
+def test_dac_voltages_to_frames_raises(voltages, dac_gain, dac_ops):
+    with pytest.raises(ValueError):
+        dac_ops.voltages_to_frames(2, voltages, dac_gain)
+    numpy = pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        dac_ops.voltages_to_frames_numpy(2, numpy.array(voltages), dac_gain)
@@ -0,0 +1,103 @@
+""" Unit tests for dac_waveform module """
+
+from unittest import mock
+import sys
+import time
+
+sys.modules['periphery'] = mock.MagicMock()
+
+# pylint: disable=wrong-import-position
+# pylint: disable=no-member
+
+import pytest
+from edgepi.dac.dac_constants import DACChannel as CH
+from edgepi.dac.dac_waveform import PlaybackStats, WaveformPlayer
+from edgepi.utilities.waiter import NullWaiter
+from test_edgepi.unit_tests.test_dac.mock_dac import make_mock_dac, write_frames
+
+
+@pytest.fixture(name="dac")
+def fixture_test_dac(mocker):
+    yield make_mock_dac(mocker)
+
+
+def test_play_sequences(mocker, dac):
+    mock_spi = mocker.patch("edgepi.peripherals.spi.SPI")
+    player = WaveformPlayer(
+        dac, {CH.AOUT1: [0, 1, 2], CH.AOUT4: (4, 3, 2, 1)}, sample_rate=1e6, waiter=NullWaiter()
+    )
+    player.start()
+    assert player.wait(timeout=5)
+    # one SPI session for the whole playback, ending with the shortest waveform
+    mock_spi.assert_called_once()
+    transfers = mock_spi.return_value.transfer.call_args_list
+    assert transfers[0::2] == write_frames(dac, CH.AOUT1, [0, 1, 2])
+    assert transfers[1::2] == write_frames(dac, CH.AOUT4, [4, 3, 2])
+    assert player.stats.count == 3
+    dac.gpio.set_pin_states.assert_called_once()
+
+
+def test_play_generator_loop(mocker, dac):
+    mock_spi = mocker.patch("edgepi.peripherals.spi.SPI")
+    player = WaveformPlayer(
+        dac,
+        {CH.AOUT2: [1, 2], CH.AOUT3: (0.5 * i for i in range(5))},
+        sample_rate=1e6,
+        loop=True,
+        waiter=NullWaiter(),
+    )
+    with player:
+        assert player.wait(timeout=5)
+    transfers = mock_spi.return_value.transfer.call_args_list
+    assert transfers[0::2] == write_frames(dac, CH.AOUT2, [1, 2, 1, 2, 1])
+    assert transfers[1::2] == write_frames(dac, CH.AOUT3, [0, 0.5, 1, 1.5, 2])
+
+
+def test_stop(mocker, dac):
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    player = WaveformPlayer(dac, {CH.AOUT5: [1, 2]}, sample_rate=1000, loop=True)
+    player.start()
+    with pytest.raises(RuntimeError):
+        player.start()
+    timeout = time.monotonic() + 5
+    while player.stats.count == 0 and time.monotonic() < timeout:
+        time.sleep(0.001)
+    assert player.stop(timeout=5)
+    assert not player.is_playing
+    assert player.stats.count > 0
+
+
+def test_underruns(mocker, dac):
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    mock_time = mocker.patch("edgepi.dac.dac_waveform.time")
+    mocker.patch("edgepi.utilities.periodic_runner.time", mock_time)
+    mock_time.perf_counter_ns.side_effect = [0, 100, 2500, 2600, 3500]
+    player = WaveformPlayer(dac, {CH.AOUT5: [1, 2, 3, 4]}, sample_rate=1e6, waiter=NullWaiter())
+    player.start()
+    player.wait(timeout=5)
+    # deadlines 0, 1000, then 2500 and 3500 rescheduled from the end of the late sample
+    assert player.stats == PlaybackStats(
+        count=4, total_overshoot_ns=1700, min_overshoot_ns=0, max_overshoot_ns=1500, underruns=1
+    )
+
+
+@pytest.mark.parametrize("waveforms, sample_rate", [
+    ({CH.AOUT1: [1, 6]}, 100),
+    ({CH.AOUT1: [-1]}, 100),
+    ({}, 100),
+    ({CH.AOUT1: [1]}, 0),
+])
+def test_invalid_waveforms(mocker, dac, waveforms, sample_rate):
+    mock_spi = mocker.patch("edgepi.peripherals.spi.SPI")
+    with pytest.raises(ValueError):
+        WaveformPlayer(dac, waveforms, sample_rate).start()
+    mock_spi.assert_not_called()
+    dac.gpio.set_pin_states.assert_not_called()
+
+
+def test_playback_error(mocker, dac):
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    player = WaveformPlayer(dac, {CH.AOUT1: iter([1, 7])}, sample_rate=1e6, waiter=NullWaiter())
+    player.start()
+    with pytest.raises(ValueError):
+        player.wait(timeout=5)
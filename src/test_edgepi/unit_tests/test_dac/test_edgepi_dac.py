@@ -19,16 +19,20 @@ from bitstring import pack
 from edgepi.gpio.gpio_constants import GpioPins
 from edgepi.dac.dac_constants import (
     AOPins,
+    GainPin,
     PowerMode,
     DACChannel as CH,
     EdgePiDacCom as COM,
     EdgePiDacCalibrationConstants as CalibConst
 )
 from edgepi.dac.edgepi_dac import EdgePiDAC
+from edgepi.digital_output.digital_output_constants import DoutPins, DoutTriState
+from edgepi.digital_output.edgepi_digital_output import EdgePiDigitalOutput
 from edgepi.calibration.calibration_constants import CalibParam
 from edgepi.eeprom.edgepi_eeprom_data import EepromDataClass
 from edgepi.eeprom.protobuf_assets.generated_pb2 import edgepi_module_pb2
 from test_edgepi.unit_tests.test_eeprom.read_serialized import read_binfile
+from test_edgepi.unit_tests.test_gpio.fake_gpio import FakeGPIO
 
 dummy_calib_param_dict = {0:CalibParam(gain=1,offset=0),
                           1:CalibParam(gain=1,offset=0),
@@ -418,3 +422,158 @@ def test__dac_switching_logic(mocker, analog_out, result):
 
     assert mock_set_pin_dir_out.call_count == result[0]
     mock_set_pin_state.assert_called_once_with(result[1])
+
+
+def test_write_voltages(mocker, dac):
+    mocker.patch("edgepi.dac.edgepi_dac.EdgePiDAC._EdgePiDAC__get_gain_state",
+                  return_value = False)
+    mock_spi = mocker.patch("edgepi.peripherals.spi.SPI")
+    codes = dac.write_voltages({CH.AOUT1: 2.123, CH.AOUT3: 0, CH.AOUT8: 5.0})
+    assert codes == {CH.AOUT1: 27826, CH.AOUT3: 0, CH.AOUT8: 65535}
+    # all channels written in one SPI session
+    mock_spi.assert_called_once()
+    assert mock_spi.return_value.transfer.call_args_list == [
+        call(dac.dac_ops.generate_write_and_update_command(ch.value, code))
+        for ch, code in codes.items()
+    ]
+    # AOUT3 is disconnected by setting AO_EN3 and clearing DOUT3, then clearing AO_EN3
+    assert dac.gpio.set_pin_states.call_args_list == [
+        call({
+            GpioPins.PWM1.value: True,
+            AOPins.AO_EN1.value: True,
+            GpioPins.DOUT1.value: False,
+            AOPins.AO_EN3.value: True,
+            GpioPins.DOUT3.value: False,
+            AOPins.AO_EN8.value: True,
+            GpioPins.DOUT8.value: False,
+        }),
+        call({AOPins.AO_EN3.value: False}),
+    ]
+
+
+def test_write_voltages_raises(mocker, dac):
+    mocker.patch("edgepi.dac.edgepi_dac.EdgePiDAC._EdgePiDAC__get_gain_state",
+                  return_value = False)
+    mock_spi = mocker.patch("edgepi.peripherals.spi.SPI")
+    with pytest.raises(ValueError):
+        dac.write_voltages({CH.AOUT1: 2.0, CH.AOUT2: 5.5})
+    mock_spi.assert_not_called()
+    dac.gpio.set_pin_states.assert_not_called()
+
+
+def test_enable_outputs(dac):
+    dac.enable_outputs([CH.AOUT2, CH.AOUT5])
+    dac.gpio.set_pin_states.assert_called_once_with({
+        GpioPins.PWM2.value: True,
+        AOPins.AO_EN2.value: True,
+        GpioPins.DOUT2.value: False,
+        AOPins.AO_EN5.value: True,
+        GpioPins.DOUT5.value: False,
+    })
+
+
+@pytest.fixture(name="fake_gpio_dac")
+def fixture_fake_gpio_dac(mocker):
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    eelayout= edgepi_module_pb2.EepromData()
+    eelayout.ParseFromString(read_binfile())
+    mocker.patch("edgepi.dac.edgepi_dac.EdgePiEEPROM.read_edgepi_data",
+                  return_value = EepromDataClass.extract_eeprom_data(eelayout))
+    dac = EdgePiDAC(gpio=FakeGPIO())
+    dac.dac_ops.dict_calib_param = dummy_calib_param_dict
+    yield dac
+
+
+def test_write_voltage_routing_cache(mocker, fake_gpio_dac):
+    dac, gpio = fake_gpio_dac, fake_gpio_dac.gpio
+    mock_spi = mocker.patch("edgepi.peripherals.spi.SPI")
+    read_gain = mocker.spy(gpio, "read_pin_state")
+    dac.write_voltage(CH.AOUT3, 1.0)
+    assert gpio.pins[AOPins.AO_EN3.value] == (True, False)
+    assert gpio.pins[GpioPins.DOUT3.value] == (False, False)
+    writes, reads = gpio.writes, gpio.reads
+    # repeated non-zero writes neither read nor write the expander
+    dac.write_voltage(CH.AOUT3, 2.0)
+    dac.write_voltage(CH.AOUT3, 3.0)
+    assert (gpio.writes, gpio.reads) == (writes, reads)
+    assert mock_spi.return_value.transfer.call_count == 3
+    read_gain.assert_called_once_with(GpioPins.DAC_GAIN.value)
+    # output disconnected on 0 V, and connected again on the next non-zero write
+    dac.write_voltage(CH.AOUT3, 0)
+    assert gpio.pins[AOPins.AO_EN3.value] == (False, False)
+    writes = gpio.writes
+    dac.write_voltage(CH.AOUT3, 0)
+    assert gpio.writes == writes
+    dac.write_voltages({CH.AOUT3: 1.0, CH.AOUT4: 1.0})
+    assert gpio.pins[AOPins.AO_EN3.value] == gpio.pins[AOPins.AO_EN4.value] == (True, False)
+    writes, reads = gpio.writes, gpio.reads
+    dac.enable_outputs([CH.AOUT3, CH.AOUT4])
+    assert (gpio.writes, gpio.reads) == (writes, reads)
+    # gain and routing read again once another object writes the expander
+    gpio.set_pin_state(GainPin.DAC_GAIN.value)
+    dac.write_voltage(CH.AOUT3, 1.0)
+    assert read_gain.call_count == 2
+    assert gpio.reads == reads + 3
+
+
+@pytest.mark.parametrize(
+    "analog_out, pwm_pin", [(CH.AOUT1, GpioPins.PWM1), (CH.AOUT2, GpioPins.PWM2)]
+)
+def test_write_voltage_reroutes_pwm_pin(fake_gpio_dac, analog_out, pwm_pin):
+    dac, gpio = fake_gpio_dac, fake_gpio_dac.gpio
+    dac.write_voltage(analog_out, 1.0)
+    assert gpio.pins[pwm_pin.value] == (True, False)
+    # PWM module takes the pin over
+    gpio.clear_pin_state(pwm_pin.value)
+    dac.write_voltage(analog_out, 2.0)
+    assert gpio.pins[pwm_pin.value] == (True, False)
+
+
+def test_write_voltage_reroutes_after_dout_change(mocker, fake_gpio_dac):
+    dac, gpio = fake_gpio_dac, fake_gpio_dac.gpio
+    mocker.patch("edgepi.digital_output.edgepi_digital_output.time.sleep")
+    dout = EdgePiDigitalOutput(gpio=gpio, dac_factory=lambda: dac)
+    dac.write_voltage(CH.AOUT3, 2.5)
+    dout.set_dout_state(DoutPins.DOUT3, DoutTriState.HIGH)
+    assert gpio.pins[AOPins.AO_EN3.value] == (False, False)
+    dac.write_voltage(CH.AOUT3, 3.0)
+    assert gpio.pins[AOPins.AO_EN3.value] == (True, False)
+    assert gpio.pins[GpioPins.DOUT3.value] == (False, False)
+
+
+@pytest.mark.parametrize("gain_state, dac_gain", [(False, 1), (True, 2)])
+def test_get_snapshot(mocker, dac, gain_state, dac_gain):
+    mock_spi = mocker.patch("edgepi.peripherals.spi.SPI")
+    read_codes = [1000 * (ch.value + 1) for ch in CH]
+    # each transfer returns the code of the previous readback command
+    mock_spi.return_value.transfer.side_effect = [[0, 0, 0]] + [
+        [0, code >> 8, code & 0xFF] for code in read_codes
+    ]
+    dac.gpio.read_pin_state.return_value = gain_state
+    dac.gpio.get_pin_direction.return_value = False
+    snapshot = dac.get_snapshot()
+    mock_spi.assert_called_once()
+    assert mock_spi.return_value.transfer.call_args_list == [
+        call([(COM.COM_READBACK.value << 4) + ch.value, 0, 0]) for ch in CH
+    ] + [call([0, 0, 0])]
+    dac.gpio.read_pin_state.assert_called_once()
+    assert snapshot.gain_state == gain_state
+    assert snapshot.codes == dict(zip(CH, read_codes))
+    assert snapshot.voltages == {
+        ch: dac.dac_ops.code_to_voltage(ch.value, code, dac_gain)
+        for ch, code in snapshot.codes.items()
+    }
+
+
+def test_dac_shared_gpio_and_eeprom_data(mocker):
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    mock_gpio = mocker.patch("edgepi.dac.edgepi_dac.EdgePiGPIO")
+    mock_eeprom = mocker.patch("edgepi.dac.edgepi_dac.EdgePiEEPROM")
+    eelayout= edgepi_module_pb2.EepromData()
+    eelayout.ParseFromString(read_binfile())
+    eeprom_data = EepromDataClass.extract_eeprom_data(eelayout)
+    gpio = mocker.MagicMock()
+    dac = EdgePiDAC(gpio=gpio, eeprom_data=eeprom_data)
+    assert dac.gpio is gpio
+    mock_gpio.assert_not_called()
+    mock_eeprom.assert_not_called()
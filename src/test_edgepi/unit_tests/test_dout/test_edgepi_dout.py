@@ -10,6 +10,7 @@ if sys.platform != 'linux':
 from contextlib import nullcontext as does_not_raise
 import pytest
 from edgepi.gpio.gpio_constants import GpioPins
+from edgepi.dac.dac_constants import DACChannel as Ch
 from edgepi.digital_output.digital_output_constants import DoutPins, DoutTriState
 from edgepi.digital_output.edgepi_digital_output import EdgePiDigitalOutput, InvalidPinName
 
@@ -83,3 +84,55 @@ def test_get_state(mocker, pin_name, mock_vals, result):
     dout= EdgePiDigitalOutput()
     gpio_state = dout.get_state(pin_name)
     assert gpio_state == result
+
+
+def test_dac_created_on_use(mocker):
+    mock_dac = mocker.patch("edgepi.digital_output.edgepi_digital_output.EdgePiDAC")
+    dout = EdgePiDigitalOutput()
+    mock_dac.assert_not_called()
+    dac = dout.dac
+    assert dout.dac is dac
+    mock_dac.assert_called_once()
+
+
+def test_set_dout_states(mocker):
+    mock_read = mocker.patch(
+        "edgepi.gpio.edgepi_gpio.EdgePiGPIOExpander._EdgePiGPIOExpander__read_register",
+        return_value=0x00)
+    mock_write = mocker.patch(
+        "edgepi.gpio.edgepi_gpio.EdgePiGPIOExpander._EdgePiGPIOExpander__write_changed_values")
+    mock_sleep = mocker.patch("edgepi.digital_output.edgepi_digital_output.time.sleep")
+    mock_dac = mocker.patch("edgepi.digital_output.edgepi_digital_output.EdgePiDAC")
+    dout = EdgePiDigitalOutput()
+    dout.set_dout_states({
+        DoutPins.DOUT1: DoutTriState.HIGH,
+        DoutPins.DOUT2: DoutTriState.LOW,
+        DoutPins.DOUT4: DoutTriState.HI_Z,
+        DoutPins.DOUT8: DoutTriState.HIGH,
+    })
+    mock_dac.return_value.write_voltages.assert_called_once_with({Ch.AOUT4: 0})
+    mock_sleep.assert_called_once_with(0.05)
+    # AO_EN set: 2 reads, DOUT ports 2 and 3: 4 reads, AO_EN clear: 2 reads, direction in: 1 read
+    assert mock_read.call_count == 9
+    # AO_EN set, DOUT ports 2 and 3, AO_EN clear, DOUT4 direction in
+    assert mock_write.call_count == 5
+    pins = dout.gpio.expander_pin_dict
+    assert pins[GpioPins.AO_EN4.value].is_high and not pins[GpioPins.AO_EN1.value].is_high
+    assert pins[DoutPins.DOUT1.value].is_high and pins[DoutPins.DOUT8.value].is_high
+    assert not pins[DoutPins.DOUT2.value].is_high
+    assert not pins[DoutPins.DOUT4.value].is_out
+
+
+@pytest.mark.parametrize("pin_states, error", [
+    ({DoutPins.DOUT1: DoutTriState.HIGH, DoutPins.DOUT2: None}, pytest.raises(ValueError)),
+    ({DoutPins.DOUT1: DoutTriState.HIGH, None: DoutTriState.LOW}, pytest.raises(InvalidPinName)),
+    ({GpioPins.AO_EN8: DoutTriState.LOW}, pytest.raises(InvalidPinName)),
+])
+def test_set_dout_states_raises(mocker, pin_states, error):
+    mock_set = mocker.patch("edgepi.gpio.edgepi_gpio.EdgePiGPIO.set_pin_states")
+    mock_dac = mocker.patch("edgepi.digital_output.edgepi_digital_output.EdgePiDAC")
+    dout = EdgePiDigitalOutput()
+    with error:
+        dout.set_dout_states(pin_states)
+    mock_set.assert_not_called()
+    mock_dac.assert_not_called()
@@ -0,0 +1,70 @@
+"""In-memory GPIO expander, shared by modules under test in place of EdgePiGPIO"""
+
+from edgepi.gpio.gpio_configs import generate_expander_pin_info
+
+
+class FakeGPIO:
+    """
+    Keeps the state and direction of each GPIO expander pin in memory. Pins start as low
+    inputs, as after power on. `writes` counts the calls changing pins, and `reads` the calls
+    reading them.
+    """
+
+    def __init__(self):
+        # pin name to (is_high, is_input)
+        self.pins = {pin_name: (False, True) for pin_name in generate_expander_pin_info()}
+        self.writes = 0
+        self.reads = 0
+
+    @property
+    def expander_generation(self) -> int:
+        """Number of calls changing pins, as counted by EdgePiGPIO across processes"""
+        return self.writes
+
+    def set_pin_state(self, pin_name: str):
+        """Set a pin to a high output"""
+        self.pins[pin_name] = (True, False)
+        self.writes += 1
+
+    def clear_pin_state(self, pin_name: str):
+        """Set a pin to a low output"""
+        self.pins[pin_name] = (False, False)
+        self.writes += 1
+
+    def set_pin_states(self, pin_states: dict):
+        """Set pins to outputs, formatted as {pin name: True for high}"""
+        for pin_name, state in pin_states.items():
+            self.pins[pin_name] = (bool(state), False)
+        self.writes += 1
+
+    def set_pin_direction_out(self, pin_name: str):
+        """Set a pin to an output, keeping its state"""
+        self.pins[pin_name] = (self.pins[pin_name][0], False)
+        self.writes += 1
+
+    def set_pin_direction_in(self, pin_name: str):
+        """Set a pin to an input, keeping its state"""
+        self.pins[pin_name] = (self.pins[pin_name][0], True)
+        self.writes += 1
+
+    def set_pin_directions_in(self, pin_names: list):
+        """Set pins to inputs, keeping their states"""
+        for pin_name in pin_names:
+            self.pins[pin_name] = (self.pins[pin_name][0], True)
+        self.writes += 1
+
+    def read_pin_state(self, pin_name: str) -> bool:
+        """True if a pin is high"""
+        self.reads += 1
+        return self.pins[pin_name][0]
+
+    def get_pin_direction(self, pin_name: str) -> bool:
+        """True if a pin is an input"""
+        self.reads += 1
+        return self.pins[pin_name][1]
+
+    def read_expander_pin_states(self, pin_names: list = None) -> dict:
+        """(is_high, is_input) of pins, formatted as {pin name: (bool, bool)}, all if None"""
+        self.reads += 1
+        pin_names = pin_names if pin_names is not None else list(self.pins)
+        return {pin_name: self.pins[pin_name] for pin_name in pin_names}
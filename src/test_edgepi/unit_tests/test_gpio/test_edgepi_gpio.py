@@ -135,3 +135,27 @@ def test_edgepi_gpio_toggle_pin(mocker, pin_name, error):
         # pylint: disable = expression-not-assigned
         exp.assert_called_once_with(pin_name) if pin_name in edgepi_gpio.expander_pin_dict else \
             gpio.assert_called_once_with(pin_name)
+
+def test_edgepi_gpio_set_pin_states(mocker):
+    mock_expander = mocker.patch('edgepi.gpio.edgepi_gpio.EdgePiGPIO.set_expander_pin_states')
+    mock_chip = mocker.patch('edgepi.gpio.edgepi_gpio.EdgePiGPIO.write_gpio_pin_state')
+    edgepi_gpio = EdgePiGPIO()
+    edgepi_gpio.set_pin_states({GpioPins.AO_EN1.value: True, GpioPins.DIN1.value: False,
+                                GpioPins.AO_EN2.value: False})
+    mock_expander.assert_called_once_with({GpioPins.AO_EN1.value: True,
+                                           GpioPins.AO_EN2.value: False})
+    mock_chip.assert_called_once_with(GpioPins.DIN1.value, False)
+    with pytest.raises(PinNameNotFound):
+        edgepi_gpio.set_pin_states({"Does not exits": True})
+
+def test_edgepi_gpio_set_pin_directions_in(mocker):
+    mock_expander = mocker.patch(
+        'edgepi.gpio.edgepi_gpio.EdgePiGPIO.set_expander_pin_directions_in')
+    mock_chip = mocker.patch('edgepi.gpio.edgepi_gpio.EdgePiGPIO.set_gpio_pin_dir')
+    edgepi_gpio = EdgePiGPIO()
+    edgepi_gpio.set_pin_directions_in([GpioPins.DOUT3.value, GpioPins.DIN1.value,
+                                       GpioPins.DOUT8.value])
+    mock_expander.assert_called_once_with([GpioPins.DOUT3.value, GpioPins.DOUT8.value])
+    mock_chip.assert_called_once_with(GpioPins.DIN1.value, True)
+    with pytest.raises(PinNameNotFound):
+        edgepi_gpio.set_pin_directions_in(["Does not exits"])
@@ -63,15 +63,19 @@ def test_edgepi_expander_read_register(mock_data, mock_msg, dev_address, out, mo
 # pylint: disable=unused-argument
 def test_edgepi_expander__write_changed_values(mock_data, mock_msg, dev_address, reg_dict,mock_i2c):
     gpio_ctrl = EdgePiGPIOExpander()
+    generation = gpio_ctrl.expander_generation
     gpio_ctrl._EdgePiGPIOExpander__write_changed_values(reg_dict,
                                                             dev_address)
     for reg_addx, entry in reg_dict.items():
         if entry["is_changed"]:
             mock_msg.assert_called_once_with(reg_addx, [entry["value"]])
             mock_data.assert_called_once()
+            # other objects see the write through the shared generation
+            assert EdgePiGPIOExpander().expander_generation == generation + 1
         else:
             assert mock_msg.call_count == 0
             assert mock_data.call_count == 0
+            assert gpio_ctrl.expander_generation == generation
     gpio_ctrl.i2cdev.close.assert_called_once()
 
 @pytest.mark.parametrize("pin_name, mock_value, result",
@@ -208,3 +212,74 @@ def test_toggle_expander_pin(mocker, pin_name, mock_value, result):
     gpio_ctrl = EdgePiGPIOExpander()
     gpio_ctrl.toggle_expander_pin(pin_name)
     assert gpio_ctrl.expander_pin_dict[pin_name] != result
+
+@pytest.mark.parametrize("reg_val, num_writes",
+                         [(0xFF, 2),
+                          (0x00, 1)])
+def test_set_expander_pin_states(mocker, reg_val, num_writes):
+    mock_read = mocker.patch(
+        "edgepi.gpio.edgepi_gpio.EdgePiGPIOExpander._EdgePiGPIOExpander__read_register",
+        return_value = reg_val)
+    mock_write = mocker.patch(
+        "edgepi.gpio.edgepi_gpio.EdgePiGPIOExpander._EdgePiGPIOExpander__write_changed_values")
+    gpio_ctrl = EdgePiGPIOExpander()
+    pin_states = {DACPins.AO_EN1.value: False, DACPins.AO_EN2.value: True,
+                  DACPins.AO_EN3.value: True}
+    gpio_ctrl.set_expander_pin_states(pin_states)
+    # AO_EN pins share one output port register and one configuration port register
+    assert mock_read.call_count == 2
+    assert mock_write.call_count == num_writes
+    out_dict = mock_write.call_args_list[0].args[0]
+    out_val = list(out_dict.values())[0]["value"]
+    for pin_name, state in pin_states.items():
+        set_code = gpio_ctrl.expander_pin_dict[pin_name].set_code
+        assert (out_val & set_code.op_code == set_code.op_code) == state
+        assert gpio_ctrl.expander_pin_dict[pin_name].is_high == state
+        assert gpio_ctrl.expander_pin_dict[pin_name].is_out
+
+
+def test_set_expander_pin_directions_in(mocker):
+    mock_read = mocker.patch(
+        "edgepi.gpio.edgepi_gpio.EdgePiGPIOExpander._EdgePiGPIOExpander__read_register",
+        return_value = 0x00)
+    mock_write = mocker.patch(
+        "edgepi.gpio.edgepi_gpio.EdgePiGPIOExpander._EdgePiGPIOExpander__write_changed_values")
+    gpio_ctrl = EdgePiGPIOExpander()
+    pin_names = [DACPins.AO_EN1.value, DACPins.AO_EN4.value]
+    gpio_ctrl.set_expander_pin_directions_in(pin_names)
+    # both pins share one configuration port register
+    mock_read.assert_called_once()
+    mock_write.assert_called_once()
+    dir_val = list(mock_write.call_args.args[0].values())[0]["value"]
+    for pin_name in pin_names:
+        dir_in_code = gpio_ctrl.expander_pin_dict[pin_name].dir_in_code
+        assert dir_val & dir_in_code.op_code == dir_in_code.op_code
+        assert not gpio_ctrl.expander_pin_dict[pin_name].is_out
+
+
+def test_read_expander_pin_states(mocker):
+    mocker.patch("edgepi.peripherals.i2c.I2C")
+    mock_open = mocker.patch(
+        "edgepi.gpio.edgepi_gpio_expander.EdgePiGPIOExpander.i2c_open")
+    # output port registers 0x02/0x03 all high, configuration registers 0x06/0x07 all input
+    reg_vals = {0x02: 0xFF, 0x03: 0xFF, 0x06: 0xFF, 0x07: 0x00}
+    def transfer(_dev_address, msg):
+        msg[1].data = [reg_vals[msg[0].data[0]]]
+    mock_transfer = mocker.patch(
+        "edgepi.gpio.edgepi_gpio_expander.EdgePiGPIOExpander.transfer", side_effect=transfer)
+    gpio_ctrl = EdgePiGPIOExpander()
+    mocker.patch.object(gpio_ctrl, "set_read_msg", side_effect=lambda addr, msg: [
+        mock.MagicMock(data=[addr]), mock.MagicMock(data=msg)
+    ])
+    pin_states = gpio_ctrl.read_expander_pin_states()
+    mock_open.assert_called_once()
+    # 2 output and 2 configuration registers on each of the 2 expanders
+    assert mock_transfer.call_count == 8
+    assert set(pin_states) == set(gpio_ctrl.expander_pin_dict)
+    for pin_name, (is_high, is_input) in pin_states.items():
+        dir_reg = gpio_ctrl.expander_pin_dict[pin_name].dir_out_code.reg_address
+        assert is_high
+        assert is_input == (dir_reg == 0x06)
+    pin_states = gpio_ctrl.read_expander_pin_states([DACPins.AO_EN1.value])
+    assert list(pin_states) == [DACPins.AO_EN1.value]
+    assert mock_transfer.call_count == 10
@@ -2,7 +2,7 @@
 
 
 import pytest
-from edgepi.reg_helper.reg_helper import _apply_opcode
+from edgepi.reg_helper.reg_helper import apply_opcodes
 from edgepi.gpio.gpio_constants import (
     GpioAOutputClear,
     GpioAOutputSet,
@@ -11,6 +11,11 @@ from edgepi.gpio.gpio_constants import (
 )
 
 
+def _apply_opcode(reg_value, opcode):
+    """value of a register after applying an opcode to it"""
+    return apply_opcodes({opcode.reg_address: reg_value}, [opcode])[opcode.reg_address]["value"]
+
+
 @pytest.mark.parametrize(
     "reg_value, opcode, updated_reg_value",
     [
@@ -0,0 +1,145 @@
+"""unit tests for io_stats.py module"""
+
+import urllib.request
+from unittest.mock import MagicMock
+
+import pytest
+from edgepi.peripherals.gpio import GpioDevice
+from edgepi.peripherals.i2c import I2CDevice
+from edgepi.peripherals.io_stats import (
+    IO_STATS,
+    IOStatsRegistry,
+    PrometheusExporter,
+    format_prometheus,
+)
+from edgepi.peripherals.pwm import PwmDevice
+from edgepi.peripherals.spi import SpiDevice
+
+
+@pytest.fixture(name="io_stats")
+def fixture_io_stats():
+    IO_STATS.reset()
+    IO_STATS.enable()
+    yield IO_STATS
+    IO_STATS.disable()
+    IO_STATS.reset()
+
+
+def test_registry_disabled_by_default():
+    registry = IOStatsRegistry()
+    assert registry.device("spi", "/dev/spidev6.1") is None
+    registry.enable()
+    stats = registry.device("spi", "/dev/spidev6.1")
+    assert registry.device("spi", "/dev/spidev6.1") is stats
+    assert registry.get("spi", "/dev/spidev6.1") is stats
+    assert registry.devices() == [stats]
+    registry.disable()
+    assert registry.device("spi", "/dev/spidev6.1") is None
+    assert registry.get("spi", "/dev/spidev6.1") is stats
+    registry.reset()
+    assert not registry.devices()
+
+
+def test_disabled_devices_record_nothing(mocker):
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    IO_STATS.reset()
+    spidev = SpiDevice(6, 1)
+    with spidev.spi_open():
+        spidev.transfer([0, 1, 0])
+    assert not IO_STATS.devices()
+
+
+def test_spi_stats(mocker, io_stats):
+    spi = mocker.patch("edgepi.peripherals.spi.SPI")
+    spi.return_value.transfer.side_effect = lambda data: [0] * len(data)
+    spidev = SpiDevice(6, 1, waiter=MagicMock())
+    with spidev.spi_open():
+        spidev.transfer([0, 1, 0])
+        spidev.transfer([0, 1])
+    spidev.spi_apply_adc_commands([([0x08], 0.001, [0x12, 0, 0, 0, 0, 0, 0])])
+    stats = io_stats.get("spi", "/dev/spidev6.1")
+    assert stats.opens == 2
+    assert stats.closes == 2
+    assert stats.transactions == 4
+    assert stats.bytes_out == 13
+    assert stats.bytes_in == 13
+    assert stats.transaction_ns.count == 4
+    assert stats.lock_wait_ns.count == 2
+    assert stats.lock_hold_ns.count == 2
+    assert stats.delay_ns.count == 1
+    spidev.waiter.wait.assert_called_once_with(0.001)
+    assert not SpiDevice.lock_spi[1].locked()
+
+
+def test_i2c_stats(mocker, io_stats):
+    mocker.patch("edgepi.peripherals.i2c.I2C")
+    i2cdev = I2CDevice("/dev/i2c-10")
+    with i2cdev.i2c_open():
+        msg = [MagicMock(data=[0x02], read=False), MagicMock(data=[0, 0], read=True)]
+        i2cdev.transfer(32, msg)
+        i2cdev.transfer(32, [MagicMock(data=[0x02, 0xFF], read=False)])
+    stats = io_stats.get("i2c", "/dev/i2c-10")
+    assert (stats.opens, stats.closes, stats.transactions) == (1, 1, 2)
+    assert (stats.bytes_out, stats.bytes_in) == (3, 2)
+
+
+def test_gpio_stats(mocker, io_stats):
+    mocker.patch("edgepi.peripherals.gpio.GPIO")
+    gpiodev = GpioDevice("/dev/gpiochip0")
+    gpiodev.open_read_state_batch([1, 2, 3], "in", "pull_down")
+    gpiodev.open_read_state(4, "in", "pull_down")
+    with gpiodev.open_gpio(5, "out", None):
+        gpiodev.write_state(True)
+        gpiodev.read_state()
+    stats = io_stats.get("gpio", "/dev/gpiochip0")
+    assert (stats.opens, stats.closes, stats.transactions) == (3, 3, 6)
+    assert stats.lock_hold_ns.count == 3
+
+
+def test_pwm_stats(mocker, io_stats):
+    mocker.patch("edgepi.peripherals.pwm.PWM")
+    pwmdev = PwmDevice(0, 1)
+    pwmdev.open_pwm()
+    pwmdev.set_frequency_pwm(1000)
+    pwmdev.get_frequency_pwm()
+    pwmdev.enable_pwm()
+    pwmdev.close_pwm()
+    stats = io_stats.get("pwm", "/sys/class/pwm/pwmchip0/pwm1")
+    assert (stats.opens, stats.closes, stats.transactions) == (1, 1, 3)
+
+
+def test_format_prometheus():
+    registry = IOStatsRegistry()
+    registry.enable()
+    stats = registry.device("spi", "/dev/spidev6.1")
+    stats.record_transaction(1500, 3, 3)
+    stats.record_transaction(5000, 2, 2)
+    text = format_prometheus(registry)
+    labels = 'bus="spi",path="/dev/spidev6.1"'
+    assert "# TYPE edgepi_io_transactions_total counter" in text
+    assert f"edgepi_io_transactions_total{{{labels}}} 2" in text
+    assert f"edgepi_io_bytes_written_total{{{labels}}} 5" in text
+    assert "# TYPE edgepi_io_transaction_seconds histogram" in text
+    assert f'edgepi_io_transaction_seconds_bucket{{{labels},le="1e-06"}} 0' in text
+    assert f'edgepi_io_transaction_seconds_bucket{{{labels},le="2e-06"}} 1' in text
+    assert f'edgepi_io_transaction_seconds_bucket{{{labels},le="8e-06"}} 2' in text
+    assert f'edgepi_io_transaction_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"edgepi_io_transaction_seconds_sum{{{labels}}} 6.5e-06" in text
+    assert f"edgepi_io_transaction_seconds_count{{{labels}}} 2" in text
+    assert f"edgepi_io_delay_seconds_count{{{labels}}} 0" in text
+
+
+def test_prometheus_exporter():
+    registry = IOStatsRegistry()
+    exporter = PrometheusExporter(port=0, registry=registry)
+    exporter.start()
+    try:
+        assert registry.enabled
+        registry.device("i2c", "/dev/i2c-10").record_transaction(1000)
+        url = f"http://127.0.0.1:{exporter.port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.status == 200
+            body = response.read().decode()
+        assert 'edgepi_io_transactions_total{bus="i2c",path="/dev/i2c-10"} 1' in body
+    finally:
+        exporter.stop()
@@ -0,0 +1,113 @@
+"""unit tests for ipc.py module"""
+
+import fcntl
+import grp
+import os
+
+import pytest
+from edgepi.peripherals import ipc
+from edgepi.peripherals.ipc import BusLock, SharedRegisterShadow
+
+
+def _can_lock_from_other_fd(path):
+    """opening a new file description behaves like another process trying to lock"""
+    fd = os.open(path, os.O_RDWR)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return True
+    except BlockingIOError:
+        return False
+    finally:
+        os.close(fd)
+
+
+def test_bus_lock_excludes_other_processes(tmp_path):
+    lock = BusLock("spi-dev1", lock_dir=str(tmp_path))
+    assert lock.path == os.path.join(str(tmp_path), "edgepi-spi-dev1.lock")
+    assert lock.locked() is False
+    with lock:
+        assert lock.locked() is True
+        assert _can_lock_from_other_fd(lock.path) is False
+    assert lock.locked() is False
+    assert _can_lock_from_other_fd(lock.path) is True
+
+
+def test_bus_lock_reentrant(tmp_path):
+    lock = BusLock("i2c", lock_dir=str(tmp_path))
+    with lock:
+        with lock:
+            assert lock.locked() is True
+        # inner release must not drop the file lock held by the outer block
+        assert lock.locked() is True
+        assert _can_lock_from_other_fd(lock.path) is False
+    assert lock.locked() is False
+
+
+def test_bus_lock_falls_back_to_thread_lock(tmp_path):
+    lock = BusLock("gpio", lock_dir=str(tmp_path / "missing"))
+    with lock:
+        assert lock.locked() is True
+    assert lock.locked() is False
+
+
+def test_shared_register_shadow(tmp_path):
+    shadow = SharedRegisterShadow("adc", 4, shm_dir=str(tmp_path))
+    other = SharedRegisterShadow("adc", 4, shm_dir=str(tmp_path))
+    assert shadow.read() == (0, None)
+
+    # a partial write does not make the shadow valid
+    assert shadow.write({1: 0x11}) == 1
+    assert other.read() == (1, None)
+
+    assert shadow.write({0: 0x10, 1: 0x11, 2: 0x12, 3: 0x13}) == 2
+    assert other.read() == (2, {0: 0x10, 1: 0x11, 2: 0x12, 3: 0x13})
+
+    assert other.write({2: 0xFF}) == 3
+    assert shadow.generation == 3
+    assert shadow.read() == (3, {0: 0x10, 1: 0x11, 2: 0xFF, 3: 0x13})
+
+    assert other.invalidate() == 4
+    assert shadow.read() == (4, None)
+    shadow.close()
+    other.close()
+
+
+def test_shared_register_shadow_value_range(tmp_path):
+    shadow = SharedRegisterShadow("tc", 2, shm_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        shadow.write({0: 256, 1: 0})
+    shadow.close()
+
+
+def test_shared_file_mode(tmp_path):
+    lock = BusLock("spi-dev1", lock_dir=str(tmp_path))
+    with lock:
+        pass
+    shadow = SharedRegisterShadow("adc", 4, shm_dir=str(tmp_path))
+    # readable and writable by the owner and group only
+    assert os.stat(lock.path).st_mode & 0o777 == 0o660
+    assert os.stat(shadow.path).st_mode & 0o777 == 0o660
+    shadow.close()
+
+
+def test_shared_file_mode_configurable(tmp_path, monkeypatch):
+    monkeypatch.setattr(ipc, "FILE_MODE", 0o600)
+    lock = BusLock("i2c", lock_dir=str(tmp_path))
+    with lock:
+        pass
+    shadow = SharedRegisterShadow("tc", 2, shm_dir=str(tmp_path), mode=0o640)
+    assert os.stat(lock.path).st_mode & 0o777 == 0o600
+    assert os.stat(shadow.path).st_mode & 0o777 == 0o640
+    shadow.close()
+
+
+def test_shared_file_group(tmp_path):
+    group = grp.getgrgid(os.getgid()).gr_name
+    shadow = SharedRegisterShadow("adc", 4, shm_dir=str(tmp_path), group=group)
+    assert os.stat(shadow.path).st_gid == os.getgid()
+    shadow.close()
+    # an unknown group leaves the file usable
+    shadow = SharedRegisterShadow("adc", 4, shm_dir=str(tmp_path), group="no-such-group")
+    assert shadow.read() == (0, None)
+    shadow.close()
@@ -44,3 +44,15 @@ def test_spi_open(mocker, dev_id):
     assert spidev.lock_spi[dev_id].locked() is False
     spidev.spi.transfer.aasert_called_once()
     spidev.spi.close.aasert_called_once()
+
+
+def test_transfers_are_timestamped(mocker):
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    mocker.patch("edgepi.peripherals.spi.time.monotonic_ns", side_effect=[10, 20, 30])
+    spidev = SpiDevice(6, 0)
+    assert spidev.last_transfer_ns is None
+    with spidev.spi_open():
+        spidev.transfer([0, 1, 0])
+    assert spidev.last_transfer_ns == 10
+    spidev.spi_apply_adc_commands([([0x12], 0, [0xFF]), ([0x12], 0, [0xFF])])
+    assert spidev.last_command_timestamps_ns == [20, 30]
@@ -0,0 +1,91 @@
+"""unit tests for spi_replay.py module"""
+
+from unittest import mock
+import sys
+
+sys.modules["periphery"] = mock.MagicMock()
+
+# pylint: disable=wrong-import-position
+import pytest
+from edgepi.peripherals.spi_replay import (
+    ReplayMismatchError,
+    SpiFrame,
+    SpiRecorder,
+    SpiRecording,
+    SpiReplayer,
+)
+from edgepi.tc.edgepi_tc import EdgePiTC
+from edgepi.tc.tc_constants import TCAddresses
+
+TEMP_REGS = [0x19, 0x00, 0x01, 0x90, 0x00]
+
+
+class FakeTCSpi:
+    """SPI connection answering temperature register reads"""
+
+    transfers = 0
+
+    def __init__(self, *_args, **_kwargs):
+        pass
+
+    def transfer(self, data):
+        """Echo the register address, followed by the temperature register values"""
+        FakeTCSpi.transfers += 1
+        return [data[0]] + TEMP_REGS[:len(data) - 1]
+
+    def close(self):
+        """Nothing to close"""
+
+
+def _record_tc_reads(num_reads):
+    recorder = SpiRecorder(transport=FakeTCSpi)
+    tc = EdgePiTC(transport=recorder)
+    temps = [tc.read_temperatures() for _ in range(num_reads)]
+    return recorder.recording, temps
+
+
+def test_replay_tc_reads(tmp_path):
+    recording, temps = _record_tc_reads(3)
+    assert len(recording.frames) == 3
+    assert recording.frames[0].tx == bytes([TCAddresses.CJTH_R.value] + [0xFF] * 5)
+
+    path = str(tmp_path / "tc.json")
+    recording.save(path)
+    replayer = SpiReplayer(SpiRecording.load(path))
+    tc = EdgePiTC(transport=replayer)
+    transfers = FakeTCSpi.transfers
+    assert [tc.read_temperatures() for _ in range(3)] == temps
+    assert FakeTCSpi.transfers == transfers
+    assert replayer.remaining == 0
+    with pytest.raises(ReplayMismatchError):
+        tc.read_temperatures()
+
+    replayer.rewind()
+    assert tc.read_temperatures() == temps[0]
+
+
+def test_replay_mismatch():
+    recording, _ = _record_tc_reads(2)
+    tc = EdgePiTC(transport=SpiReplayer(recording))
+    with pytest.raises(ReplayMismatchError):
+        tc.read_faults()
+    lenient = EdgePiTC(transport=SpiReplayer(recording, strict=False))
+    lenient.read_faults()
+
+
+def test_replay_pacing(mocker):
+    recording = SpiRecording([
+        SpiFrame("/dev/spidev6.2", time_ns, b"\x00", b"\x01") for time_ns in (0, 1000, 5000)
+    ])
+    waiter = mocker.MagicMock()
+    replayer = SpiReplayer(recording, speed=2, waiter=waiter)
+    spi = replayer("/dev/spidev6.2")
+    for _ in range(3):
+        assert spi.transfer([0]) == [1]
+    deadlines = [call.args[0] for call in waiter.wait_until.call_args_list]
+    assert [deadline - deadlines[0] for deadline in deadlines] == [0, 500, 2500]
+
+
+def test_replay_invalid_speed():
+    with pytest.raises(ValueError):
+        SpiReplayer(SpiRecording(), speed=0)
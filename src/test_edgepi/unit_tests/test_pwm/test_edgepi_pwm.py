@@ -8,7 +8,7 @@ if sys.platform != 'linux':
 from contextlib import nullcontext as does_not_raise
 import pytest
 from edgepi.gpio.gpio_constants import GpioPins
-from edgepi.pwm.pwm_constants import PWMCh, Polarity, PWMPins
+from edgepi.pwm.pwm_constants import PWMCh, Polarity, PWMPins, PWMState
 from edgepi.pwm.edgepi_pwm import EdgePiPWM, PwmDeviceError
 
 @pytest.fixture(name="pwm_dev")
@@ -380,3 +380,20 @@ def test_set_config(mocker, params, pwm_dev):
         mock_set_pol.assert_called_once_with(params[0],params[3])
     else:
         assert mock_set_pol.call_count == 0
+
+@pytest.mark.parametrize("pwm_num", [PWMPins.PWM1, PWMPins.PWM2])
+def test_get_state(mocker, pwm_num, pwm_dev):
+    mock_pwmdevice = mocker.MagicMock()
+    mock_pwmdevice.get_frequency_pwm.return_value = 2000
+    mock_pwmdevice.get_duty_cycle_pwm.return_value = 0.25
+    mock_pwmdevice.get_polarity_pwm.return_value = Polarity.INVERSED
+    mock_pwmdevice.get_enabled_pwm.return_value = True
+    pwm_dev._EdgePiPWM__pwm_devs[pwm_num] = None
+    assert pwm_dev.get_state(pwm_num) is None
+    pwm_dev._EdgePiPWM__pwm_devs[pwm_num] = mock_pwmdevice
+    assert pwm_dev.get_state(pwm_num) == PWMState(
+        frequency=2000, duty_cycle=0.25, polarity=Polarity.INVERSED, enabled=True
+    )
+    pwm_dev._EdgePiPWM__pwm_devs[pwm_num] = None
+    with pytest.raises(ValueError):
+        pwm_dev.get_state(None)
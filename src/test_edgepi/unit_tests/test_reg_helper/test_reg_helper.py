@@ -1,13 +1,15 @@
 """unit tests for reg_helper.py module"""
 
 
-from copy import deepcopy
 import pytest
 from edgepi.reg_helper.reg_helper import (
-    _apply_opcode,
-    _add_change_flags,
+    apply_compiled_opcodes,
     apply_opcodes,
-    _convert_values_to_dict,
+    compile_opcodes,
+    OpCode,
+    OpCodeMaskIncompatibleError,
+    RegisterUpdateError,
+    changed_register_spans,
     convert_dict_to_values,
     is_bit_set,
 )
@@ -273,21 +275,8 @@ from edgepi.tc.tc_constants import (
     ],
 )
 def test_apply_opcode(reg_value, opcode, updated_reg_value):
-    assert _apply_opcode(reg_value, opcode) == updated_reg_value
-
-
-@pytest.mark.parametrize(
-    "reg_values",
-    [
-        ({0x0: {"value": 0x255}}),
-        ({0x0: {"value": 0x255}, 0x1: {"value": 0x255}, 0x2: {"value": 0x255}}),
-        ({0x0: {}, 0x1: {"value": 0x255}, 0x2: {}}),
-    ],
-)
-def test_add_change_flags_adds_flags(reg_values):
-    _add_change_flags(reg_values)
-    for key in reg_values:
-        assert reg_values[key]["is_changed"] is False
+    reg_values = apply_opcodes({opcode.reg_address: reg_value}, [opcode])
+    assert reg_values[opcode.reg_address]["value"] == updated_reg_value
 
 
 @pytest.mark.parametrize(
@@ -308,40 +297,30 @@ def test_apply_opcodes_raises(reg_values, opcodes):
     "reg_values, opcodes, out",
     [
         (
-            {TCAddresses.CR1_W.value: 0x0},
+            {TCAddresses.CR1_W.value: 0x13},
             [AvgMode.AVG_1.value],
-            {
-                TCAddresses.CR1_W.value: {
-                    "value": AvgMode.AVG_1.value.op_code,
-                    "is_changed": True,
-                }
-            },
+            {TCAddresses.CR1_W.value: {"value": 0x03, "is_changed": True}},
         ),
         (
-            {TCAddresses.CR0_W.value: 0x0, TCAddresses.CR1_W.value: 0x0},
+            {TCAddresses.CR0_W.value: 0x0, TCAddresses.CR1_W.value: 0x13},
             [AvgMode.AVG_1.value],
             {
                 TCAddresses.CR0_W.value: {"value": 0x0, "is_changed": False},
-                TCAddresses.CR1_W.value: {
-                    "value": AvgMode.AVG_1.value.op_code,
-                    "is_changed": True,
-                },
+                TCAddresses.CR1_W.value: {"value": 0x03, "is_changed": True},
             },
         ),
         (
-            {TCAddresses.CR0_W.value: 0x0, TCAddresses.CR1_W.value: 0x0},
+            {TCAddresses.CR0_W.value: 0x0, TCAddresses.CR1_W.value: 0x13},
             [AvgMode.AVG_1.value, ConvMode.AUTO.value],
             {
                 TCAddresses.CR0_W.value: {
                     "value": ConvMode.AUTO.value.op_code,
                     "is_changed": True,
                 },
-                TCAddresses.CR1_W.value: {
-                    "value": AvgMode.AVG_1.value.op_code,
-                    "is_changed": True,
-                },
+                TCAddresses.CR1_W.value: {"value": 0x03, "is_changed": True},
             },
         ),
+        # CR1 already holds the AVG_1 value, so only CR0 is changed
         (
             {TCAddresses.CR0_W.value: 0x0, TCAddresses.CR1_W.value: 0x0},
             [AvgMode.AVG_1.value, ConvMode.AUTO.value],
@@ -350,10 +329,7 @@ def test_apply_opcodes_raises(reg_values, opcodes):
                     "value": ConvMode.AUTO.value.op_code,
                     "is_changed": True,
                 },
-                TCAddresses.CR1_W.value: {
-                    "value": AvgMode.AVG_1.value.op_code,
-                    "is_changed": True,
-                },
+                TCAddresses.CR1_W.value: {"value": 0x0, "is_changed": False},
             },
         ),
     ],
@@ -362,28 +338,6 @@ def test_apply_opcodes(reg_values, opcodes, out):
     assert apply_opcodes(reg_values, opcodes) == out
 
 
-@pytest.mark.parametrize(
-    "reg_map",
-    [
-        ({TCAddresses.CR0_R.value: 0xFF}),
-        (
-            {
-                TCAddresses.CR0_R.value: 0xFF,
-                TCAddresses.CR1_R.value: 0x00,
-                TCAddresses.CJLF_R.value: 0x5F,
-            }
-        ),
-    ],
-)
-def test_convert_values_to_dict(reg_map):
-    map_copy = deepcopy(reg_map)
-    _convert_values_to_dict(reg_map)
-    for key in reg_map:
-        assert isinstance(reg_map[key], dict)  # assert changed format to addx, dict pairs
-        assert (
-            reg_map[key]["value"] == map_copy[key]
-        )  # assert value field in dict, and reg_value copied correctly
-
 @pytest.mark.parametrize('reg_dict, result',[({3:{'value':32,'is_changed':False}}, {3:32}),
                                              ({3:{'value':32,'is_changed':True}}, {3:32}),
                                              ({3:{'value':32,'is_changed':False},
@@ -429,3 +383,79 @@ def test_convert_dict_to_values(reg_dict, result):
 ])
 def test_is_bit_set(reg_val, bit_mask, result):
     assert is_bit_set(reg_val, bit_mask) == result
+
+
+def _flagged_map(values: list, changed: list) -> dict:
+    return {
+        addx: {"value": value, "is_changed": addx in changed}
+        for addx, value in enumerate(values)
+    }
+
+
+@pytest.mark.parametrize("reg_map, max_gap, result", [
+    (_flagged_map([0, 1, 2, 3], []), 0, []),
+    (_flagged_map([0, 1, 2, 3], [2]), 0, [(2, [2])]),
+    (_flagged_map([0, 1, 2, 3], [1, 2]), 0, [(1, [1, 2])]),
+    (_flagged_map([0, 1, 2, 3, 4, 5], [0, 3]), 0, [(0, [0]), (3, [3])]),
+    (_flagged_map([0, 1, 2, 3, 4, 5], [0, 3]), 2, [(0, [0, 1, 2, 3])]),
+    (_flagged_map([0, 1, 2, 3, 4, 5], [0, 4]), 2, [(0, [0]), (4, [4])]),
+    # gaps are bridged only with registers whose value is known
+    ({0: {"value": 7, "is_changed": True}, 2: {"value": 9, "is_changed": True}}, 2,
+     [(0, [7]), (2, [9])]),
+])
+def test_changed_register_spans(reg_map, max_gap, result):
+    assert changed_register_spans(reg_map, max_gap) == result
+
+
+@pytest.mark.parametrize("opcodes, result", [
+    ([OpCode(0x10, 1, 0x0F)], ((1, 0x0F, 0x10),)),
+    # opcodes on different bits of a register are merged
+    ([OpCode(0x10, 1, 0x0F), OpCode(0x02, 1, 0xF0)], ((1, 0x00, 0x12),)),
+    # later opcodes take precedence over earlier ones on shared bits
+    ([OpCode(0x30, 1, 0x0F), OpCode(0x40, 1, 0x3F)], ((1, 0x0F, 0x70),)),
+    ([OpCode(0x01, 3, 0xFE), OpCode(0x80, 0, 0x7F)], ((0, 0x7F, 0x80), (3, 0xFE, 0x01))),
+])
+def test_compile_opcodes(opcodes, result):
+    assert compile_opcodes(opcodes) == result
+
+
+def test_compile_opcodes_raises():
+    with pytest.raises(OpCodeMaskIncompatibleError):
+        compile_opcodes([OpCode(0x11, 0, 0xF0)])
+
+
+@pytest.mark.parametrize("image, opcodes, base_addx, result, dirty", [
+    (bytearray([0xFF, 0xFF, 0xFF]), [OpCode(0x10, 1, 0x0F)], 0,
+     bytearray([0xFF, 0x1F, 0xFF]), 0b010),
+    (bytearray([0x00, 0x00]), [OpCode(0x01, 4, 0xFE), OpCode(0x80, 5, 0x7F)], 4,
+     bytearray([0x01, 0x80]), 0b11),
+    # registers outside the image are ignored
+    (bytearray([0x00, 0x00]), [OpCode(0x01, 7, 0xFE)], 0, bytearray([0x00, 0x00]), 0),
+    # registers whose value does not change are not flagged
+    (bytearray([0x10]), [OpCode(0x10, 0, 0x0F)], 0, bytearray([0x10]), 0),
+    (bytearray([0x10, 0x10]), [OpCode(0x10, 0, 0x0F), OpCode(0x20, 1, 0x0F)], 0,
+     bytearray([0x10, 0x20]), 0b10),
+])
+def test_apply_compiled_opcodes(image, opcodes, base_addx, result, dirty):
+    assert apply_compiled_opcodes(image, compile_opcodes(opcodes), base_addx) == dirty
+    assert image == result
+
+
+def test_apply_opcodes_sparse_map():
+    reg_values = {2: 0xFF, 5: 0x00}
+    assert apply_opcodes(reg_values, [OpCode(0x00, 3, 0x00), OpCode(0x01, 5, 0xFE)]) == {
+        2: {"value": 0xFF, "is_changed": False},
+        5: {"value": 0x01, "is_changed": True},
+    }
+
+
+def test_apply_opcodes_checks_untargeted_registers(mocker):
+    def apply_compiled(image, compiled, base_addx):
+        # corrupt a register no opcode targets
+        image[1] = 0xAA
+        return apply_compiled_opcodes(image, compiled, base_addx)
+    mocker.patch(
+        "edgepi.reg_helper.reg_helper.apply_compiled_opcodes", side_effect=apply_compiled
+    )
+    with pytest.raises(RegisterUpdateError):
+        apply_opcodes({0: 0x00, 1: 0x00}, [OpCode(0x01, 0, 0xFE)])
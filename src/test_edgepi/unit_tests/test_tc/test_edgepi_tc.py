@@ -414,7 +414,8 @@ def test_set_config(mocker, args, set_reg_value, updated_regs, tc):
         # check updates were applied
         else:
             assert reg_values[addx]["value"] == updated_regs[addx]
-            assert reg_values[addx]["is_changed"]
+            # registers already holding the updated value are not written
+            assert reg_values[addx]["is_changed"] == (updated_regs[addx] != start_values[addx])
 
 
 @pytest.mark.parametrize(
@@ -486,6 +487,28 @@ def test_single_sample(mocker, cr0_val, cmd, tc):
         mock_write.assert_called_once_with(TCAddresses.CR0_W.value, cmd)
 
 
+@pytest.mark.parametrize(
+    "temp_regs, cj_code, lt_code, temps",
+    [
+        ([0x19, 0x00, 0x01, 0x90, 0x00, 0x00], 0x640, 0xC80, (25.0, 25.0)),
+        ([0x19, 0x40, 0x01, 0x90, 0x80, 0x01], 0x650, 0xC84, (25.25, 25.03125)),
+    ],
+)
+def test_read_temperature_records(mocker, temp_regs, cj_code, lt_code, temps, tc):
+    mock_transfer = mocker.patch(
+        "edgepi.peripherals.spi.SpiDevice.transfer",
+        return_value=[TCAddresses.CJTH_R.value] + temp_regs,
+    )
+    tc.last_transfer_ns = 1000
+    records = tc.read_temperature_records()
+    mock_transfer.assert_called_once_with([TCAddresses.CJTH_R.value] + [0xFF] * 6)
+    assert list(records.timestamp_ns) == [1000, 1000]
+    assert list(records.channel) == [0, 1]
+    assert list(records.raw_code) == [cj_code, lt_code]
+    assert tuple(records.value) == temps
+    assert list(records.status) == [temp_regs[5]] * 2
+
+
 @pytest.mark.parametrize(
     "cr0_val, cmd",
     [
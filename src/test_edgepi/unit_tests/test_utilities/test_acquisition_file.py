@@ -0,0 +1,97 @@
+"""unit tests for acquisition_file.py module"""
+
+import pytest
+from edgepi.calibration.calibration_constants import CalibParam
+from edgepi.eeprom.edgepi_eeprom_data import EepromDataClass
+from edgepi.eeprom.protobuf_assets.eeprom_data_classes.eeprom_key_module import AwsKeys
+from edgepi.eeprom.protobuf_assets.eeprom_data_classes.eeprom_rtd_module import RTDModule
+from edgepi.utilities.acquisition_file import (
+    AcquisitionReader,
+    AcquisitionWriter,
+    ChannelInfo,
+)
+from edgepi.utilities.sample_records import SampleBatch, SampleRecord
+
+CHANNELS = [ChannelInfo(0x0A, "AIN1", "adc", "V"), ChannelInfo(0x100, "CJ", "tc", "C")]
+
+
+def _adc_batch(start: int, count: int) -> SampleBatch:
+    return SampleBatch([
+        SampleRecord(1000 * i, 0x0A, i, i / 10, 0x40) for i in range(start, start + count)
+    ])
+
+
+def _write_file(path, chunk_size=4, close=True):
+    writer = AcquisitionWriter(path, CHANNELS, chunk_size=chunk_size)
+    writer.append(_adc_batch(0, 6))
+    writer.append(SampleBatch([SampleRecord(500, 0, 0x640, 25.0, 0)]), channel_offset=0x100)
+    writer.append(_adc_batch(6, 4))
+    if close:
+        writer.close()
+    else:
+        writer.flush()
+    return writer
+
+
+@pytest.mark.parametrize("close", [True, False])
+def test_acquisition_file_roundtrip(tmp_path, close):
+    path = str(tmp_path / "capture.acq")
+    _write_file(path, close=close)
+    with AcquisitionReader(path) as reader:
+        assert reader.channels[0x0A] == CHANNELS[0]
+        assert [chunk.count for chunk in reader.chunks if chunk.channel == 0x0A] == [4, 4, 2]
+        assert reader.read_batch(0x0A) == _adc_batch(0, 10)
+        assert list(reader.read_batch(0x100)) == [SampleRecord(500, 0x100, 0x640, 25.0, 0)]
+        assert reader.read_batch(0x0A, start_ns=3000, end_ns=7000) == _adc_batch(3, 4)
+        assert len(reader.read_batch(0x0A, start_ns=20000)) == 0
+        assert len(reader.read_batch(0x0B)) == 0
+
+
+def test_acquisition_file_column_views(tmp_path):
+    path = str(tmp_path / "capture.acq")
+    _write_file(path)
+    reader = AcquisitionReader(path)
+    views = reader.column_views(0x0A, start_ns=5000)
+    assert [list(view["raw_code"]) for view in views] == [[5, 6, 7], [8, 9]]
+    assert list(views[0]["value"]) == [0.5, 0.6, 0.7]
+    for view in views:
+        for column in view.values():
+            column.release()
+    del views
+    reader.close()
+
+
+def test_acquisition_file_numpy(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    path = str(tmp_path / "capture.acq")
+    _write_file(path)
+    with AcquisitionReader(path) as reader:
+        arrays = reader.read_numpy(0x0A, start_ns=1000, end_ns=3000)
+        assert arrays["timestamp_ns"].tolist() == [1000, 2000]
+        assert numpy.allclose(reader.read_numpy(0x0A)["value"], [i / 10 for i in range(10)])
+        del arrays
+
+
+def test_acquisition_file_calibration(tmp_path):
+    path = str(tmp_path / "capture.acq")
+    eeprom_data = EepromDataClass(
+        rtd_calib_params=RTDModule(CalibParam(gain=1.1, offset=0.2), 1000.0),
+        config_key=AwsKeys("private key", "certificate"),
+        serial="20221110-021",
+    )
+    AcquisitionWriter(path, calibration=eeprom_data).close()
+    with AcquisitionReader(path) as reader:
+        assert reader.calibration == {
+            "rtd_calib_params": {"rtd": {"gain": 1.1, "offset": 0.2}, "rtd_resistor": 1000.0},
+            "serial": "20221110-021",
+        }
+        assert not reader.chunks
+
+
+def test_acquisition_file_invalid(tmp_path):
+    path = tmp_path / "capture.acq"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        AcquisitionReader(str(path))
+    with pytest.raises(ValueError):
+        AcquisitionWriter(str(path), chunk_size=0)
@@ -0,0 +1,53 @@
+"""unit tests for histogram.py module"""
+
+import pytest
+from edgepi.utilities.histogram import DEFAULT_TIME_BOUNDS_NS, Histogram, exponential_bounds
+
+
+def test_exponential_bounds():
+    assert exponential_bounds(1, 2, 4) == [1, 2, 4, 8]
+    assert DEFAULT_TIME_BOUNDS_NS[0] == 1000
+    assert DEFAULT_TIME_BOUNDS_NS[-1] > 1e9
+
+
+@pytest.mark.parametrize("start, factor, count", [(0, 2, 4), (1, 1, 4), (1, 2, 0)])
+def test_exponential_bounds_invalid(start, factor, count):
+    with pytest.raises(ValueError):
+        exponential_bounds(start, factor, count)
+
+
+@pytest.mark.parametrize("bounds", [[], [1, 1], [2, 1]])
+def test_histogram_invalid_bounds(bounds):
+    with pytest.raises(ValueError):
+        Histogram(bounds)
+
+
+def test_histogram_record():
+    histogram = Histogram([10, 20, 40])
+    assert histogram.mean is None
+    assert histogram.quantile(0.5) is None
+    for value in [5, 10, 11, 30, 35, 100]:
+        histogram.record(value)
+    assert histogram.counts == [2, 1, 2, 1]
+    assert (histogram.count, histogram.sum, histogram.min, histogram.max) == (6, 191, 5, 100)
+    assert histogram.mean == pytest.approx(191 / 6)
+    assert histogram.buckets() == [(10, 2), (20, 3), (40, 5), (float("inf"), 6)]
+
+
+@pytest.mark.parametrize("fraction, expected", [
+    (0, 10),
+    (0.3, 10),
+    (0.5, 20),
+    (0.8, 40),
+    (1, 100),
+])
+def test_histogram_quantile(fraction, expected):
+    histogram = Histogram([10, 20, 40])
+    for value in [5, 10, 11, 30, 35, 100]:
+        histogram.record(value)
+    assert histogram.quantile(fraction) == expected
+
+
+def test_histogram_quantile_invalid():
+    with pytest.raises(ValueError):
+        Histogram().quantile(1.5)
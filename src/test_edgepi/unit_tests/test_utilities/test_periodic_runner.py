@@ -0,0 +1,77 @@
+"""unit tests for periodic_runner.py module"""
+
+from contextlib import nullcontext
+
+import pytest
+from edgepi.utilities.periodic_runner import PeriodicRunner
+from edgepi.utilities.waiter import NullWaiter
+
+
+class _CountingRunner(PeriodicRunner):
+    """
+    Runner counting its iterations, and failing at iteration `fail_at`. Iterations end at
+    their deadline, or at the times in `end_times`.
+    """
+
+    def __init__(self, num_iterations=None, fail_at=None, end_times=None):
+        super().__init__(NullWaiter())
+        self.num_iterations = num_iterations
+        self.fail_at = fail_at
+        self.end_times = end_times
+        self.iterations = 0
+        self.deadlines_ns = []
+        self.lateness_ns = []
+
+    def start(self, max_iterations=None):
+        """Start the runner thread"""
+        self._start_thread(1e6, "CountingRunner", max_iterations)
+
+    def _session(self):
+        return nullcontext()
+
+    def _iterate(self, deadline_ns):
+        if self.iterations == self.num_iterations:
+            return None
+        if self.iterations == self.fail_at:
+            raise ValueError("iteration failed")
+        self.iterations += 1
+        self.deadlines_ns.append(deadline_ns)
+        return self.end_times.pop(0) if self.end_times else deadline_ns
+
+    def _overrun(self, lateness_ns):
+        self.lateness_ns.append(lateness_ns)
+
+
+def test_runner_ends_when_iterate_returns_none():
+    runner = _CountingRunner(num_iterations=3)
+    with runner:
+        assert runner.wait(timeout=5)
+    assert runner.iterations == 3
+    assert not runner.is_running
+
+
+def test_runner_max_iterations():
+    runner = _CountingRunner()
+    runner.start(max_iterations=5)
+    assert runner.wait(timeout=5)
+    assert runner.iterations == 5
+
+
+def test_runner_overruns(mocker):
+    mock_time = mocker.patch("edgepi.utilities.periodic_runner.time")
+    mock_time.perf_counter_ns.return_value = 0
+    # the second iteration ends 500 ns after the third iteration's deadline
+    runner = _CountingRunner(num_iterations=4, end_times=[100, 2500, 2600, 3500])
+    runner.start()
+    assert runner.wait(timeout=5)
+    assert runner.deadlines_ns == [0, 1000, 2500, 3500]
+    assert runner.lateness_ns == [500]
+
+
+def test_runner_error():
+    runner = _CountingRunner(fail_at=2)
+    runner.start()
+    with pytest.raises(ValueError):
+        runner.wait(timeout=5)
+    assert runner.iterations == 2
+    assert not runner.is_running
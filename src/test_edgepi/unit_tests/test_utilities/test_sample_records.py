@@ -0,0 +1,42 @@
+"""unit tests for sample_records.py module"""
+
+import pytest
+from edgepi.utilities.sample_records import SAMPLE_FIELDS, SampleBatch, SampleRecord
+
+
+RECORDS = [
+    SampleRecord(1_000, 0x0A, 0x81197953, 0.1036, 0x40),
+    SampleRecord(2_000, 0x1A, 0x926C1393, 1.737, 0x41),
+    SampleRecord(3_000, 0x23, 0, -2.5, 0),
+]
+
+
+def test_sample_batch_roundtrip():
+    batch = SampleBatch(RECORDS)
+    assert len(batch) == 3
+    assert batch[1] == RECORDS[1]
+    assert list(batch) == RECORDS
+    assert list(batch.channel) == [0x0A, 0x1A, 0x23]
+    assert batch == SampleBatch(RECORDS)
+    assert batch != SampleBatch(RECORDS[:2])
+
+
+def test_sample_batch_extend():
+    batch = SampleBatch(RECORDS[:1])
+    batch.extend(SampleBatch(RECORDS[1:]))
+    assert batch == SampleBatch(RECORDS)
+
+
+def test_sample_record_equality():
+    assert RECORDS[0] == SampleRecord(*RECORDS[0].as_tuple())
+    assert RECORDS[0] != RECORDS[1]
+    assert RECORDS[0] != RECORDS[0].as_tuple()
+
+
+def test_sample_batch_to_numpy():
+    numpy = pytest.importorskip("numpy")
+    samples = SampleBatch(RECORDS).to_numpy()
+    assert samples.dtype.names == tuple(name for name, _, _ in SAMPLE_FIELDS)
+    assert samples["timestamp_ns"].tolist() == [1_000, 2_000, 3_000]
+    assert samples["raw_code"][1] == 0x926C1393
+    assert numpy.allclose(samples["value"], [0.1036, 1.737, -2.5])
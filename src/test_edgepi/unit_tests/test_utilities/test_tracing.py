@@ -0,0 +1,114 @@
+"""unit tests for tracing.py module"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from edgepi.peripherals.spi import SpiDevice
+from edgepi.utilities.tracing import TRACER, Tracer, traced
+
+
+@pytest.fixture(name="tracer")
+def fixture_tracer():
+    TRACER.clear()
+    TRACER.enable()
+    yield TRACER
+    TRACER.disable()
+    TRACER.clear()
+
+
+class _Traced:
+    """Class with traced methods"""
+
+    @traced(category="test")
+    def outer(self):
+        """Traced method calling another traced method"""
+        return self.__inner() + 1
+
+    @traced(category="test")
+    def __inner(self):
+        return 1
+
+    @traced(name="failing")
+    def fail(self):
+        """Traced method raising an exception"""
+        raise ValueError("failed")
+
+
+def test_tracing_disabled_by_default():
+    tracer = Tracer()
+    with tracer.span("operation"):
+        pass
+    tracer.add_span("operation", "sdk", 0, 10)
+    assert not tracer.spans()
+    TRACER.clear()
+    assert _Traced().outer() == 2
+    assert not TRACER.spans()
+
+
+def test_traced_spans_nest(tracer):
+    assert _Traced().outer() == 2
+    inner, outer = tracer.spans()
+    assert inner.name == "_Traced.__inner"
+    assert outer.name == "_Traced.outer"
+    assert inner.category == outer.category == "test"
+    assert outer.start_ns <= inner.start_ns <= inner.end_ns <= outer.end_ns
+    assert inner.thread_id == outer.thread_id
+
+
+def test_traced_span_records_error(tracer):
+    with pytest.raises(ValueError):
+        _Traced().fail()
+    (span,) = tracer.spans()
+    assert span.name == "failing"
+    assert span.args == {"error": "ValueError"}
+
+
+def test_span_args(tracer):
+    with tracer.span("operation", "adc", adc_num=1):
+        pass
+    (span,) = tracer.spans()
+    assert (span.name, span.category, span.args) == ("operation", "adc", {"adc_num": 1})
+    assert span.duration_ns >= 0
+
+
+def test_max_spans():
+    tracer = Tracer(max_spans=2)
+    tracer.enable()
+    for index in range(3):
+        tracer.add_span(f"span{index}", "sdk", index, index + 1)
+    assert [span.name for span in tracer.spans()] == ["span1", "span2"]
+
+
+def test_chrome_trace(tmp_path, tracer):
+    tracer.add_span("operation", "adc", 2000, 5500, {"adc_num": 1})
+    trace = tracer.to_chrome_trace()
+    metadata, event = trace["traceEvents"]
+    assert metadata["ph"] == "M"
+    assert metadata["args"] == {"name": "MainThread"}
+    assert event["name"] == "operation"
+    assert event["cat"] == "adc"
+    assert event["ph"] == "X"
+    assert (event["ts"], event["dur"]) == (2.0, 3.5)
+    assert event["tid"] == metadata["tid"]
+    assert event["args"] == {"adc_num": "1"}
+    path = tmp_path / "trace.json"
+    tracer.save_chrome_trace(str(path))
+    assert json.loads(path.read_text(encoding="utf-8")) == trace
+
+
+def test_spi_commands_traced(mocker, tracer):
+    mocker.patch("edgepi.peripherals.spi.SPI")
+    spidev = SpiDevice(6, 1, waiter=MagicMock())
+    spidev.spi_apply_adc_commands([([0x08], 0.001, [0x12])])
+    spans = {span.name: span for span in tracer.spans()}
+    assert set(spans) == {
+        "spi-dev1 lock wait",
+        "SpiDevice.delay",
+        "spi-dev1 lock hold",
+        "SpiDevice.spi_apply_adc_commands",
+    }
+    assert spans["SpiDevice.delay"].args == {"seconds": 0.001}
+    outer = spans["SpiDevice.spi_apply_adc_commands"]
+    for span in spans.values():
+        assert outer.start_ns <= span.start_ns <= span.end_ns <= outer.end_ns
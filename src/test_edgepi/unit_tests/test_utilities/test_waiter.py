@@ -0,0 +1,73 @@
+"""unit tests for waiter.py module"""
+
+import time
+
+import pytest
+from edgepi.utilities.waiter import (
+    HybridWaiter,
+    NullWaiter,
+    SleepWaiter,
+    SpinWaiter,
+    Waiter,
+    WaitStats,
+    WaitStrategy,
+    get_waiter,
+)
+
+
+@pytest.mark.parametrize("strategy, waiter_class", [
+    (WaitStrategy.SLEEP, SleepWaiter),
+    (WaitStrategy.SPIN, SpinWaiter),
+    (WaitStrategy.HYBRID, HybridWaiter),
+])
+def test_waiter_waits_until_deadline(strategy, waiter_class):
+    waiter = get_waiter(strategy)
+    assert isinstance(waiter, waiter_class)
+    assert waiter.strategy == strategy
+    for _ in range(3):
+        start = time.perf_counter_ns()
+        waiter.wait(0.0005)
+        assert time.perf_counter_ns() - start >= 500_000
+    assert waiter.stats.count == 3
+    assert 0 <= waiter.stats.min_overshoot_ns <= waiter.stats.max_overshoot_ns
+    waiter.reset_stats()
+    assert waiter.stats == WaitStats()
+
+
+def test_hybrid_waiter_sleeps_before_spinning(mocker):
+    sleep = mocker.patch("edgepi.utilities.waiter.time.sleep")
+    waiter = HybridWaiter(spin_us=100)
+    waiter.wait(0.001)
+    # sleeps for about 900 µs, then spins for the remaining time
+    assert 0 < sleep.call_args.args[0] <= 0.0009
+    sleep.reset_mock()
+    waiter.wait(0.00005)
+    sleep.assert_not_called()
+
+
+def test_hybrid_waiter_invalid_spin_time():
+    with pytest.raises(ValueError):
+        HybridWaiter(spin_us=-1)
+
+
+def test_wait_stats():
+    stats = WaitStats()
+    assert stats.mean_overshoot_ns is None
+    for overshoot in [30, 10, 20]:
+        stats.record(overshoot)
+    assert stats == WaitStats(3, 60, 10, 30)
+    assert stats.mean_overshoot_ns == 20
+
+
+def test_null_waiter_returns_immediately():
+    waiter = get_waiter(WaitStrategy.NONE)
+    assert isinstance(waiter, NullWaiter)
+    start = time.perf_counter_ns()
+    waiter.wait(10)
+    assert time.perf_counter_ns() - start < 1e9
+    assert waiter.stats.count == 1
+
+
+def test_waiter_is_abstract():
+    with pytest.raises(TypeError):
+        Waiter()  # pylint: disable=abstract-class-instantiated